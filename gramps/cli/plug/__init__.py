@@ -58,7 +58,8 @@ from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.errors import ReportError, FilterError
 from gramps.gen.plug.report import (CATEGORY_TEXT, CATEGORY_DRAW, CATEGORY_BOOK,
                                     CATEGORY_GRAPHVIZ, CATEGORY_TREE,
-                                    CATEGORY_CODE, ReportOptions, append_styles)
+                                    CATEGORY_CODE, ReportOptions, ReportCache,
+                                    append_styles)
 from gramps.gen.plug.report._paper import paper_sizes
 from gramps.gen.const import USER_HOME, DOCGEN_OPTIONS
 from gramps.gen.dbstate import DbState
@@ -791,6 +792,7 @@ def cl_book(database, name, book, options_str_dict):
     user = User()
     rptlist = []
     selected_style = StyleSheet()
+    cache = ReportCache() # shared by the items of the book
     for item in book.get_item_list():
 
         # The option values were loaded magically by the book parser.
@@ -803,6 +805,7 @@ def cl_book(database, name, book, options_str_dict):
                 menu_option.set_value(opt_dict[optname])
 
         item.option_class.set_document(doc)
+        item.option_class.set_cache(cache)
         report_class = item.get_write_item()
         obj = (write_book_item(database,
                                report_class, item.option_class, user),
@@ -166,6 +166,7 @@ register('database.autobackup', 0)
 register('database.path', os.path.join(HOME_DIR, 'grampsdb'))
 register('database.host', '')
 register('database.port', '')
+register('database.undo-history', 1000)
 
 register('export.proxy-order',
          [["privacy", 0],
@@ -215,6 +216,7 @@ register('interface.pedview-tree-direction', 2)
 register('interface.pedview-show-unknown-people', False)
 register('interface.place-name-height', 100)
 register('interface.place-name-width', 450)
+register('interface.progressive-view-loading', True)
 register('interface.sidebar-text', True)
 register('interface.size-checked', False)
 register('interface.statusbar', 1)
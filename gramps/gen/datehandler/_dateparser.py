@@ -32,6 +32,7 @@ date parsing class. The default base class provides parsing for English.
 #-------------------------------------------------------------------------
 import re
 import calendar
+from collections import OrderedDict
 
 #-------------------------------------------------------------------------
 #
@@ -59,6 +60,11 @@ from ._datestrings import DateStrings
 _max_days = [ 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 _leap_days = [ 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 
+# dates made only of numbers, and samples of them
+_numeric_text = re.compile(r'\d[\d\s/.,-]*$')
+_numeric_samples = ('1850', '1850-03-12', '1850/3/12', '12.03.1850',
+                    '3/12/1850', '12-3-1850', '12 3 1850', '1850/51')
+
 def gregorian_valid(date_tuple):
     """ Checks if date_tuple is a valid date in Gregorian Calendar  """
     day = date_tuple[0]
@@ -195,6 +201,9 @@ class DateParser:
 
     _dhformat_parse = re.compile(r".*%(\S).*%(\S).*%(\S).*")
 
+    # number of recently parsed texts whose dates are kept by parse
+    CACHE_SIZE = 1000
+
     # RFC-2822 only uses capitalized English abbreviated names, no locales.
     _rfc_days = ('Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat')
     _rfc_mons_to_int = {
@@ -371,6 +380,18 @@ class DateParser:
             self.ymd = False
             self._ddmy = False
 
+        # recently parsed texts and their dates
+        self._cache = OrderedDict()
+        self._cache_today = re.compile(self._today_str, re.IGNORECASE)
+        # the month names never match numeric dates, skip trying them
+        self._skip_months = not any(
+            regex.match(sample)
+            for regex in (self._text, self._text2, self._jtext, self._jtext2,
+                          self._ftext, self._ftext2, self._ptext,
+                          self._ptext2, self._itext, self._itext2,
+                          self._stext, self._stext2)
+            for sample in _numeric_samples)
+
     def dhformat_changed(self):
         """ Allow overriding so a subclass can modify it """
         pass
@@ -617,9 +638,10 @@ class DateParser:
         else:
             check = None
 
-        value = subparser(text)
-        if value != Date.EMPTY:
-            return value
+        if not (self._skip_months and _numeric_text.match(text)):
+            value = subparser(text)
+            if value != Date.EMPTY:
+                return value
 
         match = self._iso.match(text)
         if match:
@@ -914,9 +936,11 @@ class DateParser:
         cal = Date.CAL_GREGORIAN
         newyear = Date.NEWYEAR_JAN1
 
-        (text, cal, newyear) = self.match_calendar_newyear(text, cal, newyear)
-        (text, newyear) = self.match_newyear(text, newyear)
-        (text, cal) = self.match_calendar(text, cal)
+        if '(' in text: # calendar and newyear are given in parentheses
+            (text, cal, newyear) = self.match_calendar_newyear(text, cal,
+                                                               newyear)
+            (text, newyear) = self.match_newyear(text, newyear)
+            (text, cal) = self.match_calendar(text, cal)
         (text, qual) = self.match_quality(text, qual)
 
         if self.match_span(text, cal, newyear, qual, date):
@@ -948,10 +972,21 @@ class DateParser:
     def parse(self, text):
         """
         Parses the text, returning a :class:`.Date` object.
+
+        The dates of the texts parsed recently are kept, as imported files
+        give the same dates many times.
         """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return Date(cached)
         new_date = Date()
         try:
             self.set_date(new_date, text)
         except DateError:
             new_date.set_as_text(text)
+        if not self._cache_today.search(text): # changes every day
+            self._cache[text] = Date(new_date)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
         return new_date
@@ -0,0 +1,120 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the date parsers of all the locales.
+
+The corpus of each locale is made of the dates shown by its date displayer
+and of numeric and ISO dates, repeated as the dates of an imported file are.
+Each parser parses it once without keeping the parsed dates, and once as
+:meth:`.DateParser.parse` does.
+
+Run with::
+
+    python3 -m gramps.gen.datehandler.test.dateparser_benchmark [repeat]
+"""
+import sys
+from time import perf_counter
+
+from ...lib.date import Date
+from ...utils.grampslocale import GrampsLocale
+from .._datehandler import LANG_TO_PARSER
+
+# (quality, modifier, calendar, value)
+DATES = [
+    (Date.QUAL_NONE, Date.MOD_NONE, Date.CAL_GREGORIAN,
+     (12, 3, 1850, False)),
+    (Date.QUAL_NONE, Date.MOD_NONE, Date.CAL_GREGORIAN, (0, 3, 1850, False)),
+    (Date.QUAL_NONE, Date.MOD_NONE, Date.CAL_GREGORIAN, (0, 0, 1850, False)),
+    (Date.QUAL_NONE, Date.MOD_ABOUT, Date.CAL_GREGORIAN,
+     (0, 0, 1850, False)),
+    (Date.QUAL_NONE, Date.MOD_BEFORE, Date.CAL_GREGORIAN,
+     (1, 5, 1901, False)),
+    (Date.QUAL_NONE, Date.MOD_AFTER, Date.CAL_GREGORIAN,
+     (0, 0, 1766, False)),
+    (Date.QUAL_ESTIMATED, Date.MOD_NONE, Date.CAL_GREGORIAN,
+     (0, 0, 1820, False)),
+    (Date.QUAL_CALCULATED, Date.MOD_ABOUT, Date.CAL_GREGORIAN,
+     (0, 0, 1790, False)),
+    (Date.QUAL_NONE, Date.MOD_RANGE, Date.CAL_GREGORIAN,
+     (0, 0, 1850, False, 0, 0, 1860, False)),
+    (Date.QUAL_NONE, Date.MOD_SPAN, Date.CAL_GREGORIAN,
+     (5, 6, 1850, False, 0, 0, 1860, False)),
+    (Date.QUAL_NONE, Date.MOD_NONE, Date.CAL_JULIAN, (24, 2, 1700, False)),
+    (Date.QUAL_NONE, Date.MOD_NONE, Date.CAL_GREGORIAN, (1, 3, 1720, True)),
+    ]
+
+NUMERIC = ['1850', '1850-03-12', '12.03.1850', '3/12/1850', '1850-03']
+
+def get_parsers():
+    """
+    Return the (language, locale) of a language of each date parser.
+    """
+    languages = {}
+    for lang, parser_class in LANG_TO_PARSER.items():
+        languages.setdefault(parser_class, []).append(lang)
+    # the language codes are the shortest names of the languages
+    return sorted((lang, GrampsLocale(lang=lang))
+                  for lang in (min(sorted(langs), key=len)
+                               for langs in languages.values()))
+
+def get_corpus(locale):
+    """
+    Return the texts of the dates to parse for the locale.
+    """
+    corpus = list(NUMERIC)
+    for quality, modifier, calendar, value in DATES:
+        date = Date()
+        date.set(quality, modifier, calendar, value)
+        corpus.append(locale.date_displayer.display(date))
+    return corpus
+
+def time_parse(parser, corpus, repeat, cache_size):
+    """
+    Return the best time of parsing the corpus with the cache size.
+    """
+    best = None
+    for dummy in range(repeat):
+        parser._cache.clear()
+        parser.CACHE_SIZE = cache_size
+        start = perf_counter()
+        for text in corpus:
+            parser.parse(text)
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    del parser.CACHE_SIZE
+    return best
+
+def main(repeat=5):
+    """
+    Run the benchmark and print the results.
+    """
+    print("%-8s %8s %12s %12s %8s" % ("Locale", "texts", "parse (us)",
+                                       "cached (us)", "speedup"))
+    for lang, locale in get_parsers():
+        corpus = get_corpus(locale) * 20
+        parser = locale.date_parser
+        uncached = time_parse(parser, corpus, repeat, 0)
+        cached = time_parse(parser, corpus, repeat, parser.CACHE_SIZE)
+        print("%-8s %8d %12.1f %12.1f %7.1fx" % (
+            lang, len(corpus), uncached * 1e6 / len(corpus),
+            cached * 1e6 / len(corpus), uncached / cached))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
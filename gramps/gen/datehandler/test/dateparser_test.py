@@ -26,7 +26,7 @@ Deeper testing of some DateParser internals.
 import unittest
 
 from ...utils.grampslocale import GrampsLocale
-from ...lib.date import Date
+from ...lib.date import Date, DateError
 
 class DateParserTest(unittest.TestCase):
     def setUp(self):
@@ -121,5 +121,47 @@ class Test_generate_variants(unittest.TestCase):
         v = self.month_variants[5]
         self.assertIn("Maj", v)
 
+class Test_parse_fast_path(unittest.TestCase):
+    """
+    The dates kept by parse, and the numeric dates parsed without trying
+    the month names, are the dates parsed the long way.
+    """
+    EXTRA = ['1850/51', '12 3 1850', '12-3-1850', '3/1850', '1700 (Julian)',
+             'abt 1850-03', 'bet 1850 and 1860 (Mar25)', 'foo', '']
+
+    def slow_parse(self, parser, text):
+        date = Date()
+        parser._skip_months = False
+        try:
+            parser.set_date(date, text)
+        except DateError:
+            date.set_as_text(text)
+        finally:
+            parser._skip_months = True
+        return date
+
+    def test_same_dates_in_all_locales(self):
+        from .dateparser_benchmark import get_parsers, get_corpus
+        for lang, locale in get_parsers():
+            parser = locale.date_parser
+            self.assertTrue(parser._skip_months, msg=lang)
+            for text in (get_corpus(locale) + self.EXTRA) * 2:
+                self.assertEqual(parser.parse(text).serialize(),
+                                 self.slow_parse(parser, text).serialize(),
+                                 msg="%s: %r" % (lang, text))
+
+    def test_cached_dates_are_copies(self):
+        from .._dateparser import DateParser
+        parser = DateParser()
+        date = parser.parse('12 mar 1850')
+        date.set_yr_mon_day(1900, 1, 1)
+        self.assertEqual(parser.parse('12 mar 1850').get_year(), 1850)
+
+    def test_today_not_cached(self):
+        from .._dateparser import DateParser
+        parser = DateParser()
+        parser.parse('today')
+        self.assertNotIn('today', parser._cache)
+
 if __name__ == "__main__":
     unittest.main()
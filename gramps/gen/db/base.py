@@ -40,11 +40,12 @@ import logging
 # Gramps libraries
 #
 #-------------------------------------------------------------------------
-from ..db.dbconst import DBLOGNAME
+from ..db.dbconst import DBLOGNAME, CLASS_TO_KEY_MAP
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from ..lib.childreftype import ChildRefType
 from ..lib.childref import ChildRef
+from ..utils.place import conv_lat_lon_float
 from .txn import DbTxn
 from .exceptions import DbTransactionCancel, DbException
 
@@ -1433,6 +1434,84 @@ class DbReadBase:
         """
         return False
 
+    def get_text_index_handles(self, class_name, text):
+        """
+        Return the set of handles of the objects of class class_name whose
+        text may contain text, ignoring case. The set may contain objects
+        that do not match, so the objects must still be checked, but all
+        matching objects are in it.
+
+        Returns None if the database has no text index, or the text is too
+        short for it to be used. All objects must then be checked.
+        """
+        return None
+
+    def get_statistics(self):
+        """
+        Return the :class:`.DbStatistics` of the database, kept up to date as
+        objects are committed, or None if the database does not keep them.
+        In that case, the statistics must be computed from the objects.
+        """
+        return None
+
+    def get_place_hierarchy(self):
+        """
+        Return the :class:`.DbPlaceHierarchy` of the database, kept up to
+        date as places are committed, or None if the database does not keep
+        it. In that case, the enclosing places must be read from the
+        database.
+        """
+        return None
+
+    def get_place_coordinates(self, handles=None):
+        """
+        Return a dictionary of the (latitude, longitude) of places, in
+        decimal degrees as returned by :func:`.conv_lat_lon_float`, by their
+        handles. Only the places with valid coordinates are in it.
+
+        :param handles: the handles of the places, or None for all places.
+        :type handles: list
+        """
+        if handles is None:
+            handles = self.iter_place_handles()
+        coordinates = {}
+        for handle in handles:
+            place = self.get_place_from_handle(handle)
+            if place is None:
+                continue
+            lat, lon = conv_lat_lon_float(place.get_latitude(),
+                                          place.get_longitude())
+            if lat is not None:
+                coordinates[handle] = (lat, lon)
+        return coordinates
+
+    def get_place_handles_in_area(self, lat1, lon1, lat2, lon2):
+        """
+        Return the list of handles of the places with coordinates in an
+        area, bounds included. If lon1 is greater than lon2, the area
+        crosses the antimeridian.
+        """
+        lat1, lat2 = min(lat1, lat2), max(lat1, lat2)
+        return [handle for handle, (lat, lon)
+                in self.get_place_coordinates().items()
+                if lat1 <= lat <= lat2 and
+                (lon1 <= lon <= lon2 if lon1 <= lon2 else
+                 lon >= lon1 or lon <= lon2)]
+
+    def get_backlink_map(self):
+        """
+        Return a dictionary of the sets of (class_name, handle) tuples of the
+        objects that hold a reference to an object, by the handles of the
+        referenced objects, for all the objects of the database.
+        """
+        backlinks = {}
+        for class_name in CLASS_TO_KEY_MAP:
+            for handle in self.method('iter_%s_handles', class_name)():
+                blinks = set(self.find_backlink_handles(handle))
+                if blinks:
+                    backlinks[handle] = blinks
+        return backlinks
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
@@ -1659,6 +1738,13 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def rebuild_text_index(self, callback):
+        """
+        Rebuild the text index used by :meth:`get_text_index_handles`.
+        Returns False if the database does not support a text index.
+        """
+        raise NotImplementedError
+
     def remove_citation(self, handle, transaction):
         """
         Remove the Event specified by the database handle from the
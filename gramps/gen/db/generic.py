@@ -35,6 +35,7 @@ import ast
 import sys
 import datetime
 import glob
+import sqlite3
 from pathlib import Path
 
 #------------------------------------------------------------------------
@@ -59,6 +60,8 @@ from ..lib.researcher import Researcher
 from ..lib import (Tag, Media, Person, Family, Source, Citation, Event,
                    Place, Repository, Note, NameOriginType)
 from ..lib.genderstats import GenderStats
+from .stats import DbStatistics
+from .hierarchy import DbPlaceHierarchy
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
@@ -68,51 +71,217 @@ LOG = logging.getLogger(DBLOGNAME)
 SIGBASE = ('person', 'family', 'source', 'event', 'media',
            'place', 'repository', 'reference', 'note', 'tag', 'citation')
 
+def _make_delta(old_data, new_data):
+    """
+    Return the fields of the serialized data of an object before a change
+    which differ from those after it, as a list of (index, value).
+    """
+    return [(index, value) for index, value in enumerate(old_data)
+            if index >= len(new_data) or value != new_data[index]]
+
+def _apply_delta(new_data, delta):
+    """
+    Return the serialized data of an object before a change, from that
+    after the change and the delta of :func:`_make_delta`.
+    """
+    old_data = list(new_data)
+    for index, value in delta:
+        if index < len(old_data):
+            old_data[index] = value
+        else:
+            old_data.append(value)
+    return tuple(old_data)
+
+class StoredTxn:
+    """
+    A transaction of the undo history restored from the undo journal: only
+    its description and the span of its records are kept.
+    """
+    __slots__ = ('msg', 'timestamp', 'first', 'last')
+
+    def __init__(self, msg, timestamp, first, last):
+        self.msg = msg
+        self.timestamp = timestamp
+        self.first = first
+        self.last = last
+
+    def get_description(self):
+        return self.msg
+
+    def get_recnos(self, reverse=False):
+        if self.first is None or self.last is None:
+            return []
+        if not reverse:
+            return range(self.first, self.last+1)
+        else:
+            return range(self.last, self.first-1, -1)
+
 class DbGenericUndo(DbUndo):
+    """
+    The undo history, with its records kept in an SQLite journal file next
+    to the database rather than in memory.
+
+    The data of an object before an update is stored as the fields which
+    differ from its data after the update. At most the number of
+    transactions of the 'database.undo-history' preference are kept; the
+    records of the oldest ones are removed as new ones are committed.
+
+    The history is kept when the database is closed, and restored when it
+    is opened again, unless the database was not closed properly.
+    """
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.journal = None
+        self.limit = config.get('database.undo-history')
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the journal, and restore the undo history from it if value is
+        the token returned by :meth:`save` when the database was closed.
         """
-        pass
+        path = self.path
+        if self.db.readonly or not path:
+            path = ':memory:'
+        try:
+            self.journal = self.__connect(path)
+        except sqlite3.DatabaseError:
+            # not a journal, like the undo file of older versions
+            os.remove(path)
+            self.journal = self.__connect(path)
+        cursor = self.journal.execute(
+            "SELECT value FROM metadata WHERE key = 'token'")
+        row = cursor.fetchone()
+        if value is None or row is None or row[0] != value:
+            self.__clear_journal()
+            return
+        for (msg, timestamp, first, last, undone) in self.journal.execute(
+                "SELECT msg, timestamp, first, last, undone "
+                "FROM txn ORDER BY id"):
+            txn = StoredTxn(msg, timestamp, first, last)
+            if undone:
+                self.redoq.append(txn)
+            else:
+                self.undoq.append(txn)
+
+    @staticmethod
+    def __connect(path):
+        connection = sqlite3.connect(path)
+        # the journal is thrown away if the database is not closed properly
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("CREATE TABLE IF NOT EXISTS undo "
+                           "(recno INTEGER PRIMARY KEY, delta INTEGER, "
+                           "data BLOB)")
+        connection.execute("CREATE TABLE IF NOT EXISTS txn "
+                           "(id INTEGER PRIMARY KEY, msg TEXT, "
+                           "timestamp REAL, first INTEGER, last INTEGER, "
+                           "undone INTEGER)")
+        connection.execute("CREATE TABLE IF NOT EXISTS metadata "
+                           "(key TEXT PRIMARY KEY, value TEXT)")
+        return connection
+
+    def __clear_journal(self):
+        self.journal.execute("DELETE FROM undo")
+        self.journal.execute("DELETE FROM txn")
+        self.journal.execute("DELETE FROM metadata")
+        self.journal.commit()
+
+    def save(self):
+        """
+        Write the undo history to the journal, and return the token to give
+        to :meth:`open` to restore it.
+        """
+        token = create_id()
+        self.journal.execute("DELETE FROM txn")
+        self.journal.executemany(
+            "INSERT INTO txn (msg, timestamp, first, last, undone) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(txn.get_description(), txn.timestamp, txn.first, txn.last,
+              undone)
+             for undone, queue in ((False, self.undoq),
+                                   (True, self.redoq))
+             for txn in queue])
+        self.journal.execute("INSERT OR REPLACE INTO metadata (key, value) "
+                            "VALUES ('token', ?)", [token])
+        self.journal.commit()
+        return token
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the journal.
         """
-        pass
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def clear(self):
+        """
+        Clear the undo/redo list and the journal.
+        """
+        super(DbGenericUndo, self).clear()
+        self.__clear_journal()
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction to the undo/redo list, and remove the oldest
+        transactions above the limit of the history.
+        """
+        super(DbGenericUndo, self).commit(txn, msg)
+        while (len(self.undoq) > 1 and
+               len(self.undoq) + len(self.redoq) > self.limit):
+            old_txn = self.undoq.popleft()
+            if old_txn.first is not None:
+                self.journal.execute(
+                    "DELETE FROM undo WHERE recno BETWEEN ? AND ?",
+                    [old_txn.first, old_txn.last])
+        self.journal.commit()
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new record on the end, and return its record number.
         """
-        self.undodb.append(value)
+        (key, trans_type, handle, old_data, new_data) = pickle.loads(value)
+        delta = (trans_type == TXNUPD and key != REFERENCE_KEY and
+                 old_data is not None and new_data is not None)
+        if delta:
+            value = pickle.dumps((key, trans_type, handle,
+                                  _make_delta(old_data, new_data), new_data),
+                                 1)
+        cursor = self.journal.execute(
+            "INSERT INTO undo (delta, data) VALUES (?, ?)", [delta, value])
+        return cursor.lastrowid
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
-        """
-        return self.undodb[index]
+        Returns a record by record number.
+        """
+        cursor = self.journal.execute(
+            "SELECT delta, data FROM undo WHERE recno = ?", [index])
+        row = cursor.fetchone()
+        if row is None:
+            raise IndexError(index)
+        delta, value = row
+        if delta:
+            (key, trans_type, handle, old_data, new_data) = pickle.loads(value)
+            value = pickle.dumps((key, trans_type, handle,
+                                  _apply_delta(new_data, old_data), new_data),
+                                 1)
+        return value
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set a record to a value.
         """
-        self.undodb[index] = value
+        self.journal.execute("UPDATE undo SET delta = 0, data = ? "
+                            "WHERE recno = ?", [value, index])
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of records.
         """
-        return len(self.undodb)
+        cursor = self.journal.execute("SELECT count(*) FROM undo")
+        return cursor.fetchone()[0]
 
     def _redo(self, update_history):
         """
@@ -132,7 +301,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = \
-                    pickle.loads(self.undodb[record_id])
+                    pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
@@ -181,7 +350,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = \
-                        pickle.loads(self.undodb[record_id])
+                        pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
@@ -302,7 +471,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (20, 0, 0)
+    VERSION = (21, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
@@ -530,6 +699,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.has_changed = 0  # Also gives commits since startup
         self.surname_list = []
         self.genderStats = GenderStats() # can pass in loaded stats as dict
+        self.statistics = DbStatistics(self)
+        self.place_hierarchy = DbPlaceHierarchy(self)
         self.owner = Researcher()
         if directory:
             self.load(directory)
@@ -626,12 +797,15 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         self._set_save_path(directory)
 
-        if self._directory:
+        if self._directory and self._directory != ':memory:':
             self.undolog = os.path.join(self._directory, DBUNDOFN)
         else:
             self.undolog = None
         self.undodb = DbGenericUndo(self, self.undolog)
-        self.undodb.open()
+        # The undo history, only kept if the database is closed properly:
+        self.undodb.open(self._get_metadata('undo_journal', None))
+        if not self.readonly:
+            self._set_metadata('undo_journal', None)
 
         # Other items to load
         gstats = self.get_gender_stats()
@@ -665,6 +839,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 self.close()
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
 
+        self.place_hierarchy = DbPlaceHierarchy(self)
+
+        # Statistics, only kept if the database is closed properly:
+        self.statistics = DbStatistics(self)
+        self.statistics.load(self._get_metadata('statistics', None))
+        if not self.readonly:
+            self._set_metadata('statistics', None)
+
     def _close(self):
         """
         Close database backend.
@@ -723,6 +905,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 # Save misc items:
                 if self.has_changed:
                     self.save_gender_stats(self.genderStats)
+                self._set_metadata('statistics', self.statistics.save())
+                self._set_metadata('undo_journal', self.undodb.save())
 
                 # Indexes:
                 self._set_metadata('cmap_index', self.cmap_index)
@@ -742,6 +926,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
         self.db_is_open = False
         self._directory = None
 
@@ -2292,7 +2478,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         return self._get_metadata("media-path", None)
 
     def set_mediapath(self, mediapath):
-        return self._set_metadata("media-path", mediapath)
+        self._set_metadata("media-path", mediapath)
+        self.statistics.refresh_media()
+
+    def get_statistics(self):
+        return self.statistics
+
+    def get_place_hierarchy(self):
+        return self.place_hierarchy
 
     def get_surname_list(self):
         """
@@ -2482,7 +2675,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         from gramps.gen.db.upgrade import (
             gramps_upgrade_14, gramps_upgrade_15, gramps_upgrade_16,
             gramps_upgrade_17, gramps_upgrade_18, gramps_upgrade_19,
-            gramps_upgrade_20)
+            gramps_upgrade_20, gramps_upgrade_21)
 
         if version < 14:
             gramps_upgrade_14(self)
@@ -2498,6 +2691,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19(self)
         if version < 20:
             gramps_upgrade_20(self)
+        if version < 21:
+            gramps_upgrade_21(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
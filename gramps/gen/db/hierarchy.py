@@ -0,0 +1,162 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Place hierarchy of a database, kept up to date as places are committed.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+from itertools import count
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..utils.location import get_place_entry
+from .dbconst import PLACE_KEY
+
+# the generations of all the hierarchies are different, so that the data
+# derived from a hierarchy is not mistaken for that of another one
+_GENERATIONS = count(1)
+
+#-------------------------------------------------------------------------
+#
+# DbPlaceHierarchy
+#
+#-------------------------------------------------------------------------
+class DbPlaceHierarchy:
+    """
+    The names, types and enclosing places of the places of a database.
+
+    The :class:`.PlaceEntry` of each place is read from the database the
+    first time it is needed, and replaced whenever the place is committed or
+    removed. The enclosing places of each place, through all the routes up
+    the hierarchy, are kept until a place changes.
+
+    The generation changes with each place committed or removed, so that the
+    data derived from the hierarchy, like the titles of the places, can be
+    dropped when it changes.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the places. They will be read again when needed.
+        """
+        self.generation = next(_GENERATIONS)
+        self.entries = {}
+        self.ancestors = {}
+        self.dated = {}
+
+    def __changed(self, handle, entry):
+        self.generation = next(_GENERATIONS)
+        self.entries[handle] = entry
+        self.ancestors = {}
+        self.dated = {}
+
+    #-------------------------------------------------------------------------
+    #
+    # Updates
+    #
+    #-------------------------------------------------------------------------
+    def commit(self, obj_key, obj):
+        """
+        Update the hierarchy for a committed object.
+        """
+        if obj_key == PLACE_KEY:
+            self.__changed(obj.handle, get_place_entry(obj))
+
+    def remove(self, obj_key, handle):
+        """
+        Update the hierarchy for a removed object.
+        """
+        if obj_key == PLACE_KEY:
+            self.__changed(handle, None)
+
+    #-------------------------------------------------------------------------
+    #
+    # Access
+    #
+    #-------------------------------------------------------------------------
+    def get_entry(self, handle):
+        """
+        Return the :class:`.PlaceEntry` of a place, or None if the place
+        does not exist.
+        """
+        try:
+            return self.entries[handle]
+        except KeyError:
+            pass
+        place = None
+        if handle and self.db.has_place_handle(handle):
+            place = self.db.get_place_from_handle(handle)
+        entry = None if place is None else get_place_entry(place)
+        self.entries[handle] = entry
+        return entry
+
+    def get_ancestors(self, handle):
+        """
+        Return the set of the handles of the places enclosing a place,
+        through all the routes up the hierarchy, whatever their dates.
+        """
+        try:
+            return self.ancestors[handle]
+        except KeyError:
+            pass
+        ancestors = set()
+        todo = [handle]
+        visited = set(todo)
+        while todo:
+            entry = self.get_entry(todo.pop())
+            if entry is None:
+                continue
+            for parent, dummy in entry.parents:
+                ancestors.add(parent)
+                if parent not in visited:
+                    visited.add(parent)
+                    todo.append(parent)
+        ancestors = frozenset(ancestors)
+        self.ancestors[handle] = ancestors
+        return ancestors
+
+    def is_dated(self, handle):
+        """
+        Return True if a name or an enclosing place of a place, or of one of
+        the places enclosing it, has a date. Otherwise, the names of the
+        place and its enclosing places are the same at all dates.
+        """
+        try:
+            return self.dated[handle]
+        except KeyError:
+            pass
+        dated = False
+        for place_handle in {handle} | self.get_ancestors(handle):
+            entry = self.get_entry(place_handle)
+            if entry is not None and entry.dated:
+                dated = True
+                break
+        self.dated[handle] = dated
+        return dated
@@ -0,0 +1,447 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Summary statistics of a database, kept up to date as objects are committed.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+import os
+import logging
+from collections import Counter, namedtuple
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..lib import Person
+from ..utils.file import media_path_full
+from .dbconst import PERSON_KEY, EVENT_KEY, MEDIA_KEY
+
+LOG = logging.getLogger(".db.stats")
+
+#-------------------------------------------------------------------------
+#
+# PersonStats
+#
+#-------------------------------------------------------------------------
+PersonStats = namedtuple('PersonStats', [
+    'gender',           # gender of the person
+    'incomplete',       # number of incomplete names
+    'birth',            # handle of the birth event, or None
+    'missing_birth',    # True if the person has no dated birth event
+    'disconnected',     # True if the person has no families
+    'media',            # number of media references
+    'group_names',      # unique group names of the names
+    'surnames',         # unique non empty surnames of the names
+])
+
+#-------------------------------------------------------------------------
+#
+# DbStatistics
+#
+#-------------------------------------------------------------------------
+class DbStatistics:
+    """
+    Statistics about the people and the media of a database.
+
+    The statistics of each person and each media object are recorded, and
+    the totals are updated from the difference between the old and new
+    records whenever an object is committed or removed, so that they are
+    available without going through the database.
+
+    The statistics are computed from the database the first time they are
+    used, unless they have been loaded from the metadata of the database.
+    The size of each media file is cached along with its modification time,
+    which is checked when the media statistics are asked for, so that the
+    files are only measured again when they change.
+    """
+    VERSION = 1
+
+    def __init__(self, db):
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the statistics. They will be computed again when needed.
+        """
+        self.built = False
+        self.people = {}
+        self.media = {}
+        self.births = {}
+        self.genders = Counter()
+        self.group_names = Counter()
+        self.surnames = Counter()
+        self.representatives = {}
+        self.incomplete_names = 0
+        self.missing_births = 0
+        self.disconnected = 0
+        self.with_media = 0
+        self.media_references = 0
+        self.media_bytes = 0
+        self.missing_media = {}
+
+    #-------------------------------------------------------------------------
+    #
+    # Persistence
+    #
+    #-------------------------------------------------------------------------
+    def save(self):
+        """
+        Return the statistics in a form that can be stored in the metadata of
+        the database, or None if they have not been computed.
+        """
+        if not self.built:
+            return None
+        return {'version': self.VERSION,
+                'people': {handle: tuple(stats)
+                           for handle, stats in self.people.items()},
+                'media': self.media}
+
+    def load(self, data):
+        """
+        Restore the statistics saved by :meth:`save`. The statistics are
+        dropped if the data is from another version, or does not match the
+        number of objects in the database.
+        """
+        self.clear()
+        if (not data or data.get('version') != self.VERSION or
+                len(data['people']) != self.db.get_number_of_people() or
+                len(data['media']) != self.db.get_number_of_media()):
+            return
+        for handle, stats in data['people'].items():
+            self.__add_person(handle, PersonStats(*stats))
+        for handle, entry in data['media'].items():
+            self.__add_media(handle, tuple(entry))
+        self.built = True
+
+    def rebuild(self):
+        """
+        Compute the statistics from the database.
+        """
+        self.clear()
+        for person in self.db.iter_people():
+            self.__add_person(person.handle, self.__person_stats(person))
+        for media in self.db.iter_media():
+            self.__add_media(media.handle,
+                             self.__media_entry(media.get_path()))
+        self.built = True
+
+    def __check(self):
+        if not self.built:
+            LOG.debug("computing the statistics of the database")
+            self.rebuild()
+
+    #-------------------------------------------------------------------------
+    #
+    # Updates
+    #
+    #-------------------------------------------------------------------------
+    def commit(self, obj_key, obj):
+        """
+        Update the statistics for a committed object.
+        """
+        if not self.built:
+            return
+        if obj_key == PERSON_KEY:
+            self.__remove_person(obj.handle)
+            self.__add_person(obj.handle, self.__person_stats(obj))
+        elif obj_key == EVENT_KEY:
+            self.__update_births(obj.handle, obj)
+        elif obj_key == MEDIA_KEY:
+            old = self.__remove_media(obj.handle)
+            self.__add_media(obj.handle,
+                             self.__media_entry(obj.get_path(), old))
+
+    def remove(self, obj_key, handle):
+        """
+        Update the statistics for a removed object.
+        """
+        if not self.built:
+            return
+        if obj_key == PERSON_KEY:
+            self.__remove_person(handle)
+        elif obj_key == EVENT_KEY:
+            self.__update_births(handle, None)
+        elif obj_key == MEDIA_KEY:
+            self.__remove_media(handle)
+
+    def refresh_media(self):
+        """
+        Measure again the media files that changed on disk, or after the
+        media path of the database changed.
+        """
+        if not self.built:
+            return
+        for handle, entry in list(self.media.items()):
+            new = self.__media_entry(entry[0], entry)
+            if new is not entry:
+                self.__remove_media(handle)
+                self.__add_media(handle, new)
+
+    #-------------------------------------------------------------------------
+    #
+    # People
+    #
+    #-------------------------------------------------------------------------
+    def __person_stats(self, person):
+        names = [person.primary_name] + person.alternate_names
+        incomplete = 0
+        for name in names:
+            if name.get_first_name().strip() == "":
+                incomplete += 1
+            elif name.get_surname_list():
+                for surname in name.get_surname_list():
+                    if surname.get_surname().strip() == "":
+                        incomplete += 1
+            else:
+                incomplete += 1
+        birth = None
+        birth_ref = person.get_birth_ref()
+        if birth_ref:
+            birth = birth_ref.ref
+        return PersonStats(
+            gender=person.gender,
+            incomplete=incomplete,
+            birth=birth,
+            missing_birth=not self.__has_date(birth),
+            disconnected=(not person.get_main_parents_family_handle() and
+                          not person.get_family_handle_list()),
+            media=len(person.get_media_list()),
+            group_names=tuple(set(name.get_group_name().strip()
+                                  for name in names)),
+            surnames=tuple(set(name.get_surname().strip()
+                               for name in names
+                               if name.get_surname().strip())))
+
+    def __has_date(self, event_handle):
+        if not event_handle:
+            return False
+        event = self.db.get_event_from_handle(event_handle)
+        return event is not None and not event.get_date_object().is_empty()
+
+    def __add_person(self, handle, stats):
+        self.people[handle] = stats
+        self.genders[stats.gender] += 1
+        self.incomplete_names += stats.incomplete
+        self.missing_births += stats.missing_birth
+        self.disconnected += stats.disconnected
+        self.with_media += stats.media > 0
+        self.media_references += stats.media
+        if stats.birth:
+            self.births.setdefault(stats.birth, set()).add(handle)
+        for group_name in stats.group_names:
+            self.group_names[group_name] += 1
+            self.representatives[group_name] = handle
+        self.surnames.update(stats.surnames)
+
+    def __remove_person(self, handle):
+        stats = self.people.pop(handle, None)
+        if stats is None:
+            return
+        self.genders[stats.gender] -= 1
+        self.incomplete_names -= stats.incomplete
+        self.missing_births -= stats.missing_birth
+        self.disconnected -= stats.disconnected
+        self.with_media -= stats.media > 0
+        self.media_references -= stats.media
+        if stats.birth:
+            people = self.births[stats.birth]
+            people.discard(handle)
+            if not people:
+                del self.births[stats.birth]
+        for group_name in stats.group_names:
+            self.group_names[group_name] -= 1
+            if not self.group_names[group_name]:
+                del self.group_names[group_name]
+                del self.representatives[group_name]
+            elif self.representatives[group_name] == handle:
+                # found again when needed
+                self.representatives[group_name] = None
+        for surname in stats.surnames:
+            self.surnames[surname] -= 1
+            if not self.surnames[surname]:
+                del self.surnames[surname]
+
+    def __update_births(self, event_handle, event):
+        missing = event is None or event.get_date_object().is_empty()
+        for handle in self.births.get(event_handle, ()):
+            stats = self.people[handle]
+            if stats.missing_birth != missing:
+                self.missing_births += 1 if missing else -1
+                self.people[handle] = stats._replace(missing_birth=missing)
+
+    #-------------------------------------------------------------------------
+    #
+    # Media
+    #
+    #-------------------------------------------------------------------------
+    def __media_entry(self, path, old=None):
+        """
+        Return the (path, full path, modification time, size) of the file of
+        a media object. The size is None if the file is not found. The old
+        entry is kept if the file did not change.
+        """
+        try:
+            fullname = media_path_full(self.db, path)
+        except KeyError:
+            # the media path uses an unknown environment variable
+            entry = (path, None, None, None)
+            return old if old == entry else entry
+        try:
+            mtime = os.stat(fullname).st_mtime
+            if old and old[:3] == (path, fullname, mtime):
+                return old
+            return (path, fullname, mtime, os.path.getsize(fullname))
+        except OSError:
+            entry = (path, fullname, None, None)
+            return old if old == entry else entry
+
+    def __add_media(self, handle, entry):
+        self.media[handle] = entry
+        if entry[3] is None:
+            self.missing_media[handle] = entry[0]
+        else:
+            self.media_bytes += entry[3]
+
+    def __remove_media(self, handle):
+        entry = self.media.pop(handle, None)
+        if entry is None:
+            return None
+        if entry[3] is None:
+            del self.missing_media[handle]
+        else:
+            self.media_bytes -= entry[3]
+        return entry
+
+    #-------------------------------------------------------------------------
+    #
+    # Queries
+    #
+    #-------------------------------------------------------------------------
+    def get_number_of_people(self):
+        """
+        Return the number of people.
+        """
+        self.__check()
+        return len(self.people)
+
+    def get_gender_count(self, gender):
+        """
+        Return the number of people with the gender, one of Person.MALE,
+        Person.FEMALE or Person.UNKNOWN.
+        """
+        self.__check()
+        if gender in (Person.MALE, Person.FEMALE):
+            return self.genders[gender]
+        return (len(self.people) - self.genders[Person.MALE] -
+                self.genders[Person.FEMALE])
+
+    def get_incomplete_names(self):
+        """
+        Return the number of names without a given name or a surname.
+        """
+        self.__check()
+        return self.incomplete_names
+
+    def get_missing_births(self):
+        """
+        Return the number of people without a birth event with a date.
+        """
+        self.__check()
+        return self.missing_births
+
+    def get_disconnected(self):
+        """
+        Return the number of people without parents, spouses or children.
+        """
+        self.__check()
+        return self.disconnected
+
+    def get_people_with_media(self):
+        """
+        Return the number of people with media references.
+        """
+        self.__check()
+        return self.with_media
+
+    def get_media_references(self):
+        """
+        Return the number of media references of the people.
+        """
+        self.__check()
+        return self.media_references
+
+    def get_surname_counts(self):
+        """
+        Return a Counter of the number of people with each surname.
+        """
+        self.__check()
+        return self.surnames
+
+    def get_group_name_counts(self):
+        """
+        Return a Counter of the number of people with each group name.
+        """
+        self.__check()
+        return self.group_names
+
+    def get_group_name_person(self, group_name):
+        """
+        Return the handle of a person with the group name, or None if there
+        is nobody with it.
+        """
+        self.__check()
+        if group_name not in self.group_names:
+            return None
+        handle = self.representatives[group_name]
+        if handle is None:
+            for handle, stats in self.people.items():
+                if group_name in stats.group_names:
+                    break
+            self.representatives[group_name] = handle
+        return handle
+
+    def get_number_of_media(self):
+        """
+        Return the number of media objects.
+        """
+        self.__check()
+        return len(self.media)
+
+    def get_media_bytes(self):
+        """
+        Return the total size in bytes of the media files found.
+        """
+        self.__check()
+        self.refresh_media()
+        return self.media_bytes
+
+    def get_missing_media(self):
+        """
+        Return the list of paths of the media files not found.
+        """
+        self.__check()
+        self.refresh_media()
+        return list(self.missing_media.values())
@@ -37,7 +37,6 @@ from gramps.cli.clidbman import NAME_FILE
 from gramps.gen.lib import EventType, NameOriginType, Tag, MarkerType
 from gramps.gen.utils.file import create_checksum
 from gramps.gen.utils.id import create_id
-from gramps.gui.dialog import (InfoDialog)
 from .dbconst import (PERSON_KEY, FAMILY_KEY, EVENT_KEY, MEDIA_KEY, PLACE_KEY,
                       REPOSITORY_KEY, CITATION_KEY, SOURCE_KEY, NOTE_KEY,
                       TAG_KEY)
@@ -47,6 +46,26 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_21(self):
+    """
+    Upgrade database from version 20 to 21.
+
+    Add the coordinates of the places, in decimal degrees, to the place
+    table. They are computed when the secondary columns are rebuilt, after
+    the upgrade.
+    """
+    # the columns are there if an upgrade stopped before saving the version
+    if not self._column_exists('place', 'latitude'):
+        self._txn_begin()
+        self.dbapi.execute('ALTER TABLE place ADD COLUMN latitude REAL')
+        self.dbapi.execute('ALTER TABLE place ADD COLUMN longitude REAL')
+        self.dbapi.execute('CREATE INDEX place_coordinates '
+                           'ON place(latitude, longitude)')
+        self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 21)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
@@ -734,6 +753,7 @@ def gramps_upgrade_16(self):
              "Tools -> Family Tree Processing -> Merge\n"
              "in order to merge citations that contain similar\n"
              "information")
+    from gramps.gui.dialog import InfoDialog
     InfoDialog(_('Upgrade Statistics'), txt, monospaced=True)  # TODO no-parent
 
 
@@ -70,6 +70,7 @@ from ..const import ARABIC_COMMA, ARABIC_SEMICOLON, GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 from ..lib.name import Name
 from ..lib.nameorigintype import NameOriginType
+from ..utils.lru import LRU
 
 try:
     from ..config import config
@@ -148,6 +149,29 @@ class NameDisplayError(Exception):
 #
 #-------------------------------------------------------------------------
 
+def _name_key(num, first, raw_surn_data_list, suffix, title, call, nick,
+              famnick):
+    """
+    The key of a formatted name in the caches: the format and the parts of
+    the name that the formats use.
+    """
+    return (num, first,
+            tuple((raw_surn_data[_SURNAME_IN_LIST],
+                   raw_surn_data[_PREFIX_IN_LIST],
+                   raw_surn_data[_PRIMARY_IN_LIST],
+                   tuple(raw_surn_data[_TYPE_IN_LIST]),
+                   raw_surn_data[_CONNECTOR_IN_LIST])
+                  for raw_surn_data in raw_surn_data_list),
+            suffix, title, call, nick, famnick)
+
+def _raw_name_key(num, raw_data):
+    """
+    The key of a formatted raw name in the caches.
+    """
+    return _name_key(num, raw_data[_FIRSTNAME], raw_data[_SURNAME_LIST],
+                     raw_data[_SUFFIX], raw_data[_TITLE], raw_data[_CALL],
+                     raw_data[_NICK], raw_data[_FAMNICK])
+
 def _raw_full_surname(raw_surn_data_list):
     """method for the 'l' symbol: full surnames"""
     result = ""
@@ -332,6 +356,9 @@ class NameDisplay:
     format_funcs = {}
     raw_format_funcs = {}
 
+    # number of formatted names kept
+    CACHE_SIZE = 20000
+
     def __init__(self, xlocale=glocale):
         """
         Initialize the NameDisplay class.
@@ -370,6 +397,10 @@ class NameDisplay:
 
         self.name_formats = {}
 
+        # formatted names, by format number and name data
+        self._cache = LRU(self.CACHE_SIZE)
+        self._raw_cache = LRU(self.CACHE_SIZE)
+
         if WITH_GRAMPS_CONFIG:
             self.default_format = config.get('preferences.name-format')
             if self.default_format == 0:
@@ -391,6 +422,17 @@ class NameDisplay:
         """ How to handle single patronymic as surname is changed"""
         global PAT_AS_SURN
         PAT_AS_SURN = config.get('preferences.patronimic-surname')
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Forget the formatted names, when the name formats change.
+
+        The names are kept by their data, so that the names of the people
+        that are changed are formatted again without clearing the cache.
+        """
+        self._cache.clear()
+        self._raw_cache.clear()
 
     def get_pat_as_surn(self):
         global PAT_AS_SURN
@@ -422,6 +464,7 @@ class NameDisplay:
         self.name_formats = {num: value
                              for num, value in self.name_formats.items()
                              if num >= 0}
+        self.clear_cache()
 
     def set_name_format(self, formats):
 
@@ -457,6 +500,7 @@ class NameDisplay:
             del self.name_formats[num]
         except:
             pass
+        self.clear_cache()
 
     def set_default_format(self, num):
         if num not in self.name_formats:
@@ -467,6 +511,7 @@ class NameDisplay:
             num = Name.LNFN
 
         self.default_format = num
+        self.clear_cache()
 
         self.name_formats[Name.DEF] = (self.name_formats[Name.DEF][_F_NAME],
                                        self.name_formats[Name.DEF][_F_FMT],
@@ -486,6 +531,7 @@ class NameDisplay:
                                       self.name_formats[num][_F_RAWFN])
         except:
             pass
+        self.clear_cache()
 
     def get_name_format(self, also_default=False,
                         only_custom=False,
@@ -745,6 +791,67 @@ class NameDisplay:
         args = "first,raw_surname_list,suffix,title,call,nick,famnick"
         return self._make_fn(format_str, d, args)
 
+    def _format_name(self, num, name):
+        """
+        Return the name formatted with the format num, keeping it in the
+        cache.
+        """
+        key = _name_key(num, name.first_name,
+                        [surn.serialize() for surn in name.surname_list],
+                        name.suffix, name.title, name.call, name.nick,
+                        name.famnick)
+        if key in self._cache:
+            return self._cache[key]
+        result = self.name_formats[num][_F_FN](name)
+        self._cache[key] = result
+        return result
+
+    def _format_raw_name(self, num, raw_data):
+        """
+        Return the raw name formatted with the format num, keeping it in the
+        cache.
+        """
+        key = _raw_name_key(num, raw_data)
+        if key in self._raw_cache:
+            return self._raw_cache[key]
+        result = self.name_formats[num][_F_RAWFN](raw_data)
+        self._raw_cache[key] = result
+        return result
+
+    def format_many(self, raw_names, num=None):
+        """
+        Return the formatted names of many names, as for the rows of a list
+        or the entries of an index. The names are formatted as
+        :meth:`display_name` formats them.
+
+        :param raw_names: The raw unserialized data of the names.
+        :type raw_names: iterable of tuples
+        :param num: The number of the name format, as returned by
+                    :meth:`add_name_format`. When it is None, each name is
+                    displayed with its own display format.
+        :type num: int
+        :returns: Returns the list of the formatted names.
+        :rtype: list
+        """
+        funcs = {}
+        result = []
+        for raw_data in raw_names:
+            fmt_num = raw_data[_DISPLAY] if num is None else num
+            if fmt_num not in funcs:
+                valid = self._is_format_valid(fmt_num)
+                fmt_str = (self.name_formats[valid][_F_FMT] or
+                           self.name_formats[self.default_format][_F_FMT])
+                funcs[fmt_num] = (valid, self._format_raw_fn(fmt_str))
+            valid, func = funcs[fmt_num]
+            key = _raw_name_key(valid, raw_data)
+            if key in self._cache:
+                result.append(self._cache[key])
+            else:
+                name = func(raw_data)
+                self._cache[key] = name
+                result.append(name)
+        return result
+
     def format_str(self, name, format_str):
         return self._format_str_base(name.first_name, name.surname_list,
                                      name.suffix, name.title,
@@ -853,7 +960,7 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(name.sort_as)
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def truncate(self, full_name, max_length=15, elipsis="..."):
         name_out = ""
@@ -879,7 +986,7 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(raw_data[_SORT])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self._format_raw_name(num, raw_data)
 
     def display(self, person):
         """
@@ -913,7 +1020,7 @@ class NameDisplay:
         @rtype: str
         """
         name = person.get_primary_name()
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def display_formal(self, person):
         """
@@ -946,7 +1053,7 @@ class NameDisplay:
             return ""
 
         num = self._is_format_valid(name.display_as)
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def raw_display_name(self, raw_data):
         """
@@ -959,7 +1066,7 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(raw_data[_DISPLAY])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self._format_raw_name(num, raw_data)
 
     def display_given(self, person):
         return self.format_str(person.get_primary_name(),'%f')
@@ -38,7 +38,8 @@ import xml.dom.minidom
 from ..const import PLACE_FORMATS, GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from ..config import config
-from ..utils.location import get_location_list
+from ..utils.location import get_location_list, get_place_entry
+from ..utils.lru import LRU
 from ..lib import PlaceType
 
 #-------------------------------------------------------------------------
@@ -62,7 +63,12 @@ class PlaceFormat:
 #-------------------------------------------------------------------------
 class PlaceDisplay:
 
+    # number of titles kept
+    CACHE_SIZE = 10000
+
     def __init__(self):
+        self._titles = LRU(self.CACHE_SIZE)
+        self._generation = None
         self.place_formats = []
         self.default_format = config.get('preferences.place-format')
         if os.path.exists(PLACE_FORMATS):
@@ -79,6 +85,15 @@ class PlaceDisplay:
             return ""
         place_handle = event.get_place_handle()
         if place_handle:
+            hierarchy = db.get_place_hierarchy()
+            if hierarchy is not None and config.get('preferences.place-auto'):
+                # the title may be known without reading the place
+                entry = hierarchy.get_entry(place_handle)
+                if entry is not None:
+                    key = self._title_key(hierarchy, entry,
+                                          event.get_date_object(), fmt)
+                    if key in self._titles:
+                        return self._titles[key]
             place = db.get_place_from_handle(place_handle)
             return self.display(db, place, event.get_date_object(), fmt)
         else:
@@ -89,56 +104,88 @@ class PlaceDisplay:
             return ""
         if not config.get('preferences.place-auto'):
             return place.title
+        hierarchy = db.get_place_hierarchy()
+        if hierarchy is None:
+            return self._display(db, place, date, fmt)
+        # the title is computed from the place given, which may have changed
+        # since it was read
+        key = self._title_key(hierarchy, get_place_entry(place), date, fmt)
+        if key in self._titles:
+            return self._titles[key]
+        title = self._display(db, place, date, fmt)
+        self._titles[key] = title
+        return title
+
+    def _title_key(self, hierarchy, entry, date, fmt):
+        """
+        Return the key of the title of a place in the cache: the place, the
+        date if the names of the place or of the enclosing places depend on
+        it, and the format.
+        """
+        if self._generation != hierarchy.generation:
+            self._titles.clear()
+            self._generation = hierarchy.generation
+        if fmt == -1:
+            fmt = config.get('preferences.place-format')
+        pf = self.place_formats[fmt]
+        if date is not None and (entry.dated or any(
+                hierarchy.is_dated(handle) for handle, dummy in entry.parents)):
+            date = date.serialize()
         else:
-            if fmt == -1:
-                fmt = config.get('preferences.place-format')
-            pf = self.place_formats[fmt]
-            lang = pf.language
-            all_places = get_location_list(db, place, date, lang)
-
-            # Apply format string to place list
-            index = _find_populated_place(all_places)
-            places = []
-            for slice in pf.levels.split(','):
-                parts = slice.split(':')
-                if len(parts) == 1:
-                    offset = _get_offset(parts[0], index)
-                    if offset is not None:
-                        try:
-                            places.append(all_places[offset])
-                        except IndexError:
-                            pass
-                elif len(parts) == 2:
-                    start = _get_offset(parts[0], index)
-                    end = _get_offset(parts[1], index)
-                    if start is None:
-                        places.extend(all_places[:end])
-                    elif end is None:
-                        places.extend(all_places[start:])
-                    else:
-                        places.extend(all_places[start:end])
-
-            if pf.street:
-                types = [item[1] for item in places]
-                try:
-                    idx = types.index(PlaceType.NUMBER)
-                except ValueError:
-                    idx = None
-                if idx is not None and len(places) > idx+1:
-                    if pf.street == 1:
-                        combined = (places[idx][0] + ' ' + places[idx+1][0],
-                                    places[idx+1][1])
-                    else:
-                        combined = (places[idx+1][0] + ' ' + places[idx][0],
-                                    places[idx+1][1])
-                    places = places[:idx] + [combined] + places[idx+2:]
-
-            names = [item[0] for item in places]
-            if pf.reverse:
-                names.reverse()
-
-            # TODO for Arabic, should the next line's comma be translated?
-            return ", ".join(names)
+            date = None
+        return (entry.key, date, pf.levels, pf.language, pf.street,
+                pf.reverse)
+
+    def _display(self, db, place, date, fmt):
+        if fmt == -1:
+            fmt = config.get('preferences.place-format')
+        pf = self.place_formats[fmt]
+        lang = pf.language
+        all_places = get_location_list(db, place, date, lang)
+
+        # Apply format string to place list
+        index = _find_populated_place(all_places)
+        places = []
+        for slice in pf.levels.split(','):
+            parts = slice.split(':')
+            if len(parts) == 1:
+                offset = _get_offset(parts[0], index)
+                if offset is not None:
+                    try:
+                        places.append(all_places[offset])
+                    except IndexError:
+                        pass
+            elif len(parts) == 2:
+                start = _get_offset(parts[0], index)
+                end = _get_offset(parts[1], index)
+                if start is None:
+                    places.extend(all_places[:end])
+                elif end is None:
+                    places.extend(all_places[start:])
+                else:
+                    places.extend(all_places[start:end])
+
+        if pf.street:
+            types = [item[1] for item in places]
+            try:
+                idx = types.index(PlaceType.NUMBER)
+            except ValueError:
+                idx = None
+            if idx is not None and len(places) > idx+1:
+                if pf.street == 1:
+                    combined = (places[idx][0] + ' ' + places[idx+1][0],
+                                places[idx+1][1])
+                else:
+                    combined = (places[idx+1][0] + ' ' + places[idx][0],
+                                places[idx+1][1])
+                places = places[:idx] + [combined] + places[idx+2:]
+
+        names = [item[0] for item in places]
+        if pf.reverse:
+            names.reverse()
+
+        # TODO for Arabic, should the next line's comma be translated?
+        return ", ".join(names)
 
     def get_formats(self):
         return self.place_formats
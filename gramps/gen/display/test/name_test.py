@@ -0,0 +1,91 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the cache of the formatted names """
+
+import unittest
+
+from ...lib import Name, Surname, NameOriginType
+from ..name import NameDisplay
+
+def _name(first, surname, origin=NameOriginType.GIVEN):
+    name = Name()
+    name.set_first_name(first)
+    surn = Surname()
+    surn.set_surname(surname)
+    surn.set_origintype(NameOriginType(origin))
+    name.add_surname(surn)
+    return name
+
+def _as_lists(data):
+    """ The data, as it is read from JSON """
+    if isinstance(data, (list, tuple)):
+        return [_as_lists(item) for item in data]
+    return data
+
+class NameCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.nd = NameDisplay()
+        self.nd.set_default_format(Name.LNFN)
+
+    def test_display(self):
+        name = _name("John", "Smith")
+        self.assertEqual(self.nd.display_name(name), "Smith, John")
+        self.assertEqual(self.nd.display_name(name), "Smith, John")
+        self.assertEqual(self.nd.raw_display_name(name.serialize()),
+                         "Smith, John")
+        self.assertEqual(self.nd.raw_sorted_name(name.serialize()),
+                         "Smith, John")
+
+    def test_changed_name(self):
+        name = _name("John", "Smith")
+        self.nd.display_name(name)
+        name.get_primary_surname().set_surname("Jones")
+        self.assertEqual(self.nd.display_name(name), "Jones, John")
+        name.set_first_name("Jim")
+        self.assertEqual(self.nd.raw_display_name(name.serialize()),
+                         "Jones, Jim")
+
+    def test_changed_format(self):
+        name = _name("John", "Smith")
+        self.nd.display_name(name)
+        self.nd.set_default_format(Name.FNLN)
+        self.assertEqual(self.nd.display_name(name), "John Smith")
+        num = self.nd.add_name_format("Test", "%l %f")
+        self.nd.set_default_format(num)
+        self.assertEqual(self.nd.display_name(name), "Smith John")
+        self.nd.edit_name_format(num, "Test", "%f")
+        self.assertEqual(self.nd.display_name(name), "John")
+        self.assertEqual(self.nd.raw_display_name(name.serialize()), "John")
+
+    def test_format_many(self):
+        names = [_name("John", "Smith"), _name("Anna", ""),
+                 _name("Ivan", "Petrovich", NameOriginType.PATRONYMIC)]
+        names[1].set_display_as(Name.FN)
+        raw_names = [name.serialize() for name in names]
+        self.assertEqual(self.nd.format_many(raw_names),
+                         [self.nd.display_name(name) for name in names])
+        self.assertEqual(self.nd.format_many(raw_names, Name.FNLN),
+                         ["John Smith", "Anna", "Ivan Petrovich"])
+        self.assertEqual(
+            self.nd.format_many(_as_lists(raw_names), Name.LNFNP),
+            self.nd.format_many(raw_names, Name.LNFNP))
+
+if __name__ == "__main__":
+    unittest.main()
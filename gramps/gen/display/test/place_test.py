@@ -0,0 +1,124 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the place hierarchy and the titles of the places """
+
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date, PlaceName, PlaceRef
+from ...proxy import LivingProxyDb
+from ...user import User
+from ...utils.location import located_in
+from ..place import displayer
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class PlaceHierarchyTest(unittest.TestCase):
+    """
+    The titles of the places are those computed from the objects: a proxy
+    of the database does not keep the hierarchy.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        self.proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_INCLUDE_ALL)
+
+    def get_place(self, gramps_id):
+        return self.db.get_place_from_gramps_id(gramps_id)
+
+    def assert_titles(self):
+        for place in self.db.iter_places():
+            expected = displayer.display(self.proxy, place)
+            self.assertEqual(displayer.display(self.db, place), expected)
+            self.assertEqual(displayer.display(self.db, place), expected)
+
+    def test_display(self):
+        self.assertIsNotNone(self.db.get_place_hierarchy())
+        self.assertIsNone(self.proxy.get_place_hierarchy())
+        self.assert_titles()
+
+    def test_display_event(self):
+        for event in self.db.iter_events():
+            expected = displayer.display_event(self.proxy, event)
+            self.assertEqual(displayer.display_event(self.db, event),
+                             expected)
+            self.assertEqual(displayer.display_event(self.db, event),
+                             expected)
+
+    def test_changes(self):
+        city = self.get_place('P0010')
+        county = self.db.get_place_from_handle(
+            city.get_placeref_list()[0].ref)
+        self.assertFalse(self.db.get_place_hierarchy().is_dated(city.handle))
+        title = displayer.display(self.db, city)
+        name = county.get_name().get_value()
+        self.assertIn(name, title)
+
+        # a new name from 1900
+        date = Date(1900, 0, 0)
+        date.set_modifier(Date.MOD_BEFORE)
+        county.get_name().set_date_object(date)
+        new_name = PlaceName(value="New " + name)
+        date = Date(1900, 0, 0)
+        date.set_modifier(Date.MOD_AFTER)
+        new_name.set_date_object(date)
+        county.add_alternative_name(new_name)
+        with DbTxn("Rename county", self.db) as trans:
+            self.db.commit_place(county, trans)
+        self.assertTrue(self.db.get_place_hierarchy().is_dated(city.handle))
+        self.assertEqual(displayer.display(self.db, city, Date(1850, 0, 0)),
+                         title)
+        self.assertEqual(displayer.display(self.db, city, Date(1950, 0, 0)),
+                         title.replace(name, "New " + name))
+        self.assert_titles()
+
+        # a place enclosed by the city, only known in the editor
+        other = self.get_place('P0020')
+        placeref = PlaceRef()
+        placeref.ref = city.handle
+        other.set_placeref_list([placeref])
+        self.assertEqual(displayer.display(self.db, other),
+                         displayer.display(self.proxy, other))
+        # the hierarchy is that of the database
+        self.assertTrue(located_in(self.db, city.handle, county.handle))
+        self.assertEqual(located_in(self.db, other.handle, city.handle),
+                         located_in(self.proxy, other.handle, city.handle))
+
+        self.db.undo()
+        self.assertEqual(displayer.display(self.db, city, Date(1950, 0, 0)),
+                         title)
+
+    def test_located_in(self):
+        handles = self.db.get_place_handles()
+        for handle1 in handles:
+            for handle2 in handles[:40]:
+                self.assertEqual(located_in(self.db, handle1, handle2),
+                                 located_in(self.proxy, handle1, handle2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -39,6 +39,8 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..lib.rawaccessor import get_raw_accessor
+from ..proxy.proxybase import ProxyDbBase
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -121,6 +123,22 @@ class GenericFilter:
     def get_rules(self):
         return self.flist
 
+    def get_dependencies(self):
+        """
+        Return the set of the primary object class names of which a change
+        can alter the filter result for objects other than the changed object
+        and the objects referencing it, or None if any change can do so.
+
+        Views use this to check only the changed objects again after an edit,
+        and to apply the filter to all objects only when needed.
+        """
+        dependencies = set()
+        for rule in self.flist:
+            if rule.dependencies is None:
+                return None
+            dependencies.update(rule.dependencies)
+        return dependencies
+
     def get_cursor(self, db):
         return db.get_person_cursor()
 
@@ -133,6 +151,9 @@ class GenericFilter:
     def find_from_handle(self, db, handle):
         return db.get_person_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_person_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_people()
 
@@ -167,9 +188,39 @@ class GenericFilter:
             user.end_progress()
         return final_list
 
+    def split_rules(self):
+        """
+        Split the rules into those that can be applied to the serialized
+        data of the objects, and those that need the objects.
+        """
+        raw_list = []
+        obj_list = []
+        for rule in self.flist:
+            if rule.can_apply_raw():
+                raw_list.append(rule)
+            else:
+                obj_list.append(rule)
+        return raw_list, obj_list
+
+    def and_test_raw(self, db, data, raw_list, obj_list, accessor):
+        """
+        Apply the rules to the serialized data of an object. The object is
+        only created if the rules that can use the data all match, and other
+        rules remain.
+        """
+        if not all(rule.apply_raw(db, data, accessor) for rule in raw_list):
+            return False
+        if obj_list:
+            obj = self.make_obj()
+            obj.unserialize(data)
+            return all(rule.apply(db, obj) for rule in obj_list)
+        return True
+
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
         final_list = []
         flist = self.flist
+        raw_list, obj_list = self.split_rules()
+        accessor = get_raw_accessor(type(self.make_obj()))
         if user:
             user.begin_progress(_('Filter'), _('Applying ...'),
                                 self.get_number(db))
@@ -177,13 +228,26 @@ class GenericFilter:
             with (self.get_tree_cursor(db) if tree else
                   self.get_cursor(db)) as cursor:
                 for handle, data in cursor:
-                    person = self.make_obj()
-                    person.unserialize(data)
                     if user:
                         user.step_progress()
-                    val = all(rule.apply(db, person) for rule in flist)
+                    val = self.and_test_raw(db, data, raw_list, obj_list,
+                                            accessor)
                     if val != self.invert:
                         final_list.append(handle)
+        elif raw_list and not isinstance(db, ProxyDbBase):
+            # the proxies create the objects to give the serialized data
+            for data in id_list:
+                if tupleind is None:
+                    handle = data
+                else:
+                    handle = data[tupleind]
+                raw = self.get_raw_data(db, handle)
+                if user:
+                    user.step_progress()
+                val = raw is None or self.and_test_raw(db, raw, raw_list,
+                                                       obj_list, accessor)
+                if val != self.invert:
+                    final_list.append(data)
         else:
             for data in id_list:
                 if tupleind is None:
@@ -279,6 +343,9 @@ class GenericFamilyFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_family_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_family_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_families()
 
@@ -296,6 +363,9 @@ class GenericEventFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_event_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_event_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_events()
 
@@ -313,6 +383,9 @@ class GenericSourceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_source_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_source_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_sources()
 
@@ -333,6 +406,9 @@ class GenericCitationFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_citation_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_citation_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_citations()
 
@@ -353,6 +429,9 @@ class GenericPlaceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_place_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_place_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_places()
 
@@ -370,6 +449,9 @@ class GenericMediaFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_media_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_media_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_media()
 
@@ -387,6 +469,9 @@ class GenericRepoFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_repository_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_repository_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_repositories()
 
@@ -404,6 +489,9 @@ class GenericNoteFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_note_from_handle(handle)
 
+    def get_raw_data(self, db, handle):
+        return db.get_raw_note_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_notes()
 
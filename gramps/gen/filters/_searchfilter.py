@@ -31,6 +31,13 @@ class SearchFilter:
     def match(self, handle, db):
         return self.invert ^ (self.func(handle).upper().find(self.text) != -1)
 
+    def get_dependencies(self):
+        """
+        The text of a row only changes with the object and the objects it
+        refers to, see GenericFilter.get_dependencies.
+        """
+        return set()
+
 class ExactSearchFilter(SearchFilter):
     def __init__(self, func, text, invert):
         SearchFilter.__init__(self, func, text, invert)
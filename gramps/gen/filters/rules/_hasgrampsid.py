@@ -53,3 +53,6 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.gramps_id(data) == self.list[0]
@@ -67,3 +67,8 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def apply_raw(self, db, data, accessor):
+        if self.tag_handle is None:
+            return False
+        return self.tag_handle in accessor.tag_list(data)
@@ -40,3 +40,6 @@ class IsPublic(Rule):
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def apply_raw(self, db, data, accessor):
+        return not accessor.private(data)
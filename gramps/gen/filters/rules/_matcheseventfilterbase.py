@@ -52,6 +52,7 @@ class MatchesEventFilterBase(MatchesFilterBase):
     description = "Matches objects who have events that match a certain" \
                    " event filter"
     category = _('General filters')
+    dependencies = None
 
     # we want to have this filter show event filters
     namespace = 'Event'
@@ -56,6 +56,23 @@ class MatchesFilterBase(Rule):
     description = "Matches objects matched by the specified filter name"
     category = _('General filters')
 
+    @property
+    def dependencies(self):
+        """
+        The dependencies of the rules of the referenced filter.
+        """
+        filt = self.find_filter()
+        if filt is None:
+            return ()
+        if getattr(self, '_in_dependencies', False):
+            # the filter definition contains a loop
+            return None
+        self._in_dependencies = True
+        try:
+            return filt.get_dependencies()
+        finally:
+            self._in_dependencies = False
+
     def prepare(self, db, user):
         if gramps.gen.filters.CustomFilters:
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
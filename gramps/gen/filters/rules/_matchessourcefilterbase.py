@@ -49,6 +49,7 @@ class MatchesSourceFilterBase(MatchesFilterBase):
     description = "Matches objects with sources that match the " \
                    "specified source filter name"
     category = _('Citation/source filters')
+    dependencies = None
 
     # we want to have this filter show source filters
     namespace = 'Source'
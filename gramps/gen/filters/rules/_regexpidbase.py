@@ -54,3 +54,6 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def apply_raw(self, db, data, accessor):
+        return self.match_substring(0, accessor.gramps_id(data))
@@ -55,6 +55,13 @@ class Rule:
     category = _('Miscellaneous filters')
     description = _('No description')
     allow_regex = False
+    # Names of the primary object classes of which a change can alter the
+    # result of the rule for objects other than the changed object and the
+    # objects referencing it, directly or through other objects, or None if
+    # any change can do so. The links between parents, children and spouses
+    # are kept by the families, and a change of them is signalled for the
+    # families.
+    dependencies = ()
 
     def __init__(self, arg, use_regex=False):
         self.list = []
@@ -139,6 +146,31 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def apply_raw(self, db, data, accessor):
+        """
+        Apply the rule to the serialized data of a database entry, without
+        creating the object. accessor is the RawAccessor of the class of the
+        entry. Rules that only need the fields of the entry itself override
+        this next to apply, so that filters can skip creating the objects;
+        by default, the object is created and given to apply.
+        """
+        return self.apply(db, accessor.obj_class.create(data))
+
+    def can_apply_raw(self):
+        """
+        Return True if apply_raw can be used instead of apply, that is if
+        apply_raw is overridden by the same class as apply, or a subclass,
+        and apply is not replaced on the rule itself.
+        """
+        if 'apply' in self.__dict__:
+            return False
+        for cls in type(self).__mro__:
+            if 'apply_raw' in cls.__dict__:
+                return cls is not Rule
+            if 'apply' in cls.__dict__:
+                return False
+        return False
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = ('%s="%s"' % (_(self.labels[ix][0] if
@@ -48,6 +48,7 @@ class MatchesRepositoryFilter(MatchesFilterBase):
     description = _("Matches citations with sources with a repository "
                     "reference that match a certain repository filter")
     category = _('General filters')
+    dependencies = None
 
     # we want to have this filter show repository filters
     namespace = 'Repository'
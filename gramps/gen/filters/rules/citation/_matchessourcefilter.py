@@ -50,6 +50,7 @@ class MatchesSourceFilter(MatchesFilterBase):
     description = _("Matches citations with sources that match the "
                     "specified source filter name")
     category = _('General filters')
+    dependencies = None
 
     # we want to have this filter show source filters
     namespace = 'Source'
@@ -52,6 +52,7 @@ class MatchesPersonFilter(MatchesFilterBase):
     description = _("Matches events of persons matched by the specified "
                     "person filter name")
     category = _('General filters')
+    dependencies = None
 
     # we want to have this filter show person filters
     namespace = 'Person'
@@ -50,3 +50,6 @@ class IsBookmarked(Rule):
 
     def apply(self, db, family):
         return family.get_handle() in self.bookmarks
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.bookmarks
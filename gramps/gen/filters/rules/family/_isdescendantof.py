@@ -44,6 +44,7 @@ class IsDescendantOf(Rule):
     labels = [_('ID:'), _('Inclusive:')]
     name = _('Descendant families of <family>')
     category = _('General filters')
+    dependencies = ('Family',)
     description = _('Matches descendant families of the specified family')
 
     def prepare(self, db, user):
@@ -58,6 +59,9 @@ class IsDescendantOf(Rule):
     def apply(self, db, family):
         return family.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self, db, family, first):
         """
         Initialise family handle list.
@@ -132,6 +132,7 @@ class DeepRelationshipPathBetween(Rule):
     labels = [_('ID:'), _('Filter name:')]
     name = _("Relationship path between <person> and people matching <filter>")
     category = _('Relationship filters')
+    dependencies = ('Family',)
     description = _("Searches over the database starting from a specified"
                     " person and returns everyone between that person and"
                     " a set of target people specified with a filter.  "
@@ -175,3 +176,6 @@ class DeepRelationshipPathBetween(Rule):
 
     def apply(self, db, person):
         return person.get_handle() in self.__matches
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.__matches
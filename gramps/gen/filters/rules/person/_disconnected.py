@@ -49,3 +49,7 @@ class Disconnected(Rule):
     def apply(self,db,person):
         return not (person.get_parent_family_handle_list()
                 or person.get_family_handle_list())
+
+    def apply_raw(self, db, data, accessor):
+        return not (accessor.parent_family_list(data)
+                    or accessor.family_list(data))
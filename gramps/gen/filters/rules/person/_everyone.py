@@ -50,3 +50,6 @@ class Everyone(Rule):
 
     def apply(self,db,person):
         return True
+
+    def apply_raw(self, db, data, accessor):
+        return True
@@ -45,6 +45,7 @@ class HasCommonAncestorWith(Rule):
     labels = [ _('ID:') ]
     name = _('People with a common ancestor with <person>')
     category = _("Ancestral filters")
+    dependencies = ('Family',)
     description = _("Matches people that have a common ancestor "
                     "with a specified person")
 
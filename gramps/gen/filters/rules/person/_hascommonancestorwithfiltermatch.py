@@ -49,6 +49,7 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
     description = _("Matches people that have a common ancestor "
                     "with anybody matched by a filter")
     category = _("Ancestral filters")
+    dependencies = None
 
     def __init__(self, list, use_regex=False):
         HasCommonAncestorWith.__init__(self, list, use_regex)
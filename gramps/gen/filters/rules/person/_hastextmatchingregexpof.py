@@ -53,4 +53,5 @@ class HasTextMatchingRegexpOf(HasTextMatchingSubstringOf):
         self.media_map = set()
         self.case_sensitive = False
         self.regexp_match = True
+        self.candidates = None
         self.cache_sources()
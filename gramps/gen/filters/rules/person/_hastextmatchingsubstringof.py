@@ -67,6 +67,19 @@ class HasTextMatchingSubstringOf(Rule):
                 self.case_sensitive = False
         except IndexError:
             self.case_sensitive = False
+        self.candidates = None
+        if not self.use_regex:
+            # use the text index of the database to skip the objects that
+            # can not match
+            candidates = {}
+            for class_name in ('Person', 'Family', 'Event', 'Place',
+                               'Source', 'Citation', 'Media', 'Repository'):
+                handles = db.get_text_index_handles(class_name, self.list[0])
+                if handles is None:
+                    break
+                candidates[class_name] = handles
+            else:
+                self.candidates = candidates
         self.cache_repos()
         self.cache_sources()
 
@@ -78,6 +91,7 @@ class HasTextMatchingSubstringOf(Rule):
         self.family_map.clear()
         self.place_map.clear()
         self.media_map.clear()
+        self.candidates = None
 
     def apply(self,db,person):
         if person.handle in self.person_map:   # Cached by matching Source?
@@ -172,7 +186,21 @@ class HasTextMatchingSubstringOf(Rule):
 
     def cache_sources(self):
         # search all sources and match all referents of a matching source
-        for source in self.db.iter_sources():
+        sources = self.db.iter_sources()
+        if self.candidates is not None:
+            # only the sources that can match, that have a matching
+            # repository or a citation that can match
+            handles = set(self.candidates['Source'])
+            for repo_handle in self.repo_map:
+                handles.update(handle for (class_name, handle) in
+                               self.db.find_backlink_handles(repo_handle,
+                                                             ['Source']))
+            for citation_handle in self.candidates['Citation']:
+                citation = self.db.get_citation_from_handle(citation_handle)
+                handles.add(citation.get_reference_handle())
+            sources = (self.db.get_source_from_handle(handle)
+                       for handle in handles if handle)
+        for source in sources:
             match = self.match_object(source)
             LOG.debug("cache_sources match %s string %s source %s" %
                       (match, self.list[0], source.gramps_id))
@@ -208,6 +236,9 @@ class HasTextMatchingSubstringOf(Rule):
     def match_object(self, obj):
         if not obj:
             return False
+        if (self.candidates is not None and
+                obj.handle not in self.candidates[obj.__class__.__name__]):
+            return False
         if self.use_regex:
             return obj.matches_regexp(self.list[0],self.case_sensitive)
         return obj.matches_string(self.list[0],self.case_sensitive)
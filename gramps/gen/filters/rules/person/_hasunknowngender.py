@@ -48,3 +48,6 @@ class HasUnknownGender(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.UNKNOWN
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.gender(data) == Person.UNKNOWN
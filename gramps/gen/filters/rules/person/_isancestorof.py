@@ -44,6 +44,7 @@ class IsAncestorOf(Rule):
     labels = [ _('ID:'), _('Inclusive:') ]
     name = _('Ancestors of <person>')
     category = _("Ancestral filters")
+    dependencies = ('Family',)
     description = _("Matches people that are ancestors of a specified person")
 
     def prepare(self, db, user):
@@ -66,6 +67,9 @@ class IsAncestorOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_ancestor_list(self, db, person,first):
         if not person:
             return
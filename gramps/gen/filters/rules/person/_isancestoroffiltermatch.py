@@ -46,6 +46,7 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
     labels = [ _('Filter name:') ]
     name = _('Ancestors of <filter> match')
     category = _("Ancestral filters")
+    dependencies = None
     description = _("Matches people that are ancestors "
                     "of anybody matched by a filter")
 
@@ -80,3 +81,6 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
 
     def apply(self,db,person):
         return person.handle in self.map
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
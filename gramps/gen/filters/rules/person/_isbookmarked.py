@@ -51,3 +51,6 @@ class IsBookmarked(Rule):
 
     def apply(self,db,person):
         return person.handle in self.bookmarks
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.bookmarks
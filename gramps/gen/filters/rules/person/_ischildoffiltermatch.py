@@ -46,6 +46,7 @@ class IsChildOfFilterMatch(Rule):
     labels = [ _('Filter name:') ]
     name = _('Children of <filter> match')
     category = _('Family filters')
+    dependencies = None
     description = _("Matches children of anybody matched by a filter")
 
     def prepare(self, db, user):
@@ -72,6 +73,9 @@ class IsChildOfFilterMatch(Rule):
     def apply(self,db,person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self,person):
         if not person:
             return
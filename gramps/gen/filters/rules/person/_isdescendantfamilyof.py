@@ -49,6 +49,7 @@ class IsDescendantFamilyOf(Rule):
     labels = [ _('ID:'), _('Inclusive:') ]
     name = _('Descendant family members of <person>')
     category = _('Descendant filters')
+    dependencies = ('Family',)
     description = _("Matches people that are descendants or the spouse "
                     "of a descendant of a specified person")
 
@@ -73,6 +74,9 @@ class IsDescendantFamilyOf(Rule):
     def apply(self,db,person):
         return person.handle in self.matches
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.matches
+
     def add_matches(self,person):
         if not person:
             return
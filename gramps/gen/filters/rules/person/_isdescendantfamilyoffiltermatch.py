@@ -46,6 +46,7 @@ class IsDescendantFamilyOfFilterMatch(IsDescendantFamilyOf):
     labels = [_('Filter name:')]
     name = _('Descendant family members of <filter> match')
     category = _('Descendant filters')
+    dependencies = None
     description = _("Matches people that are descendants or the spouse "
                     "of anybody matched by a filter")
 
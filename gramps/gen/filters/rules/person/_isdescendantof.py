@@ -45,6 +45,7 @@ class IsDescendantOf(Rule):
     labels = [ _('ID:'), _('Inclusive:') ]
     name = _('Descendants of <person>')
     category = _('Descendant filters')
+    dependencies = ('Family',)
     description = _('Matches all descendants for the specified person')
 
     def prepare(self, db, user):
@@ -66,6 +67,9 @@ class IsDescendantOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self, person, first):
         if not person or person.handle in self.map:
             # if we have been here before, skip
@@ -46,6 +46,7 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
     labels = [ _('Filter name:') ]
     name = _('Descendants of <filter> match')
     category = _('Descendant filters')
+    dependencies = None
     description = _("Matches people that are descendants "
                     "of anybody matched by a filter")
 
@@ -80,3 +81,6 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
 
     def apply(self,db,person):
         return person.handle in self.map
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
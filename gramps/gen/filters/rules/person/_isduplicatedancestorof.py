@@ -46,6 +46,7 @@ class IsDuplicatedAncestorOf(Rule):
     labels = [ _('ID:')]
     name = _('Duplicated ancestors of <person>')
     category = _("Ancestral filters")
+    dependencies = ('Family',)
     description = _("Matches people that are ancestors twice or more "
                     "of a specified person")
 
@@ -64,6 +65,9 @@ class IsDuplicatedAncestorOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map2
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map2
+
     def init_ancestor_list(self, db, person):
         fam_id = person.get_main_parents_family_handle()
         if fam_id:
@@ -48,3 +48,6 @@ class IsFemale(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.FEMALE
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.gender(data) == Person.FEMALE
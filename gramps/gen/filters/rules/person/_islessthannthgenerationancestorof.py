@@ -45,6 +45,7 @@ class IsLessThanNthGenerationAncestorOf(Rule):
     labels = [ _('ID:'), _('Number of generations:') ]
     name = _('Ancestors of <person> not more than <N> generations away')
     category = _("Ancestral filters")
+    dependencies = ('Family',)
     description = _("Matches people that are ancestors "
                     "of a specified person not more than N generations away")
 
@@ -85,3 +86,6 @@ class IsLessThanNthGenerationAncestorOf(Rule):
 
     def apply(self,db,person):
         return person.handle in self.map
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
@@ -52,6 +52,7 @@ class IsLessThanNthGenerationAncestorOfBookmarked(Rule):
     name = _('Ancestors of bookmarked people not more '
                     'than <N> generations away')
     category = _('Ancestral filters')
+    dependencies = ('Family',)
     description = _("Matches ancestors of the people on the bookmark list "
                     "not more than N generations away")
 
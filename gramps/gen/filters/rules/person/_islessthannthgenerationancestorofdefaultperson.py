@@ -47,6 +47,7 @@ class IsLessThanNthGenerationAncestorOfDefaultPerson(Rule):
     name = _('Ancestors of the Home Person '
                     'not more than <N> generations away')
     category = _('Ancestral filters')
+    dependencies = ('Family',)
     description = _("Matches ancestors of the Home Person "
                     "not more than N generations away")
 
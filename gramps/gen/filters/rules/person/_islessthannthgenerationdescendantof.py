@@ -46,6 +46,7 @@ class IsLessThanNthGenerationDescendantOf(Rule):
     name = _('Descendants of <person> not more than '
                     '<N> generations away')
     category = _('Descendant filters')
+    dependencies = ('Family',)
     description = _("Matches people that are descendants of a "
                     "specified person not more than N generations away")
 
@@ -64,6 +65,9 @@ class IsLessThanNthGenerationDescendantOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self,person,gen):
         if not person or person.handle in self.map:
             # if we have been here before, skip
@@ -48,3 +48,6 @@ class IsMale(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.MALE
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.gender(data) == Person.MALE
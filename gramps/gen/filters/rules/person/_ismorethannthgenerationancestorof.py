@@ -45,6 +45,7 @@ class IsMoreThanNthGenerationAncestorOf(Rule):
     labels = [ _('ID:'), _('Number of generations:') ]
     name = _('Ancestors of <person> at least <N> generations away')
     category = _("Ancestral filters")
+    dependencies = ('Family',)
     description = _("Matches people that are ancestors "
                     "of a specified person at least N generations away")
 
@@ -82,3 +83,6 @@ class IsMoreThanNthGenerationAncestorOf(Rule):
 
     def apply(self,db,person):
         return person.handle in self.map
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
@@ -45,6 +45,7 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
     labels = [ _('ID:'), _('Number of generations:') ]
     name = _('Descendants of <person> at least <N> generations away')
     category = _("Descendant filters")
+    dependencies = ('Family',)
     description = _("Matches people that are descendants of a specified "
                  "person at least N generations away")
 
@@ -64,6 +65,9 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
     def apply(self,db,person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self, person, gen):
         if not person:
             return
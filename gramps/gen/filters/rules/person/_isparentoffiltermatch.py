@@ -46,6 +46,7 @@ class IsParentOfFilterMatch(Rule):
     labels = [ _('Filter name:') ]
     name = _('Parents of <filter> match')
     category = _('Family filters')
+    dependencies = None
     description = _("Matches parents of anybody matched by a filter")
 
     def prepare(self, db, user):
@@ -72,6 +73,9 @@ class IsParentOfFilterMatch(Rule):
     def apply(self,db,person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self,person):
         for fam_id in person.get_parent_family_handle_list():
             fam = self.db.get_family_from_handle(fam_id)
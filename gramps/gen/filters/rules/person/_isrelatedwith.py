@@ -44,6 +44,7 @@ class IsRelatedWith(Rule):
     labels = [ _('ID:') ]
     name = _('People related to <Person>')
     category = _("Relationship filters")
+    dependencies = ('Family',)
     description = _("Matches people related to a specified person")
 
     def prepare(self, db, user):
@@ -62,6 +63,8 @@ class IsRelatedWith(Rule):
     def apply(self, db, person):
         return person.handle in self.relatives
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.relatives
 
     def add_relative(self, start):
         """Non-recursive function that scans relatives and add them to self.relatives"""
@@ -45,6 +45,7 @@ class IsSiblingOfFilterMatch(Rule):
     labels = [ _('Filter name:') ]
     name = _('Siblings of <filter> match')
     category = _('Family filters')
+    dependencies = None
     description = _("Matches siblings of anybody matched by a filter")
 
     def prepare(self, db, user):
@@ -71,6 +72,9 @@ class IsSiblingOfFilterMatch(Rule):
     def apply(self,db,person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self,person):
         if not person:
             return
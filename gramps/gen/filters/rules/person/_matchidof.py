@@ -48,3 +48,6 @@ class MatchIdOf(Rule):
 
     def apply(self,db,person):
         return person.gramps_id.find(self.list[0]) !=-1
+
+    def apply_raw(self, db, data, accessor):
+        return accessor.gramps_id(data).find(self.list[0]) != -1
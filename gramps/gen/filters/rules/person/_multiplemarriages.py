@@ -45,3 +45,6 @@ class MultipleMarriages(Rule):
 
     def apply(self,db,person):
         return len(person.get_family_handle_list()) > 1
+
+    def apply_raw(self, db, data, accessor):
+        return len(accessor.family_list(data)) > 1
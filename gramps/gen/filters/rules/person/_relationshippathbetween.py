@@ -45,6 +45,7 @@ class RelationshipPathBetween(Rule):
     labels = [ _('ID:'), _('ID:') ]
     name = _("Relationship path between <persons>")
     category = _('Relationship filters')
+    dependencies = ('Family',)
     description = _("Matches the ancestors of two persons back "
                     "to a common ancestor, producing the relationship "
                     "path between two persons.")
@@ -94,6 +95,9 @@ class RelationshipPathBetween(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
+
     def init_list(self, p1_handle, p2_handle):
         firstMap = {}
         firstList = set()
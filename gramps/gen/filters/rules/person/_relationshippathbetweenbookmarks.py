@@ -50,6 +50,7 @@ class RelationshipPathBetweenBookmarks(Rule):
 
     name = _("Relationship path between bookmarked persons")
     category = _('Relationship filters')
+    dependencies = ('Family',)
     description = _("Matches the ancestors of bookmarked individuals "
                     "back to common ancestors, producing the relationship "
                     "path(s) between bookmarked persons.")
@@ -162,4 +163,5 @@ class RelationshipPathBetweenBookmarks(Rule):
     def apply(self,db,person):
         return person.handle in self.map
 
-
+    def apply_raw(self, db, data, accessor):
+        return accessor.handle(data) in self.map
@@ -49,6 +49,7 @@ class IsEnclosedBy(Rule):
     name = _('Places enclosed by another place')
     description = _('Matches a place enclosed by a particular place')
     category = _('General filters')
+    dependencies = ('Place',)
 
     def prepare(self, db, user):
         self.handle = None
@@ -45,6 +45,7 @@ class MatchesRepositoryFilter(MatchesFilterBase):
     description = _("Matches sources with a repository reference that match a certain\n"
                   "repository filter")
     category = _('General filters')
+    dependencies = None
 
     # we want to have this filter show repository filters
     namespace = 'Repository'
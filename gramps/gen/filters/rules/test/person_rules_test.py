@@ -31,6 +31,8 @@ reload_custom_filters()
 from ....db.utils import import_as_dict
 from ....filters import GenericFilter, CustomFilters
 from ....const import DATA_DIR
+from ....lib import Person
+from ....lib.rawaccessor import get_raw_accessor
 from ....user import User
 
 from ..person import (
@@ -39,9 +41,11 @@ from ..person import (
     HasCommonAncestorWith, HasCommonAncestorWithFilterMatch,
     HasFamilyAttribute, HasFamilyEvent, HasIdOf, HasLDS,
     HasNameOf, HasNameOriginType, HasNameType, HasNickname, HasRelationship,
-    HasSoundexName, HasSourceOf, HasTextMatchingRegexpOf, HasUnknownGender,
+    HasSoundexName, HasSourceOf, HasTextMatchingRegexpOf,
+    HasTextMatchingSubstringOf, HasUnknownGender,
     HaveAltFamilies, HaveChildren, HavePhotos, IncompleteNames,
-    IsAncestorOfFilterMatch, IsBookmarked, IsChildOfFilterMatch,
+    IsAncestorOf, IsAncestorOfFilterMatch, IsBookmarked,
+    IsChildOfFilterMatch,
     IsDescendantFamilyOf, IsDescendantFamilyOfFilterMatch,
     IsDescendantOfFilterMatch, IsDefaultPerson, IsDescendantOf,
     IsDuplicatedAncestorOf, IsFemale,
@@ -50,9 +54,10 @@ from ..person import (
     IsLessThanNthGenerationAncestorOfBookmarked, IsMale,
     IsMoreThanNthGenerationAncestorOf, IsMoreThanNthGenerationDescendantOf,
     IsParentOfFilterMatch, IsRelatedWith, IsSiblingOfFilterMatch,
-    IsSpouseOfFilterMatch, IsWitness, MissingParent, MultipleMarriages,
+    IsSpouseOfFilterMatch, IsWitness, MatchesFilter, MissingParent,
+    MultipleMarriages,
     NeverMarried, NoBirthdate, NoDeathdate, PeoplePrivate, PeoplePublic,
-    PersonWithIncompleteEvent, ProbablyAlive, RegExpName,
+    PersonWithIncompleteEvent, ProbablyAlive, RegExpIdOf, RegExpName,
     RelationshipPathBetweenBookmarks,
 )
 
@@ -324,6 +329,21 @@ class BaseTest(unittest.TestCase):
         res = self.filter_with_rule(rule)
         self.assertEqual(len(res), 28)
 
+    def test_HasTextMatchingSubstringOf(self):
+        """
+        Test rule.
+        """
+        rule = HasTextMatchingSubstringOf(['of Lessard', False])
+        res = self.filter_with_rule(rule)
+        self.assertEqual(len(res), 21)
+        # without the text index of the database
+        self.db._text_index = False
+        try:
+            res = self.filter_with_rule(rule)
+        finally:
+            self.db._text_index = None
+        self.assertEqual(len(res), 21)
+
     def test_IsMoreThanNthGenerationAncestorOf(self):
         """
         Test rule.
@@ -875,6 +895,61 @@ class BaseTest(unittest.TestCase):
         self.assertEqual(self.filter_with_rule(rule), set([
             'GNUJQCL9MD64AM56OH']))
 
+    def test_dependencies(self):
+        """
+        Test the dependencies filters report to the views.
+        """
+        filter_ = GenericFilter()
+        filter_.add_rule(IsMale([]))
+        filter_.add_rule(HasIdOf(['I0044']))
+        self.assertEqual(filter_.get_dependencies(), set())
+        filter_.add_rule(IsAncestorOf(['I0044', 1]))
+        self.assertEqual(filter_.get_dependencies(), {'Family'})
+        filter_.add_rule(IsDescendantOfFilterMatch(['Base']))
+        self.assertIsNone(filter_.get_dependencies())
+
+        base = GenericFilter()
+        base.add_rule(IsDescendantOf(['I0044', 1]))
+        base.set_name('Base')
+        filters = CustomFilters.get_filters_dict('Person')
+        filters['Base'] = base
+        self.addCleanup(filters.pop, 'Base')
+        self.assertEqual(MatchesFilter(['Base']).dependencies, {'Family'})
+
+    def test_apply_raw(self):
+        """
+        Test that rules give the same result on the serialized data as on
+        the objects, with and without a list of handles.
+        """
+        rules = [IsMale([]), IsFemale([]), HasUnknownGender([]),
+                 HasIdOf(['I0044']), RegExpIdOf(['I00[12]']),
+                 Disconnected([]), NeverMarried([]), MultipleMarriages([]),
+                 PeoplePrivate([]), PeoplePublic([]),
+                 IsAncestorOf(['I0044', 1])]
+        handles = list(self.db.iter_person_handles())
+        for rule in rules:
+            self.assertTrue(rule.can_apply_raw())
+            filter_ = GenericFilter()
+            filter_.add_rule(rule)
+            # a rule that needs the objects, and matches everyone
+            filter_.add_rule(HasNameOf([''] * 11))
+            rule.requestprepare(self.db, None)
+            expected = set(person.handle for person in self.db.iter_people()
+                           if rule.apply(self.db, person))
+            rule.requestreset()
+            self.assertEqual(set(filter_.apply(self.db)), expected)
+            self.assertEqual(set(filter_.apply(self.db, handles)), expected)
+        self.assertFalse(HasNameOf([''] * 11).can_apply_raw())
+        # the rules that need the objects create them from the data
+        accessor = get_raw_accessor(Person)
+        rule = HasNameOf(['', '', 'Garner'] + [''] * 8)
+        rule.requestprepare(self.db, None)
+        for person in self.db.iter_people():
+            self.assertEqual(rule.apply_raw(self.db, person.serialize(),
+                                            accessor),
+                             rule.apply(self.db, person))
+        rule.requestreset()
+
 
 if __name__ == "__main__":
     unittest.main()
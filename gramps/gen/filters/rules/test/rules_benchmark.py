@@ -0,0 +1,111 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Micro-benchmark of the filter rules on the example database.
+
+Each rule of the catalogue is applied with a filter over all objects, once
+as it is and once with the rules forced to use the objects, to compare the
+time taken with and without creating the objects.
+
+Run with::
+
+    python3 -m gramps.gen.filters.rules.test.rules_benchmark [repeat]
+"""
+import os
+import sys
+from time import perf_counter
+
+from ....filters import reload_custom_filters
+reload_custom_filters()
+from ....db.utils import import_as_dict
+from ....filters import GenericFilterFactory
+from ....const import DATA_DIR
+from ....user import User
+from .. import Rule
+from .. import person, family
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+# (namespace, rule class, arguments)
+CATALOGUE = [
+    ('Person', person.Everyone, []),
+    ('Person', person.IsMale, []),
+    ('Person', person.IsFemale, []),
+    ('Person', person.HasUnknownGender, []),
+    ('Person', person.HasIdOf, ['I0044']),
+    ('Person', person.RegExpIdOf, ['I00[12]']),
+    ('Person', person.MatchIdOf, ['I00']),
+    ('Person', person.PeoplePrivate, []),
+    ('Person', person.PeoplePublic, []),
+    ('Person', person.Disconnected, []),
+    ('Person', person.NeverMarried, []),
+    ('Person', person.MultipleMarriages, []),
+    ('Person', person.IsBookmarked, []),
+    ('Person', person.IsAncestorOf, ['I0044', 1]),
+    ('Person', person.IsDescendantOf, ['I0044', 1]),
+    ('Person', person.IsRelatedWith, ['I0001']),
+    ('Person', person.HasNameOf, [''] * 11),
+    ('Person', person.IncompleteNames, []),
+    ('Family', family.HasIdOf, ['F0001']),
+    ('Family', family.RegExpIdOf, ['F00[12]']),
+    ('Family', family.FamilyPrivate, []),
+    ('Family', family.IsBookmarked, []),
+]
+
+def time_rule(db, namespace, rule, repeat):
+    """
+    Return the best time of applying a filter with the rule to all objects.
+    """
+    best = None
+    for dummy in range(repeat):
+        filter_ = GenericFilterFactory(namespace)()
+        filter_.add_rule(rule)
+        start = perf_counter()
+        filter_.apply(db)
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(repeat=5):
+    """
+    Run the benchmark and print the results.
+    """
+    db = import_as_dict(EXAMPLE, User())
+    can_apply_raw = Rule.can_apply_raw
+    print("%-40s %10s %10s %8s" % ("Rule", "raw (ms)", "obj (ms)",
+                                   "speedup"))
+    for namespace, rule_class, args in CATALOGUE:
+        rule = rule_class(args)
+        raw = rule.can_apply_raw()
+        raw_time = time_rule(db, namespace, rule, repeat)
+        # force the filters to create the objects
+        Rule.can_apply_raw = lambda self: False
+        try:
+            obj_time = time_rule(db, namespace, rule, repeat)
+        finally:
+            Rule.can_apply_raw = can_apply_raw
+        print("%-40s %10.2f %10.2f %7.1fx%s" % (
+            "%s.%s" % (namespace, rule_class.__name__), raw_time * 1000,
+            obj_time * 1000, obj_time / raw_time, "" if raw else " *"))
+    print("* rule needs the objects")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -134,6 +134,20 @@ class BaseObject(metaclass=ABCMeta):
         """
         return []
 
+    def get_text_data_list_recursively(self):
+        """
+        Return the list of all textual attributes of the object and of its
+        child objects, that is all text searched by :meth:`matches_string`.
+
+        :returns: Returns the list of all textual attributes of the object
+                  and of its child objects.
+        :rtype: list
+        """
+        text_list = [item for item in self.get_text_data_list() if item]
+        for obj in self.get_text_data_child_list():
+            text_list.extend(obj.get_text_data_list_recursively())
+        return text_list
+
     def get_referenced_handles(self):
         """
         Return the list of (classname, handle) tuples for all directly
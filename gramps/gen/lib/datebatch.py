@@ -0,0 +1,251 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Date computations on many dates at once.
+
+The dates are given as sequences of tuples, and the results are the same as
+those of the computations on each date of :mod:`.gcalendar` and
+:class:`.Date`. The computations use NumPy when it is available and the
+batch is large enough; otherwise each date is computed on its own, as are the
+calendar conversions of the Hebrew, Persian and Islamic calendars.
+
+The Age Stats gramplet and the Statistics Chart report compute their ages
+and the Gregorian years of their dates here, once all the dates are known.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+try:
+    import numpy
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from .gcalendar import (gregorian_sdn, julian_sdn, hebrew_sdn, french_sdn,
+                        persian_sdn, islamic_sdn, swedish_sdn,
+                        gregorian_ymd, julian_ymd, hebrew_ymd, french_ymd,
+                        persian_ymd, islamic_ymd, swedish_ymd)
+from .gcalendar import (_GRG_SDN_OFFSET, _GRG_DAYS_PER_5_MONTHS,
+                        _GRG_DAYS_PER_4_YEARS, _GRG_DAYS_PER_400_YEARS,
+                        _JLN_SDN_OFFSET, _JLN_DAYS_PER_5_MONTHS,
+                        _JLN_DAYS_PER_4_YEARS, _FR_SDN_OFFSET,
+                        _FR_DAYS_PER_4_YEARS, _FR_DAYS_PER_MONTH)
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+# the calendars, in the order of Date.CAL_*
+_TO_SDN = [gregorian_sdn, julian_sdn, hebrew_sdn, french_sdn, persian_sdn,
+           islamic_sdn, swedish_sdn]
+_FROM_SDN = [gregorian_ymd, julian_ymd, hebrew_ymd, french_ymd, persian_ymd,
+             islamic_ymd, swedish_ymd]
+_CAL_GREGORIAN, _CAL_JULIAN, _CAL_FRENCH, _CAL_SWEDISH = 0, 1, 3, 6
+
+# below this size, the NumPy overhead is larger than the gain
+MIN_BATCH = 32
+
+def _use_numpy(count):
+    return HAVE_NUMPY and count >= MIN_BATCH
+
+def _columns(rows, count):
+    """
+    The first count columns of the rows of a table, as arrays.
+    """
+    return [numpy.array(column, dtype=numpy.int64)
+            for column in list(zip(*rows))[:count]]
+
+#-------------------------------------------------------------------------
+#
+# Array versions of the gcalendar conversions
+#
+#-------------------------------------------------------------------------
+def _shift_year(year, month):
+    """
+    Years counted from 4801 BC, starting in March, and months from March.
+    """
+    year = numpy.where(year < 0, year + 4801, year + 4800)
+    march = month > 2
+    return (numpy.where(march, year, year - 1),
+            numpy.where(march, month - 3, month + 9))
+
+def _gregorian_sdn(year, month, day):
+    year, month = _shift_year(year, month)
+    return (((year // 100) * _GRG_DAYS_PER_400_YEARS) // 4
+            + ((year % 100) * _GRG_DAYS_PER_4_YEARS) // 4
+            + (month * _GRG_DAYS_PER_5_MONTHS + 2) // 5
+            + day - _GRG_SDN_OFFSET)
+
+def _julian_sdn(year, month, day):
+    year, month = _shift_year(year, month)
+    return ((year * _JLN_DAYS_PER_4_YEARS) // 4
+            + (month * _JLN_DAYS_PER_5_MONTHS + 2) // 5
+            + day - _JLN_SDN_OFFSET)
+
+def _french_sdn(year, month, day):
+    return ((year * _FR_DAYS_PER_4_YEARS) // 4
+            + (month - 1) * _FR_DAYS_PER_MONTH + day + _FR_SDN_OFFSET)
+
+def _swedish_sdn(year, month, day):
+    key = (year * 100 + month) * 100 + day
+    return numpy.where(
+        (key >= 17000301) & (key <= 17120230),
+        _julian_sdn(year, month, day) - 1,
+        numpy.where(key >= 17530301, _gregorian_sdn(year, month, day),
+                    _julian_sdn(year, month, day)))
+
+def _unshift_year(year, day_of_year):
+    """
+    The year, month and day of the day of the year of a year starting in
+    March and counted from 4801 BC.
+    """
+    temp = day_of_year * 5 - 3
+    month = temp // _GRG_DAYS_PER_5_MONTHS
+    day = (temp % _GRG_DAYS_PER_5_MONTHS) // 5 + 1
+    march = month < 10
+    year = numpy.where(march, year, year + 1) - 4800
+    return (numpy.where(year <= 0, year - 1, year),
+            numpy.where(march, month + 3, month - 9), day)
+
+def _gregorian_ymd(sdn):
+    temp = (_GRG_SDN_OFFSET + sdn) * 4 - 1
+    century = temp // _GRG_DAYS_PER_400_YEARS
+    temp = ((temp % _GRG_DAYS_PER_400_YEARS) // 4) * 4 + 3
+    year = (century * 100) + (temp // _GRG_DAYS_PER_4_YEARS)
+    return _unshift_year(year, (temp % _GRG_DAYS_PER_4_YEARS) // 4 + 1)
+
+def _julian_ymd(sdn):
+    temp = (sdn + _JLN_SDN_OFFSET) * 4 - 1
+    year = temp // _JLN_DAYS_PER_4_YEARS
+    return _unshift_year(year, (temp % _JLN_DAYS_PER_4_YEARS) // 4 + 1)
+
+def _french_ymd(sdn):
+    temp = (sdn - _FR_SDN_OFFSET) * 4 - 1
+    day_of_year = (temp % _FR_DAYS_PER_4_YEARS) // 4
+    return (temp // _FR_DAYS_PER_4_YEARS,
+            (day_of_year // _FR_DAYS_PER_MONTH) + 1,
+            (day_of_year % _FR_DAYS_PER_MONTH) + 1)
+
+def _swedish_ymd(sdn):
+    swedish = (sdn >= 2342042) & (sdn < 2346425)
+    julian = _julian_ymd(numpy.where(swedish, sdn + 1, sdn))
+    gregorian = _gregorian_ymd(sdn)
+    last = sdn == 2346425
+    return tuple(numpy.where(last, value,
+                             numpy.where(sdn >= 2361390, grg, jln))
+                 for value, grg, jln in zip((1712, 2, 30), gregorian, julian))
+
+_ARRAY_TO_SDN = {_CAL_GREGORIAN: _gregorian_sdn, _CAL_JULIAN: _julian_sdn,
+                 _CAL_FRENCH: _french_sdn, _CAL_SWEDISH: _swedish_sdn}
+_ARRAY_FROM_SDN = {_CAL_GREGORIAN: _gregorian_ymd, _CAL_JULIAN: _julian_ymd,
+                   _CAL_FRENCH: _french_ymd, _CAL_SWEDISH: _swedish_ymd}
+
+#-------------------------------------------------------------------------
+#
+# Batch computations
+#
+#-------------------------------------------------------------------------
+def sort_values(dates):
+    """
+    Return the sort values of dates, as :meth:`.Date.recalc_sort_value`
+    computes them.
+
+    :param dates: The dates, as (calendar, year, month, day) tuples, where
+        calendar is one of Date.CAL_*. A zero year, month or day counts as 1.
+    :returns: The list of the sort values.
+    """
+    dates = list(dates)
+    if not _use_numpy(len(dates)):
+        return [_TO_SDN[calendar](year or 1, max(month, 1), max(day, 1))
+                for (calendar, year, month, day) in dates]
+    calendars, years, months, days = _columns(dates, 4)
+    years = numpy.where(years == 0, 1, years)
+    months = numpy.maximum(months, 1)
+    days = numpy.maximum(days, 1)
+    result = numpy.zeros(len(dates), dtype=numpy.int64)
+    others = numpy.ones(len(dates), dtype=bool)
+    for calendar, func in _ARRAY_TO_SDN.items():
+        mask = calendars == calendar
+        if mask.any():
+            result[mask] = func(years[mask], months[mask], days[mask])
+            others &= ~mask
+    result = result.tolist()
+    for index in numpy.flatnonzero(others).tolist():
+        calendar, year, month, day = dates[index]
+        result[index] = _TO_SDN[calendar](year or 1, max(month, 1),
+                                          max(day, 1))
+    return result
+
+def from_sort_values(sdns, calendar=_CAL_GREGORIAN):
+    """
+    Return the dates of sort values in a calendar, as the conversion
+    functions of :mod:`.gcalendar` compute them.
+
+    :param sdns: The sort values.
+    :param calendar: The calendar, one of Date.CAL_*.
+    :returns: The list of the (year, month, day) tuples of the dates.
+    """
+    sdns = list(sdns)
+    if calendar not in _ARRAY_FROM_SDN or not _use_numpy(len(sdns)):
+        return [_FROM_SDN[calendar](sdn) for sdn in sdns]
+    year, month, day = _ARRAY_FROM_SDN[calendar](
+        numpy.array(sdns, dtype=numpy.int64))
+    return list(zip(year.tolist(), month.tolist(), day.tolist()))
+
+def convert_calendar(dates, calendar=_CAL_GREGORIAN):
+    """
+    Return dates converted to another calendar.
+
+    :param dates: The dates, as (calendar, year, month, day) tuples.
+    :param calendar: The calendar to convert to, one of Date.CAL_*.
+    :returns: The list of the (year, month, day) tuples of the dates.
+    """
+    return from_sort_values(sort_values(dates), calendar)
+
+def year_differences(starts, stops):
+    """
+    Return the number of whole years between pairs of dates of the same
+    calendar: the difference of the years, less one if the month and day of
+    the start are after those of the stop.
+
+    :param starts: The start dates, as (day, month, year, ...) tuples, as
+        the values of :class:`.Date`.
+    :param stops: The stop dates, in the same form.
+    :returns: The list of the differences.
+    """
+    starts = list(starts)
+    stops = list(stops)
+    if not _use_numpy(len(starts)):
+        return [stop[2] - start[2] - ((start[1], start[0]) >
+                                      (stop[1], stop[0]))
+                for start, stop in zip(starts, stops)]
+    start_day, start_month, start_year = _columns(starts, 3)
+    stop_day, stop_month, stop_year = _columns(stops, 3)
+    later = ((start_month > stop_month) |
+             ((start_month == stop_month) & (start_day > stop_day)))
+    return (stop_year - start_year - later).tolist()
@@ -0,0 +1,79 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Access to the fields of serialized Gramps objects.
+"""
+
+#------------------------------------------------------------------------
+#
+# Python modules
+#
+#------------------------------------------------------------------------
+from operator import itemgetter
+
+#------------------------------------------------------------------------
+#
+# RawAccessor
+#
+#------------------------------------------------------------------------
+class RawAccessor:
+    """
+    Read the fields of the serialized data of an object, as returned by its
+    serialize method, without creating the object.
+
+    The accessor is built from the schema of the class, of which the
+    properties are in the order of the serialized data. Each property is an
+    attribute of the accessor, that returns the field from the data::
+
+        accessor = get_raw_accessor(Person)
+        accessor.gender(data)
+
+    The schema type of each property is in the types dictionary.
+    """
+
+    def __init__(self, cls):
+        properties = [(name, schema) for (name, schema)
+                      in cls.get_schema()["properties"].items()
+                      if name != "_class"]
+        if len(properties) != len(cls().serialize()):
+            raise ValueError("The schema of %s does not match its "
+                             "serialized data" % cls.__name__)
+        self.obj_class = cls
+        self.class_name = cls.__name__
+        self.positions = {}
+        self.types = {}
+        for position, (name, schema) in enumerate(properties):
+            self.positions[name] = position
+            self.types[name] = schema.get("type")
+            setattr(self, name, itemgetter(position))
+
+__ACCESSORS = {}
+
+def get_raw_accessor(cls):
+    """
+    Return the RawAccessor of a class. Accessors are only built once.
+
+    :param cls: The class of the serialized objects.
+    :type cls: class
+    :returns: The accessor of the class.
+    :rtype: RawAccessor
+    """
+    if cls not in __ACCESSORS:
+        __ACCESSORS[cls] = RawAccessor(cls)
+    return __ACCESSORS[cls]
@@ -0,0 +1,105 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" unittest for datebatch """
+
+import random
+import unittest
+
+from .. import datebatch
+from ..date import Date, gregorian
+
+# years around the calendar changes, and before Christ
+YEARS = [-4000, -1, 1, 2, 1582, 1700, 1711, 1712, 1753, 1792, 1806, 2000]
+CALENDARS = list(range(len(Date.calendar_names)))
+
+def _dates():
+    for calendar in CALENDARS:
+        for year in YEARS:
+            for month in range(0, 14, 3):
+                for day in (0, 1, 28, 30):
+                    yield (calendar, year, month, day)
+
+class DateBatchTest(unittest.TestCase):
+    """
+    The batch computations give the results of the computations on each
+    date, with and without NumPy.
+    """
+    def setUp(self):
+        self.have_numpy = datebatch.HAVE_NUMPY
+
+    def tearDown(self):
+        datebatch.HAVE_NUMPY = self.have_numpy
+
+    def each_mode(self, test):
+        datebatch.HAVE_NUMPY = False
+        test()
+        if self.have_numpy:
+            datebatch.HAVE_NUMPY = True
+            test()
+
+    def test_sort_values(self):
+        dates = list(_dates())
+        expected = []
+        for calendar, year, month, day in dates:
+            date = Date()
+            date.calendar = calendar
+            date.dateval = (day, month, year, False)
+            expected.append(date.recalc_sort_value())
+        self.each_mode(lambda: self.assertEqual(
+            datebatch.sort_values(dates), expected))
+
+    def test_from_sort_values(self):
+        sdns = list(range(2342000, 2346500, 7)) + list(range(2361380, 2361400))
+        for calendar in CALENDARS:
+            expected = [Date._calendar_change[calendar](sdn) for sdn in sdns]
+            self.each_mode(lambda: self.assertEqual(
+                datebatch.from_sort_values(sdns, calendar), expected))
+
+    def test_convert_calendar(self):
+        dates = [(Date.CAL_JULIAN, 1700, month, 1) for month in range(1, 13)]
+        dates *= 4
+        expected = []
+        for calendar, year, month, day in dates:
+            date = Date()
+            date.set(calendar=calendar, value=(day, month, year, False))
+            expected.append(gregorian(date).get_ymd())
+        self.each_mode(lambda: self.assertEqual(
+            datebatch.convert_calendar(dates), expected))
+
+    def test_year_differences(self):
+        starts = [(12, 3, 1850, False), (0, 0, 1850, False), (1, 2, 1850)]
+        stops = [(11, 3, 1900, False), (0, 0, 1900, False), (1, 2, 1900)]
+        self.each_mode(lambda: self.assertEqual(
+            datebatch.year_differences(starts, stops), [49, 50, 50]))
+        rand = random.Random(38)
+        starts = [(rand.randint(0, 31), rand.randint(0, 12),
+                   rand.randint(-100, 2000), False) for dummy in range(500)]
+        stops = [(rand.randint(0, 31), rand.randint(0, 12),
+                  rand.randint(-100, 2000), False) for dummy in range(500)]
+        expected = []
+        for start, stop in zip(starts, stops):
+            if (start[1], start[0]) > (stop[1], stop[0]):
+                expected.append(stop[2] - start[2] - 1)
+            else:
+                expected.append(stop[2] - start[2])
+        self.each_mode(lambda: self.assertEqual(
+            datebatch.year_differences(starts, stops), expected))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,7 @@ from . import BaseDoc
 from ..menu import NumberOption, TextOption, EnumeratedListOption, \
     BooleanOption
 from ...constfunc import win
+from ...errors import ReportError
 
 #-------------------------------------------------------------------------
 #
@@ -423,12 +424,23 @@ class GVDocBase(BaseDoc, GVDoc):
     Base document generator for all Graphviz document generators. Classes that
     inherit from this class will only need to implement the close function.
     The close function will generate the actual file of the appropriate type.
+
+    The graph is kept in memory until the document is opened. If the class
+    has a dot format, dot is then started to render the file, and the graph
+    is written to its input as it is generated.
     """
+    # the extension of the generated file
+    _extension = None
+    # the output format of dot, or None if dot is not started when the
+    # document is opened
+    _dot_format = None
+
     def __init__(self, options, paper_style, uistate=None):
         BaseDoc.__init__(self, None, paper_style, uistate=uistate)
 
         self._filename = None
         self._dot = BytesIO()
+        self._process = None
         self._paper = paper_style
 
         get_option = options.menu.get_option_by_name
@@ -510,16 +522,88 @@ class GVDocBase(BaseDoc, GVDoc):
 
     def write(self, text):
         """ Write text to the dot file """
-        self._dot.write(text.encode('utf8', 'xmlcharrefreplace'))
+        try:
+            self._dot.write(text.encode('utf8', 'xmlcharrefreplace'))
+        except BrokenPipeError:
+            self.__wait_dot(stopped=True)
 
     def open(self, filename):
         """ Implement GVDocBase.open() """
         self._filename = os.path.normpath(os.path.abspath(filename))
 
+        # Make sure the extension is correct
+        if self._extension and not self._filename.endswith(self._extension):
+            self._filename += self._extension
+
+        if self._dot_format:
+            self.start_dot(self._dot_format, self._filename)
+
+    def start_dot(self, dot_format, filename):
+        """
+        Start dot to render the graph to a file, and write the graph to its
+        input from now on, starting with the part written so far.
+        """
+        try:
+            self._process = Popen(['dot', '-T' + dot_format, '-o' + filename],
+                                  stdin=PIPE)
+        except OSError as msg:
+            raise ReportError(_("Could not create %s") % filename, msg)
+        graph = self._dot.getvalue()
+        self._dot = self._process.stdin
+        try:
+            self._dot.write(graph)
+        except BrokenPipeError:
+            self.__wait_dot(stopped=True)
+
+    def __wait_dot(self, stopped=False):
+        """
+        Wait for dot to render the graph, and raise a ReportError if it
+        failed or stopped reading the graph before its end.
+        """
+        process, self._process = self._process, None
+        try:
+            self._dot.close()
+        except BrokenPipeError:
+            stopped = True
+        if process.wait() != 0 or stopped:
+            raise ReportError(_("Could not create %s") % self._filename,
+                              _("Graphviz exited with status %d")
+                              % process.returncode)
+
+    def __kill_dot(self):
+        """
+        Stop dot without waiting for it to render the graph.
+        """
+        process, self._process = self._process, None
+        process.kill()
+        try:
+            self._dot.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
+
+    def __del__(self):
+        # the report failed or was cancelled before close(): stop dot
+        if getattr(self, '_process', None) is not None:
+            self.__kill_dot()
+
     def close(self):
         """
-        This isn't useful by itself. Other classes need to override this and
-        actually generate a file.
+        End the graph, and wait for dot to render it if it was started.
+        Other classes may need to override this to generate a file.
+        """
+        try:
+            self.__write_end()
+        except BaseException:
+            if self._process is not None:
+                self.__kill_dot()
+            raise
+        if self._process is not None:
+            self.__wait_dot()
+
+    def __write_end(self):
+        """
+        Write the note and the end of the graph.
         """
         if self.note:
             # build up the label
@@ -665,17 +749,21 @@ class GVDocBase(BaseDoc, GVDoc):
 #------------------------------------------------------------------------------
 class GVDotDoc(GVDocBase):
     """ GVDoc implementation that generates a .gv text file. """
+    _extension = ".gv"
+
+    def open(self, filename):
+        """ Implements GVDotDoc.open() """
+        GVDocBase.open(self, filename)
+
+        # Write the graph to the file as it is generated
+        dotfile = open(self._filename, "wb")
+        dotfile.write(self._dot.getvalue())
+        self._dot = dotfile
 
     def close(self):
         """ Implements GVDotDoc.close() """
         GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-3:] != ".gv":
-            self._filename += ".gv"
-
-        with open(self._filename, "wb") as dotfile:
-            dotfile.write(self._dot.getvalue())
+        self._dot.close()
 
 
 #------------------------------------------------------------------------------
@@ -685,6 +773,7 @@ class GVDotDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVPsDoc(GVDocBase):
     """ GVDoc implementation that generates a .ps file using Graphviz. """
+    _extension = ".ps"
 
     def __init__(self, options, paper_style):
         # DPI must always be 72 for PDF.
@@ -699,19 +788,9 @@ class GVPsDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVPsDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-3:] != ".ps":
-            self._filename += ".ps"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
+    def open(self, filename):
+        """ Implements GVPsDoc.open() """
+        GVDocBase.open(self, filename)
 
         # Generate the PS file.
         # Reason for using -Tps:cairo. Needed for Non Latin-1 letters
@@ -728,7 +807,7 @@ class GVPsDoc(GVDocBase):
         # recent versions of Graphviz doesn't even try, just puts out a single
         # large page.
 
-        command = 'dot -Tps:cairo -o"%s" "%s"' % (self._filename, tmp_dot)
+        dot_format = 'ps:cairo'
         dotversion = str(Popen(['dot', '-V'],
                                stderr=PIPE).communicate(input=None)[1])
         # Problem with dot 2.26.3 and later and multiple pages, which gives
@@ -736,10 +815,8 @@ class GVPsDoc(GVDocBase):
         # gives bad result for non-Latin-1 characters (utf-8).
         if (dotversion.find('2.26.3') or dotversion.find('2.28.0') != -1) and \
                 (self.vpages * self.hpages) > 1:
-            command = command.replace(':cairo', '')
-        os.system(command)
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
+            dot_format = 'ps'
+        self.start_dot(dot_format, self._filename)
 
 
 #------------------------------------------------------------------------------
@@ -749,6 +826,8 @@ class GVPsDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVSvgDoc(GVDocBase):
     """ GVDoc implementation that generates a .svg file using Graphviz. """
+    _extension = ".svg"
+    _dot_format = "svg:cairo"
 
     def __init__(self, options, paper_style):
         # GV documentation allow multiple pages only for ps format,
@@ -757,25 +836,6 @@ class GVSvgDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVSvgDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".svg":
-            self._filename += ".svg"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        # Generate the SVG file.
-        os.system('dot -Tsvg:cairo -o"%s" "%s"' % (self._filename, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -784,6 +844,8 @@ class GVSvgDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVSvgzDoc(GVDocBase):
     """ GVDoc implementation that generates a .svg file using Graphviz. """
+    _extension = ".svgz"
+    _dot_format = "svgz"
 
     def __init__(self, options, paper_style):
         # GV documentation allow multiple pages only for ps format,
@@ -792,25 +854,6 @@ class GVSvgzDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVSvgzDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-5:] != ".svgz":
-            self._filename += ".svgz"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        # Generate the SVGZ file.
-        os.system('dot -Tsvgz -o"%s" "%s"' % (self._filename, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -819,6 +862,8 @@ class GVSvgzDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVPngDoc(GVDocBase):
     """ GVDoc implementation that generates a .png file using Graphviz. """
+    _extension = ".png"
+    _dot_format = "png"
 
     def __init__(self, options, paper_style):
         # GV documentation allow multiple pages only for ps format,
@@ -827,25 +872,6 @@ class GVPngDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVPngDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".png":
-            self._filename += ".png"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        # Generate the PNG file.
-        os.system('dot -Tpng -o"%s" "%s"' % (self._filename, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -854,6 +880,8 @@ class GVPngDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVJpegDoc(GVDocBase):
     """ GVDoc implementation that generates a .jpg file using Graphviz. """
+    _extension = ".jpg"
+    _dot_format = "jpg"
 
     def __init__(self, options, paper_style):
         # GV documentation allow multiple pages only for ps format,
@@ -862,25 +890,6 @@ class GVJpegDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVJpegDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".jpg":
-            self._filename += ".jpg"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        # Generate the JPEG file.
-        os.system('dot -Tjpg -o"%s" "%s"' % (self._filename, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -889,6 +898,8 @@ class GVJpegDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVGifDoc(GVDocBase):
     """ GVDoc implementation that generates a .gif file using Graphviz. """
+    _extension = ".gif"
+    _dot_format = "gif"
 
     def __init__(self, options, paper_style):
         # GV documentation allow multiple pages only for ps format,
@@ -897,25 +908,6 @@ class GVGifDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVGifDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".gif":
-            self._filename += ".gif"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        # Generate the GIF file.
-        os.system('dot -Tgif -o"%s" "%s"' % (self._filename, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -924,6 +916,8 @@ class GVGifDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVPdfGvDoc(GVDocBase):
     """ GVDoc implementation that generates a .pdf file using Graphviz. """
+    _extension = ".pdf"
+    _dot_format = "pdf"
 
     def __init__(self, options, paper_style):
         # DPI must always be 72 for PDF.
@@ -935,27 +929,6 @@ class GVPdfGvDoc(GVDocBase):
         options.menu.get_option_by_name('h_pages').set_value(1)
         GVDocBase.__init__(self, options, paper_style)
 
-    def close(self):
-        """ Implements GVPdfGvDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".pdf":
-            self._filename += ".pdf"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
-        fname = self._filename
-
-        # Generate the PDF file.
-        os.system('dot -Tpdf -o"%s" "%s"' % (fname, tmp_dot))
-
-        # Delete the temporary dot file
-        os.remove(tmp_dot)
-
 
 #------------------------------------------------------------------------------
 #
@@ -964,28 +937,21 @@ class GVPdfGvDoc(GVDocBase):
 #------------------------------------------------------------------------------
 class GVPdfGsDoc(GVDocBase):
     """ GVDoc implementation that generates a .pdf file using Ghostscript. """
+    _extension = ".pdf"
+
     def __init__(self, options, paper_style):
         # DPI must always be 72 for PDF.
         # GV documentation says dpi is only for image formats.
         options.menu.get_option_by_name('dpi').set_value(72)
         GVDocBase.__init__(self, options, paper_style)
+        self._tmp_ps = None
 
-    def close(self):
-        """ Implements GVPdfGsDoc.close() """
-        GVDocBase.close(self)
-
-        # Make sure the extension is correct
-        if self._filename[-4:] != ".pdf":
-            self._filename += ".pdf"
-
-        # Create a temporary dot file
-        (handle, tmp_dot) = tempfile.mkstemp(".gv")
-        dotfile = os.fdopen(handle, "wb")
-        dotfile.write(self._dot.getvalue())
-        dotfile.close()
+    def open(self, filename):
+        """ Implements GVPdfGsDoc.open() """
+        GVDocBase.open(self, filename)
 
         # Create a temporary PostScript file
-        (handle, tmp_ps) = tempfile.mkstemp(".ps")
+        (handle, self._tmp_ps) = tempfile.mkstemp(".ps")
         os.close(handle)
 
         # Generate PostScript using dot
@@ -994,9 +960,16 @@ class GVPdfGsDoc(GVDocBase):
         # :cairo does not work with with multi-page See issue 4164
         # recent versions of Graphviz doesn't even try, just puts out a single
         # large page, so we use Ghostscript to split it up.
+        self.start_dot('ps:cairo', self._tmp_ps)
 
-        command = 'dot -Tps:cairo -o"%s" "%s"' % (tmp_ps, tmp_dot)
-        os.system(command)
+    def close(self):
+        """ Implements GVPdfGsDoc.close() """
+        tmp_ps = self._tmp_ps
+        try:
+            GVDocBase.close(self)
+        except BaseException:
+            os.remove(tmp_ps)
+            raise
 
         # Add .5 to remove rounding errors.
         paper_size = self._paper.get_size()
@@ -1056,7 +1029,6 @@ class GVPdfGsDoc(GVDocBase):
         os.remove(tmp_ps)
         for tmp_pdf_piece in list_of_pieces:
             os.remove(tmp_pdf_piece)
-        os.remove(tmp_dot)
 
 #------------------------------------------------------------------------------
 #
@@ -28,6 +28,7 @@
 
 from ._constants import *
 from ._reportbase import Report
+from ._reportcache import ReportCache
 
 from ._bibliography import Bibliography, Citation
 
@@ -660,6 +660,7 @@ class OptionHandler(_options.OptionHandler):
         # We will not need to save/retrieve them, just keep around.
         self.doc = EmptyDoc() # Nasty hack. Text reports replace this
         self.output = None
+        self.cache = None
 
         # Retrieve our options from whole collection
         self.style_name = self.option_list_collection.default_style_name
@@ -900,6 +901,22 @@ class ReportOptions(_options.Options):
         """
         self.handler.doc = val
 
+    def get_cache(self):
+        """
+        Return the cache shared with the other reports of a book, or None.
+
+        .. warning:: This method MUST NOT be overridden by subclasses.
+        """
+        return self.handler.cache
+
+    def set_cache(self, val):
+        """
+        Set the cache shared with the other reports of a book.
+
+        .. warning:: This method MUST NOT be overridden by subclasses.
+        """
+        self.handler.cache = val
+
     def get_output(self):
         """
         Return document output destination.
@@ -30,6 +30,7 @@ from ...const import GRAMPS_LOCALE as glocale
 from ...utils.grampslocale import GrampsLocale
 from ...display.name import NameDisplay
 from ...config import config
+from ._reportcache import ReportCache
 
 #-------------------------------------------------------------------------
 #
@@ -50,6 +51,9 @@ class Report:
 
         self.doc = options_class.get_document()
 
+        # shared with the other reports of a book
+        self.cache = options_class.get_cache() or ReportCache()
+
         creator = database.get_researcher().get_name()
         self.doc.set_creator(creator)
 
@@ -0,0 +1,135 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Share the results of computations between the reports of a book.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+import logging
+
+LOG = logging.getLogger(".report.cache")
+
+#-------------------------------------------------------------------------
+#
+# ReportCache
+#
+#-------------------------------------------------------------------------
+class ReportCache:
+    """
+    Results of computations shared by the reports of a book.
+
+    The items of a book are run one after the other on the same database,
+    and often compute the same things: the same proxy databases for the
+    same privacy options, the same filters, the ancestors of the same
+    person. A single cache is given to all the items of a book, so that
+    each result is only computed once. A report run on its own gets a cache
+    of its own.
+
+    Reports opt in by getting their results through the cache, with a key
+    that includes everything the result depends on, usually the database
+    the report uses. The results are shared and must not be modified.
+    """
+
+    def __init__(self):
+        self.__values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, func, *args):
+        """
+        Return the value cached for the key, or compute it with func(*args)
+        and cache it.
+
+        :param key: A hashable key identifying the value.
+        :param func: The function computing the value.
+        """
+        try:
+            value = self.__values[key]
+        except KeyError:
+            self.misses += 1
+            value = self.__values[key] = func(*args)
+        else:
+            self.hits += 1
+        return value
+
+    def clear(self):
+        """
+        Forget all the cached values.
+        """
+        LOG.debug("%d hits, %d misses", self.hits, self.misses)
+        self.__values.clear()
+        self.hits = self.misses = 0
+
+    def get_proxy(self, proxy_class, database, *args, **kwargs):
+        """
+        Return a proxy of the database built with the arguments, reusing the
+        proxy of a previous report built with the same arguments, so that
+        proxies doing work when they are built, or caching objects, only do
+        so once.
+
+        :param proxy_class: The class of the proxy.
+        :param database: The database the proxy is for.
+        """
+        key = ('proxy', proxy_class, database, args,
+               tuple(sorted(kwargs.items())))
+        return self.get(key, lambda: proxy_class(database, *args, **kwargs))
+
+    def apply_filter(self, filter_, database, id_list=None, user=None):
+        """
+        Return the handles of the objects of the database matching the
+        filter, as :meth:`.GenericFilter.apply` does. The filter is applied
+        to all the objects of the database once for each filter definition;
+        if id_list is given, the matching handles are returned in its order.
+
+        :param filter_: The filter to apply.
+        :type filter_: :class:`.GenericFilter`
+        :param database: The database to apply the filter to.
+        :param id_list: The handles of the objects to consider, or None for
+            all the objects of the database.
+        :param user: The user to report the progress of the filter to.
+        """
+        key = self.__filter_key(filter_)
+        if key is None:
+            return filter_.apply(database, id_list, user=user)
+        handles = self.get(('filter', database, key),
+                           filter_.apply, database, None, None, user)
+        if id_list is None:
+            return list(handles)
+        matched = self.get(('filter-set', database, key), frozenset, handles)
+        return [handle for handle in id_list if handle in matched]
+
+    @staticmethod
+    def __filter_key(filter_):
+        """
+        Return a key identifying the definition of the filter, or None if
+        the filter cannot be identified.
+        """
+        try:
+            key = (filter_.__class__, filter_.get_logical_op(),
+                   filter_.get_invert(),
+                   tuple((rule.__class__, tuple(rule.list), rule.use_regex)
+                         for rule in filter_.get_rules()))
+            hash(key)
+        except (AttributeError, TypeError):
+            return None
+        return key
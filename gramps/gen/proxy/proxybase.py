@@ -900,6 +900,18 @@ class ProxyDbBase(DbReadBase):
                             self.db.get_place_from_handle(handle)
                            ) is not None
 
+    def get_place_coordinates(self, handles=None):
+        """
+        Return a dictionary of the (latitude, longitude) of the places with
+        valid coordinates, by their handles. The proxies do not change the
+        coordinates of the places they keep.
+        """
+        coordinates = self.db.get_place_coordinates(handles)
+        if self.include_place is None:
+            return coordinates
+        return {handle: coords for handle, coords in coordinates.items()
+                if self.include_place(handle)}
+
     def has_media_handle(self, handle):
         """
         returns True if the handle exists in the current Mediadatabase.
@@ -27,6 +27,7 @@ Classes for relationships.
 #
 #-------------------------------------------------------------------------
 import logging
+from itertools import islice
 
 #-------------------------------------------------------------------------
 #
@@ -837,6 +838,7 @@ class RelationshipCalculator:
         self.stored_map = None
         self.map_handle = None
         self.map_meta = None
+        self.__parent_index = {}
         self.__db_connected = False
         self.depth = 15
         try:
@@ -1277,6 +1279,49 @@ class RelationshipCalculator:
             self.dirtymap = False
             self.map_handle = orig_person.handle
 
+        common = self._merge_common_ancestors(first_map, second_map)
+        return self.__distance_result(common)
+
+    def __distance_result(self, common):
+        """
+        Build the return value of get_relationship_distance_new from the
+        sorted list of common ancestors, adding the messages collected
+        during the search.
+        """
+        #check for extra messages
+        if self.__max_depth_reached:
+            self.__msg += [_('Family Tree reaches back more than the maximum '
+                             '%d generations searched.\nIt is possible that '
+                             'relationships have been missed') %
+                           (self.__max_depth)]
+
+        if common and not self.__all_dist:
+            rank = common[0][0]
+            person_handle = common[0][1]
+            first_rel = common[0][2]
+            first_fam = common[0][3]
+            second_rel = common[0][4]
+            second_fam = common[0][5]
+            return (rank, person_handle, first_rel, first_fam, second_rel,
+                    second_fam), self.__msg
+        if common:
+            #list with tuples (rank, handle person,rel_str_orig,rel_fam_orig,
+            #       rel_str_other,rel_fam_str) and messages
+            return common, self.__msg
+        if not self.__all_dist:
+            return  (-1, None, '', [], '', []), self.__msg
+        else:
+            return [(-1, None, '', [], '', [])], self.__msg
+
+    def _merge_common_ancestors(self, first_map, second_map):
+        """
+        Combine the ancestor maps of two people into the sorted list of
+        common ancestors (rank, person handle, firstRel_str, firstRel_fam,
+        secondRel_str, secondRel_fam), as used by
+        get_relationship_distance_new. Paths passing through a closer common
+        ancestor are dropped.
+        """
+        common = []
         for person_handle in second_map:
             if person_handle in first_map:
                 com = []
@@ -1327,30 +1372,7 @@ class RelationshipCalculator:
                         deletelist.reverse()
                         for index in deletelist:
                             del common[index]
-        #check for extra messages
-        if self.__max_depth_reached:
-            self.__msg += [_('Family Tree reaches back more than the maximum '
-                             '%d generations searched.\nIt is possible that '
-                             'relationships have been missed') %
-                           (self.__max_depth)]
-
-        if common and not self.__all_dist:
-            rank = common[0][0]
-            person_handle = common[0][1]
-            first_rel = common[0][2]
-            first_fam = common[0][3]
-            second_rel = common[0][4]
-            second_fam = common[0][5]
-            return (rank, person_handle, first_rel, first_fam, second_rel,
-                    second_fam), self.__msg
-        if common:
-            #list with tuples (rank, handle person,rel_str_orig,rel_fam_orig,
-            #       rel_str_other,rel_fam_str) and messages
-            return common, self.__msg
-        if not self.__all_dist:
-            return  (-1, None, '', [], '', []), self.__msg
-        else:
-            return [(-1, None, '', [], '', [])], self.__msg
+        return common
 
     def __apply_filter(self, db, person, rel_str, rel_fam, pmap,
                        depth=1, stoprecursemap=None):
@@ -1494,6 +1516,307 @@ class RelationshipCalculator:
             traceback.print_exc()
             return
 
+    def get_common_ancestors(self, db, orig_person, other_person,
+                             all_families=False, all_dist=False,
+                             only_birth=True):
+        """
+        Iterative version of get_relationship_distance_new, taking the same
+        parameters and returning the same data. It is used by
+        get_one_relationship and get_all_relationships.
+
+        The ancestors of both people are looked up generation by generation
+        in a compact parent index, instead of recursing over full person
+        and family objects. If all_dist is False, the search advances from
+        both people at once, always on the side that is least far up, and
+        stops as soon as no common ancestor closer than the best one found
+        can still be reached, so closely related people are found without
+        collecting the complete ancestry of either of them.
+        If all_dist is True, all ancestors of orig_person are collected
+        first, and the search from other_person stops at every common
+        ancestor, as get_relationship_distance_new does.
+
+        :param db: database to work on
+        :param orig_person: first person
+        :type orig_person: Person Obj
+        :param other_person: second person, relation is sought between
+                             first and second person
+        :type other_person:  Person Obj
+        :param all_families: if False only Main family is searched, otherwise
+                             all families are used
+        :type all_families: bool
+        :param all_dist: if False only the shortest distance is returned,
+                         otherwise all relationships
+        :type all_dist:  bool
+        :param only_birth: if True only parents with birth relation are
+                           considered
+        :type only_birth:  bool
+        """
+        self.__start_search(all_families, all_dist, only_birth)
+        first_map = {orig_person.handle: [[''], [[]]]}
+        second_map = {other_person.handle: [[''], [[]]]}
+        first = [(orig_person.handle, '', [])]
+        second = [(other_person.handle, '', [])]
+        if all_dist:
+            while first:
+                first = self.__ancestor_generation(db, first, first_map)
+            while second:
+                second = self.__ancestor_generation(db, second, second_map,
+                                                    first_map)
+        else:
+            best = self.__closest_common(first_map, second_map)
+            while first or second:
+                #the closest relation not yet seen has a common ancestor
+                #above the current generation of one of both searches
+                bound = min(len(frontier[0][1]) + 1
+                            for frontier in (first, second) if frontier)
+                if best is not None and bound > best:
+                    break
+                if not second or (first and
+                                  (len(first[0][1]), len(first)) <=
+                                  (len(second[0][1]), len(second))):
+                    first = self.__ancestor_generation(db, first, first_map)
+                else:
+                    second = self.__ancestor_generation(db, second,
+                                                        second_map, first_map)
+                best = self.__closest_common(first_map, second_map)
+        common = self._merge_common_ancestors(first_map, second_map)
+        return self.__distance_result(common)
+
+    def get_relationships_to_person(self, db, home_person, handle_list,
+                                    olocale=glocale):
+        """
+        Return a dictionary mapping each person handle of handle_list to the
+        relationship string get_one_relationship gives between home_person
+        and that person.
+
+        This is meant for queries of the relationship of everyone to the
+        home person. The ancestors of home_person are collected only once,
+        people without a common ancestor are recognised by a search that
+        stops at the first common ancestor found, and only related people
+        go through the full relationship computation, which reuses the
+        parent index of the whole batch.
+
+        If olocale is passed in (a GrampsLocale) that language will be used.
+
+        :param olocale: allow selection of the relationship language
+        :type olocale: a GrampsLocale instance
+        """
+        self._locale = olocale
+        self.__start_search(True, True, False)
+        home_map = {home_person.handle: [[''], [[]]]}
+        frontier = [(home_person.handle, '', [])]
+        while frontier:
+            frontier = self.__ancestor_generation(db, frontier, home_map)
+
+        storemap = self.storemap
+        if not storemap:
+            #the parent index is only kept up to date when connected to the
+            #database signals, so keep it for this batch only
+            self.storemap = True
+        relationships = {}
+        try:
+            for handle in handle_list:
+                if handle in relationships:
+                    continue
+                person = db.get_person_from_handle(handle)
+                if person is None:
+                    continue
+                if handle == home_person.handle:
+                    relationships[handle] = ''
+                elif self.__is_related(db, handle, home_map):
+                    relationships[handle] = self.get_one_relationship(
+                        db, home_person, person, olocale=olocale)
+                else:
+                    relationships[handle] = self.is_spouse(
+                        db, home_person, person) or ''
+        finally:
+            if not storemap:
+                self.storemap = False
+                self.__parent_index = {}
+        return relationships
+
+    def __start_search(self, all_families, all_dist, only_birth):
+        """
+        Reset the data shared by the iterative search methods.
+        """
+        self.__max_depth_reached = False
+        self.__loop_detected = False
+        self.__max_depth = self.get_depth()
+        self.__all_families = all_families
+        self.__all_dist = all_dist
+        self.__only_birth = only_birth
+        self.__crosslinks = False
+        self.__msg = []
+        if not self.storemap:
+            #without database signals we cannot know when the index is stale
+            self.__parent_index = {}
+
+    def __is_related(self, db, handle, first_map):
+        """
+        Return True if the person with the given handle or one of the
+        ancestors is in first_map.
+        """
+        if handle in first_map:
+            return True
+        second_map = {handle: [[''], [[]]]}
+        frontier = [(handle, '', [])]
+        while frontier:
+            known = len(second_map)
+            frontier = self.__ancestor_generation(db, frontier, second_map,
+                                                  first_map)
+            for person_handle in islice(second_map, known, None):
+                if person_handle in first_map:
+                    return True
+        return False
+
+    def __closest_common(self, first_map, second_map):
+        """
+        Return the rank of the closest common ancestor present in both maps,
+        or None if there is none yet.
+        """
+        if len(second_map) < len(first_map):
+            first_map, second_map = second_map, first_map
+        best = None
+        for person_handle, (rels, fams) in first_map.items():
+            if person_handle in second_map:
+                rank = (min(len(rel) for rel in rels) +
+                        min(len(rel) for rel in second_map[person_handle][0]))
+                if best is None or rank < best:
+                    best = rank
+        return best
+
+    def _get_parent_families(self, db, handle):
+        """
+        Return the entry of the person with the given handle in the parent
+        index, a tuple (main, families). families holds a tuple
+        (father handle, mother handle, father is birth parent, mother is
+        birth parent, siblings) for each parent family of the person, in
+        the order of the parent family list, and main is True if the first
+        of them is the main parent family of the person. siblings lists the
+        other children of a family without parents, and is empty otherwise.
+
+        Entries are kept until the database signals a change of people or
+        families.
+        """
+        try:
+            return self.__parent_index[handle]
+        except KeyError:
+            pass
+        main = False
+        families = []
+        person = db.get_person_from_handle(handle)
+        if person:
+            main_handle = person.get_main_parents_family_handle()
+            for family_handle in person.get_parent_family_handle_list():
+                family = db.get_family_from_handle(family_handle)
+                if not family:
+                    continue
+                childrel = [(ref.get_mother_relation(),
+                             ref.get_father_relation())
+                            for ref in family.get_child_ref_list()
+                            if ref.ref == handle]
+                if not childrel:
+                    continue
+                if not families and family_handle == main_handle:
+                    main = True
+                fhandle = family.father_handle
+                mhandle = family.mother_handle
+                siblings = ()
+                if not fhandle and not mhandle:
+                    siblings = tuple(ref.ref
+                                     for ref in family.get_child_ref_list()
+                                     if ref.ref != handle)
+                families.append((fhandle, mhandle,
+                                 childrel[0][1] == ChildRefType.BIRTH,
+                                 childrel[0][0] == ChildRefType.BIRTH,
+                                 siblings))
+        entry = (main, tuple(families))
+        self.__parent_index[handle] = entry
+        return entry
+
+    def __ancestor_generation(self, db, frontier, pmap, stopmap=None):
+        """
+        Look up the parents of the people in frontier, a list of
+        (person handle, rel_str, rel_fam) of the same generation, and add
+        them to pmap as __apply_filter does. Return the list of parents of
+        which the parents must be looked up next.
+
+        If stopmap is None, pmap is the map of the first person and
+        siblings from families without parents are added to it. Otherwise
+        parents present in stopmap are common ancestors, and their parents
+        are not looked up unless the first map has crosslinks.
+        """
+        parents = []
+        for handle, rel_str, rel_fam in frontier:
+            main, families = self._get_parent_families(db, handle)
+            if not self.__all_families:
+                families = families[:1] if main else ()
+            parentstodo = {}
+            for fam, (fhandle, mhandle, fbirth, mbirth,
+                      siblings) in enumerate(families):
+                rel_fam_new = rel_fam + [fam]
+                for data in [(fhandle, self.REL_FATHER,
+                              self.REL_FATHER_NOTBIRTH, fbirth),
+                             (mhandle, self.REL_MOTHER,
+                              self.REL_MOTHER_NOTBIRTH, mbirth)]:
+                    if data[0] and data[0] not in parentstodo:
+                        if data[3]:
+                            addstr = data[1]
+                        elif not self.__only_birth:
+                            addstr = data[2]
+                        else:
+                            continue
+                        parentstodo[data[0]] = (rel_str + addstr,
+                                                rel_fam_new)
+                    elif data[0]:
+                        #parent in several families of this person
+                        famlist = parentstodo[data[0]][1]
+                        if not isinstance(famlist[-1], list) and \
+                                fam != famlist[-1]:
+                            famlist = famlist[:-1] + [[famlist[-1]]]
+                        if isinstance(famlist[-1], list) and \
+                                fam not in famlist[-1]:
+                            famlist = famlist[:-1] + [famlist[-1] + [fam]]
+                            parentstodo[data[0]] = (parentstodo[data[0]][0],
+                                                    famlist)
+                if siblings and stopmap is None:
+                    for chandle in siblings:
+                        if chandle in pmap:
+                            pmap[chandle][0].append(rel_str + self.REL_SIBLING)
+                            pmap[chandle][1].append(rel_fam_new)
+                        else:
+                            pmap[chandle] = [[rel_str + self.REL_SIBLING],
+                                             [rel_fam_new]]
+
+            for parent_handle, (rel_str_new, rel_fam_new) in \
+                    parentstodo.items():
+                if len(rel_str_new) >= self.__max_depth:
+                    self.__max_depth_reached = True
+                    continue
+                if parent_handle in pmap:
+                    if stopmap is None:
+                        self.__crosslinks = True
+                    rels = pmap[parent_handle][0]
+                    loop = [rel for rel in rels if rel_str_new.startswith(rel)]
+                    rels.append(rel_str_new)
+                    pmap[parent_handle][1].append(rel_fam_new)
+                    if loop:
+                        #loop, keep one message in storage!
+                        self.__loop_detected = True
+                        parent = db.get_person_from_handle(parent_handle)
+                        self.__msg += [_("Relationship loop detected:") + " " +
+                                       _("Person %(person)s connects to himself via %(relation)s")  %
+                                       {'person' : parent.get_primary_name().get_name(),
+                                        'relation' : rel_str_new[len(loop[0]):]}]
+                        continue
+                else:
+                    pmap[parent_handle] = [[rel_str_new], [rel_fam_new]]
+                if (stopmap is not None and parent_handle in stopmap
+                        and not self.__crosslinks):
+                    continue
+                parents.append((parent_handle, rel_str_new, rel_fam_new))
+        return parents
+
     def collapse_relations(self, relations):
         """
         Internal method to condense the relationships as returned by
@@ -1701,7 +2024,7 @@ class RelationshipCalculator:
             else:
                 return rel_str
 
-        data, msg = self.get_relationship_distance_new(
+        data, msg = self.get_common_ancestors(
             db, orig_person, other_person, all_dist=True, all_families=True,
             only_birth=False)
         if data[0][0] == -1:
@@ -1809,7 +2132,7 @@ class RelationshipCalculator:
             relstrings.append(is_spouse)
             commons[is_spouse] = []
 
-        data, msg = self.get_relationship_distance_new(
+        data, msg = self.get_common_ancestors(
             db, orig_person, other_person, all_dist=True, all_families=True,
             only_birth=False)
         if data[0][0] != -1:
@@ -2255,6 +2578,7 @@ class RelationshipCalculator:
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
         self.stored_map = None
+        self.__parent_index = {}
 
     def _dbchange_callback(self, db):
         """
@@ -2262,6 +2586,7 @@ class RelationshipCalculator:
         Connects must be remade
         """
         self.dirtymap = True
+        self.__parent_index = {}
         #signals are disconnected on close of old database, connect to new
         self.__connect_db_signals(db)
 
@@ -2273,6 +2598,7 @@ class RelationshipCalculator:
         will be checked
         """
         self.dirtymap = True
+        self.__parent_index = {}
 
 #-------------------------------------------------------------------------
 #
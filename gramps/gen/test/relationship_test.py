@@ -0,0 +1,109 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the iterative search of relationship.py """
+
+import os
+import random
+import unittest
+
+from ..const import DATA_DIR
+from ..db.utils import import_as_dict
+from ..user import User
+from ..relationship import RelationshipCalculator
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class RelationshipSearchTest(unittest.TestCase):
+    """
+    Compare the iterative search with the recursive one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.people = list(cls.db.iter_people())
+
+    def setUp(self):
+        self.rel_calc = RelationshipCalculator()
+        rand = random.Random(26)
+        self.pairs = [rand.sample(self.people, 2) for _ in range(100)]
+        # most people of the example tree are not related
+        self.pairs += [(person, self.relative(rand, person))
+                       for person in rand.sample(self.people, 100)]
+
+    def relative(self, rand, person):
+        """
+        Return a relative of the person, found by going up to an ancestor
+        and down to one of its descendants.
+        """
+        for _ in range(rand.randint(1, 4)):
+            handle = person.get_main_parents_family_handle()
+            if not handle:
+                break
+            family = self.db.get_family_from_handle(handle)
+            parents = [handle for handle in (family.get_father_handle(),
+                                             family.get_mother_handle())
+                       if handle]
+            if not parents:
+                break
+            person = self.db.get_person_from_handle(rand.choice(parents))
+        for _ in range(rand.randint(0, 4)):
+            children = [child_ref.ref
+                        for handle in person.get_family_handle_list()
+                        for child_ref in self.db.get_family_from_handle(
+                            handle).get_child_ref_list()]
+            if not children:
+                break
+            person = self.db.get_person_from_handle(rand.choice(children))
+        return person
+
+    def test_shortest(self):
+        for orig, other in self.pairs:
+            for all_families in (False, True):
+                old, msg = self.rel_calc.get_relationship_distance_new(
+                    self.db, orig, other, all_families=all_families,
+                    only_birth=False)
+                new, msg = self.rel_calc.get_common_ancestors(
+                    self.db, orig, other, all_families=all_families,
+                    only_birth=False)
+                self.assertEqual(old, new)
+
+    def test_all_distances(self):
+        for orig, other in self.pairs:
+            old, msg = self.rel_calc.get_relationship_distance_new(
+                self.db, orig, other, all_families=True, all_dist=True)
+            new, msg = self.rel_calc.get_common_ancestors(
+                self.db, orig, other, all_families=True, all_dist=True)
+            self.assertEqual(sorted(old, key=repr), sorted(new, key=repr))
+
+    def test_relationships_to_person(self):
+        home = self.db.get_default_person() or self.people[0]
+        handles = [person.handle for person in self.people[:300]]
+        result = self.rel_calc.get_relationships_to_person(self.db, home,
+                                                           handles)
+        for handle in handles:
+            person = self.db.get_person_from_handle(handle)
+            self.assertEqual(result[handle],
+                             self.rel_calc.get_one_relationship(
+                                 self.db, home, person))
+
+if __name__ == "__main__":
+    unittest.main()
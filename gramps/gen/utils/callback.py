@@ -182,6 +182,30 @@ class Callback:
     Any signals emitted whilst signals are blocked will be lost.
 
 
+    **Batching signals**
+
+
+    Signals emitted by an instance can be held back and delivered together,
+    either for the duration of a context::
+
+            with t.batch_signals():
+                ...
+
+    or until the main loop runs again, using the scheduler given to
+    :meth:`set_scheduler`::
+
+            t.defer_signals()
+
+    While they are held back, the handle lists of the signals named
+    '<name>-add', '<name>-update' and '<name>-delete' are merged: an object
+    added then deleted is not reported, an object added then updated is only
+    reported as added, and a signal '<name>-rebuild' drops the held back
+    handles of '<name>'. Other signals are delivered once for each distinct
+    set of arguments. Each callback is then called once for each of the
+    signals delivered. :meth:`get_signal_counts` gives the number of signals
+    emitted and that of the callbacks called.
+
+
     **Debugging signal callbacks**
 
 
@@ -198,6 +222,9 @@ class Callback:
     # the class methods, dissable_all_signals() and enable_all_signals().
     __BLOCK_ALL_SIGNALS = False
     __LOG_ALL = False
+    # A function which calls the function it is given when the main loop
+    # runs again, see set_scheduler().
+    __SCHEDULER = None
 
     def __init__(self):
         self.__enable_logging = False # controls whether lots of debug
@@ -222,6 +249,12 @@ class Callback:
                                    # being emitted by this instance. This is
                                    # used to prevent recursive emittion of the
                                    # same signal.
+        self.__batch_depth = 0   # number of batches opened, signals are
+                                 # held back while it is not zero
+        self.__deferred = False  # whether a batch is closed by the scheduler
+        self.__pending = {}      # the signals held back, see __hold()
+        self.__emitted = 0       # counters of the signals emitted and of
+        self.__delivered = 0     # the callbacks called
 
         # To speed up the signal type checking the signals declared by
         # each of the classes in the inheritance tree of this instance
@@ -382,7 +415,7 @@ class Callback:
                                % ((str(signal_name), ) + inspect.stack()[1][1:4]))
                     return
 
-                if arg_types is not None:
+                if __debug__ and arg_types is not None:
                     for i in range(0, len(arg_types)):
                         if not isinstance(args[i], arg_types[i]):
                             self._warn("Signal emitted with "
@@ -394,23 +427,140 @@ class Callback:
                                        % ((str(signal_name), ) + inspect.stack()[1][1:4] +\
                                           (args[i], repr(type(args[i])), repr(arg_types[i]))))
                             return
-            if signal_name in self.__callback_map:
-                self._log("emitting signal: %s\n" % (signal_name, ))
-                # Don't bother if there are no callbacks.
-                for (key, fn) in self.__callback_map[signal_name]:
-                    self._log("Calling callback with key: %s\n" % (key, ))
-                    try:
-                        if isinstance(fn, types.FunctionType) or \
-                                isinstance(fn, types.MethodType): # call func
-                            fn(*args)
-                        else:
-                            self._warn("Badly formed entry in callback map.\n")
-                    except:
-                        self._warn("Exception occurred in callback function.\n"
-                                   "%s" % ("".join(traceback.format_exception(*sys.exc_info())), ))
+            self.__emitted += 1
+            if self.__batch_depth:
+                self.__hold(signal_name, args)
+            else:
+                self.__deliver(signal_name, args)
+        finally:
+            self._current_signals.remove(signal_name)
+
+    def __deliver(self, signal_name, args):
+        """
+        Call the callbacks connected to a signal.
+        """
+        if signal_name in self.__callback_map:
+            self._log("emitting signal: %s\n" % (signal_name, ))
+            # Don't bother if there are no callbacks.
+            for (key, fn) in self.__callback_map[signal_name]:
+                self._log("Calling callback with key: %s\n" % (key, ))
+                try:
+                    if isinstance(fn, types.FunctionType) or \
+                            isinstance(fn, types.MethodType): # call func
+                        self.__delivered += 1
+                        fn(*args)
+                    else:
+                        self._warn("Badly formed entry in callback map.\n")
+                except:
+                    self._warn("Exception occurred in callback function.\n"
+                               "%s" % ("".join(traceback.format_exception(*sys.exc_info())), ))
+
+    def __hold(self, signal_name, args):
+        """
+        Hold back a signal until the end of the batch.
+
+        The handles of the signals '<name>-add', '<name>-update' and
+        '<name>-delete' are kept under the key (None, '<name>') in a
+        dictionary {handle: action}; the other signals under the key
+        (signal_name, args).
+        """
+        name, dummy, action = signal_name.rpartition('-')
+        if (action in ('add', 'update', 'delete') and args and
+                len(args) == 1 and isinstance(args[0], list)):
+            handles = self.__pending.setdefault((None, name), {})
+            for handle in args[0]:
+                previous = handles.get(handle)
+                if action == 'delete':
+                    if previous == 'add':
+                        del handles[handle]
+                    else:
+                        handles[handle] = 'delete'
+                elif previous == 'delete':
+                    handles[handle] = 'update'
+                elif previous != 'add':
+                    handles[handle] = action
+            return
+        if action == 'rebuild' and not args:
+            self.__pending.pop((None, name), None)
+        key = (signal_name, args or ())
+        try:
+            self.__pending[key] = args or ()
+        except TypeError:
+            # unhashable arguments: the signal is not merged
+            self.__pending[(signal_name, object())] = args
+
+    def __flush(self):
+        """
+        Deliver the signals held back.
+        """
+        pending = self.__pending
+        self.__pending = {}
+        for (signal_name, name), value in pending.items():
+            if signal_name is None:
+                # do deletes and adds first
+                for action in ('delete', 'add', 'update'):
+                    handles = [handle for (handle, handle_action)
+                               in value.items() if handle_action == action]
+                    if handles:
+                        self.__deliver_once(name + '-' + action, (handles, ))
+            else:
+                self.__deliver_once(signal_name, value)
+
+    def __deliver_once(self, signal_name, args):
+        # a callback may emit signals, the same one is not delivered again
+        if signal_name in self._current_signals:
+            return
+        self._current_signals.append(signal_name)
+        try:
+            self.__deliver(signal_name, args)
         finally:
             self._current_signals.remove(signal_name)
 
+    def batch_signals(self):
+        """
+        Return a context manager, during which the signals are held back, to
+        be merged and delivered when it exits.
+        """
+        return _SignalBatch(self)
+
+    def begin_signal_batch(self):
+        """
+        Hold back the signals until :meth:`end_signal_batch` is called.
+        Batches may be nested.
+        """
+        self.__batch_depth += 1
+
+    def end_signal_batch(self):
+        """
+        Deliver the signals held back when the outermost batch ends.
+        """
+        self.__batch_depth -= 1
+        if self.__batch_depth == 0:
+            self.__flush()
+
+    def defer_signals(self):
+        """
+        Hold back the signals until the main loop runs again, if a scheduler
+        was given to :meth:`set_scheduler`; otherwise, do nothing.
+        """
+        if self.__SCHEDULER is None or self.__deferred:
+            return
+        self.__SCHEDULER(self.__end_deferred)
+        self.__deferred = True
+        self.begin_signal_batch()
+
+    def __end_deferred(self):
+        self.__deferred = False
+        self.end_signal_batch()
+        return False
+
+    def get_signal_counts(self):
+        """
+        Return the number of signals emitted by this instance, and that of
+        the calls of their callbacks, as a tuple (emitted, delivered).
+        """
+        return (self.__emitted, self.__delivered)
+
     #
     # instance signals control methods
     #
@@ -451,3 +601,31 @@ class Callback:
     def enable_all_signals(cls):
         cls.__BLOCK_ALL_SIGNALS = False
 
+    @classmethod
+    def set_scheduler(cls, scheduler):
+        """
+        Set the function used by :meth:`defer_signals`, which must call the
+        function it is given when the main loop runs again, or None.
+        """
+        # a static method, so that the function is not bound to the
+        # instances when it is read from them
+        if scheduler is not None:
+            scheduler = staticmethod(scheduler)
+        cls.__SCHEDULER = scheduler
+
+
+class _SignalBatch:
+    """
+    Context manager holding back the signals of a :class:`Callback`.
+    """
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __enter__(self):
+        self.callback.begin_signal_batch()
+        return self.callback
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.callback.end_signal_batch()
+        return False
+
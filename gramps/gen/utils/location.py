@@ -21,8 +21,43 @@
 """
 Location utility functions
 """
+from collections import namedtuple
+
 from ..lib.date import Date, Today
 
+#-------------------------------------------------------------------------
+#
+# PlaceEntry
+#
+#-------------------------------------------------------------------------
+PlaceEntry = namedtuple('PlaceEntry', [
+    'names',    # list of the (value, language, date) of the names
+    'type',     # the PlaceType
+    'parents',  # list of the (handle, date) of the enclosing places
+    'dated',    # True if a name or an enclosing place has a date
+    'key',      # the names, type and enclosing places, as a hashable tuple
+])
+
+def get_place_entry(place):
+    """
+    Return the :class:`PlaceEntry` of a place: the data used to display
+    the places of the hierarchy.
+    """
+    names = [(name.get_value(), name.get_language(), name.get_date_object())
+             for name in place.get_all_names()]
+    parents = [(placeref.ref, placeref.get_date_object())
+               for placeref in place.get_placeref_list()]
+    place_type = place.get_type()
+    dated = any(not date.is_empty()
+                for date in [name[2] for name in names] +
+                [parent[1] for parent in parents])
+    key = (place.handle,
+           tuple((value, lang, date.serialize())
+                 for (value, lang, date) in names),
+           place_type.serialize(),
+           tuple((handle, date.serialize()) for (handle, date) in parents))
+    return PlaceEntry(names, place_type, parents, dated, key)
+
 #-------------------------------------------------------------------------
 #
 # get_location_list
@@ -31,36 +66,43 @@ from ..lib.date import Date, Today
 def get_location_list(db, place, date=None, lang=''):
     """
     Return a list of place names for display.
+
+    The enclosing places are taken from the place hierarchy of the database
+    when it keeps one.
     """
     if date is None:
         date = __get_latest_date(place)
+    hierarchy = db.get_place_hierarchy()
+    entry = get_place_entry(place)
     visited = [place.handle]
-    lines = [(__get_name(place, date, lang), place.get_type())]
+    lines = [(__get_name(entry, date, lang), entry.type)]
     while True:
         handle = None
-        for placeref in place.get_placeref_list():
-            ref_date = placeref.get_date_object()
+        for ref, ref_date in entry.parents:
             if ref_date.is_empty() or date.match_exact(ref_date):
-                handle = placeref.ref
+                handle = ref
                 break
         if handle is None or handle in visited:
             break
-        place = db.get_place_from_handle(handle)
-        if place is None:
+        if hierarchy is not None:
+            entry = hierarchy.get_entry(handle)
+        else:
+            place = db.get_place_from_handle(handle)
+            entry = None if place is None else get_place_entry(place)
+        if entry is None:
             break
         visited.append(handle)
-        lines.append((__get_name(place, date, lang), place.get_type()))
+        lines.append((__get_name(entry, date, lang), entry.type))
     return lines
 
-def __get_name(place, date, lang):
+def __get_name(entry, date, lang):
     endonym = None
-    for place_name in place.get_all_names():
-        name_date = place_name.get_date_object()
+    for value, name_lang, name_date in entry.names:
         if name_date.is_empty() or date.match_exact(name_date):
-            if place_name.get_language() == lang:
-                return place_name.get_value()
+            if name_lang == lang:
+                return value
             if endonym is None:
-                endonym = place_name.get_value()
+                endonym = value
     return endonym if endonym is not None else '?'
 
 def __get_latest_date(place):
@@ -134,6 +176,9 @@ def located_in(db, handle1, handle2):
     Determine if the place identified by handle1 is located within the place
     identified by handle2.
     """
+    hierarchy = db.get_place_hierarchy()
+    if hierarchy is not None:
+        return handle2 in hierarchy.get_ancestors(handle1)
     place = db.get_place_from_handle(handle1)
     todo = [(place, [handle1])]
     while len(todo):
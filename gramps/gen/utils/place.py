@@ -564,6 +564,18 @@ def conv_lat_lon(latitude, longitude, format="D.D4"):
                           ("%03d%02d%06.3f" % (deg_lon, min_lon+1, 0.))
         return str_lat + str_lon
 
+def conv_lat_lon_float(latitude, longitude):
+    """
+    Convert given string latitude and longitude to decimal degrees, rounded
+    like the 'D.D8' format of :func:`conv_lat_lon`, so that
+    "%.8f" % latitude gives the same string.
+
+    :returns: a tuple of 2 floats. If conversion fails: returns (None, None)
+    """
+    latitude, longitude = conv_lat_lon(latitude, longitude, "D.D8")
+    if latitude is None:
+        return (None, None)
+    return (float(latitude), float(longitude))
 
 
 def atanh(x):
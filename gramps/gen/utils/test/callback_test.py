@@ -320,6 +320,89 @@ class TestCallback(unittest.TestCase):
         self.assertEqual(res[0][0:6], "Signal",
                          "multisignal recursion not blocked")
 
+    def test_batch(self):
+
+        class TestSignals(Callback):
+
+            __signals__ = {
+                        'note-add' : (list,),
+                        'note-update' : (list,),
+                        'note-delete' : (list,),
+                        'note-rebuild' : None,
+                        'test-int' : (int,)
+                        }
+
+        rl = []
+        t = TestSignals()
+        for signal in ('note-add', 'note-update', 'note-delete'):
+            t.connect(signal, lambda handles, signal=signal:
+                      rl.append((signal, handles)))
+        t.connect('note-rebuild', lambda: rl.append(('note-rebuild', )))
+        t.connect('test-int', lambda i: rl.append(('test-int', i)))
+
+        with t.batch_signals():
+            t.emit('note-add', (['a', 'b', 'c'],))
+            t.emit('note-update', (['a', 'd'],))
+            t.emit('note-delete', (['b', 'e'],))
+            with t.batch_signals():
+                t.emit('test-int', (1,))
+                t.emit('test-int', (1,))
+                t.emit('note-add', (['e'],))
+            t.emit('test-int', (2,))
+            self.assertEqual(rl, [])
+        self.assertEqual(rl, [('note-add', ['a', 'c']),
+                              ('note-update', ['d', 'e']),
+                              ('test-int', 1), ('test-int', 2)])
+        self.assertEqual(t.get_signal_counts(), (7, 4))
+
+        rl[:] = []
+        with t.batch_signals():
+            t.emit('note-update', (['a'],))
+            t.emit('note-rebuild')
+            t.emit('note-delete', (['b'],))
+        self.assertEqual(rl, [('note-rebuild', ), ('note-delete', ['b'])])
+
+    def test_defer(self):
+
+        class TestSignals(Callback):
+
+            __signals__ = {
+                        'test-int' : (int,)
+                        }
+
+        rl = []
+        scheduled = []
+        t = TestSignals()
+        t.connect('test-int', lambda i: rl.append(i))
+        t.defer_signals()
+        t.emit('test-int', (1,))
+        self.assertEqual(rl, [1])
+
+        # a function, which would be bound to the instances if it was
+        # stored as it is, unlike the builtin list.append
+        Callback.set_scheduler(lambda func: scheduled.append(func))
+        try:
+            t.defer_signals()
+            t.defer_signals()
+            t.emit('test-int', (2,))
+            t.emit('test-int', (2,))
+            self.assertEqual(rl, [1])
+            self.assertEqual(len(scheduled), 1)
+            scheduled.pop()()
+            self.assertEqual(rl, [1, 2])
+            t.emit('test-int', (3,))
+            self.assertEqual(rl, [1, 2, 3])
+
+            # the signals are not held back if the scheduler fails
+            def fail(func):
+                raise RuntimeError
+            Callback.set_scheduler(fail)
+            self.assertRaises(RuntimeError, t.defer_signals)
+            t.emit('test-int', (4,))
+            self.assertEqual(rl, [1, 2, 3, 4])
+        finally:
+            Callback.set_scheduler(None)
+
 if __name__ == "__main__":
     unittest.main()
 
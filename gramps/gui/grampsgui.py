@@ -40,6 +40,7 @@ LOG = logging.getLogger(".grampsgui")
 from gramps.gen.config import config
 from gramps.gen.const import DATA_DIR, IMAGE_DIR, GTK_GETTEXT_DOMAIN
 from gramps.gen.constfunc import has_display, lin
+from gramps.gen.utils.callback import Callback
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -52,6 +53,7 @@ _ = glocale.translation.gettext
 MIN_PYGOBJECT_VERSION = (3, 12, 0)
 PYGOBJ_ERR = False
 MIN_GTK_VERSION = (3, 12)
+SIGNAL_DELAY = 50  # milliseconds
 UIDEFAULT = (
     '''<?xml version="1.0" encoding="UTF-8"?>
 <interface>
@@ -565,6 +567,11 @@ class Gramps:
         theme = Gtk.IconTheme.get_default()
         theme.append_search_path(IMAGE_DIR)
 
+        # The signals held back by Callback.defer_signals() are delivered
+        # together a short while later
+        Callback.set_scheduler(
+            lambda func: GLib.timeout_add(SIGNAL_DELAY, func))
+
         dbstate = DbState()
         self._vm = ViewManager(app, dbstate,
                                config.get("interface.view-categories"))
@@ -160,10 +160,13 @@ class MergeCitation(ManagedWindow):
         if self.get_widget("gramps_btn1").get_active() ^ use_handle1:
             phoenix.set_gramps_id(titanic.get_gramps_id())
 
-        query = MergeCitationQuery(self.dbstate, phoenix, titanic)
-        query.execute()
-        # Add the selected handle to history so that when merge is complete,
-        # phoenix is the selected row.
-        self.uistate.set_active(phoenix.get_handle(), 'Citation')
+        # the signals of the merge are delivered together, once the merged
+        # object is active
+        with self.dbstate.db.batch_signals():
+            query = MergeCitationQuery(self.dbstate, phoenix, titanic)
+            query.execute()
+            # Add the selected handle to history so that when merge is
+            # complete, phoenix is the selected row.
+            self.uistate.set_active(phoenix.get_handle(), 'Citation')
         self.uistate.set_busy_cursor(False)
         self.close()
@@ -180,10 +180,13 @@ class MergeEvent(ManagedWindow):
             phoenix.set_gramps_id(titanic.get_gramps_id())
         # cause is deprecated.
 
-        query = MergeEventQuery(self.dbstate, phoenix, titanic)
-        query.execute()
-        # Add the selected handle to history so that when merge is complete,
-        # phoenix is the selected row.
-        self.uistate.set_active(phoenix.get_handle(), 'Event')
+        # the signals of the merge are delivered together, once the merged
+        # object is active
+        with self.dbstate.db.batch_signals():
+            query = MergeEventQuery(self.dbstate, phoenix, titanic)
+            query.execute()
+            # Add the selected handle to history so that when merge is
+            # complete, phoenix is the selected row.
+            self.uistate.set_active(phoenix.get_handle(), 'Event')
         self.uistate.set_busy_cursor(False)
         self.close()
@@ -217,12 +217,15 @@ class MergeFamily(ManagedWindow):
             phoenix.set_gramps_id(titanic.get_gramps_id())
 
         try:
-            query = MergeFamilyQuery(self.database, phoenix, titanic,
-                                     phoenix_fh, phoenix_mh)
-            query.execute()
-            # Add the selected handle to history so that when merge is complete,
-            # phoenix is the selected row.
-            self.uistate.set_active(phoenix.get_handle(), 'Family')
+            # the signals of the merge are delivered together, once the
+            # merged family is active
+            with self.database.batch_signals():
+                query = MergeFamilyQuery(self.database, phoenix, titanic,
+                                         phoenix_fh, phoenix_mh)
+                query.execute()
+                # Add the selected handle to history so that when merge is
+                # complete, phoenix is the selected row.
+                self.uistate.set_active(phoenix.get_handle(), 'Family')
         except MergeError as err:
             ErrorDialog(_("Cannot merge people"), str(err),
                         parent=self.window)
@@ -169,9 +169,12 @@ class MergeNote(ManagedWindow):
         if self.get_widget("gramps_btn1").get_active() ^ use_handle1:
             phoenix.set_gramps_id(titanic.get_gramps_id())
 
-        query = MergeNoteQuery(self.dbstate, phoenix, titanic)
-        query.execute()
-        # Add the selected handle to history so that when merge is complete,
-        # phoenix is the selected row.
-        self.uistate.set_active(phoenix.get_handle(), 'Note')
+        # the signals of the merge are delivered together, once the merged
+        # object is active
+        with self.dbstate.db.batch_signals():
+            query = MergeNoteQuery(self.dbstate, phoenix, titanic)
+            query.execute()
+            # Add the selected handle to history so that when merge is
+            # complete, phoenix is the selected row.
+            self.uistate.set_active(phoenix.get_handle(), 'Note')
         self.close()
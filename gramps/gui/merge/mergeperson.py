@@ -334,8 +334,14 @@ class MergePerson(ManagedWindow):
             titanic.set_gramps_id(swapid)
 
         try:
-            query = MergePersonQuery(self.database, phoenix, titanic)
-            family_merge_ok = query.execute()
+            # the signals of the merge are delivered together, once the
+            # merged person is active
+            with self.database.batch_signals():
+                query = MergePersonQuery(self.database, phoenix, titanic)
+                family_merge_ok = query.execute()
+                # Add the selected handle to history so that when merge is
+                # complete, phoenix is the selected row.
+                self.uistate.set_active(phoenix.get_handle(), 'Person')
             if not family_merge_ok:
                 WarningDialog(
                     _("Warning"),
@@ -344,9 +350,6 @@ class MergePerson(ManagedWindow):
                       "handle.  We recommend that you go to Relationships "
                       "view and see if additional manual merging of families "
                       "is necessary."), parent=self.window)
-            # Add the selected handle to history so that when merge is complete,
-            # phoenix is the selected row.
-            self.uistate.set_active(phoenix.get_handle(), 'Person')
         except MergeError as err:
             ErrorDialog(_("Cannot merge people"), str(err),
                         parent=self.window)
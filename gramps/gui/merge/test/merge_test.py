@@ -0,0 +1,75 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the signals of the merge dialogs """
+
+import unittest
+from unittest.mock import Mock
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Family, Person
+from gramps.gui.merge.mergeperson import MergePerson
+
+
+class MergeSignalsTest(unittest.TestCase):
+    """
+    The signals of a merge are delivered together, once the merged object is
+    active.
+    """
+
+    def test_merge_person(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        with DbTxn("Add", db) as trans:
+            handles = [db.add_person(Person(), trans) for dummy in range(2)]
+            # the person removed is the father of a family
+            family = Family()
+            family.set_father_handle(handles[1])
+            family_handle = db.add_family(family, trans)
+            person = db.get_person_from_handle(handles[1])
+            person.add_family_handle(family_handle)
+            db.commit_person(person, trans)
+        signals = []
+        for name in ('person-update', 'person-delete', 'family-update'):
+            db.connect(name, lambda handles, name=name:
+                       signals.append((name, handles)))
+
+        dialog = MergePerson.__new__(MergePerson)
+        dialog.database = db
+        dialog.pr1 = db.get_person_from_handle(handles[0])
+        dialog.pr2 = db.get_person_from_handle(handles[1])
+        dialog.update = None
+        dialog.uistate = Mock()
+        dialog.uistate.set_active.side_effect = (
+            lambda *args: self.assertEqual(signals, []))
+        dialog.get_widget = lambda name: Mock(**{'get_active.return_value':
+                                                 True})
+        dialog.close = Mock()
+        dialog.cb_merge(None)
+
+        dialog.uistate.set_active.assert_called_once_with(handles[0],
+                                                          'Person')
+        self.assertEqual(sorted(signals),
+                         [('family-update', [family_handle]),
+                          ('person-delete', [handles[1]]),
+                          ('person-update', [handles[0]])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -801,9 +801,11 @@ class ToolManagedWindowBase(ManagedWindow):
         # Save options
         self.options.parse_user_options()
         self.options.handler.save_options()
-        self.pre_run()
-        self.run() # activate results tab
-        self.post_run()
+        # the changes made by the tool are signalled together
+        with self.dbstate.db.batch_signals():
+            self.pre_run()
+            self.run() # activate results tab
+            self.post_run()
 
     def initial_frame(self):
         return None
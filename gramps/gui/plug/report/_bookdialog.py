@@ -73,6 +73,7 @@ from .. import make_gui_option
 
 # Import from specific modules in ReportBase
 from gramps.gen.plug.report import BookList, Book, BookItem, append_styles
+from gramps.gen.plug.report import ReportCache
 from gramps.gen.plug.report import CATEGORY_BOOK, book_categories
 from gramps.gen.plug.report._options import ReportOptions
 from ._reportdialog import ReportDialog
@@ -1001,9 +1002,11 @@ class BookDialog(DocReportDialog):
 
         pstyle = self.paper_frame.get_paper_style()
         self.doc = self.format(None, pstyle)
+        cache = ReportCache() # shared by the items of the book
 
         for item in self.book.get_item_list():
             item.option_class.set_document(self.doc)
+            item.option_class.set_cache(cache)
             report_class = item.get_write_item()
             obj = (write_book_item(self.database, report_class,
                                    item.option_class, user),
@@ -0,0 +1,95 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the signals of the tools """
+
+import unittest
+from unittest.mock import Mock
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.dbstate import DbState
+from gramps.gen.lib import Person
+from gramps.gui.plug._windows import ToolManagedWindowBase
+from gramps.gui.plug.tool import Tool, gui_tool
+
+
+def several_commits(db):
+    """
+    Add a person, then update it and another person in separate
+    transactions, as the tools do.
+    """
+    with DbTxn("Add", db) as trans:
+        person = Person()
+        db.add_person(person, trans)
+    for gender in (Person.MALE, Person.FEMALE):
+        with DbTxn("Update", db) as trans:
+            for handle in db.get_person_handles():
+                person = db.get_person_from_handle(handle)
+                person.set_gender(gender)
+                db.commit_person(person, trans)
+
+
+class SeveralCommits(Tool):
+    """
+    A tool making its changes when it starts.
+    """
+    def __init__(self, dbstate, user, options_class, name, callback=None):
+        Tool.__init__(self, dbstate, options_class, name)
+        several_commits(self.db)
+
+
+class ToolSignalsTest(unittest.TestCase):
+    """
+    The changes made by a tool are signalled together.
+    """
+
+    def setUp(self):
+        self.dbstate = DbState()
+        db = make_database("sqlite")
+        db.load(":memory:")
+        self.dbstate.change_database(db)
+        with DbTxn("Add", db) as trans:
+            self.handle = db.add_person(Person(), trans)
+        self.signals = []
+        for action in ('add', 'update', 'delete'):
+            db.connect('person-' + action, lambda handles, action=action:
+                       self.signals.append((action, sorted(handles))))
+
+    def check_signals(self):
+        handles = self.dbstate.db.get_person_handles()
+        added = [handle for handle in handles if handle != self.handle]
+        self.assertEqual(self.signals, [('add', added),
+                                        ('update', [self.handle])])
+
+    def test_gui_tool(self):
+        options = Mock(spec=['load_previous_values'])
+        gui_tool(self.dbstate, Mock(), SeveralCommits, options, "Tool",
+                 "tool", None, None)
+        self.check_signals()
+
+    def test_run(self):
+        window = Mock(dbstate=self.dbstate)
+        window.run.side_effect = lambda: several_commits(self.dbstate.db)
+        ToolManagedWindowBase.on_ok_clicked(window, None)
+        self.assertTrue(window.post_run.called)
+        self.check_signals()
+
+
+if __name__ == "__main__":
+    unittest.main()
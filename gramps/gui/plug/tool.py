@@ -248,9 +248,11 @@ def gui_tool(dbstate, user, tool_class, options_class, translated_name,
     """
 
     try:
-        tool_class(dbstate = dbstate, user = user,
-                options_class = options_class, name = name,
-                callback = callback)
+        # the changes made by the tool while it starts are signalled together
+        with dbstate.db.batch_signals():
+            tool_class(dbstate = dbstate, user = user,
+                    options_class = options_class, name = name,
+                    callback = callback)
     except WindowActiveError:
         pass
     except:
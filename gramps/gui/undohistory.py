@@ -214,8 +214,9 @@ class UndoHistory(ManagedWindow):
             return
         func = self.db.undo if steps < 0 else self.db.redo
 
-        for step in range(abs(steps)):
-            func(False)
+        with self.db.batch_signals():
+            for step in range(abs(steps)):
+                func(False)
         self.update()
 
     def _update_ui(self):
@@ -46,6 +46,7 @@ LOG = logging.getLogger('.gui.listview')
 from gi.repository import Gdk
 from gi.repository import Gtk
 from gi.repository import Pango
+from gi.repository import GLib
 
 #----------------------------------------------------------------
 #
@@ -72,6 +73,7 @@ from ..ddtargets import DdTargets
 from ..plug.quick import create_quickreport_menu, create_web_connect_menu
 from ..utils import is_right_click
 from ..widgets.interactivesearchbox import InteractiveSearchBox
+from .treemodels.flatbasemodel import FlatBaseModel
 
 #----------------------------------------------------------------
 #
@@ -82,6 +84,13 @@ TEXT = 1
 MARKUP = 2
 ICON = 3
 
+# signal prefix and class name of the objects filters can depend on
+PRIMARY_OBJECTS = (('person', 'Person'), ('family', 'Family'),
+                   ('event', 'Event'), ('place', 'Place'),
+                   ('source', 'Source'), ('citation', 'Citation'),
+                   ('repository', 'Repository'), ('media', 'Media'),
+                   ('note', 'Note'))
+
 #----------------------------------------------------------------
 #
 # ListView
@@ -122,6 +131,9 @@ class ListView(NavigationView):
         self.signal_map = signal_map
         self.multiple_selection = multiple
         self.generic_filter = None
+        self._refilter = False
+        self._refilter_id = None
+        self._populate_id = None
         dbstate.connect('database-changed', self.change_db)
         self.connect_signals()
         self.at_popup_action = None
@@ -291,6 +303,8 @@ class ListView(NavigationView):
         Called when the page is displayed.
         """
         NavigationView.set_active(self)
+        if self._refilter:
+            self.build_tree()
         self.uistate.viewmanager.tags.tag_enable(update_menu=False)
         self.uistate.show_filter_results(self.dbstate,
                                          self.model.displayed(),
@@ -302,6 +316,10 @@ class ListView(NavigationView):
         """
         NavigationView.set_inactive(self)
         self.uistate.viewmanager.tags.tag_disable()
+        if self._populate_id is not None:
+            # load the remaining rows when the view is shown again
+            self.__stop_populate()
+            self.dirty = True
 
     def build_tree(self, force_sidebar=False, preserve_col=True):
         if self.active:
@@ -312,13 +330,20 @@ class ListView(NavigationView):
                 value = self.search_bar.get_value()
                 filter_info = (False, value, value[0] in self.exact_search())
 
-            if self.dirty or not self.model:
+            if self.dirty or not self.model or self._populate_id is not None:
+                self.__stop_populate()
                 if self.model:
                     self.list.set_model(None)
                     self.model.destroy()
+                kwargs = {}
+                if (isinstance(self.make_model, type) and
+                        issubclass(self.make_model, FlatBaseModel) and
+                        config.get('interface.progressive-view-loading')):
+                    kwargs['progressive'] = True
                 self.model = self.make_model(
                     self.dbstate.db, self.uistate, self.sort_col,
-                    search=filter_info, sort_map=self.column_order())
+                    search=filter_info, sort_map=self.column_order(),
+                    **kwargs)
             else:
                 #the entire data to show is already in memory.
                 #run only the part that determines what to show
@@ -337,9 +362,13 @@ class ListView(NavigationView):
             self.list.set_model(self.model)
             cput3 = perf_counter()
             self.__display_column_sort()
-            self.goto_active(None)
+            if getattr(self.model, 'populating', False):
+                self.__start_populate()
+            else:
+                self.goto_active(None)
 
             self.dirty = False
+            self._refilter = False
             cput4 = perf_counter()
             self.uistate.show_filter_results(self.dbstate,
                                              self.model.displayed(),
@@ -358,6 +387,48 @@ class ListView(NavigationView):
     def search_build_tree(self):
         self.build_tree()
 
+    def __start_populate(self):
+        """
+        Load the rows of a progressive model from an idle callback, showing
+        the progress in the status bar.
+        """
+        self.uistate.progress.show()
+        self.uistate.progress.set_text(_('Loading items...'))
+        self._populate_id = GLib.idle_add(self.__populate_step,
+                                          self.model.populate(),
+                                          priority=GLib.PRIORITY_LOW)
+
+    def __populate_step(self, populate):
+        """
+        Load the next batch of rows. Called when the main loop is idle.
+        """
+        try:
+            next(populate)
+        except StopIteration:
+            pass
+        if self.model.populating:
+            self.uistate.progress.pulse()
+            self.uistate.show_filter_results(self.dbstate,
+                                             self.model.displayed(),
+                                             self.model.total())
+            return True
+        self._populate_id = None
+        self.uistate.progress.hide()
+        self.goto_active(None)
+        self.uistate.show_filter_results(self.dbstate,
+                                         self.model.displayed(),
+                                         self.model.total())
+        return False
+
+    def __stop_populate(self):
+        """
+        Cancel the loading of the rows of a progressive model.
+        """
+        if self._populate_id is not None:
+            GLib.source_remove(self._populate_id)
+            self._populate_id = None
+            self.uistate.progress.hide()
+
     def exact_search(self):
         """
         Returns a tuple indicating columns requiring an exact search
@@ -681,14 +752,96 @@ class ListView(NavigationView):
         """
         Connect database signals defined in the signal map.
         """
+        # first, so that the rows are not checked one by one when the
+        # filter is applied to all of them again
+        for prefix, class_name in PRIMARY_OBJECTS:
+            for action in ('add', 'update', 'delete'):
+                signal = prefix + '-' + action
+                self.callman.add_db_signal(
+                    signal, self.__dependency_callback(class_name, signal))
         for sig in self.signal_map:
             self.callman.add_db_signal(sig, self.signal_map[sig])
         self.callman.add_db_signal('tag-update', self.tag_updated)
 
+    def __dependency_callback(self, class_name, signal):
+        """
+        Return the callback for the signal of objects of class class_name.
+        """
+        return lambda handle_list: self.filter_dependency_changed(
+            class_name, signal, handle_list)
+
+    def filter_dependency_changed(self, class_name, signal, handle_list):
+        """
+        Called when objects of class class_name are added, changed or
+        deleted.
+
+        The rows of the changed objects are checked again by row_update.
+        Those of the objects referencing them, directly or through other
+        objects, are checked again by related_update if the view connects it
+        to the update, and otherwise here. Only if the filter depends on
+        class_name in another way, like an ancestor filter on family changes,
+        the filter is applied to all rows again, once all pending changes are
+        handled.
+        """
+        if not self.model:
+            return
+        if self.model.filter_depends_on(class_name):
+            self.__schedule_refilter()
+        elif (signal.endswith('-update') and self.model.is_filtered() and
+              class_name != self.navigation_type() and
+              self.signal_map.get(signal) != self.related_update):
+            self.__filter_related_update(handle_list)
+
+    def __filter_related_update(self, hndl_list):
+        """
+        Check again the rows of the objects referencing the changed objects,
+        directly or through other objects. If there are many, the filter is
+        applied to all rows again.
+        """
+        nav_type = self.navigation_type()
+        upd_list = []
+        done = set()
+        queue = deque(hndl_list)
+        while queue:
+            hndl = queue.pop()
+            if hndl in done:
+                continue
+            done.add(hndl)
+            for cl_name, handle in self.dbstate.db.find_backlink_handles(hndl):
+                if cl_name == nav_type:
+                    upd_list.append(handle)
+                    if len(upd_list) > 20:
+                        self.__schedule_refilter()
+                        return
+                else:
+                    queue.append(handle)
+        if upd_list:
+            self.row_update(upd_list)
+
+    def __schedule_refilter(self):
+        """
+        Apply the filter to all rows again, once all pending changes are
+        handled.
+        """
+        self._refilter = True
+        self.model.refilter_pending = True
+        if self.active and self._refilter_id is None:
+            self._refilter_id = GLib.idle_add(self.__refilter)
+
+    def __refilter(self):
+        """
+        Apply the filter to all rows again.
+        """
+        self._refilter_id = None
+        if self._refilter and self.active:
+            self.build_tree()
+        return False
+
     def change_db(self, db):
         """
         Called when the database is changed.
         """
+        self.__stop_populate()
         self.list.set_model(None)
         self._change_db(db)
         self.connect_signals()
@@ -739,6 +892,11 @@ class ListView(NavigationView):
         """
         Called when an object is added.
         """
+        if self._populate_id is not None:
+            # the rows are still being loaded, start again
+            self.dirty = True
+            self.build_tree()
+            return
         if self.active or \
            (not self.dirty and not self._dirty_on_change_inactive):
             cput = perf_counter()
@@ -756,6 +914,11 @@ class ListView(NavigationView):
         """
         Called when an object is updated.
         """
+        if self._populate_id is not None:
+            # the rows are still being loaded, start again
+            self.dirty = True
+            self.build_tree()
+            return
         if self.model:
             self.model.prev_handle = None
         if self.active or \
@@ -779,6 +942,11 @@ class ListView(NavigationView):
         """
         Called when an object is deleted.
         """
+        if self._populate_id is not None:
+            # the rows are still being loaded, start again
+            self.dirty = True
+            self.build_tree()
+            return
         if self.active or \
            (not self.dirty and not self._dirty_on_change_inactive):
             cput = perf_counter()
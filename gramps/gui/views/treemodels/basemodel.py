@@ -36,6 +36,9 @@ class BaseModel:
     def __init__(self):
         self.lru_data = LRU(BaseModel._CACHE_SIZE)
         self.lru_path = LRU(BaseModel._CACHE_SIZE)
+        # set by the view when the search or filter will be applied to all
+        # rows again, the updated rows are then not checked one by one
+        self.refilter_pending = False
 
     def destroy(self):
         """
@@ -99,3 +102,23 @@ class BaseModel:
         Clear path cache for all.
         """
         self.lru_path.clear()
+
+    def is_filtered(self):
+        """
+        Return True if a search or filter can hide rows.
+        """
+        return bool(self.search or getattr(self, 'search2', None))
+
+    def filter_depends_on(self, class_name):
+        """
+        Return True if a change of an object of class class_name can alter
+        which rows the search or filter shows, beyond the changed object and
+        the objects referencing it. The search or filter must then be
+        applied to all rows again.
+        """
+        for search in (self.search, getattr(self, 'search2', None)):
+            if search:
+                dependencies = search.get_dependencies()
+                if dependencies is None or class_name in dependencies:
+                    return True
+        return False
@@ -56,8 +56,11 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     """
     Flat citation model.  (Original code in CitationBaseModel).
     """
+    text_class = 'Citation'
+    text_columns = ('citation_page', 'citation_id')
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None, progressive=False):
         self.map = db.get_raw_citation_data
         self.gen_cursor = db.get_citation_cursor
         self.fmap = [
@@ -95,7 +98,8 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
             self.citation_tag_color
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               progressive=progressive)
 
     def destroy(self):
         """
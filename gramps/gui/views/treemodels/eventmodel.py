@@ -71,8 +71,11 @@ INVALID_DATE_FORMAT = config.get('preferences.invalid-date-format')
 #-------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
 
+    text_class = 'Event'
+    text_columns = ('column_description', 'column_id')
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None, progressive=False):
         self.gen_cursor = db.get_event_cursor
         self.map = db.get_raw_event_data
 
@@ -101,7 +104,8 @@ class EventModel(FlatBaseModel):
             self.column_tag_color
            ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               progressive=progressive)
 
     def destroy(self):
         """
@@ -56,8 +56,11 @@ invalid_date_format = config.get('preferences.invalid-date-format')
 #-------------------------------------------------------------------------
 class FamilyModel(FlatBaseModel):
 
+    text_class = 'Family'
+    text_columns = ('column_id',)
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None, progressive=False):
         self.gen_cursor = db.get_family_cursor
         self.map = db.get_raw_family_data
         self.fmap = [
@@ -83,7 +86,8 @@ class FamilyModel(FlatBaseModel):
             self.column_tag_color,
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               progressive=progressive)
 
     def destroy(self):
         """
@@ -397,6 +397,35 @@ class FlatNodeMap:
             self.__corr = (len(self._index2hndl) - 1, -1)
         return Gtk.TreePath((self.real_path(insert_pos),))
 
+    def merge(self, srtkey_hndls, all_srtkey_hndls=None):
+        """
+        Insert a batch of nodes at once. This is much faster than inserting
+        them one by one, as the maps are only rebuild once.
+        Returns the paths of the inserted rows, in the order in which the
+        treeview must be notified of them.
+
+        :param srtkey_hndls: the (sortkey, handle) tuples that must be shown
+        :type srtkey_hndls: a list of (sortkey, handle) tuples
+        :param all_srtkey_hndls: all (sortkey, handle) tuples of the batch,
+                    shown or not. Only needed if the map is not identical.
+        :type all_srtkey_hndls: a list of (sortkey, handle) tuples
+
+        :Returns: paths of the rows inserted in the treeview
+        :Returns type: list of Gtk.TreePath
+        """
+        if not self._identical:
+            self._fullhndl = sorted(self._fullhndl + all_srtkey_hndls)
+        self._index2hndl = sorted(self._index2hndl + srtkey_hndls)
+        if self._identical:
+            self._fullhndl = self._index2hndl
+        self._hndl2index = dict((key[1], index)
+            for index, key in enumerate(self._index2hndl))
+        if self._reverse:
+            self.__corr = (len(self._index2hndl) - 1, -1)
+        indexes = sorted((self._hndl2index[hndl] for srtkey, hndl
+                          in srtkey_hndls), reverse=self._reverse)
+        return [Gtk.TreePath((self.real_path(index),)) for index in indexes]
+
     def delete(self, handle):
         """
         Delete the row with the given (handle).
@@ -447,9 +476,16 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # The class of the objects in the model, and the names of the columns
+    # that show text of the object itself. A search in these columns can use
+    # the text index of the database. Columns of types are left out: the
+    # index has them in the language used when the object was stored.
+    text_class = None
+    text_columns = ()
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(),
-                 sort_map=None):
+                 sort_map=None, progressive=False):
         cput = perf_counter()
         GObject.GObject.__init__(self)
         BaseModel.__init__(self)
@@ -483,7 +519,16 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         self._reverse = (order == Gtk.SortType.DESCENDING)
 
-        self.rebuild_data()
+        #with a filter from the sidebar all rows are needed at once
+        self.populating = progressive and self.rebuild_data != \
+                                            self._rebuild_filter
+        if self.populating:
+            identical = not ((self.search and self.search.text) or
+                             self.skip)
+            self.node_map.set_path_map([], [], identical=identical,
+                                       reverse=self._reverse)
+        else:
+            self.rebuild_data()
         _LOG.debug(self.__class__.__name__ + ' __init__ ' +
                     str(perf_counter() - cput) + ' sec')
 
@@ -509,6 +554,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        self.search_indexed = False
         if search:
             if search[0]:
                 #following is None if no data given in filter sidebar
@@ -525,6 +571,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                         self.search = ExactSearchFilter(func, text, inv)
                     else:
                         self.search = SearchFilter(func, text, inv)
+                    self.search_indexed = (
+                        not inv and
+                        self.fmap[col].__name__ in self.text_columns)
                 else:
                     self.search = None
                 self.rebuild_data = self._rebuild_search
@@ -532,6 +581,17 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.search = None
             self.rebuild_data = self._rebuild_search
 
+    def search_candidates(self):
+        """
+        Return the set of handles that can match the search text of the top
+        search bar, using the text index of the database, or None if all
+        handles must be checked.
+        """
+        if self.search_indexed and self.search.text:
+            return self.db.get_text_index_handles(self.text_class,
+                                                  self.search.text)
+        return None
+
     def total(self):
         """
         Total number of items that maximally can be shown
@@ -571,6 +631,51 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             srt_keys.sort()
             return srt_keys
 
+    def populate(self, step_time=0.1):
+        """
+        Fill a model created with progressive=True in steps, so that the
+        user interface stays responsive and the first rows can be used
+        while the others are being loaded.
+
+        This is a generator, meant to be run from an idle callback. Each step
+        reads the rows for about step_time seconds, adds them to the model
+        and yields the number of rows read so far.
+        """
+        srtkey_hndls = []
+        all_srtkey_hndls = []
+        count = 0
+        candidates = self.search_candidates()
+        with self.gen_cursor() as cursor:
+            start = perf_counter()
+            for handle, data in cursor:
+                count += 1
+                srtkey_hndl = (self.sort_func(data), handle)
+                all_srtkey_hndls.append(srtkey_hndl)
+                if handle not in self.skip and (
+                        not self.search or not self.search.text or
+                        ((candidates is None or handle in candidates) and
+                         self.search.match(handle, self.db))):
+                    srtkey_hndls.append(srtkey_hndl)
+                if perf_counter() - start > step_time:
+                    self.__add_batch(srtkey_hndls, all_srtkey_hndls)
+                    srtkey_hndls = []
+                    all_srtkey_hndls = []
+                    yield count
+                    start = perf_counter()
+        self.__add_batch(srtkey_hndls, all_srtkey_hndls)
+        self.populating = False
+        yield count
+
+    def __add_batch(self, srtkey_hndls, all_srtkey_hndls):
+        """
+        Add a batch of rows read by populate and notify the treeview.
+        """
+        self._in_build = True
+        for path in self.node_map.merge(srtkey_hndls, all_srtkey_hndls):
+            node = self.do_get_iter(path)[1]
+            self.row_inserted(path, node)
+        self._in_build = False
+
     def _rebuild_search(self, ignore=None):
         """ function called when view must be build, given a search text
             in the top search bar
@@ -582,7 +687,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             if not allkeys:
                 allkeys = self.sort_keys()
             if self.search and self.search.text:
-                dlist = [h for h in allkeys
+                candidates = self.search_candidates()
+                if candidates is not None:
+                    keys = [h for h in allkeys if h[1] in candidates]
+                else:
+                    keys = allkeys
+                dlist = [h for h in keys
                              if self.search.match(h[1], self.db) and
                              h[1] not in self.skip and h[1] != ignore]
                 ident = False
@@ -632,18 +742,20 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.clear_map()
         self._in_build = False
 
-    def add_row_by_handle(self, handle):
+    def add_row_by_handle(self, handle, match=None):
         """
         Add a row. This is called after object with handle is created.
-        Row is only added if search/filter data is such that it must be shown
+        Row is only added if search/filter data is such that it must be shown.
+        match is whether the object matches the search/filter, if known.
         """
         assert isinstance(handle, str)
         if self.node_map.get_path_from_handle(handle) is not None:
             return # row is already displayed
         data = self.map(handle)
         insert_val = (self.sort_func(data), handle)
-        if not self.search or \
-                (self.search and self.search.match(handle, self.db)):
+        if match is None:
+            match = not self.search or self.search.match(handle, self.db)
+        if match:
             #row needs to be added to the model
             insert_path = self.node_map.insert(insert_val)
 
@@ -665,18 +777,31 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
     def update_row_by_handle(self, handle):
         """
-        Update a row, called after the object with handle is changed
+        Update a row, called after the object with handle is changed.
+        If a search or filter is active, the object is checked against it
+        again, so that the row is shown or hidden as needed, unless it will
+        be applied to all rows again.
         """
+        check = self.search and not self.refilter_pending
         if self.node_map.get_path_from_handle(handle) is None:
+            if (check and handle not in self.skip and
+                    self.search.match(handle, self.db)):
+                #the object is hidden, but matches now. Remove it from the
+                #list of all keys, the add inserts it in both lists again
+                self.delete_row_by_handle(handle)
+                self.add_row_by_handle(handle, True)
             return # row is not currently displayed
         self.clear_cache(handle)
         oldsortkey = self.node_map.get_sortkey(handle)
         newsortkey = self.sort_func(self.map(handle))
-        if oldsortkey is None or oldsortkey != newsortkey:
+        match = bool(self.search.match(handle, self.db)) if check else None
+        if (oldsortkey is None or oldsortkey != newsortkey or
+                match is False):
             #or the changed object is not present in the view due to filtering
-            #or the order of the object must change.
+            #or the order of the object must change
+            #or the object no longer matches the filter.
             self.delete_row_by_handle(handle)
-            self.add_row_by_handle(handle)
+            self.add_row_by_handle(handle, match)
         else:
             #the row is visible in the view, is changed, but the order is fixed
             path = self.node_map.get_path_from_handle(handle)
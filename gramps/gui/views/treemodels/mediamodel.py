@@ -52,8 +52,11 @@ from .flatbasemodel import FlatBaseModel
 #-------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
 
+    text_class = 'Media'
+    text_columns = ('column_description', 'column_id', 'column_path')
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None, progressive=False):
         self.gen_cursor = db.get_media_cursor
         self.map = db.get_raw_media_data
 
@@ -81,7 +84,8 @@ class MediaModel(FlatBaseModel):
             self.column_tag_color,
             ]
         FlatBaseModel.__init__(self, db, uistate, scol, order, search=search,
-                               skip=skip, sort_map=sort_map)
+                               skip=skip, sort_map=sort_map,
+                               progressive=progressive)
 
     def destroy(self):
         """
@@ -568,11 +568,15 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     """
     Listed people model.
     """
+    text_class = 'Person'
+    text_columns = ('column_id',)
+
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
-                 search=None, skip=set(), sort_map=None):
+                 search=None, skip=set(), sort_map=None, progressive=False):
         PeopleBaseModel.__init__(self, db)
         FlatBaseModel.__init__(self, db, uistate, search=search, skip=skip,
-                               scol=scol, order=order, sort_map=sort_map)
+                               scol=scol, order=order, sort_map=sort_map,
+                               progressive=progressive)
 
     def destroy(self):
         """
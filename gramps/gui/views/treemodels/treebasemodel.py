@@ -809,6 +809,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         self.clear_cache(handle)
         if self._get_node(handle) is None:
+            if self.search and not self.refilter_pending:
+                # the object is hidden, the add shows it if it matches now
+                self.add_row_by_handle(handle)
             return  # row not currently displayed
 
         self.dont_change_active = True
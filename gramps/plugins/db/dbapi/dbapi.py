@@ -45,6 +45,7 @@ from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.lib import (Tag, Media, Person, Family, Source,
                             Citation, Event, Place, Repository, Note)
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.utils.place import conv_lat_lon_float
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 LOG = logging.getLogger(".dbapi")
@@ -54,6 +55,13 @@ class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
+    # Above this fraction of the objects of the database written or removed
+    # by a batch transaction, the whole reference map is rebuilt at commit
+    # rather than the references of the objects touched.
+    REINDEX_FRACTION = 0.25
+    # The number of handles given to a single query
+    QUERY_SIZE = 500
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -66,6 +74,20 @@ class DBAPI(DbGeneric):
         """
         return self.dbapi.table_exists("person")
 
+    def _column_exists(self, table, column):
+        """
+        Test whether the table has a column, by selecting it, which every
+        database backend can do.
+        """
+        try:
+            self.dbapi.execute("SELECT %s FROM %s LIMIT 1" % (column, table))
+            self.dbapi.fetchall()
+        except Exception:
+            # the failed query may have aborted the transaction
+            self.dbapi.rollback()
+            return False
+        return True
+
     def _create_schema(self):
         """
         Create and update schema.
@@ -109,6 +131,8 @@ class DBAPI(DbGeneric):
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
                            'enclosed_by VARCHAR(50), '
+                           'latitude REAL, '
+                           'longitude REAL, '
                            'blob_data BLOB'
                            ')')
         self.dbapi.execute('CREATE TABLE repository '
@@ -179,6 +203,8 @@ class DBAPI(DbGeneric):
                            'ON place(enclosed_by)')
         self.dbapi.execute('CREATE INDEX place_gramps_id '
                            'ON place(gramps_id)')
+        self.dbapi.execute('CREATE INDEX place_coordinates '
+                           'ON place(latitude, longitude)')
         self.dbapi.execute('CREATE INDEX tag_name '
                            'ON tag(name)')
         self.dbapi.execute('CREATE INDEX reference_ref_handle '
@@ -236,6 +262,9 @@ class DBAPI(DbGeneric):
             # A batch transaction does not store the commits
             # Aborting the session completely will become impossible.
             self.abort_possible = False
+            # The references are not kept up to date during a batch
+            # transaction: {handle: obj_key} of the objects touched
+            self._batch_touched = {}
         self.transaction = transaction
         self.dbapi.begin()
         return transaction
@@ -253,8 +282,13 @@ class DBAPI(DbGeneric):
                   TXNDEL: "-delete",
                   None: "-delete"}
         if txn.batch:
-            # FIXME: need a User GUI update callback here:
-            self.reindex_reference_map(lambda percent: percent)
+            touched = self._batch_touched
+            self._batch_touched = {}
+            if len(touched) > self.REINDEX_FRACTION * self._get_total():
+                # FIXME: need a User GUI update callback here:
+                self.reindex_reference_map(lambda percent: percent)
+            else:
+                self._update_reference_map(touched)
         self.dbapi.commit()
         if not txn.batch:
             # Now, emit signals:
@@ -287,6 +321,11 @@ class DBAPI(DbGeneric):
         Executed after a batch operation abort.
         """
         self.dbapi.rollback()
+        self._batch_touched = {}
+        # the statistics and the place hierarchy followed the changes that
+        # were rolled back
+        self.statistics.clear()
+        self.place_hierarchy.clear()
         self.transaction = None
         txn.clear()
         txn.first = None
@@ -486,6 +525,44 @@ class DBAPI(DbGeneric):
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
 
+    def get_place_coordinates(self, handles=None):
+        """
+        Return a dictionary of the (latitude, longitude) of places, in
+        decimal degrees, by their handles. Only the places with valid
+        coordinates are in it.
+
+        :param handles: the handles of the places, or None for all places.
+        :type handles: list
+        """
+        sql = ("SELECT handle, latitude, longitude FROM place "
+               "WHERE latitude IS NOT NULL")
+        if handles is None:
+            self.dbapi.execute(sql)
+            rows = self.dbapi.fetchall()
+        else:
+            handles = list(handles)
+            rows = []
+            for start in range(0, len(handles), self.QUERY_SIZE):
+                chunk = handles[start:start + self.QUERY_SIZE]
+                self.dbapi.execute(sql + " AND handle IN (%s)"
+                                   % ", ".join(["?"] * len(chunk)), chunk)
+                rows += self.dbapi.fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def get_place_handles_in_area(self, lat1, lon1, lat2, lon2):
+        """
+        Return the list of handles of the places with coordinates in an
+        area, bounds included. If lon1 is greater than lon2, the area
+        crosses the antimeridian.
+        """
+        sql = ("SELECT handle FROM place WHERE latitude BETWEEN ? AND ? AND "
+               + ("longitude BETWEEN ? AND ?" if lon1 <= lon2 else
+                  "(longitude >= ? OR longitude <= ?)"))
+        self.dbapi.execute(sql, [min(lat1, lat2), max(lat1, lat2),
+                                 lon1, lon2])
+        rows = self.dbapi.fetchall()
+        return [row[0] for row in rows]
+
     def get_repository_handles(self):
         """
         Return a list of database handles, one handle for each Repository in
@@ -620,7 +697,12 @@ class DBAPI(DbGeneric):
                                [obj.handle,
                                 pickle.dumps(obj.serialize())])
         self._update_secondary_values(obj)
-        if not trans.batch:
+        self._update_text_index(obj)
+        self.statistics.commit(obj_key, obj)
+        self.place_hierarchy.commit(obj_key, obj)
+        if trans.batch:
+            self._batch_touched[obj.handle] = obj_key
+        else:
             self._update_backlinks(obj, trans)
             if old_data:
                 trans.add(obj_key, TXNUPD, obj.handle,
@@ -709,7 +791,12 @@ class DBAPI(DbGeneric):
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
-            if not transaction.batch:
+            self._remove_text_index(handle)
+            self.statistics.remove(obj_key, handle)
+            self.place_hierarchy.remove(obj_key, handle)
+            if transaction.batch:
+                self._batch_touched[handle] = obj_key
+            else:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
     def _remove_backlinks(self, obj_class, obj_handle, transaction):
@@ -756,6 +843,28 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def get_backlink_map(self):
+        """
+        Return a dictionary of the sets of (class_name, handle) tuples of the
+        objects that hold a reference to an object, by the handles of the
+        referenced objects, for all the objects of the database.
+
+        As in DbReadBase, the references to handles of missing objects are
+        left out.
+        """
+        backlinks = {}
+        for obj_key, table in KEY_TO_NAME_MAP.items():
+            self.dbapi.execute("SELECT reference.ref_handle, "
+                               "reference.obj_class, reference.obj_handle "
+                               "FROM reference JOIN %s "
+                               "ON reference.ref_handle = %s.handle "
+                               "WHERE reference.ref_class = ?"
+                               % (table, table), [KEY_TO_CLASS_MAP[obj_key]])
+            for ref_handle, obj_class, obj_handle in self.dbapi.fetchall():
+                backlinks.setdefault(ref_handle, set()).add((obj_class,
+                                                             obj_handle))
+        return backlinks
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -810,18 +919,55 @@ class DBAPI(DbGeneric):
                 to_do.append(row[0])
                 yield (row[0], pickle.loads(row[1]))
 
-    def reindex_reference_map(self, callback):
+    def _get_total(self):
         """
-        Reindex all primary records in the database.
+        Return the number of primary objects in the database.
         """
-        self._txn_begin()
-        self.dbapi.execute("DELETE FROM reference")
         total = 0
         for tbl in ('people', 'families', 'events', 'places', 'sources',
                     'citations', 'media', 'repositories', 'notes', 'tags'):
             total += self.method("get_number_of_%s", tbl)()
+        return total
+
+    def _insert_references(self, obj):
+        """
+        Add the references of an object to the reference map.
+        """
+        references = set(obj.get_referenced_handles_recursively())
+        for (ref_class_name, ref_handle) in references:
+            self.dbapi.execute(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                [obj.handle,
+                 obj.__class__.__name__,
+                 ref_handle,
+                 ref_class_name])
+
+    def _update_reference_map(self, touched):
+        """
+        Replace the references of the objects written or removed by a batch
+        transaction.
+
+        :param touched: The objects, as a dictionary {handle: obj_key}.
+        """
+        for handle, obj_key in touched.items():
+            self.dbapi.execute("DELETE FROM reference WHERE obj_handle = ?",
+                               [handle])
+            data = self._get_raw_data(obj_key, handle)
+            if data:
+                class_func = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                                  "class_func")
+                self._insert_references(class_func.create(data))
+
+    def reindex_reference_map(self, callback):
+        """
+        Reindex all primary records in the database.
+        """
+        self._txn_begin()
+        self.dbapi.execute("DELETE FROM reference")
         UpdateCallback.__init__(self, callback)
-        self.set_total(total)
+        self.set_total(self._get_total())
         primary_table = (
             (self.get_person_cursor, Person),
             (self.get_family_cursor, Family),
@@ -840,18 +986,7 @@ class DBAPI(DbGeneric):
             logging.info("Rebuilding %s reference map", class_func.__name__)
             with cursor_func() as cursor:
                 for found_handle, val in cursor:
-                    obj = class_func.create(val)
-                    references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for (ref_class_name, ref_handle) in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [obj.handle,
-                             obj.__class__.__name__,
-                             ref_handle,
-                             ref_class_name])
+                    self._insert_references(class_func.create(val))
                     self.update()
         self._txn_commit()
 
@@ -883,6 +1018,29 @@ class DBAPI(DbGeneric):
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
 
+    def _update_text_index(self, obj):
+        """
+        Given a primary object update its entry in the text index, for the
+        backends that have one.
+        Does not commit.
+        """
+        pass
+
+    def _remove_text_index(self, handle):
+        """
+        Remove the entry of a primary object from the text index, for the
+        backends that have one.
+        Does not commit.
+        """
+        pass
+
+    def rebuild_text_index(self, callback=None):
+        """
+        Rebuild the text index. The DB-API backends have no text index,
+        unless they override this.
+        """
+        return False
+
     def _has_handle(self, obj_key, handle):
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT 1 FROM %s WHERE handle = ?" % table
@@ -964,6 +1122,9 @@ class DBAPI(DbGeneric):
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            self._remove_text_index(handle)
+            self.statistics.remove(obj_key, handle)
+            self.place_hierarchy.remove(obj_key, handle)
         else:
             if self._has_handle(obj_key, handle):
                 sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
@@ -973,6 +1134,9 @@ class DBAPI(DbGeneric):
                 self.dbapi.execute(sql, [handle, pickle.dumps(data)])
             obj = self._get_table_func(cls)["class_func"].create(data)
             self._update_secondary_values(obj)
+            self._update_text_index(obj)
+            self.statistics.commit(obj_key, obj)
+            self.place_hierarchy.commit(obj_key, obj)
 
     def get_surname_list(self):
         """
@@ -1042,6 +1206,12 @@ class DBAPI(DbGeneric):
             handle = self._get_place_data(obj)
             sets.append("enclosed_by = ?")
             values.append(handle)
+            latitude, longitude = conv_lat_lon_float(obj.get_latitude(),
+                                                     obj.get_longitude())
+            sets.append("latitude = ?")
+            values.append(latitude)
+            sets.append("longitude = ?")
+            values.append(longitude)
 
         if len(values) > 0:
             table_name = table.lower()
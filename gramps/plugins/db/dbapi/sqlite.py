@@ -40,11 +40,18 @@ import logging
 #-------------------------------------------------------------------------
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
 sqlite3.paramstyle = 'qmark'
 
+LOG = logging.getLogger(".sqlite")
+
+# The primary objects in the text index
+TEXT_INDEX_CLASSES = ('Person', 'Family', 'Event', 'Place', 'Source',
+                      'Citation', 'Media', 'Repository', 'Note')
+
 #-------------------------------------------------------------------------
 #
 # SQLite class
@@ -70,6 +77,149 @@ class SQLite(DBAPI):
         else:
             path_to_db = os.path.join(directory, 'sqlite.db')
         self.dbapi = Connection(path_to_db)
+        self._text_index = None
+
+    def _create_schema(self):
+        """
+        Create and update schema, with the text index.
+        """
+        super()._create_schema()
+        self.dbapi.begin()
+        self._create_text_index()
+        self.dbapi.commit()
+
+    def _has_text_index(self):
+        """
+        Return True if the database has a text index.
+        Older databases only get one when it is rebuilt.
+        """
+        if self._text_index is None:
+            self._text_index = self.dbapi.table_exists("text_index")
+        return self._text_index
+
+    def _create_text_index(self):
+        """
+        Create the text index: the text of each object is stored in the
+        text_data table, which the text_index FTS5 table indexes. The trigram
+        tokenizer allows to search any substring of at least three
+        characters.
+        Does not commit.
+        """
+        try:
+            self.dbapi.execute("CREATE VIRTUAL TABLE text_index "
+                               "USING fts5(text, content='text_data', "
+                               "content_rowid='id', tokenize='trigram')")
+        except sqlite3.OperationalError as err:
+            # SQLite is older than 3.34 or built without FTS5
+            LOG.warning("No text index: %s", err)
+            self._text_index = False
+            return
+        self.dbapi.execute('CREATE TABLE text_data '
+                           '('
+                           'id INTEGER PRIMARY KEY, '
+                           'handle VARCHAR(50), '
+                           'obj_class TEXT, '
+                           'text TEXT'
+                           ')')
+        self.dbapi.execute('CREATE INDEX text_data_handle '
+                           'ON text_data(handle)')
+        self.dbapi.execute("CREATE TRIGGER text_data_insert "
+                           "AFTER INSERT ON text_data BEGIN "
+                           "INSERT INTO text_index (rowid, text) "
+                           "VALUES (new.id, new.text); END")
+        self.dbapi.execute("CREATE TRIGGER text_data_delete "
+                           "AFTER DELETE ON text_data BEGIN "
+                           "INSERT INTO text_index (text_index, rowid, text) "
+                           "VALUES ('delete', old.id, old.text); END")
+        self._text_index = True
+
+    @staticmethod
+    def _get_index_text(obj):
+        """
+        Return the text of the object to store in the text index. It is upper
+        case, with runs of white space replaced by a single space, so that
+        searches ignore case and line breaks.
+        """
+        text_list = [obj.gramps_id] + obj.get_text_data_list_recursively()
+        return "\n".join(" ".join(text.split())
+                         for text in text_list).upper()
+
+    def _update_text_index(self, obj):
+        """
+        Given a primary object update its entry in the text index.
+        Does not commit.
+        """
+        class_name = obj.__class__.__name__
+        if class_name in TEXT_INDEX_CLASSES and self._has_text_index():
+            self._remove_text_index(obj.handle)
+            self.dbapi.execute("INSERT INTO text_data "
+                               "(handle, obj_class, text) VALUES (?, ?, ?)",
+                               [obj.handle, class_name,
+                                self._get_index_text(obj)])
+
+    def _remove_text_index(self, handle):
+        """
+        Remove the entry of a primary object from the text index.
+        Does not commit.
+        """
+        if self._has_text_index():
+            self.dbapi.execute("DELETE FROM text_data WHERE handle = ?",
+                               [handle])
+
+    def get_text_index_handles(self, class_name, text):
+        """
+        Return the set of handles of the objects of class class_name whose
+        text may contain text, ignoring case, or None if the text index can
+        not be used.
+        """
+        text = " ".join(text.split()).upper()
+        # the trigram tokenizer needs at least three characters
+        if (len(text) < 3 or class_name not in TEXT_INDEX_CLASSES or
+                not self._has_text_index()):
+            return None
+        self.dbapi.execute("SELECT text_data.handle "
+                           "FROM text_index JOIN text_data "
+                           "ON text_data.id = text_index.rowid "
+                           "WHERE text_index MATCH ? "
+                           "AND text_data.obj_class = ?",
+                           ['"%s"' % text.replace('"', '""'), class_name])
+        return set(row[0] for row in self.dbapi.fetchall())
+
+    def rebuild_text_index(self, callback=None):
+        """
+        Rebuild the text index, creating it for older databases.
+        Returns False if SQLite does not support it.
+        """
+        if self.readonly:
+            return False
+        self._txn_begin()
+        self.dbapi.execute("DROP TRIGGER IF EXISTS text_data_insert")
+        self.dbapi.execute("DROP TRIGGER IF EXISTS text_data_delete")
+        self.dbapi.execute("DROP TABLE IF EXISTS text_index")
+        self.dbapi.execute("DROP TABLE IF EXISTS text_data")
+        self._create_text_index()
+        if not self._text_index:
+            self._txn_commit()
+            return False
+        total = 0
+        for tbl in ('people', 'families', 'events', 'places', 'sources',
+                    'citations', 'media', 'repositories', 'notes'):
+            total += self.method("get_number_of_%s", tbl)()
+        UpdateCallback.__init__(self, callback)
+        self.set_total(total)
+        for class_name in TEXT_INDEX_CLASSES:
+            class_func = self._get_table_func(class_name)["class_func"]
+            with self.method("get_%s_cursor", class_name)() as cursor:
+                for handle, data in cursor:
+                    obj = class_func.create(data)
+                    self.dbapi.execute("INSERT INTO text_data "
+                                       "(handle, obj_class, text) "
+                                       "VALUES (?, ?, ?)",
+                                       [handle, class_name,
+                                        self._get_index_text(obj)])
+                    self.update()
+        self._txn_commit()
+        return True
 
 
 #-------------------------------------------------------------------------
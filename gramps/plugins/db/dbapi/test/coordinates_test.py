@@ -0,0 +1,124 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the coordinates of the places """
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import os
+import unittest
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.proxy import LivingProxyDb, PrivateProxyDb
+from gramps.gen.user import User
+from gramps.gen.utils.place import conv_lat_lon
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+#-------------------------------------------------------------------------
+#
+# PlaceCoordinatesTest class
+#
+#-------------------------------------------------------------------------
+class PlaceCoordinatesTest(unittest.TestCase):
+    """
+    The coordinates stored with the places are those parsed from the places,
+    which a proxy of the database reads.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        self.proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_INCLUDE_ALL)
+
+    def assert_coordinates(self):
+        coordinates = self.db.get_place_coordinates()
+        self.assertEqual(coordinates, self.proxy.get_place_coordinates())
+        for handle, (lat, lon) in coordinates.items():
+            place = self.db.get_place_from_handle(handle)
+            self.assertEqual(("%.8f" % lat, "%.8f" % lon),
+                             conv_lat_lon(place.get_latitude(),
+                                          place.get_longitude(), "D.D8"))
+        for area in [(30.0, -100.0, 40.0, -80.0), (40.0, -80.0, 30.0, -100.0),
+                     (-90.0, 170.0, 90.0, -170.0)]:
+            self.assertEqual(sorted(self.db.get_place_handles_in_area(*area)),
+                             sorted(self.proxy.get_place_handles_in_area(
+                                 *area)))
+        return coordinates
+
+    def test_coordinates(self):
+        coordinates = self.assert_coordinates()
+        self.assertGreater(len(coordinates), 100)
+        handles = self.db.get_place_handles()
+        self.assertEqual(self.db.get_place_coordinates(handles), coordinates)
+        self.assertEqual(self.db.get_place_coordinates(handles[:3]),
+                         {handle: coordinates[handle]
+                          for handle in handles[:3] if handle in coordinates})
+        self.assertEqual(self.db.get_place_coordinates([]), {})
+
+    def test_private(self):
+        handle = next(iter(self.db.get_place_coordinates()))
+        place = self.db.get_place_from_handle(handle)
+        place.set_privacy(True)
+        with DbTxn("Private place", self.db) as trans:
+            self.db.commit_place(place, trans)
+        proxy = PrivateProxyDb(self.db)
+        self.assertIn(place.handle, self.db.get_place_coordinates())
+        self.assertNotIn(place.handle, proxy.get_place_coordinates())
+        self.db.undo()
+
+    def test_changes(self):
+        place = self.db.get_place_from_gramps_id('P0010')
+        place.set_latitude("N50º52'21.92\"")
+        place.set_longitude("E179º59'59.99\"")
+        with DbTxn("Move place", self.db) as trans:
+            self.db.commit_place(place, trans)
+        self.assertEqual(self.db.get_place_coordinates([place.handle]),
+                         {place.handle: (50.87275556, 179.99999722)})
+        self.assertIn(place.handle,
+                      self.db.get_place_handles_in_area(50, 179, 51, -179))
+        self.assert_coordinates()
+
+        place.set_longitude("unknown")
+        with DbTxn("Move place", self.db) as trans:
+            self.db.commit_place(place, trans)
+        self.assertEqual(self.db.get_place_coordinates([place.handle]), {})
+        self.assert_coordinates()
+
+        self.db.undo()
+        self.db.undo()
+        self.assertNotIn(place.handle,
+                         self.db.get_place_handles_in_area(50, 179, 51, -179))
+        self.assert_coordinates()
+
+
+if __name__ == "__main__":
+    unittest.main()
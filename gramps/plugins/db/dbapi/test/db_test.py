@@ -23,6 +23,7 @@
 # Standard python modules
 #
 #-------------------------------------------------------------------------
+import os
 import unittest
 
 #-------------------------------------------------------------------------
@@ -32,8 +33,11 @@ import unittest
 #-------------------------------------------------------------------------
 from gramps.gen.db import DbTxn
 from gramps.gen.db.utils import make_database
+from gramps.gen.db.stats import DbStatistics
+from gramps.gen.utils.file import get_empty_tempdir
 from gramps.gen.lib import (Person, Family, Event, Place, Repository, Source,
-                            Citation, Media, Note, Tag, Researcher, Surname)
+                            Citation, Media, Note, Tag, Researcher, Surname,
+                            EventRef, EventType, Date)
 
 #-------------------------------------------------------------------------
 #
@@ -865,6 +869,110 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved['John'], (3, 1, 1))
         self.assertEqual(saved['Mary'], (1, 4, 0))
 
+    ################################################################
+    #
+    # Test statistics
+    #
+    ################################################################
+
+    def __check_statistics(self, stats):
+        fresh = DbStatistics(self.db)
+        fresh.rebuild()
+        for method in ('get_number_of_people', 'get_incomplete_names',
+                       'get_missing_births', 'get_disconnected',
+                       'get_people_with_media', 'get_media_references',
+                       'get_surname_counts', 'get_group_name_counts',
+                       'get_number_of_media', 'get_media_bytes',
+                       'get_missing_media'):
+            self.assertEqual(getattr(stats, method)(),
+                             getattr(fresh, method)(), method)
+        for gender in (Person.MALE, Person.FEMALE, Person.UNKNOWN):
+            self.assertEqual(stats.get_gender_count(gender),
+                             fresh.get_gender_count(gender))
+
+    def test_statistics(self):
+        stats = self.db.get_statistics()
+        self.assertEqual(stats.get_number_of_people(), 10)
+        self.assertEqual(stats.get_gender_count(Person.MALE), 4)
+        self.assertEqual(stats.get_gender_count(Person.FEMALE), 5)
+        self.assertEqual(stats.get_gender_count(Person.UNKNOWN), 1)
+        self.assertEqual(stats.get_missing_births(), 10)
+        self.assertEqual(stats.get_disconnected(), 10)
+        self.assertEqual(stats.get_group_name_counts()['Allen'], 2)
+        self.assertEqual(len(stats.get_surname_counts()), 5)
+
+        handle = self.db.get_person_handles()[0]
+        person = self.db.get_person_from_handle(handle)
+        with DbTxn('Edit person', self.db) as trans:
+            birth = Event()
+            birth.set_type(EventType.BIRTH)
+            self.db.add_event(birth, trans)
+            ref = EventRef()
+            ref.ref = birth.handle
+            person.add_event_ref(ref)
+            person.set_birth_ref(ref)
+            person.primary_name.first_name = ''
+            person.primary_name.get_surname_list()[0].surname = 'Smith'
+            self.db.commit_person(person, trans)
+        self.assertEqual(stats.get_missing_births(), 10)
+        self.assertEqual(stats.get_incomplete_names(), 1)
+        self.assertEqual(stats.get_group_name_counts()['Smith'], 1)
+        self.assertEqual(stats.get_group_name_person('Smith'), handle)
+        self.__check_statistics(stats)
+
+        with DbTxn('Edit birth', self.db) as trans:
+            birth.set_date_object(Date(1900, 1, 1))
+            self.db.commit_event(birth, trans)
+        self.assertEqual(stats.get_missing_births(), 9)
+        self.__check_statistics(stats)
+
+        self.db.undo()
+        self.assertEqual(stats.get_missing_births(), 10)
+        self.db.undo()
+        self.assertEqual(stats.get_incomplete_names(), 0)
+        self.assertNotIn('Smith', stats.get_group_name_counts())
+        self.__check_statistics(stats)
+
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.remove_person(handle, trans)
+        self.__check_statistics(stats)
+
+        saved = DbStatistics(self.db)
+        saved.load(stats.save())
+        self.assertTrue(saved.built)
+        self.__check_statistics(saved)
+
+    def test_media_statistics(self):
+        stats = self.db.get_statistics()
+        missing = len(stats.get_missing_media())
+        bytes_cnt = stats.get_media_bytes()
+        path = os.path.join(get_empty_tempdir("dbapi_stats_test"), "file")
+        media = Media()
+        media.set_path(path)
+        with DbTxn('Add media', self.db) as trans:
+            self.db.add_media(media, trans)
+        self.assertEqual(len(stats.get_missing_media()), missing + 1)
+        self.__check_statistics(stats)
+
+        # the file is measured again when it changes, without a commit
+        with open(path, 'w') as file:
+            file.write('12345')
+        self.assertEqual(stats.get_media_bytes(), bytes_cnt + 5)
+        self.assertEqual(len(stats.get_missing_media()), missing)
+        with open(path, 'w') as file:
+            file.write('12')
+        mtime = os.stat(path).st_mtime
+        os.utime(path, (mtime + 10, mtime + 10))
+        self.assertEqual(stats.get_media_bytes(), bytes_cnt + 2)
+        self.__check_statistics(stats)
+
+        os.remove(path)
+        self.assertEqual(stats.get_media_bytes(), bytes_cnt)
+        self.assertEqual(len(stats.get_missing_media()), missing + 1)
+        with DbTxn('Remove media', self.db) as trans:
+            self.db.remove_media(media.handle, trans)
+        self.__check_statistics(stats)
+
 
 if __name__ == "__main__":
     unittest.main()
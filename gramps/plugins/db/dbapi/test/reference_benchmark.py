@@ -0,0 +1,78 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the commit of batch transactions on the example database.
+
+The reference map is updated for the objects touched by a batch
+transaction, unless they are more than REINDEX_FRACTION of all objects, in
+which case it is rebuilt. The cost of the update grows with the number of
+events touched, and should stay below that of the rebuild.
+
+Run with::
+
+    python3 -m gramps.plugins.db.dbapi.test.reference_benchmark [repeat]
+"""
+import os
+import sys
+from time import perf_counter
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+def time_commit(db, count):
+    """
+    Change the description of count events in a batch transaction, and
+    return the time of its commit.
+    """
+    handles = db.get_event_handles()[:count]
+    trans = DbTxn("Touch events", db, batch=True)
+    trans.__enter__()
+    for handle in handles:
+        event = db.get_event_from_handle(handle)
+        event.set_description(event.get_description() + ".")
+        db.commit_event(event, trans)
+    start = perf_counter()
+    trans.__exit__(None, None, None)
+    return perf_counter() - start
+
+def main(repeat=3):
+    """
+    Run the benchmark and print the results.
+    """
+    db = import_as_dict(EXAMPLE, User())
+    total = db._get_total()
+    print("%d objects, %d events" % (total, db.get_number_of_events()))
+    print("%-20s %10s %16s" % ("Events touched", "commit (ms)",
+                               "per object (ms)"))
+    for count in (1, 10, 100, 1000):
+        best = min(time_commit(db, count) for dummy in range(repeat))
+        print("%-20d %10.2f %16.4f" % (count, best * 1000,
+                                       best * 1000 / count))
+    db.REINDEX_FRACTION = 0
+    best = min(time_commit(db, 1) for dummy in range(repeat))
+    print("%-20s %10.2f %16.4f" % ("rebuild", best * 1000,
+                                   best * 1000 / total))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,153 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the reference map after batch transactions """
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import os
+import unittest
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbReadBase, DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Event, EventRef, Note
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+#-------------------------------------------------------------------------
+#
+# BatchReferenceTest class
+#
+#-------------------------------------------------------------------------
+class BatchReferenceTest(unittest.TestCase):
+    """
+    The reference map after a batch transaction is the rebuilt one, whether
+    it is updated for the objects touched or rebuilt.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def tearDown(self):
+        if 'REINDEX_FRACTION' in self.db.__dict__:
+            del self.db.REINDEX_FRACTION
+
+    def get_references(self):
+        self.db.dbapi.execute("SELECT obj_handle, obj_class, "
+                              "ref_handle, ref_class FROM reference")
+        return sorted(self.db.dbapi.fetchall())
+
+    def assert_rebuilt(self):
+        references = self.get_references()
+        self.db.reindex_reference_map(lambda percent: percent)
+        self.assertEqual(references, self.get_references())
+
+    def touch(self, count):
+        """
+        Change the description of count events in a batch transaction.
+        """
+        handles = self.db.get_event_handles()[:count]
+        with DbTxn("Touch events", self.db, batch=True) as trans:
+            for handle in handles:
+                event = self.db.get_event_from_handle(handle)
+                event.set_description(event.get_description() + ".")
+                self.db.commit_event(event, trans)
+
+    def test_changes(self):
+        with DbTxn("Batch changes", self.db, batch=True) as trans:
+            person = self.db.get_person_from_gramps_id('I0044')
+            event = Event()
+            note = Note("Batch note")
+            self.db.add_note(note, trans)
+            event.add_note(note.handle)
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.ref = event.handle
+            person.add_event_ref(event_ref)
+            person.set_citation_list([])
+            self.db.commit_person(person, trans)
+            family = self.db.get_family_from_gramps_id('F0008')
+            self.db.remove_family_relationships(family.handle, trans)
+            self.db.remove_note(note.handle, trans)
+        self.assertIn(('Person', person.handle),
+                      list(self.db.find_backlink_handles(event.handle)))
+        self.assertEqual(
+            list(self.db.find_backlink_handles(family.handle)), [])
+        self.assert_rebuilt()
+
+    def test_rebuild(self):
+        self.db.REINDEX_FRACTION = 0
+        self.touch(1)
+        self.assert_rebuilt()
+
+    def test_update(self):
+        # fewer events than REINDEX_FRACTION of the objects
+        self.touch(1000)
+        self.assert_rebuilt()
+
+
+#-------------------------------------------------------------------------
+#
+# BacklinkMapTest class
+#
+#-------------------------------------------------------------------------
+class BacklinkMapTest(unittest.TestCase):
+    """
+    The backlink map read from the reference table is the one found with
+    find_backlink_handles for each object.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_backlink_map(self):
+        backlinks = self.db.get_backlink_map()
+        self.assertEqual(backlinks, DbReadBase.get_backlink_map(self.db))
+        handle = self.db.get_event_handles()[0]
+        self.assertEqual(backlinks[handle],
+                         set(self.db.find_backlink_handles(handle)))
+
+    def test_missing_object(self):
+        with DbTxn("Dangling reference", self.db) as trans:
+            person = self.db.get_person_from_gramps_id('I0044')
+            event_ref = EventRef()
+            event_ref.ref = 'MISSINGEVENTHANDLE'
+            person.add_event_ref(event_ref)
+            self.db.commit_person(person, trans)
+        self.assertIn(('Person', person.handle),
+                      list(self.db.find_backlink_handles(event_ref.ref)))
+        backlinks = self.db.get_backlink_map()
+        self.assertNotIn(event_ref.ref, backlinks)
+        self.assertEqual(backlinks, DbReadBase.get_backlink_map(self.db))
+
+
+if __name__ == "__main__":
+    unittest.main()
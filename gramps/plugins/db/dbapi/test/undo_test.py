@@ -0,0 +1,140 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the undo journal """
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import shutil
+import tempfile
+import unittest
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.generic import _make_delta, _apply_delta
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note
+
+#-------------------------------------------------------------------------
+#
+# UndoJournalTest class
+#
+#-------------------------------------------------------------------------
+class UndoJournalTest(unittest.TestCase):
+    """
+    The undo history is kept in the journal, bounded, and restored when the
+    database is opened again.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = self.load()
+
+    def tearDown(self):
+        if self.db.is_open():
+            self.db.close()
+        shutil.rmtree(self.directory)
+
+    def load(self):
+        db = make_database("sqlite")
+        db.load(self.directory)
+        return db
+
+    def add_note(self, text):
+        note = Note(text)
+        with DbTxn("Add note", self.db) as trans:
+            self.db.add_note(note, trans)
+        return note.handle
+
+    def edit_note(self, handle, text):
+        note = self.db.get_note_from_handle(handle)
+        note.set(text)
+        with DbTxn("Edit note", self.db) as trans:
+            self.db.commit_note(note, trans)
+
+    def get_text(self, handle):
+        return self.db.get_note_from_handle(handle).get()
+
+    def test_delta(self):
+        new_data = ('handle', 'N0001', ('text', []), [], 1, 2)
+        for old_data in [new_data,
+                         ('handle', 'N0001', ('other', []), [], 1, 3),
+                         ('handle', 'N0001', ('text', []), [], 1, 2, 3)]:
+            self.assertEqual(_apply_delta(new_data,
+                                          _make_delta(old_data, new_data)),
+                             old_data)
+        self.assertEqual(
+            _make_delta(('handle', 'N0001', ('other', []), [], 1, 3),
+                        new_data),
+            [(2, ('other', [])), (5, 3)])
+
+    def test_undo_redo(self):
+        handle = self.add_note("first")
+        self.edit_note(handle, "second")
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.get_text(handle), "first")
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.get_text(handle), "second")
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.has_note_handle(handle))
+
+    def test_limit(self):
+        self.db.undodb.limit = 3
+        handle = self.add_note("0")
+        for count in range(1, 6):
+            self.edit_note(handle, str(count))
+        self.assertEqual(self.db.undodb.undo_count, 3)
+        self.assertEqual(len(self.db.undodb), 3)
+        while self.db.undo():
+            pass
+        self.assertEqual(self.get_text(handle), "2")
+
+    def test_reopen(self):
+        handle = self.add_note("first")
+        self.edit_note(handle, "second")
+        self.edit_note(handle, "third")
+        self.db.undo()
+        self.db.close()
+        self.db = self.load()
+        self.assertEqual(self.db.undodb.undo_count, 2)
+        self.assertEqual(self.db.undodb.redo_count, 1)
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.get_text(handle), "third")
+        self.db.undo()
+        self.db.undo()
+        self.assertEqual(self.get_text(handle), "first")
+
+    def test_not_closed(self):
+        handle = self.add_note("first")
+        self.db.close(update=False)
+        self.db = self.load()
+        self.assertEqual(self.db.undodb.undo_count, 0)
+        self.assertEqual(len(self.db.undodb), 0)
+        self.assertEqual(self.get_text(handle), "first")
+
+
+if __name__ == "__main__":
+    unittest.main()
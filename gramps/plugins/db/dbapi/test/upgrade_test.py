@@ -0,0 +1,91 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the upgrade of the schema """
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import unittest
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.exceptions import DbUpgradeRequiredError
+from gramps.gen.db.upgrade import gramps_upgrade_21
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Place
+from gramps.gen.utils.file import get_empty_tempdir
+
+PLACES = [("50.866667", "4.35"), ("30:16:09", "-97:44:34"),
+          ("", ""), ("not", "valid")]
+
+#-------------------------------------------------------------------------
+#
+# UpgradeTest class
+#
+#-------------------------------------------------------------------------
+class UpgradeTest(unittest.TestCase):
+    """
+    The upgrade of a database of version 20 to 21.
+    """
+
+    def setUp(self):
+        self.path = get_empty_tempdir("dbapi_upgrade_test")
+        db = make_database("sqlite")
+        db.load(self.path)
+        with DbTxn("Add places", db) as trans:
+            for lat, lon in PLACES:
+                place = Place()
+                place.set_latitude(lat)
+                place.set_longitude(lon)
+                db.add_place(place, trans)
+        self.coordinates = db.get_place_coordinates()
+        # the place table of version 20
+        db.dbapi.execute('DROP INDEX place_coordinates')
+        db.dbapi.execute('ALTER TABLE place DROP COLUMN latitude')
+        db.dbapi.execute('ALTER TABLE place DROP COLUMN longitude')
+        db.dbapi.commit()
+        db.set_schema_version(20)
+        self.assertFalse(db._column_exists('place', 'latitude'))
+        db.close()
+
+    def test_upgrade(self):
+        db = make_database("sqlite")
+        self.assertRaises(DbUpgradeRequiredError, db.load, self.path)
+        db = make_database("sqlite")
+        db.load(self.path, force_schema_upgrade=True)
+        self.assertEqual(db.get_schema_version(), 21)
+        self.assertTrue(db._column_exists('place', 'latitude'))
+        self.assertEqual(len(self.coordinates), 2)
+        self.assertEqual(db.get_place_coordinates(), self.coordinates)
+        # an upgrade stopped before the version was saved
+        db.set_schema_version(20)
+        gramps_upgrade_21(db)
+        self.assertEqual(db.get_schema_version(), 21)
+        self.assertEqual(db.get_place_coordinates(), self.coordinates)
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -69,6 +69,9 @@ LOG = logging.getLogger(".cairodoc")
 # resolution
 DPI = 72.0
 
+# number of document level elements to keep before writing the full pages
+_STREAM_ELEMENTS = 50
+
 #------------------------------------------------------------------------
 #
 # CairoDocgen class
@@ -76,6 +79,13 @@ DPI = 72.0
 #------------------------------------------------------------------------
 class CairoDocgen(libcairodoc.CairoDoc):
     """Render the document into a file using a Cairo surface.
+
+    The pages are written to the file as soon as they are full, so that the
+    whole document is not kept in memory. Only the index marks of the pages
+    written are kept, for the table of contents and the alphabetical index.
+    Once the document has a table of contents or an index, the following
+    pages are kept until the document is closed, as the page numbers of the
+    marks on them are needed to write it.
     """
     def create_cairo_surface(self, fobj, width_in_points, height_in_points):
         # See
@@ -83,125 +93,247 @@ class CairoDocgen(libcairodoc.CairoDoc):
         # for the arg semantics.
         raise "Missing surface factory override!!!"
 
-    def run(self):
-        """Create the output file.
-        The derived class overrides EXT and create_cairo_surface
+    def open(self, filename):
+        libcairodoc.CairoDoc.open(self, filename)
+        self.__file = None
+        self.__surface = None
+        self.__context = None
+        self.__layout = None
+        self.__streaming = True
+        self.__written = 0
+        self.__toc = []
+        self.__index = {}
+
+    def __get_dimensions(self):
+        """
+        Return the page width and height, and the left and top margins.
         """
-        # get paper dimensions
-        paper_width = self.paper.get_size().get_width() * DPI / 2.54
-        paper_height = self.paper.get_size().get_height() * DPI / 2.54
         page_width = round(self.paper.get_usable_width() * DPI / 2.54)
         page_height = round(self.paper.get_usable_height() * DPI / 2.54)
         left_margin = self.paper.get_left_margin() * DPI / 2.54
         top_margin = self.paper.get_top_margin() * DPI / 2.54
+        return page_width, page_height, left_margin, top_margin
+
+    def __start_output(self):
+        """
+        Create the output file, the cairo context and the pango layout.
+        """
+        # get paper dimensions
+        paper_width = self.paper.get_size().get_width() * DPI / 2.54
+        paper_height = self.paper.get_size().get_height() * DPI / 2.54
 
         # create cairo context and pango layout
         filename = self._backend.filename
         # Cairo can't reliably handle unicode filenames on Linux or
         # Windows, so open the file for it.
-        with open(filename, 'wb') as fd:
-            try:
-                surface = self.create_cairo_surface(fd, paper_width,
-                                                    paper_height)
-                surface.set_fallback_resolution(300, 300)
-                cr = cairo.Context(surface)
-                fontmap = PangoCairo.font_map_new()
-                fontmap.set_resolution(DPI)
-                pango_context = fontmap.create_context()
-                options = cairo.FontOptions()
-                options.set_hint_metrics(cairo.HINT_METRICS_OFF)
-                if is_quartz():
-                    PangoCairo.context_set_resolution(pango_context, 72)
-                PangoCairo.context_set_font_options(pango_context, options)
-                layout = Pango.Layout(pango_context)
-                PangoCairo.update_context(cr, pango_context)
-                # paginate the document
-                self.paginate_document(layout, page_width, page_height,
-                                       DPI, DPI)
-                body_pages = self._pages
-
-                # build the table of contents and alphabetical index
-                toc_page = None
-                index_page = None
-                toc = []
-                index = {}
-                for page_nr, page in enumerate(body_pages):
-                    if page.has_toc():
-                        toc_page = page_nr
-                    if page.has_index():
-                        index_page = page_nr
-                    for mark in page.get_marks():
-                        if mark.type == INDEX_TYPE_ALP:
-                            if mark.key in index:
-                                if page_nr + 1 not in index[mark.key]:
-                                    index[mark.key].append(page_nr + 1)
-                            else:
-                                index[mark.key] = [page_nr + 1]
-                        elif mark.type == INDEX_TYPE_TOC:
-                            toc.append([mark, page_nr + 1])
-
-                # paginate the table of contents
-                rebuild_required = False
+        self.__file = open(filename, 'wb')
+        surface = self.create_cairo_surface(self.__file, paper_width,
+                                            paper_height)
+        surface.set_fallback_resolution(300, 300)
+        cr = cairo.Context(surface)
+        fontmap = PangoCairo.font_map_new()
+        fontmap.set_resolution(DPI)
+        pango_context = fontmap.create_context()
+        options = cairo.FontOptions()
+        options.set_hint_metrics(cairo.HINT_METRICS_OFF)
+        if is_quartz():
+            PangoCairo.context_set_resolution(pango_context, 72)
+        PangoCairo.context_set_font_options(pango_context, options)
+        layout = Pango.Layout(pango_context)
+        PangoCairo.update_context(cr, pango_context)
+        self.__surface = surface
+        self.__context = cr
+        self.__layout = layout
+
+    def __close_output(self):
+        """
+        Close the surface and the output file.
+        """
+        if self.__surface is not None:
+            self.__surface.finish()
+            self.__surface = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __write_pages(self, pages, collect=True):
+        """
+        Draw pages on the surface, after the pages already written, and keep
+        their index marks if collect is True.
+        """
+        page_width, page_height, left_margin, top_margin = \
+            self.__get_dimensions()
+        cr = self.__context
+        in_progress = self._pages
+        self._pages = pages
+        for page_nr, page in enumerate(pages):
+            if collect:
+                self.__collect_marks(page, self.__written + page_nr + 1,
+                                     self.__toc, self.__index)
+            cr.save()
+            cr.translate(left_margin, top_margin)
+            self.draw_page(page_nr, cr, self.__layout,
+                           page_width, page_height,
+                           DPI, DPI)
+            cr.show_page()
+            cr.restore()
+        self.__written += len(pages)
+        self._pages = in_progress
+
+    @staticmethod
+    def __collect_marks(page, page_nr, toc, index):
+        """
+        Add the index marks of a page to the table of contents and index.
+        """
+        for mark in page.get_marks():
+            if mark.type == INDEX_TYPE_ALP:
+                if mark.key in index:
+                    if page_nr not in index[mark.key]:
+                        index[mark.key].append(page_nr)
+                else:
+                    index[mark.key] = [page_nr]
+            elif mark.type == INDEX_TYPE_TOC:
+                toc.append([mark, page_nr])
+
+    def __stream(self):
+        """
+        Write the pages that are full.
+        """
+        if (not self.__streaming or
+                len(self._doc.get_children()) < _STREAM_ELEMENTS):
+            return
+        filename = self._backend.filename
+        try:
+            if self.__file is None:
+                self.__start_output()
+            page_width, page_height = self.__get_dimensions()[:2]
+            full_pages = self.paginate_complete(self.__layout,
+                                                page_width, page_height,
+                                                DPI, DPI)
+            self.__write_pages(full_pages)
+        except IOError as msg:
+            self.__close_output()
+            errmsg = "%s\n%s" % (_("Could not create %s") % filename, msg)
+            raise ReportError(errmsg)
+        except Exception as err:
+            self.__close_output()
+            errmsg = "%s\n%s" % (_("Could not create %s") % filename, err)
+            raise ReportError(errmsg)
+
+    # document level elements
+    def start_paragraph(self, style_name, leader=None):
+        if self._active_element is self._doc:
+            self.__stream()
+        libcairodoc.CairoDoc.start_paragraph(self, style_name, leader)
+
+    def start_table(self, name, style_name):
+        if self._active_element is self._doc:
+            self.__stream()
+        libcairodoc.CairoDoc.start_table(self, name, style_name)
+
+    def start_page(self):
+        self.__stream()
+        libcairodoc.CairoDoc.start_page(self)
+
+    def insert_toc(self):
+        # the pages that follow are needed to write the table of contents
+        self.__streaming = False
+        libcairodoc.CairoDoc.insert_toc(self)
+
+    def insert_index(self):
+        # the pages that follow are needed to write the index
+        self.__streaming = False
+        libcairodoc.CairoDoc.insert_index(self)
+
+    def run(self):
+        """Create the output file.
+        The derived class overrides EXT and create_cairo_surface
+        """
+        page_width, page_height, left_margin, top_margin = \
+            self.__get_dimensions()
+        filename = self._backend.filename
+        try:
+            if self.__file is None:
+                self.__start_output()
+            layout = self.__layout
+
+            # paginate the rest of the document
+            body_pages = self.paginate_complete(layout, page_width,
+                                                page_height, DPI, DPI,
+                                                last=True)
+
+            # build the table of contents and alphabetical index
+            toc_page = None
+            index_page = None
+            toc = self.__toc
+            index = self.__index
+            for page_nr, page in enumerate(body_pages):
+                if page.has_toc():
+                    toc_page = page_nr
+                if page.has_index():
+                    index_page = page_nr
+                self.__collect_marks(page, self.__written + page_nr + 1,
+                                     toc, index)
+
+            # paginate the table of contents
+            rebuild_required = False
+            if toc_page is not None:
+                toc_pages = self.__generate_toc(layout, page_width,
+                                                page_height, toc)
+                offset = len(toc_pages) - 1
+                if offset > 0:
+                    self.__increment_pages(toc, index,
+                                           self.__written + toc_page, offset)
+                    rebuild_required = True
+                if index_page and toc_page < index_page:
+                    index_page += offset
+            else:
+                toc_pages = []
+
+            # paginate the index
+            if index_page is not None:
+                index_pages = self.__generate_index(layout, page_width,
+                                                    page_height, index)
+                offset = len(index_pages) - 1
+                if offset > 0:
+                    self.__increment_pages(toc, index,
+                                           self.__written + index_page,
+                                           offset)
+                    rebuild_required = True
+                if toc_page and toc_page > index_page:
+                    toc_page += offset
+            else:
+                index_pages = []
+
+            # rebuild the table of contents and index if required
+            if rebuild_required:
                 if toc_page is not None:
                     toc_pages = self.__generate_toc(layout, page_width,
                                                     page_height, toc)
-                    offset = len(toc_pages) - 1
-                    if offset > 0:
-                        self.__increment_pages(toc, index, toc_page, offset)
-                        rebuild_required = True
-                    if index_page and toc_page < index_page:
-                        index_page += offset
-                else:
-                    toc_pages = []
-
-                # paginate the index
                 if index_page is not None:
                     index_pages = self.__generate_index(layout, page_width,
                                                         page_height, index)
-                    offset = len(index_pages) - 1
-                    if offset > 0:
-                        self.__increment_pages(toc, index, index_page, offset)
-                        rebuild_required = True
-                    if toc_page and toc_page > index_page:
-                        toc_page += offset
-                else:
-                    index_pages = []
-
-                # rebuild the table of contents and index if required
-                if rebuild_required:
-                    if toc_page is not None:
-                        toc_pages = self.__generate_toc(layout, page_width,
-                                                        page_height, toc)
-                    if index_page is not None:
-                        index_pages = self.__generate_index(layout, page_width,
-                                                            page_height, index)
-
-                # render the pages
-                if toc_page is not None:
-                    body_pages = body_pages[:toc_page] + toc_pages + \
-                                 body_pages[toc_page+1:]
-                if index_page is not None:
-                    body_pages = body_pages[:index_page] + index_pages + \
-                                 body_pages[index_page+1:]
-                self._pages = body_pages
-                for page_nr in range(len(self._pages)):
-                    cr.save()
-                    cr.translate(left_margin, top_margin)
-                    self.draw_page(page_nr, cr, layout,
-                                   page_width, page_height,
-                                   DPI, DPI)
-                    cr.show_page()
-                    cr.restore()
-
-                # close the surface (file)
-                surface.finish()
-
-            except IOError as msg:
-                errmsg = "%s\n%s" % (_("Could not create %s") % filename, msg)
-                raise ReportError(errmsg)
-            except Exception as err:
-                errmsg = "%s\n%s" % (_("Could not create %s") % filename, err)
-                raise ReportError(errmsg)
+
+            # render the pages
+            if toc_page is not None:
+                body_pages = body_pages[:toc_page] + toc_pages + \
+                             body_pages[toc_page+1:]
+            if index_page is not None:
+                body_pages = body_pages[:index_page] + index_pages + \
+                             body_pages[index_page+1:]
+            self.__write_pages(body_pages, collect=False)
+
+            # close the surface (file)
+            self.__close_output()
+
+        except IOError as msg:
+            self.__close_output()
+            errmsg = "%s\n%s" % (_("Could not create %s") % filename, msg)
+            raise ReportError(errmsg)
+        except Exception as err:
+            self.__close_output()
+            errmsg = "%s\n%s" % (_("Could not create %s") % filename, err)
+            raise ReportError(errmsg)
 
     def __increment_pages(self, toc, index, start_page, offset):
         """
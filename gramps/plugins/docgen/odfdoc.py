@@ -37,6 +37,7 @@ import os
 from hashlib import md5
 import zipfile
 import time
+import tempfile
 from io import StringIO
 from math import cos, sin, radians
 from xml.sax.saxutils import escape
@@ -92,6 +93,9 @@ NEW_STYLE = re.compile('style-name="([a-zA-Z0-9]*)__([#a-zA-Z0-9 -]*)__">')
 #
 #-------------------------------------------------------------------------
 
+# size of the pieces of the body of the document copied to the odt file
+_CHUNK_SIZE = 1 << 20
+
 _XMLNS = '''\
 xmlns:office="%(urn)soffice:1.0"
 xmlns:style="%(urn)sstyle:1.0"
@@ -415,7 +419,6 @@ class ODFDoc(BaseDoc, TextDoc, DrawDoc):
         self.cntnt = None
         self.cntnt1 = None
         self.cntnt2 = None
-        self.cntntx = None
         self.sfile = None
         self.mimetype = None
         self.meta = None
@@ -449,7 +452,8 @@ class ODFDoc(BaseDoc, TextDoc, DrawDoc):
 
         self.filename = os.path.normpath(os.path.abspath(self.filename))
         self._backend = OdfBackend()
-        self.cntnt = StringIO()
+        # the body of the document is kept in a temporary file, not in memory
+        self.cntnt = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
         self.cntnt1 = StringIO()
         self.cntnt2 = StringIO()
 
@@ -742,17 +746,10 @@ class ODFDoc(BaseDoc, TextDoc, DrawDoc):
         So me must integrate the new fonts and styles where they should be.
         The content.xml file is closed.
         """
-        self.cntntx = StringIO()
         self.stylelist_notes = self.uniq(self.stylelist_notes)
         self.add_styled_notes_fonts()
         self.add_styled_notes_styles()
         self.add_styled_photo_styles()
-        self.cntntx.write(self.cntnt1.getvalue())
-        self.cntntx.write(self.cntnt2.getvalue())
-        self.cntntx.write(self.cntnt.getvalue())
-        self.cntnt1.close()
-        self.cntnt2.close()
-        self.cntnt.close()
 
     def close(self):
         """
@@ -1144,6 +1141,24 @@ class ODFDoc(BaseDoc, TextDoc, DrawDoc):
         zipinfo.external_attr = 0o644 << 16
         zfile.writestr(zipinfo, data)
 
+    def _add_zip_content(self, zfile, date_time):
+        """
+        Add the content.xml file to an archive. The body of the document is
+        copied from its temporary file in chunks.
+        """
+        zipinfo = zipfile.ZipInfo("content.xml")
+        zipinfo.date_time = date_time
+        zipinfo.compress_type = zipfile.ZIP_DEFLATED
+        zipinfo.external_attr = 0o644 << 16
+        with zfile.open(zipinfo, "w") as dest:
+            dest.write(self.cntnt1.getvalue().encode('utf-8'))
+            dest.write(self.cntnt2.getvalue().encode('utf-8'))
+            self.cntnt.seek(0)
+            chunk = self.cntnt.read(_CHUNK_SIZE)
+            while chunk:
+                dest.write(chunk.encode('utf-8'))
+                chunk = self.cntnt.read(_CHUNK_SIZE)
+
     def _write_zip(self):
         """
         Create the odt file. This is a zip file
@@ -1160,13 +1175,15 @@ class ODFDoc(BaseDoc, TextDoc, DrawDoc):
 
         self._add_zip(zfile, "META-INF/manifest.xml", self.mfile.getvalue(),
                       now)
-        self._add_zip(zfile, "content.xml", self.cntntx.getvalue(), now)
+        self._add_zip_content(zfile, now)
         self._add_zip(zfile, "meta.xml", self.meta.getvalue(), now)
         self._add_zip(zfile, "settings.xml", self.stfile.getvalue(), now)
         self._add_zip(zfile, "styles.xml", self.sfile.getvalue(), now)
         self._add_zip(zfile, "mimetype", self.mimetype.getvalue(), now)
 
         self.mfile.close()
+        self.cntnt1.close()
+        self.cntnt2.close()
         self.cntnt.close()
         self.meta.close()
         self.stfile.close()
@@ -307,8 +307,8 @@ class Calendar(Report):
         and text.
         """
         db = self.database
-        people = db.iter_person_handles()
-        people = self.filter.apply(self.database, people, user=self._user)
+        people = self.cache.apply_filter(self.filter, self.database,
+                                         user=self._user)
 
         ngettext = self._locale.translation.ngettext # to see "nearby" comments
 
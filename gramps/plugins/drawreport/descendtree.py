@@ -1308,7 +1308,7 @@ class DescendTree(Report):
         stdoptions.run_date_format_option(self, options.menu)
         stdoptions.run_private_data_option(self, options.menu)
         stdoptions.run_living_people_option(self, options.menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         stdoptions.run_name_format_option(self, options.menu)
         self._nd = self._name_display
 
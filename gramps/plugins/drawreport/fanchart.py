@@ -180,7 +180,7 @@ class FanChart(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
 
         self.max_generations = menu.get_option_by_name('maxgen').get_value()
         self.circle = menu.get_option_by_name('circle').get_value()
@@ -44,7 +44,8 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 # Person and relation types
 from gramps.gen.lib import Person, FamilyRelType, EventType, EventRoleType
-from gramps.gen.lib.date import Date, gregorian
+from gramps.gen.lib.date import Date
+from gramps.gen.lib.datebatch import from_sort_values, year_differences
 # gender and report type names
 from gramps.gen.plug.docgen import (FontStyle, ParagraphStyle, GraphicsStyle,
                                     FONT_SANS_SERIF, FONT_SERIF,
@@ -230,6 +231,19 @@ def estimate_age(dbase, person,
     @rtype: tuple
     """
 
+    dates = age_dates(dbase, person, end_handle, start_handle, today)
+    if dates is None:
+        return (-1, -1)
+    return tuple(year_differences(*zip(*dates)))
+
+
+def age_dates(dbase, person,
+              end_handle=None, start_handle=None, today=_TODAY):
+    """
+    Return the (start, stop) dates of the lower and of the upper bounds of
+    the age of a person, as estimated by :func:`estimate_age`, or None if
+    either the birth or death date is missing.
+    """
     bhandle = None
     if start_handle:
         bhandle = start_handle
@@ -248,7 +262,7 @@ def estimate_age(dbase, person,
 
     # if either of the events is not defined, return an error message
     if not bhandle:
-        return (-1, -1)
+        return None
 
     bdata = dbase.get_event_from_handle(bhandle).get_date_object()
     if dhandle:
@@ -257,44 +271,41 @@ def estimate_age(dbase, person,
         if today is not None:
             ddata = today
         else:
-            return (-1, -1)
+            return None
 
     # if the date is not valid, return an error message
     if not bdata.get_valid() or not ddata.get_valid():
-        return (-1, -1)
+        return None
 
     # if a year is not valid, return an error message
     if not bdata.get_year_valid() or not ddata.get_year_valid():
-        return (-1, -1)
+        return None
 
     bstart = bdata.get_start_date()
     bstop = bdata.get_stop_date()
+    if bstop == Date.EMPTY:
+        bstop = bstart
 
     dstart = ddata.get_start_date()
     dstop = ddata.get_stop_date()
+    if dstop == Date.EMPTY:
+        dstop = dstart
+
+    # from the latest birth to the earliest death, and the other way round
+    return ((bstop, dstart), (bstart, dstop))
 
-    def _calc_diff(low, high):
-        if (low[1], low[0]) > (high[1], high[0]):
-            return high[2] - low[2] - 1
-        else:
-            return high[2] - low[2]
-
-    if bstop == dstop == Date.EMPTY:
-        lower = _calc_diff(bstart, dstart)
-        age = (lower, lower)
-    elif bstop == Date.EMPTY:
-        lower = _calc_diff(bstart, dstart)
-        upper = _calc_diff(bstart, dstop)
-        age = (lower, upper)
-    elif dstop == Date.EMPTY:
-        lower = _calc_diff(bstop, dstart)
-        upper = _calc_diff(bstart, dstart)
-        age = (lower, upper)
-    else:
-        lower = _calc_diff(bstop, dstart)
-        upper = _calc_diff(bstart, dstop)
-        age = (lower, upper)
-    return age
+
+def gregorian_years(dates):
+    """
+    Return the years of dates in the Gregorian calendar, as
+    gregorian(date).get_year() does, with the dates of the other calendars
+    converted at once.
+    """
+    years = from_sort_values(date.get_sort_value() for date in dates
+                             if date.get_calendar() != Date.CAL_GREGORIAN)
+    years.reverse()
+    return [date.get_year() if date.get_calendar() == Date.CAL_GREGORIAN
+            else years.pop()[0] for date in dates]
 
 
 #------------------------------------------------------------------------
@@ -323,6 +334,73 @@ def _T_(value, context=''): # enable deferred translations
 # _T_ is a gramps-defined keyword -- see po/update_po.py and po/genpot.sh
 
 
+#------------------------------------------------------------------------
+#
+# Objects of a person
+#
+#------------------------------------------------------------------------
+class PersonRecord:
+    """
+    The objects of a person used by the charts. The events and families are
+    fetched from the database once for all the charts, and the record can
+    be used in place of the database to get the events.
+    """
+    __slots__ = ('db', 'person', 'events', 'families')
+
+    def __init__(self, dbase, person):
+        self.db = dbase
+        self.person = person
+        self.events = {}
+        self.families = None
+
+    def get_event_from_handle(self, handle):
+        "return the event with the given handle"
+        event = self.events.get(handle)
+        if event is None:
+            event = self.db.get_event_from_handle(handle)
+            self.events[handle] = event
+        return event
+
+    def get_birth(self):
+        "return the birth event of the person or None"
+        birth_ref = self.person.get_birth_ref()
+        if birth_ref:
+            return self.get_event_from_handle(birth_ref.ref)
+        return None
+
+    def get_death(self):
+        "return the death event of the person or None"
+        death_ref = self.person.get_death_ref()
+        if death_ref:
+            return self.get_event_from_handle(death_ref.ref)
+        return None
+
+    def get_families(self):
+        "return the families of the person"
+        if self.families is None:
+            self.families = [self.db.get_family_from_handle(handle) for handle
+                             in self.person.get_family_handle_list()]
+        return self.families
+
+
+#------------------------------------------------------------------------
+#
+# Ages estimated with all the others
+#
+#------------------------------------------------------------------------
+class _Age:
+    """
+    The age key of a chart, estimated with the ages of all the people once
+    their data is collected: the first, or the last, in the sorted order of
+    the given ages, which are the indexes of ages to estimate or keys.
+    """
+    __slots__ = ('ages', 'pick')
+
+    def __init__(self, ages, pick=min):
+        self.ages = ages
+        self.pick = pick
+
+
 #------------------------------------------------------------------------
 #
 # Data extraction methods from the database
@@ -333,6 +411,10 @@ class Extract:
 
     def __init__(self):
         """Methods for extracting statistical data from the database"""
+        # the dates of the ages to estimate, and the (chart, _Age) found,
+        # while the data is collected
+        self._age_dates = None
+        self._ages = None
         # key, non-localized name, localized name, type method, data method
         self.extractors = {
             'data_title':  ("Title", _T_("Title", "person"),
@@ -383,41 +465,42 @@ class Extract:
     # ----------------- data extraction methods --------------------
     # take an object and return a list of strings
 
-    def get_title(self, person):
+    def get_title(self, record):
         "return title for given person"
         # TODO: return all titles, not just primary ones...
-        title = person.get_primary_name().get_title()
+        title = record.person.get_primary_name().get_title()
         if title:
             return [title]
         else:
             return [_T_("(Preferred) title missing")]
 
-    def get_forename(self, person):
+    def get_forename(self, record):
         "return forenames for given person"
         # TODO: return all forenames, not just primary ones...
-        firstnames = person.get_primary_name().get_first_name().strip()
+        firstnames = record.person.get_primary_name().get_first_name().strip()
         if firstnames:
             return firstnames.split()
         else:
             return [_T_("(Preferred) forename missing")]
 
-    def get_surname(self, person):
+    def get_surname(self, record):
         "return surnames for given person"
         # TODO: return all surnames, not just primary ones...
         # TODO: have the surname formatted according to the name_format too
-        surnames = person.get_primary_name().get_surname().strip()
+        surnames = record.person.get_primary_name().get_surname().strip()
         if surnames:
             return surnames.split()
         else:
             return [_T_("(Preferred) surname missing")]
 
-    def get_gender(self, person):
+    def get_gender(self, record):
         "return gender for given person"
         # TODO: why there's no Person.getGenderName?
         # It could be used by getDisplayInfo & this...
-        if person.gender == Person.MALE:
+        gender = record.person.gender
+        if gender == Person.MALE:
             return [_T_("Men")]
-        if person.gender == Person.FEMALE:
+        if gender == Person.FEMALE:
             return [_T_("Women")]
         return [_T_("Gender unknown")]
 
@@ -462,9 +545,9 @@ class Extract:
     def get_places(self, data):
         "return places for given (person,event_handles)"
         places = []
-        person, event_handles = data
+        record, event_handles = data
         for event_handle in event_handles:
-            event = self.db.get_event_from_handle(event_handle)
+            event = record.get_event_from_handle(event_handle)
             place_handle = event.get_place_handle()
             if place_handle:
                 place = _pd.display_event(self.db, event)
@@ -474,24 +557,24 @@ class Extract:
                 places.append(_T_("Place missing"))
         return places
 
-    def get_person_age(self, person):
+    def get_person_age(self, record):
         "return age for given person, if alive"
-        death_ref = person.get_death_ref()
+        death_ref = record.person.get_death_ref()
         if not death_ref:
-            return [self.estimate_age(person)]
+            return [self.estimate_age(record)]
         return [_T_("Already dead")]
 
-    def get_death_age(self, person):
+    def get_death_age(self, record):
         "return age at death for given person, if dead"
-        death_ref = person.get_death_ref()
+        death_ref = record.person.get_death_ref()
         if death_ref:
-            return [self.estimate_age(person, death_ref.ref)]
+            return [self.estimate_age(record, death_ref.ref)]
         return [_T_("Still alive")]
 
     def get_event_ages(self, data):
         "return ages at given (person,event_handles)"
-        person, event_handles = data
-        ages = [self.estimate_age(person, h) for h in event_handles]
+        record, event_handles = data
+        ages = [self.estimate_age(record, h) for h in event_handles]
         if ages:
             return ages
         return [_T_("Events missing")]
@@ -499,9 +582,9 @@ class Extract:
     def get_event_type(self, data):
         "return event types at given (person,event_handles)"
         types = []
-        person, event_handles = data
+        record, event_handles = data
         for event_handle in event_handles:
-            event = self.db.get_event_from_handle(event_handle)
+            event = record.get_event_from_handle(event_handle)
             event_type = self._(self._get_type(event.get_type()))
             types.append(event_type)
         if types:
@@ -510,17 +593,17 @@ class Extract:
 
     def get_first_child_age(self, data):
         "return age when first child in given (person,child_handles) was born"
-        ages, errors = self.get_sorted_child_ages(data)
+        ages, errors = self.get_child_ages(data)
         if ages:
-            errors.append(ages[0])
+            errors.append(_Age(ages, min))
             return errors
         return [_T_("Children missing")]
 
     def get_last_child_age(self, data):
         "return age when last child in given (person,child_handles) was born"
-        ages, errors = self.get_sorted_child_ages(data)
+        ages, errors = self.get_child_ages(data)
         if ages:
-            errors.append(ages[-1])
+            errors.append(_Age(ages, max))
             return errors
         return [_T_("Children missing")]
 
@@ -533,62 +616,76 @@ class Extract:
 
     # ------------------- utility methods -------------------------
 
-    def get_sorted_child_ages(self, data):
-        "return (sorted_ages,errors) for given (person,child_handles)"
+    def get_child_ages(self, data):
+        "return (ages,errors) for given (person,child_handles)"
         ages = []
         errors = []
-        person, child_handles = data
+        record, child_handles = data
         for child_handle in child_handles:
             child = self.db.get_person_from_handle(child_handle)
             birth_ref = child.get_birth_ref()
             if birth_ref:
-                ages.append(self.estimate_age(person, birth_ref.ref))
+                age = self.estimate_age(record, birth_ref.ref)
+                if isinstance(age, _Age):
+                    ages.extend(age.ages)
+                else:
+                    ages.append(age)
             else:
                 errors.append(_T_("Birth missing"))
                 continue
-        ages.sort()
         return (ages, errors)
 
-    def estimate_age(self, person, end=None, begin=None):
-        """return estimated age (range) for given person or error message.
-           age string is padded with spaces so that it can be sorted"""
-        age = estimate_age(self.db, person, end, begin)
-        if age[0] < 0 or age[1] < 0:
+    def estimate_age(self, record, end=None, begin=None):
+        """return the age of given person, to be estimated with the others,
+           or error message"""
+        dates = age_dates(record, record.person, end, begin)
+        if dates is None:
             # inadequate information
             return _T_("Date(s) missing")
-        if age[0] == age[1]:
-            # exact year
-            return "%3d" % age[0]
-        else:
-            # minimum and maximum
-            return "%3d-%d" % (age[0], age[1])
+        self._age_dates.append(dates)
+        return _Age([len(self._age_dates) - 1])
+
+    def get_age_keys(self):
+        """return the estimated age (range) of each age to estimate.
+           age string is padded with spaces so that it can be sorted"""
+        keys = []
+        starts = []
+        stops = []
+        for lower, upper in self._age_dates:
+            starts.extend((lower[0], upper[0]))
+            stops.extend((lower[1], upper[1]))
+        years = year_differences(starts, stops)
+        for lower, upper in zip(years[::2], years[1::2]):
+            if lower < 0 or upper < 0:
+                # inadequate information
+                keys.append(_T_("Date(s) missing"))
+            elif lower == upper:
+                # exact year
+                keys.append("%3d" % lower)
+            else:
+                # minimum and maximum
+                keys.append("%3d-%d" % (lower, upper))
+        return keys
 
     # ------------------- type methods -------------------------
-    # take db and person and return suitable gramps object(s)
+    # take the record of a person and return suitable gramps object(s)
 
-    def get_person(self, person):
-        "return person"
-        return person
+    def get_person(self, record):
+        "return person record"
+        return record
 
-    def get_birth(self, person):
+    def get_birth(self, record):
         "return birth event for given person or None"
-        birth_ref = person.get_birth_ref()
-        if birth_ref:
-            return self.db.get_event_from_handle(birth_ref.ref)
-        return None
+        return record.get_birth()
 
-    def get_death(self, person):
+    def get_death(self, record):
         "return death event for given person or None"
-        death_ref = person.get_death_ref()
-        if death_ref:
-            return self.db.get_event_from_handle(death_ref.ref)
-        return None
+        return record.get_death()
 
-    def get_child_handles(self, person):
+    def get_child_handles(self, record):
         "return list of child handles for given person or None"
         children = []
-        for fam_handle in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_handle)
+        for fam in record.get_families():
             for child_ref in fam.get_child_ref_list():
                 children.append(child_ref.ref)
         # TODO: it would be good to return only biological children,
@@ -596,58 +693,67 @@ class Extract:
         # (I don't want to check each children's parent family mother
         # and father relations as that would make this *much* slower)
         if children:
-            return (person, children)
+            return (record, children)
         return None
 
-    def get_marriage_handles(self, person):
+    def get_marriage_handles(self, record):
         "return list of marriage event handles for given person or None"
         marriages = []
-        for family_handle in person.get_family_handle_list():
-            family = self.db.get_family_from_handle(family_handle)
+        for family in record.get_families():
             if int(family.get_relationship()) == FamilyRelType.MARRIED:
                 for event_ref in family.get_event_ref_list():
-                    event = self.db.get_event_from_handle(event_ref.ref)
+                    event = record.get_event_from_handle(event_ref.ref)
                     if (event.get_type() == EventType.MARRIAGE and
                             (event_ref.get_role() == EventRoleType.FAMILY or
                              event_ref.get_role() == EventRoleType.PRIMARY)):
                         marriages.append(event_ref.ref)
         if marriages:
-            return (person, marriages)
+            return (record, marriages)
         return None
 
-    def get_any_family_handles(self, person):
+    def get_any_family_handles(self, record):
         "return list of family handles for given person or None"
-        families = person.get_family_handle_list()
+        families = record.person.get_family_handle_list()
 
         if families:
-            return (person, families)
+            return (record, families)
         return None
 
-    def get_event_handles(self, person):
+    def get_event_handles(self, record):
         "return list of event handles for given person or None"
-        events = [ref.ref for ref in person.get_event_ref_list()]
+        events = [ref.ref for ref in record.person.get_event_ref_list()]
 
         if events:
-            return (person, events)
+            return (record, events)
         return None
 
     # ----------------- data collection methods --------------------
 
-    def get_person_data(self, person, collect):
-        """Add data from the database to 'collect' for the given person,
-           using methods from the 'collect' data dict tuple
+    def get_person_data(self, record, collect):
+        """Add data from the database to 'collect' for the given person
+           record, using methods from the 'collect' data dict tuple.
+           The objects of the person are only extracted once for all the
+           charts using them.
         """
+        objects = {}
         for chart in collect:
             # get the information
             type_func = chart[2]
             data_func = chart[3]
-            obj = type_func(person)  # e.g. get_date()
+            if type_func in objects:
+                obj = objects[type_func]
+            else:
+                obj = objects[type_func] = type_func(record)  # e.g. get_date()
             if obj:
                 value = data_func(obj)  # e.g. get_year()
             else:
                 value = [_T_("Personal information missing")]
             # list of information found
             for key in value:
+                if isinstance(key, _Age):
+                    # counted once all the ages are estimated
+                    self._ages.append((chart[1], key))
+                    continue
                 if key in chart[1]:
                     chart[1][key] += 1
                 else:
@@ -688,43 +794,60 @@ class Extract:
                 # localized data title, value dict, type and data method
                 data.append((ext[name][1], {}, ext[name][2], ext[name][3]))
 
-        # go through the people and collect data
+        self._age_dates = []
+        self._ages = []
+
+        # go through the people and keep those fitting the criteria with
+        # the birth date, or the death date, whose year is checked
+        records = []
         for person_handle in people:
             cb_progress()
             person = dbase.get_person_from_handle(person_handle)
             # check whether person has suitable gender
             if person.gender != genders and genders != Person.UNKNOWN:
                 continue
+            record = PersonRecord(dbase, person)
 
-            # check whether birth year is within required range
-            birth = self.get_birth(person)
+            birth = record.get_birth()
             if birth:
                 birthdate = birth.get_date_object()
                 if birthdate.get_year_valid():
-                    birthdate = gregorian(birthdate)
-
-                    year = birthdate.get_year()
-                    if not (year >= year_from and year <= year_to):
-                        continue
+                    records.append((record, birthdate, True))
                 else:
                     # if death before range, person's out of range too...
-                    death = self.get_death(person)
-                    if death:
+                    death = record.get_death()
+                    if death and no_years:
                         deathdate = death.get_date_object()
                         if deathdate.get_year_valid():
-                            deathdate = gregorian(deathdate)
-
-                            if deathdate.get_year() < year_from:
-                                continue
-                        if not no_years:
-                            # don't accept people not known to be in range
-                            continue
-                    else:
-                        continue
+                            records.append((record, deathdate, False))
+                        else:
+                            records.append((record, None, False))
+                    # else don't accept people not known to be in range
+
+        # check whether birth year is within required range, with the
+        # dates of other calendars converted at once
+        years = gregorian_years([date for (record, date, birth) in records
+                                 if date is not None])
+        years.reverse()
+        for record, date, birth in records:
+            if date is not None:
+                year = years.pop()
+                if birth and not (year >= year_from and year <= year_to):
+                    continue
+                if not birth and year < year_from:
+                    continue
+            self.get_person_data(record, data)
+
+        # estimate the ages at once, and count them
+        keys = self.get_age_keys()
+        for chart, age in self._ages:
+            key = age.pick(keys[index] if isinstance(index, int) else index
+                           for index in age.ages)
+            if key in chart:
+                chart[key] += 1
             else:
-                continue
-
-            self.get_person_data(person, data)
+                chart[key] = 1
+        self._age_dates = self._ages = None
         return data
 
 
@@ -766,7 +889,7 @@ class StatisticsChart(Report):
         stdoptions.run_private_data_option(self, menu)
         living_opt = stdoptions.run_living_people_option(self, menu,
                                                          self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
 
         get_option_by_name = menu.get_option_by_name
         get_value = lambda name: get_option_by_name(name).get_value()
@@ -804,9 +927,8 @@ class StatisticsChart(Report):
         span_string += " %s-%s" % (self._get_date(Date(year_from)), # localized
                                    self._get_date(Date(year_to)))
 
-        people = self.filter.apply(self.database,
-                                   self.database.iter_person_handles(),
-                                   user=self._user)
+        people = self.cache.apply_filter(self.filter, self.database,
+                                         user=self._user)
 
         # extract requested items from the database and count them
         self._user.begin_progress(_('Statistics Charts'),
@@ -105,7 +105,7 @@ class TimeLine(Report):
         stdoptions.run_private_data_option(self, menu)
         living_opt = stdoptions.run_living_people_option(self, menu,
                                                          self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
 
         self.filter = menu.get_option_by_name('filter').get_filter()
         self.fil_name = "(%s)" % self.filter.get_name(self._locale)
@@ -130,9 +130,8 @@ class TimeLine(Report):
 
     def write_report(self):
         # Apply the filter
-        self.plist = self.filter.apply(self.database,
-                                       self.database.iter_person_handles(),
-                                       user=self._user)
+        self.plist = self.cache.apply_filter(self.filter, self.database,
+                                             user=self._user)
 
         # Find the range of dates to include
         (low, high) = self.find_year_range()
@@ -374,9 +373,8 @@ class TimeLine(Report):
 
     def name_size(self):
         """ get the length of the name """
-        self.plist = self.filter.apply(self.database,
-                                       self.database.iter_person_handles(),
-                                       user=self._user)
+        self.plist = self.cache.apply_filter(self.filter, self.database,
+                                             user=self._user)
 
         style_sheet = self.doc.get_style_sheet()
         gstyle = style_sheet.get_draw_style('TLG-text')
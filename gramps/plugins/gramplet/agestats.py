@@ -37,6 +37,7 @@ from collections import defaultdict
 #------------------------------------------------------------------------
 from gramps.gen.plug import Gramplet
 from gramps.gen.lib import ChildRefType
+from gramps.gen.lib.datebatch import year_differences
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -97,6 +98,11 @@ class AgeStatsGramplet(Gramplet):
         age_handles = [[] for i in range(self.max_age)]
         mother_handles = [[] for i in range(self.max_mother_diff)]
         father_handles = [[] for i in range(self.max_father_diff)]
+        # birth dates of the parents, which have several children
+        parent_births = {}
+        # the differences are computed at once at the end, from the years
+        # only: (start, stop, counts, handles, max difference, handle)
+        diffs = []
         text = ""
         count = 0
         for p in self.dbstate.db.iter_people():
@@ -114,14 +120,8 @@ class AgeStatsGramplet(Gramplet):
                 death_event = self.dbstate.db.get_event_from_handle(death_ref.ref)
                 death_date = death_event.get_date_object()
             if death_date and birth_date and birth_date.get_year() != 0:
-                age = death_date.get_year() - birth_date.get_year()
-                if age >= 0 and age < self.max_age:
-                    age_dict[age] += 1
-                    age_handles[age].append(p.handle)
-                #else:
-                #    print "Age out of range: %d for %s" % (age,
-                #                                           p.get_primary_name().get_first_name()
-                #                                           + " " + p.get_primary_name().get_surname())
+                diffs.append((birth_date, death_date, age_dict, age_handles,
+                              self.max_age, p.handle))
             # for each parent m/f:
             family_list = p.get_parent_family_handle_list()
             for family_handle in family_list:
@@ -141,36 +141,25 @@ class AgeStatsGramplet(Gramplet):
                         f_handle = None
                     # if they have a birth_date, compute difference each m/f
                     if f_handle:
-                        f = self.dbstate.db.get_person_from_handle(f_handle)
-                        bref = f.get_birth_ref()
-                        if bref:
-                            bevent = self.dbstate.db.get_event_from_handle(bref.ref)
-                            bdate = bevent.get_date_object()
-                            if bdate and birth_date and birth_date.get_year() != 0:
-                                diff = birth_date.get_year() - bdate.get_year()
-                                if diff >= 0 and diff < self.max_father_diff:
-                                    father_dict[diff] += 1
-                                    father_handles[diff].append(f_handle)
-                                #else:
-                                #    print "Father diff out of range: %d for %s" % (diff,
-                                #                                                   p.get_primary_name().get_first_name()
-                                #                                                   + " " + p.get_primary_name().get_surname())
+                        bdate = self.get_birth_date(f_handle, parent_births)
+                        if bdate and birth_date and birth_date.get_year() != 0:
+                            diffs.append((bdate, birth_date, father_dict,
+                                          father_handles, self.max_father_diff,
+                                          f_handle))
                     if m_handle:
-                        m = self.dbstate.db.get_person_from_handle(m_handle)
-                        bref = m.get_birth_ref()
-                        if bref:
-                            bevent = self.dbstate.db.get_event_from_handle(bref.ref)
-                            bdate = bevent.get_date_object()
-                            if bdate and birth_date and birth_date.get_year() != 0:
-                                diff = birth_date.get_year() - bdate.get_year()
-                                if diff >= 0 and diff < self.max_mother_diff:
-                                    mother_dict[diff] += 1
-                                    mother_handles[diff].append(m_handle)
-                                #else:
-                                #    print "Mother diff out of range: %d for %s" % (diff,
-                                #                                                   p.get_primary_name().get_first_name()
-                                #                                                   + " " + p.get_primary_name().get_surname())
+                        bdate = self.get_birth_date(m_handle, parent_births)
+                        if bdate and birth_date and birth_date.get_year() != 0:
+                            diffs.append((bdate, birth_date, mother_dict,
+                                          mother_handles, self.max_mother_diff,
+                                          m_handle))
             count += 1
+        years = year_differences([(0, 0, diff[0].get_year()) for diff in diffs],
+                                 [(0, 0, diff[1].get_year()) for diff in diffs])
+        for year, (start, stop, counts, handles, limit, handle) in zip(years,
+                                                                     diffs):
+            if year >= 0 and year < limit:
+                counts[year] += 1
+                handles[year].append(handle)
         width = self.chart_width
         graph_width = width - 8
         self.create_bargraph(age_dict, age_handles, _("Lifespan Age Distribution"), _("Age"), graph_width, 5, self.max_age)
@@ -180,6 +169,18 @@ class AgeStatsGramplet(Gramplet):
         self.gui.buffer.apply_tag_by_name("fixed", start, end)
         self.append_text("", scroll_to="begin")
 
+    def get_birth_date(self, handle, births):
+        """ Returns the birth date of a person, or None """
+        if handle not in births:
+            bdate = None
+            person = self.dbstate.db.get_person_from_handle(handle)
+            bref = person.get_birth_ref()
+            if bref:
+                bevent = self.dbstate.db.get_event_from_handle(bref.ref)
+                bdate = bevent.get_date_object()
+            births[handle] = bdate
+        return births[handle]
+
     def ticks(self, width, start=0, stop=100, fill=" "):
         """ Returns the tickmark numbers for a graph axis """
         count = int(width / 10.0)
@@ -25,7 +25,7 @@
 # Gramps modules
 #
 #------------------------------------------------------------------------
-from gramps.plugins.lib.librecords import find_records, CALLNAME_DONTUSE
+from gramps.plugins.lib.librecords import RecordFinder, CALLNAME_DONTUSE
 from gramps.gen.plug import Gramplet
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
@@ -49,7 +49,10 @@ class RecordsGramplet(Gramplet):
     def main(self):
         self.set_text(_("Processing...") + "\n")
         yield True
-        records = find_records(self.dbstate.db, None, 3, CALLNAME_DONTUSE)
+        finder = RecordFinder(self.dbstate.db, None, 3, CALLNAME_DONTUSE)
+        for dummy in finder.iter_find():
+            yield True
+        records = finder.records
         self.set_text("")
         for (text, varname, top) in records:
             yield True
@@ -70,72 +70,41 @@ class StatsGramplet(Gramplet):
     def main(self):
         self.set_text(_("Processing..."))
         database = self.dbstate.db
-        personList = database.iter_people()
-
-        with_media = 0
-        total_media = 0
-        incomp_names = 0
-        disconnected = 0
-        missing_bday = 0
-        males = 0
-        females = 0
-        unknowns = 0
-        bytes_cnt = 0
-        notfound = []
-
         mobjects = database.get_number_of_media()
-        mbytes = "0"
-        for media in database.iter_media():
-            fullname = media_path_full(database, media.get_path())
-            try:
-                bytes_cnt += os.path.getsize(fullname)
-                length = len(str(bytes_cnt))
-                if bytes_cnt <= 999999:
-                    mbytes = _("less than 1")
-                else:
-                    mbytes = str(bytes_cnt)[:(length - 6)]
-            except OSError:
-                notfound.append(media.get_path())
-
-        for cnt, person in enumerate(personList):
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-                total_media += length
 
-            for name in ([person.get_primary_name()] +
-                         person.get_alternate_names()):
+        stats = database.get_statistics()
+        if stats is None:
+            counts = yield from self.__count(database)
+        else:
+            counts = {
+                'with_media': stats.get_people_with_media(),
+                'total_media': stats.get_media_references(),
+                'incomp_names': stats.get_incomplete_names(),
+                'disconnected': stats.get_disconnected(),
+                'missing_bday': stats.get_missing_births(),
+                'males': stats.get_gender_count(Person.MALE),
+                'females': stats.get_gender_count(Person.FEMALE),
+                'unknowns': stats.get_gender_count(Person.UNKNOWN),
+                'bytes_cnt': stats.get_media_bytes(),
+                'notfound': stats.get_missing_media()}
+        with_media = counts['with_media']
+        total_media = counts['total_media']
+        incomp_names = counts['incomp_names']
+        disconnected = counts['disconnected']
+        missing_bday = counts['missing_bday']
+        males = counts['males']
+        females = counts['females']
+        unknowns = counts['unknowns']
+        bytes_cnt = counts['bytes_cnt']
+        notfound = counts['notfound']
+
+        if len(notfound) == mobjects:
+            mbytes = "0"
+        elif bytes_cnt <= 999999:
+            mbytes = _("less than 1")
+        else:
+            mbytes = str(bytes_cnt)[:(len(str(bytes_cnt)) - 6)]
 
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
-                        incomp_names += 1
-
-            if (not person.get_main_parents_family_handle() and
-                    not person.get_family_handle_list()):
-                disconnected += 1
-
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = database.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            else:
-                unknowns += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
         self.clear_text()
         self.append_text(_("Individuals") + "\n")
         self.append_text("----------------------------\n")
@@ -199,3 +168,71 @@ class StatsGramplet(Gramplet):
                   'Filter', 'missing media')
         self.append_text(" %s\n" % len(notfound))
         self.append_text("", scroll_to="begin")
+
+    def __count(self, database):
+        """
+        Count the people and media by going through the database, for the
+        databases that do not keep statistics.
+        """
+        with_media = 0
+        total_media = 0
+        incomp_names = 0
+        disconnected = 0
+        missing_bday = 0
+        males = 0
+        females = 0
+        unknowns = 0
+        bytes_cnt = 0
+        notfound = []
+
+        for media in database.iter_media():
+            fullname = media_path_full(database, media.get_path())
+            try:
+                bytes_cnt += os.path.getsize(fullname)
+            except OSError:
+                notfound.append(media.get_path())
+
+        for cnt, person in enumerate(database.iter_people()):
+            length = len(person.get_media_list())
+            if length > 0:
+                with_media += 1
+                total_media += length
+
+            for name in ([person.get_primary_name()] +
+                         person.get_alternate_names()):
+
+                if name.get_first_name().strip() == "":
+                    incomp_names += 1
+                else:
+                    if name.get_surname_list():
+                        for surname in name.get_surname_list():
+                            if surname.get_surname().strip() == "":
+                                incomp_names += 1
+                    else:
+                        incomp_names += 1
+
+            if (not person.get_main_parents_family_handle() and
+                    not person.get_family_handle_list()):
+                disconnected += 1
+
+            birth_ref = person.get_birth_ref()
+            if birth_ref:
+                birth = database.get_event_from_handle(birth_ref.ref)
+                if not get_date(birth):
+                    missing_bday += 1
+            else:
+                missing_bday += 1
+
+            if person.get_gender() == Person.FEMALE:
+                females += 1
+            elif person.get_gender() == Person.MALE:
+                males += 1
+            else:
+                unknowns += 1
+            if not cnt % _YIELD_INTERVAL:
+                yield True
+        return {'with_media': with_media, 'total_media': total_media,
+                'incomp_names': incomp_names, 'disconnected': disconnected,
+                'missing_bday': missing_bday, 'males': males,
+                'females': females, 'unknowns': unknowns,
+                'bytes_cnt': bytes_cnt, 'notfound': notfound}
@@ -95,24 +95,35 @@ class SurnameCloudGramplet(Gramplet):
         surnames = defaultdict(int)
         representative_handle = {}
 
-        cnt = 0
-        namelist = []
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-            # Count unique surnames
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if not name.get_surname().strip() in namelist \
-                    and not name.get_surname().strip() == "":
-                    namelist.append(name.get_surname().strip())
+        stats = self.dbstate.db.get_statistics()
+        if stats is not None:
+            surnames = stats.get_group_name_counts()
+            representative_handle = stats.get_group_name_person
+            namelist = stats.get_surname_counts()
+            total_people = stats.get_number_of_people()
+        else:
+            cnt = 0
+            namelist = []
+            for person in self.dbstate.db.iter_people():
+                allnames = ([person.get_primary_name()] +
+                            person.get_alternate_names())
+                allnames = set([name.get_group_name().strip()
+                                for name in allnames])
+                for surname in allnames:
+                    surnames[surname] += 1
+                    representative_handle[surname] = person.handle
+                cnt += 1
+                if not cnt % _YIELD_INTERVAL:
+                    yield True
+                # Count unique surnames
+                for name in ([person.get_primary_name()] +
+                             person.get_alternate_names()):
+                    if not name.get_surname().strip() in namelist \
+                        and not name.get_surname().strip() == "":
+                        namelist.append(name.get_surname().strip())
+            representative_handle = representative_handle.get
+            total_people = cnt
 
-        total_people = cnt
         surname_sort = []
         total = cnt = 0
         for surname in surnames:
@@ -165,7 +176,7 @@ class SurnameCloudGramplet(Gramplet):
                 else:
                     text = surname
                 size = make_tag_size(count, counts, mins=mins, maxs=maxs)
-                self.link(text, 'Surname', representative_handle[surname], size,
+                self.link(text, 'Surname', representative_handle(surname), size,
                           "%s, %d%% (%d)" % (text,
                                              int((float(count)/total_people) * 100),
                                              count))
@@ -71,18 +71,27 @@ class TopSurnamesGramplet(Gramplet):
         surnames = defaultdict(int)
         representative_handle = {}
 
-        cnt = 0
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        stats = self.dbstate.db.get_statistics()
+        if stats is not None:
+            surnames = stats.get_group_name_counts()
+            representative_handle = stats.get_group_name_person
+            total_people = stats.get_number_of_people()
+        else:
+            cnt = 0
+            for person in self.dbstate.db.iter_people():
+                allnames = ([person.get_primary_name()] +
+                            person.get_alternate_names())
+                allnames = set([name.get_group_name().strip()
+                                for name in allnames])
+                for surname in allnames:
+                    surnames[surname] += 1
+                    representative_handle[surname] = person.handle
+                cnt += 1
+                if not cnt % _YIELD_INTERVAL:
+                    yield True
+            representative_handle = representative_handle.get
+            total_people = cnt
 
-        total_people = cnt
         surname_sort = []
         total = 0
 
@@ -104,7 +113,7 @@ class TopSurnamesGramplet(Gramplet):
             text = "%s, " % (surname if surname else nosurname)
             text += "%d%% (%d)\n" % (int((float(count)/total) * 100), count)
             self.append_text(" %d. " % (line + 1))
-            self.link(text, 'Surname', representative_handle[surname])
+            self.link(text, 'Surname', representative_handle(surname))
             line += 1
             if line >= self.top_size:
                 break
@@ -37,7 +37,9 @@
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from math import radians
+from collections import deque
 import re
+import weakref
 
 #------------------------------------------------------------------------
 #
@@ -176,6 +178,23 @@ def tabstops_to_tabarray(tab_stops, dpi):
 
     return tab_array
 
+# text measurements, for each Pango layout
+_MEASUREMENTS = weakref.WeakKeyDictionary()
+
+def get_measurements(layout):
+    """
+    Return the cache of the paragraph measurements made with a Pango layout.
+
+    The height of a paragraph only depends on its text, its style and the
+    width available, so the measurements can be reused when the document is
+    paginated again, as when the table of contents or the index changes size.
+    """
+    try:
+        return _MEASUREMENTS[layout]
+    except KeyError:
+        measurements = _MEASUREMENTS[layout] = {}
+        return measurements
+
 def raw_length(s):
     """
     Return the length of the raw string after all pango markup has been removed.
@@ -468,6 +487,8 @@ class GtkDocParagraph(GtkDocBaseElement):
 
         self._plaintext = None
         self._attrlist = None
+        # True once the text is split, it is then no longer in self._text
+        self._split = False
 
         self._marklist = []
 
@@ -499,6 +520,7 @@ class GtkDocParagraph(GtkDocBaseElement):
         """
         Internal method to allow for splitting of paragraphs
         """
+        self._split = True
         if not isinstance(plaintext, str):
             self._plaintext = plaintext.decode('utf-8')
         else:
@@ -534,6 +556,28 @@ class GtkDocParagraph(GtkDocBaseElement):
         text_width = width - l_margin - 2 * h_padding - r_margin
         if f_indent < 0:
             text_width -= f_indent
+        text_height = height - t_margin - 2 * v_padding
+
+        # the paragraph may have been measured before
+        font_style = self._style.get_font()
+        align = self._style.get_alignment_text()
+        measurements = get_measurements(layout)
+        key = None
+        if not self._split:
+            key = (self._text, int(text_width * Pango.SCALE),
+                   int(f_indent * Pango.SCALE), tuple(self._style.get_tabs()),
+                   align, font_families[font_style.face],
+                   font_style.get_size(), font_style.get_bold(),
+                   font_style.get_italic(), dpi_x)
+        if key in measurements:
+            layout_height, spacing = measurements[key]
+            if layout_height - spacing <= text_height:
+                paragraph_height = (layout_height + spacing + t_margin +
+                                    (2 * v_padding))
+                if height - paragraph_height > b_margin:
+                    paragraph_height += b_margin
+                return (self, None), paragraph_height
+
         layout.set_width(int(text_width * Pango.SCALE))
 
         # set paragraph properties
@@ -541,7 +585,6 @@ class GtkDocParagraph(GtkDocBaseElement):
         layout.set_indent(int(f_indent * Pango.SCALE))
         layout.set_tabs(tabstops_to_tabarray(self._style.get_tabs(), dpi_x))
         #
-        align = self._style.get_alignment_text()
         if align == 'left':
             layout.set_justify(False)
             layout.set_alignment(Pango.Alignment.LEFT)
@@ -561,20 +604,19 @@ class GtkDocParagraph(GtkDocBaseElement):
         else:
             raise ValueError
         #
-        font_style = self._style.get_font()
         layout.set_font_description(fontstyle_to_fontdescription(font_style))
         #set line spacing based on font:
         spacing = font_style.get_size() * self.spacingfractionfont
         layout.set_spacing(int(round(spacing * Pango.SCALE)))
 
-        text_height = height - t_margin - 2 * v_padding
-
         # calculate where to cut the paragraph
         layout.set_text(self._plaintext, -1)
         layout.set_attributes(self._attrlist)
         layout_width, layout_height = layout.get_pixel_size()
         line_count = layout.get_line_count()
         spacing = layout.get_spacing() / Pango.SCALE
+        if key is not None:
+            measurements[key] = (layout_height, spacing)
 
         # if all paragraph fits we don't need to cut
         if layout_height - spacing <= text_height:
@@ -1404,7 +1446,7 @@ class CairoDoc(BaseDoc, TextDoc, DrawDoc):
         self._doc = GtkDocDocument()
         self._active_element = self._doc
         self._pages = []
-        self._elements_to_paginate = []
+        self._elements_to_paginate = deque()
         self._links_error = False
 
     def close(self):
@@ -1733,7 +1775,7 @@ links (like ODF) and write PDF from that format.
         """
         # if first time run than initialize the variables
         if not self._elements_to_paginate:
-            self._elements_to_paginate = self._doc.get_children()[:]
+            self._elements_to_paginate = deque(self._doc.get_children())
             self._pages.append(GtkDocDocument())
             self._available_height = page_height
 
@@ -1741,7 +1783,7 @@ links (like ODF) and write PDF from that format.
         if not self._elements_to_paginate:
             #this is a self._doc where nothing has been added. Empty page.
             return True
-        elem = self._elements_to_paginate.pop(0)
+        elem = self._elements_to_paginate.popleft()
         (e1, e2), e1_h = elem.divide(layout,
                                      page_width,
                                      self._available_height,
@@ -1754,7 +1796,7 @@ links (like ODF) and write PDF from that format.
 
         # if elem was divided remember the second half to be processed
         if e2 is not None:
-            self._elements_to_paginate.insert(0, e2)
+            self._elements_to_paginate.appendleft(e2)
 
         # calculate how much space left on current page
         self._available_height -= e1_h
@@ -1766,6 +1808,34 @@ links (like ODF) and write PDF from that format.
 
         return len(self._elements_to_paginate) == 0
 
+    def paginate_complete(self, layout, page_width, page_height,
+                          dpi_x, dpi_y, last=False):
+        """Paginate the document level elements that are complete.
+
+        All the elements are complete but the last one, which may still be
+        written to, unless last is True. The complete elements are removed
+        from the meta document, and the pages that are full are removed from
+        the list of pages and returned. The last page stays in the list, to
+        be continued, unless last is True.
+
+        """
+        if not self._pages:
+            self._pages.append(GtkDocDocument())
+            self._available_height = page_height
+        children = self._doc.get_children()
+        complete = len(children) if last else len(children) - 1
+        if complete > 0:
+            self._elements_to_paginate.extend(children[:complete])
+            self._doc._children = children[complete:]
+            while not self.paginate(layout, page_width, page_height,
+                                    dpi_x, dpi_y):
+                pass
+        if last:
+            full_pages, self._pages = self._pages, []
+        else:
+            full_pages, self._pages = self._pages[:-1], self._pages[-1:]
+        return full_pages
+
     def draw_page(self, page_nr, cr, layout, width, height, dpi_x, dpi_y):
         """Draw a page on a Cairo context.
         """
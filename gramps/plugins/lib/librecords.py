@@ -27,6 +27,7 @@
 #
 #------------------------------------------------------------------------
 import datetime
+import heapq
 
 #------------------------------------------------------------------------
 #
@@ -109,293 +110,395 @@ def find_records(db, filter, top_size, callname,
     :param living_mode: enable optional control of living people's records
     :type living_mode: int
     """
+    finder = RecordFinder(db, filter, top_size, callname,
+                          trans_text=trans_text, name_format=name_format,
+                          living_mode=living_mode, user=user)
+    for dummy in finder.iter_find():
+        pass
+    return finder.records
 
-    def get_unfiltered_person_from_handle(person_handle):
-        if living_mode == LivingProxyDb.MODE_INCLUDE_ALL:
-            return db.get_person_from_handle(person_handle)
+#------------------------------------------------------------------------
+#
+# _TopList
+#
+#------------------------------------------------------------------------
+class _TopList:
+    """
+    The records of a category: the entries with the top_size best values,
+    and the entries with the same value as the last of them.
+
+    The entries are grouped by value, and the values are in a heap with the
+    worst first, so that an entry is added or rejected without sorting the
+    list.
+    """
+
+    def __init__(self, top_size, highest):
+        self.top_size = top_size
+        self.highest = highest
+        self.heap = []      # values, the worst first
+        self.groups = {}    # entries of each value, in the order added
+        self.size = 0
+
+    def add(self, key, entry):
+        """
+        Add an entry with the given sort key if it is one of the best.
+        """
+        # the heap is a min-heap: negate the keys to keep the lowest
+        value = key if self.highest else -key
+        heap = self.heap
+        if value in self.groups:
+            self.groups[value].append(entry)
+        elif heap and self.size >= self.top_size and value < heap[0]:
+            return
+        else:
+            heapq.heappush(heap, value)
+            self.groups[value] = [entry]
+        self.size += 1
+        # drop the worst entries if there are enough better ones
+        while heap and self.size - len(self.groups[heap[0]]) >= self.top_size:
+            self.size -= len(self.groups.pop(heapq.heappop(heap)))
+
+    def get_entries(self):
+        """
+        Return the entries, the best first.
+        """
+        if self.highest:
+            return sorted((entry for group in self.groups.values()
+                           for entry in group), reverse=True)
+        return [entry for value in sorted(self.groups, reverse=True)
+                for entry in self.groups[value]]
+
+#------------------------------------------------------------------------
+#
+# RecordFinder
+#
+#------------------------------------------------------------------------
+class RecordFinder:
+    """
+    Find the records of all categories in one pass over the people and one
+    over the families.
+
+    The dates of birth and death and the birth children of each person are
+    only looked up once, and the best entries of each category are kept in
+    a bounded list. :meth:`iter_find` does the work step by step, so that a
+    gramplet can keep the interface responsive on large trees.
+    """
+    STEP = 100  # number of people or families between each step
+
+    def __init__(self, db, filter, top_size, callname,
+                 trans_text=glocale.translation.sgettext, name_format=None,
+                 living_mode=LivingProxyDb.MODE_INCLUDE_ALL, user=None):
+        """
+        See :func:`find_records` for the arguments.
+        """
+        self.db = db
+        self.filter = filter
+        self.top_size = top_size
+        self.callname = callname
+        self.trans_text = trans_text
+        self.name_format = name_format
+        self.living_mode = living_mode
+        self.user = user
+        self.records = None
+
+        today = datetime.date.today()
+        self.today_date = Date(today.year, today.month, today.day)
+
+        self.__lists = {}
+        self.__dates = {}
+        self.__children = {}
+        self.__alive = {}
+
+    def iter_find(self):
+        """
+        Find the records, yielding every STEP people or families. The
+        records are in the records attribute at the end, as a list of
+        (translated text, category, entries) for the categories of RECORDS.
+        """
+        self.__lists.clear()
+        person_handle_list = list(self.db.iter_person_handles())
+        if self.filter:
+            person_handle_list = self.filter.apply(self.db, person_handle_list,
+                                                   user=self.user)
+
+        for count, person_handle in enumerate(person_handle_list, 1):
+            person = self.db.get_person_from_handle(person_handle)
+            if person is not None:
+                self.__add_person(person)
+            if count % self.STEP == 0:
+                yield
+
+        filtered = set(person_handle_list) if self.filter else None
+        for count, family in enumerate(self.db.iter_families(), 1):
+            self.__add_family(family, filtered)
+            if count % self.STEP == 0:
+                yield
+
+        self.records = [(self.trans_text(text), varname,
+                         self.__lists[varname].get_entries()
+                         if varname in self.__lists else [])
+                        for (text, varname, default) in RECORDS]
+
+    def __record(self, lowest, highest, value, text, handle_type, handle):
+        """
+        Add an entry to the records of the categories with the lowest and
+        the highest values.
+        """
+        if value < 0: # ignore erroneous data
+            return # (since the data-verification tool already finds it)
+
+        if isinstance(value, Span):
+            low_value = value.minmax[0]
+            high_value = value.minmax[1]
+        else:
+            low_value = value
+            high_value = value
+
+        if lowest is not None:
+            self.__get_list(lowest, False).add(
+                high_value, (high_value, value, text, handle_type, handle))
+        if highest is not None:
+            self.__get_list(highest, True).add(
+                low_value, (low_value, value, text, handle_type, handle))
+
+    def __get_list(self, varname, highest):
+        if varname not in self.__lists:
+            self.__lists[varname] = _TopList(self.top_size, highest)
+        return self.__lists[varname]
+
+    #------------------------------------------------------------------------
+    #
+    # People
+    #
+    #------------------------------------------------------------------------
+    def __get_unfiltered_person(self, person_handle):
+        if self.living_mode == LivingProxyDb.MODE_INCLUDE_ALL:
+            return self.db.get_person_from_handle(person_handle)
         else: # we are in the proxy so get the person before proxy changes
-            return db.get_unfiltered_person(person_handle)
-
-    today = datetime.date.today()
-    today_date = Date(today.year, today.month, today.day)
-
-    # Person records
-    person_youngestliving = []
-    person_oldestliving = []
-    person_youngestdied = []
-    person_oldestdied = []
-    person_youngestmarried = []
-    person_oldestmarried = []
-    person_youngestdivorced = []
-    person_oldestdivorced = []
-    person_youngestfather = []
-    person_youngestmother = []
-    person_oldestfather = []
-    person_oldestmother = []
-    person_mostkidsfather = []
-    person_mostkidsmother = []
-    person_mostgrandkidsfather = []
-    person_mostgrandkidsmother = []
-
-    person_handle_list = db.iter_person_handles()
-
-    # the next "if" will turn person_handle_list from a generator into a
-    # list, but only when this code is called from a report (which has a
-    # filter) and not when called from a gramplet (which has no filter);
-    # so the next line drains the generator and turns it into a list
-    # always, so the gramplet can use it later, in the second loop
-    person_handle_list = list(person_handle_list)
-
-    if filter:
-        person_handle_list = filter.apply(db, person_handle_list, user=user)
-
-    for person_handle in person_handle_list:
-        person = db.get_person_from_handle(person_handle)
-        unfil_person = get_unfiltered_person_from_handle(person_handle)
-        if person is None:
-            continue
-
-        # FIXME this should check for a "fallback" birth also/instead
-        birth_ref = person.get_birth_ref()
-
-        if not birth_ref:
-            # No birth event, so we can't calculate any age.
-            continue
-
-        birth = db.get_event_from_handle(birth_ref.ref)
-        birth_date = birth.get_date_object()
-
-        death_date = _find_death_date(db, person)
-
-        if not _good_date(birth_date):
-            # Birth date unknown or incomplete, so we can't calculate any age.
-            continue
-
-        name = _get_styled_primary_name(person, callname,
-                                        trans_text=trans_text,
-                                        name_format=name_format)
-
-        if death_date is None:
-            if probably_alive(unfil_person, db):
-                # Still living, look for age records
-                _record(person_youngestliving, person_oldestliving,
-                        today_date - birth_date, name, 'Person', person_handle,
-                        top_size)
-        elif _good_date(death_date):
-            # Already died, look for age records
-            _record(person_youngestdied, person_oldestdied,
-                    death_date - birth_date, name, 'Person', person_handle,
-                    top_size)
-
-        for family_handle in person.get_family_handle_list():
-            family = db.get_family_from_handle(family_handle)
-
-            marriage_date = None
-            divorce_date = None
-            for event_ref in family.get_event_ref_list():
-                event = db.get_event_from_handle(event_ref.ref)
-                if (event.get_type().is_marriage() and
-                    (event_ref.get_role().is_family() or
-                     event_ref.get_role().is_primary())):
-                    marriage_date = event.get_date_object()
-                elif (event.get_type().is_divorce() and
-                      (event_ref.get_role().is_family() or
-                       event_ref.get_role().is_primary())):
-                    divorce_date = event.get_date_object()
-
-            if _good_date(marriage_date):
-                _record(person_youngestmarried, person_oldestmarried,
-                        marriage_date - birth_date,
-                        name, 'Person', person_handle, top_size)
+            return self.db.get_unfiltered_person(person_handle)
+
+    def __probably_alive(self, person_handle):
+        if person_handle not in self.__alive:
+            self.__alive[person_handle] = probably_alive(
+                self.__get_unfiltered_person(person_handle), self.db)
+        return self.__alive[person_handle]
+
+    def __get_dates(self, person):
+        """
+        Return the birth date and the death date of a person, or None.
+        """
+        if person.handle not in self.__dates:
+            # FIXME this should check for a "fallback" birth also/instead
+            birth_ref = person.get_birth_ref()
+            if birth_ref:
+                birth = self.db.get_event_from_handle(birth_ref.ref)
+                birth_date = birth.get_date_object()
+            else:
+                birth_date = None
+            self.__dates[person.handle] = (birth_date,
+                                           _find_death_date(self.db, person))
+        return self.__dates[person.handle]
+
+    def __get_birth_children(self, person):
+        if person.handle not in self.__children:
+            self.__children[person.handle] = get_birth_children(self.db,
+                                                                person)
+        return self.__children[person.handle]
+
+    def __get_name(self, person):
+        return _get_styled_primary_name(person, self.callname,
+                                        trans_text=self.trans_text,
+                                        name_format=self.name_format)
+
+    def __add_person(self, person):
+        db = self.db
+        person_handle = person.handle
+        name = self.__get_name(person)
+        gender = person.get_gender()
+        birth_date, death_date = self.__get_dates(person)
+
+        if _good_date(birth_date):
+            if death_date is None:
+                if self.__probably_alive(person_handle):
+                    # Still living, look for age records
+                    self.__record('person_youngestliving',
+                                  'person_oldestliving',
+                                  self.today_date - birth_date,
+                                  name, 'Person', person_handle)
+            elif _good_date(death_date):
+                # Already died, look for age records
+                self.__record('person_youngestdied', 'person_oldestdied',
+                              death_date - birth_date,
+                              name, 'Person', person_handle)
+
+            for family_handle in person.get_family_handle_list():
+                family = db.get_family_from_handle(family_handle)
+
+                marriage_date, divorce, divorce_date = \
+                    self.__get_family_dates(family)
+
+                if _good_date(marriage_date):
+                    self.__record('person_youngestmarried',
+                                  'person_oldestmarried',
+                                  marriage_date - birth_date,
+                                  name, 'Person', person_handle)
+
+                if _good_date(divorce_date):
+                    self.__record('person_youngestdivorced',
+                                  'person_oldestdivorced',
+                                  divorce_date - birth_date,
+                                  name, 'Person', person_handle)
+
+                for child_ref in family.get_child_ref_list():
+                    if gender == person.MALE:
+                        relation = child_ref.get_father_relation()
+                    elif gender == person.FEMALE:
+                        relation = child_ref.get_mother_relation()
+                    else:
+                        continue
+                    if relation != ChildRefType.BIRTH:
+                        continue
+
+                    child = db.get_person_from_handle(child_ref.ref)
+                    child_birth_date = self.__get_dates(child)[0]
+                    if not _good_date(child_birth_date):
+                        continue
+
+                    if gender == person.MALE:
+                        self.__record('person_youngestfather',
+                                      'person_oldestfather',
+                                      child_birth_date - birth_date,
+                                      name, 'Person', person_handle)
+                    elif gender == person.FEMALE:
+                        self.__record('person_youngestmother',
+                                      'person_oldestmother',
+                                      child_birth_date - birth_date,
+                                      name, 'Person', person_handle)
+
+        # the number of children doesn't care about birth or death
+        if gender == person.MALE:
+            kids, grandkids = 'person_mostkidsfather', \
+                              'person_mostgrandkidsfather'
+        elif gender == person.FEMALE:
+            kids, grandkids = 'person_mostkidsmother', \
+                              'person_mostgrandkidsmother'
+        else:
+            return
+        person_child_list = self.__get_birth_children(person)
+        self.__record(None, kids, len(person_child_list),
+                      name, 'Person', person_handle)
+        grandchildren = sum(len(self.__get_birth_children(child))
+                            for child in person_child_list)
+        self.__record(None, grandkids, grandchildren,
+                      name, 'Person', person_handle)
+
+    #------------------------------------------------------------------------
+    #
+    # Families
+    #
+    #------------------------------------------------------------------------
+    def __get_family_dates(self, family):
+        """
+        Return the marriage date, the divorce event and the divorce date of
+        a family, or None.
+        """
+        marriage_date = None
+        divorce = None
+        divorce_date = None
+        for event_ref in family.get_event_ref_list():
+            event = self.db.get_event_from_handle(event_ref.ref)
+            if (event.get_type().is_marriage() and
+                (event_ref.get_role().is_family() or
+                 event_ref.get_role().is_primary())):
+                marriage_date = event.get_date_object()
+            elif (event.get_type().is_divorce() and
+                  (event_ref.get_role().is_family() or
+                   event_ref.get_role().is_primary())):
+                divorce = event
+                divorce_date = event.get_date_object()
+        return marriage_date, divorce, divorce_date
 
-            if _good_date(divorce_date):
-                _record(person_youngestdivorced, person_oldestdivorced,
-                        divorce_date - birth_date,
-                        name, 'Person', person_handle, top_size)
-
-            for child_ref in family.get_child_ref_list():
-                if person.get_gender() == person.MALE:
-                    relation = child_ref.get_father_relation()
-                elif person.get_gender() == person.FEMALE:
-                    relation = child_ref.get_mother_relation()
-                else:
-                    continue
-                if relation != ChildRefType.BIRTH:
-                    continue
-
-                child = db.get_person_from_handle(child_ref.ref)
-
-                # FIXME this should check for a "fallback" birth also/instead
-                child_birth_ref = child.get_birth_ref()
-                if not child_birth_ref:
-                    continue
-
-                child_birth = db.get_event_from_handle(child_birth_ref.ref)
-                child_birth_date = child_birth.get_date_object()
-
-                if not _good_date(child_birth_date):
-                    continue
-
-                if person.get_gender() == person.MALE:
-                    _record(person_youngestfather, person_oldestfather,
-                            child_birth_date - birth_date,
-                            name, 'Person', person_handle, top_size)
-                elif person.get_gender() == person.FEMALE:
-                    _record(person_youngestmother, person_oldestmother,
-                            child_birth_date - birth_date,
-                            name, 'Person', person_handle, top_size)
-
-    for person_handle in person_handle_list:
-        # this "person loop" doesn't care about a person's birth or death
-        person = db.get_person_from_handle(person_handle)
-        if person is None:
-            continue
-
-        name = _get_styled_primary_name(person, callname,
-                                        trans_text=trans_text,
-                                        name_format=name_format)
-
-        person_child_list = get_birth_children(db, person)
-        if person.get_gender() == person.MALE:
-            _record(None, person_mostkidsfather,
-                    len(person_child_list),
-                    name, 'Person', person_handle, top_size)
-        elif person.get_gender() == person.FEMALE:
-            _record(None, person_mostkidsmother,
-                    len(person_child_list),
-                    name, 'Person', person_handle, top_size)
-
-        person_grandchild_list = []
-        for child in person_child_list:
-            person_grandchild_list += get_birth_children(db, child)
-        if person.get_gender() == person.MALE:
-            _record(None, person_mostgrandkidsfather,
-                    len(person_grandchild_list),
-                    name, 'Person', person_handle, top_size)
-        elif person.get_gender() == person.FEMALE:
-            _record(None, person_mostgrandkidsmother,
-                    len(person_grandchild_list),
-                    name, 'Person', person_handle, top_size)
-
-    # Family records
-    family_mostchildren = []
-    family_youngestmarried = []
-    family_oldestmarried = []
-    family_shortest = []
-    family_longest = []
-    family_smallestagediff = []
-    family_biggestagediff = []
-
-    for family in db.iter_families():
-        #family = db.get_family_from_handle(family_handle)
-        if living_mode != LivingProxyDb.MODE_INCLUDE_ALL:
+    def __add_family(self, family, filtered):
+        db = self.db
+        if self.living_mode != LivingProxyDb.MODE_INCLUDE_ALL:
             # FIXME no iter_families method in LivingProxyDb so do it this way
             family = db.get_family_from_handle(family.get_handle())
 
         father_handle = family.get_father_handle()
         if not father_handle:
-            continue
+            return
         mother_handle = family.get_mother_handle()
         if not mother_handle:
-            continue
+            return
 
         # Test if either father or mother are in filter
-        if filter:
-            # we don't want many progress reports popping up, so no user=user
-            if not filter.apply(db, [father_handle, mother_handle]):
-                continue
+        if (filtered is not None and father_handle not in filtered and
+                mother_handle not in filtered):
+            return
 
         father = db.get_person_from_handle(father_handle)
-        unfil_father = get_unfiltered_person_from_handle(father_handle)
         if father is None:
-            continue
+            return
         mother = db.get_person_from_handle(mother_handle)
-        unfil_mother = get_unfiltered_person_from_handle(mother_handle)
         if mother is None:
-            continue
-
-        name = StyledText(trans_text("%(father)s and %(mother)s")) % {
-                'father': _get_styled_primary_name(father, callname,
-                                                   trans_text=trans_text,
-                                                   name_format=name_format),
-                'mother': _get_styled_primary_name(mother, callname,
-                                                   trans_text=trans_text,
-                                                   name_format=name_format)}
-
-        if (living_mode == LivingProxyDb.MODE_INCLUDE_ALL
-            or (not probably_alive(unfil_father, db) and
-                not probably_alive(unfil_mother, db))):
-            _record(None, family_mostchildren,
-                    len(family.get_child_ref_list()),
-                    name, 'Family', family.handle, top_size)
-
-        father_birth_ref = father.get_birth_ref()
-        if father_birth_ref:
-            father_birth_date = db.get_event_from_handle(father_birth_ref.ref).get_date_object()
-        else:
-            father_birth_date = None
+            return
 
-        mother_birth_ref = mother.get_birth_ref()
-        if mother_birth_ref:
-            mother_birth_date = db.get_event_from_handle(mother_birth_ref.ref).get_date_object()
-        else:
-            mother_birth_date = None
+        name = StyledText(self.trans_text("%(father)s and %(mother)s")) % {
+            'father': self.__get_name(father),
+            'mother': self.__get_name(mother)}
+
+        if (self.living_mode == LivingProxyDb.MODE_INCLUDE_ALL
+                or (not self.__probably_alive(father_handle) and
+                    not self.__probably_alive(mother_handle))):
+            self.__record(None, 'family_mostchildren',
+                          len(family.get_child_ref_list()),
+                          name, 'Family', family.handle)
+
+        father_birth_date, father_death_date = self.__get_dates(father)
+        mother_birth_date, mother_death_date = self.__get_dates(mother)
 
         if _good_date(father_birth_date) and _good_date(mother_birth_date):
             if father_birth_date >> mother_birth_date:
-                _record(family_smallestagediff, family_biggestagediff,
-                        father_birth_date - mother_birth_date,
-                        name, 'Family', family.handle, top_size)
+                self.__record('family_smallestagediff',
+                              'family_biggestagediff',
+                              father_birth_date - mother_birth_date,
+                              name, 'Family', family.handle)
             elif mother_birth_date >> father_birth_date:
-                _record(family_smallestagediff, family_biggestagediff,
-                        mother_birth_date - father_birth_date,
-                        name, 'Family', family.handle, top_size)
-
-        marriage_date = None
-        divorce = None
-        divorce_date = None
-        for event_ref in family.get_event_ref_list():
-            event = db.get_event_from_handle(event_ref.ref)
-            if (event.get_type().is_marriage() and
-                (event_ref.get_role().is_family() or
-                 event_ref.get_role().is_primary())):
-                marriage_date = event.get_date_object()
-            if (event and event.get_type().is_divorce() and
-                (event_ref.get_role().is_family() or
-                 event_ref.get_role().is_primary())):
-                divorce = event
-                divorce_date = event.get_date_object()
+                self.__record('family_smallestagediff',
+                              'family_biggestagediff',
+                              mother_birth_date - father_birth_date,
+                              name, 'Family', family.handle)
 
-        father_death_date = _find_death_date(db, father)
-        mother_death_date = _find_death_date(db, mother)
+        marriage_date, divorce, divorce_date = self.__get_family_dates(family)
 
         if not _good_date(marriage_date):
             # Not married or marriage date unknown
-            continue
+            return
 
         if divorce is not None and not _good_date(divorce_date):
             # Divorced but date unknown or inexact
-            continue
+            return
 
-        if (not probably_alive(unfil_father, db)
+        if (not self.__probably_alive(father_handle)
                 and not _good_date(father_death_date)):
             # Father died but death date unknown or inexact
-            continue
+            return
 
-        if (not probably_alive(unfil_mother, db)
+        if (not self.__probably_alive(mother_handle)
                 and not _good_date(mother_death_date)):
             # Mother died but death date unknown or inexact
-            continue
+            return
 
         if (divorce_date is None
-            and father_death_date is None
-            and mother_death_date is None):
+                and father_death_date is None
+                and mother_death_date is None):
             # Still married and alive
-            if (probably_alive(unfil_father, db)
-                    and probably_alive(unfil_mother, db)):
-                _record(family_youngestmarried, family_oldestmarried,
-                        today_date - marriage_date,
-                        name, 'Family', family.handle, top_size)
+            if (self.__probably_alive(father_handle)
+                    and self.__probably_alive(mother_handle)):
+                self.__record('family_youngestmarried',
+                              'family_oldestmarried',
+                              self.today_date - marriage_date,
+                              name, 'Family', family.handle)
         elif (_good_date(divorce_date) or
               _good_date(father_death_date) or
               _good_date(mother_death_date)):
@@ -413,40 +516,9 @@ def find_records(db, filter, top_size, callname,
                     end = divorce_date
             duration = end - marriage_date
 
-            _record(family_shortest, family_longest,
-                    duration, name, 'Family', family.handle, top_size)
-    #python 3 workaround: assign locals to tmp so we work with runtime version
-    tmp = locals()
-    return [(trans_text(text), varname, tmp[varname])
-                for (text, varname, default) in RECORDS]
+            self.__record('family_shortest', 'family_longest',
+                          duration, name, 'Family', family.handle)
 
-def _record(lowest, highest, value, text, handle_type, handle, top_size):
-
-    if value < 0: # ignore erroneous data
-        return # (since the data-verification tool already finds it)
-
-    if isinstance(value, Span):
-        low_value = value.minmax[0]
-        high_value = value.minmax[1]
-    else:
-        low_value = value
-        high_value = value
-
-    if lowest is not None:
-        lowest.append((high_value, value, text, handle_type, handle))
-        lowest.sort(key=lambda a: a[0])   # FIXME: Ist das lambda notwendig?
-        for i in range(top_size, len(lowest)):
-            if lowest[i-1][0] < lowest[i][0]:
-                del lowest[i:]
-                break
-
-    if highest is not None:
-        highest.append((low_value, value, text, handle_type, handle))
-        highest.sort(reverse=True)
-        for i in range(top_size, len(highest)):
-            if highest[i-1][0] > highest[i][0]:
-                del highest[i:]
-                break
 
 def get_birth_children(db, person):
     """ return all the birth children of a person, in a list """
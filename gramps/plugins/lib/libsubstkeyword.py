@@ -33,6 +33,13 @@ Will return a value such as:
 Mary Smith was born on 3/28/1923.
 """
 
+#------------------------------------------------------------------------
+#
+# Python modules
+#
+#------------------------------------------------------------------------
+import re
+
 #------------------------------------------------------------------------
 #
 # Gramps modules
@@ -60,6 +67,9 @@ class TextTypes:
     separator, text, remove, display = list(range(4))
 TXT = TextTypes()
 
+# text of a line without any group, separator, variable or escaped char
+_PLAIN_TEXT = re.compile(r'[^{}<$\\]*')
+
 
 #------------------------------------------------------------------------
 #
@@ -201,6 +211,10 @@ class DateFormat(GenericFormat):
     otherwise, parse through a format string and put the date parts in
     """
 
+    def __init__(self, _in, locale=glocale, cache=None):
+        GenericFormat.__init__(self, _in, locale)
+        self._cache = cache
+
     def get_date(self, event):
         """ A helper method for retrieving a date from an event """
         if event:
@@ -208,7 +222,9 @@ class DateFormat(GenericFormat):
         return None
 
     def _default_format(self, date):
-        return self._locale.date_displayer.display(date)
+        if self._cache is None:
+            return self._locale.date_displayer.display(date)
+        return self._cache.display_date(self._locale, date)
 
     def __count_chars(self, char, max_amount):
         """ count the year/month/day codes """
@@ -333,9 +349,10 @@ class PlaceFormat(GenericFormat):
     otherwise, parse through a format string and put the place parts in
     """
 
-    def __init__(self, database, _in):
+    def __init__(self, database, _in, cache=None):
         self.database = database
         GenericFormat.__init__(self, _in)
+        self._cache = cache
 
     def get_place(self, database, event):
         """ A helper method for retrieving a place from an event """
@@ -346,7 +363,9 @@ class PlaceFormat(GenericFormat):
         return None
 
     def _default_format(self, place):
-        return _pd.display(self.database, place)
+        if self._cache is None:
+            return _pd.display(self.database, place)
+        return self._cache.display_place(self.database, place)
 
     def parse_format(self, database, place):
         """ Parse the place """
@@ -357,16 +376,10 @@ class PlaceFormat(GenericFormat):
         code = "elcuspn" + "oitxy"
         upper = code.upper()
 
-        main_loc = get_main_location(database, place)
-        location = Location()
-        location.set_street(main_loc.get(PlaceType.STREET, ''))
-        location.set_locality(main_loc.get(PlaceType.LOCALITY, ''))
-        location.set_parish(main_loc.get(PlaceType.PARISH, ''))
-        location.set_city(main_loc.get(PlaceType.CITY, ''))
-        location.set_county(main_loc.get(PlaceType.COUNTY, ''))
-        location.set_state(main_loc.get(PlaceType.STATE, ''))
-        location.set_postal_code(main_loc.get(PlaceType.STREET, ''))
-        location.set_country(main_loc.get(PlaceType.COUNTRY, ''))
+        if self._cache is None:
+            location = get_location(database, place)
+        else:
+            location = self._cache.get_location(database, place)
 
         function = [location.get_street,
                     location.get_locality,
@@ -386,6 +399,21 @@ class PlaceFormat(GenericFormat):
         return self.generic_format(place, code, upper, function)
 
 
+def get_location(database, place):
+    """ Return the Location of the main location of a place """
+    main_loc = get_main_location(database, place)
+    location = Location()
+    location.set_street(main_loc.get(PlaceType.STREET, ''))
+    location.set_locality(main_loc.get(PlaceType.LOCALITY, ''))
+    location.set_parish(main_loc.get(PlaceType.PARISH, ''))
+    location.set_city(main_loc.get(PlaceType.CITY, ''))
+    location.set_county(main_loc.get(PlaceType.COUNTY, ''))
+    location.set_state(main_loc.get(PlaceType.STATE, ''))
+    location.set_postal_code(main_loc.get(PlaceType.STREET, ''))
+    location.set_country(main_loc.get(PlaceType.COUNTRY, ''))
+    return location
+
+
 #------------------------------------------------------------------------
 # Event Format strings
 #------------------------------------------------------------------------
@@ -396,9 +424,10 @@ class EventFormat(GenericFormat):
         dates and places can have their own format strings
     """
 
-    def __init__(self, database, _in, locale):
+    def __init__(self, database, _in, locale, cache=None):
         self.database = database
         GenericFormat.__init__(self, _in, locale)
+        self._cache = cache
 
     def _default_format(self, event):
         if event is None:
@@ -425,12 +454,13 @@ class EventFormat(GenericFormat):
 
         def format_date():
             """ start formatting a date in this event """
-            date_format = DateFormat(self.string_in, self._locale)
+            date_format = DateFormat(self.string_in, self._locale, self._cache)
             return date_format.parse_format(date_format.get_date(event))
 
         def format_place():
             """ start formatting a place in this event """
-            place_format = PlaceFormat(self.database, self.string_in)
+            place_format = PlaceFormat(self.database, self.string_in,
+                                       self._cache)
             place = place_format.get_place(self.database, event)
             return place_format.parse_format(self.database, place)
 
@@ -520,9 +550,10 @@ class GalleryFormat(GenericFormat):
         dates (no places) can have their own format strings
     """
 
-    def __init__(self, database, _in, locale):
+    def __init__(self, database, _in, locale, cache=None):
         self.database = database
         GenericFormat.__init__(self, _in, locale)
+        self._cache = cache
 
     def _default_format(self, photo):
         if photo is None:
@@ -549,7 +580,7 @@ class GalleryFormat(GenericFormat):
 
         def format_date():
             """ start formatting a date in this photo """
-            date_format = DateFormat(self.string_in, self._locale)
+            date_format = DateFormat(self.string_in, self._locale, self._cache)
             return date_format.parse_format(date_format.get_date(photo))
 
         def format_attrib():
@@ -593,31 +624,37 @@ class ConsumableString:
 
     This will contain the string to be parsed.  or string in.
     There will only be one of these for each processed line.
+
+    The string is not copied as it is consumed: only the position of its
+    first char is moved, so each step is done in constant time.
     """
     def __init__(self, string):
         self.__this_string = string
+        self.__length = len(string)
+        self.__index = 0
         self.__setup()
 
     def __setup(self):
         """ update class attributes this and next """
-        if len(self.__this_string) > 0:
-            self.this = self.__this_string[0]
+        index = self.__index
+        if index < self.__length:
+            self.this = self.__this_string[index]
         else:
             self.this = None
-        if len(self.__this_string) > 1:
-            self.next = self.__this_string[1]
+        if index + 1 < self.__length:
+            self.next = self.__this_string[index + 1]
         else:
             self.next = None
 
     def step(self):
         """ remove the first char from the string """
-        self.__this_string = self.__this_string[1:]
+        self.__index += 1
         self.__setup()
         return self.this
 
     def step2(self):
         """ remove the first two chars from the string """
-        self.__this_string = self.__this_string[2:]
+        self.__index += 2
         self.__setup()
         return self.this
 
@@ -658,6 +695,17 @@ class ConsumableString:
             return rtrn
         return ''
 
+    def parse_plain_text(self):
+        """ return/remove a char of text, and the plain text after it, up to
+        the next char that may start something else """
+        rtrn = self.parse_format()
+        match = _PLAIN_TEXT.match(self.__this_string, self.__index)
+        if match.end() > self.__index:
+            rtrn += match.group()
+            self.__index = match.end()
+            self.__setup()
+        return rtrn
+
 
 #------------------------------------------------------------------------
 #
@@ -819,6 +867,7 @@ class VariableParse:
         self._in = consumer_in
         self._locale = locale
         self._nd = name_displayer
+        self._cache = friend.cache
 
     def is_a(self):
         """ check """
@@ -849,6 +898,14 @@ class VariableParse:
                 return event
         return None
 
+    def get_event(self, key, get_event, *args):
+        """ get an event with get_event(args), once for each key, as the
+        same event can be in more than one variable of the lines """
+        events = self.friend.events
+        if key not in events:
+            events[key] = get_event(*args)
+        return events[key]
+
     def empty_item(self, item):
         """ return false if there is a valid item(date or place).
         Otherwise
@@ -877,7 +934,7 @@ class VariableParse:
         """ sub to process a date
         Given an event, get the date object, process the format,
         return the result """
-        date_f = DateFormat(self._in, self._locale)
+        date_f = DateFormat(self._in, self._locale, self._cache)
         date = date_f.get_date(event)
         if self.empty_item(date):
             return
@@ -887,7 +944,7 @@ class VariableParse:
         """ sub to process a date
         Given an event, get the place object, process the format,
         return the result """
-        place_f = PlaceFormat(self.database, self._in)
+        place_f = PlaceFormat(self.database, self._in, self._cache)
         place = place_f.get_place(self.database, event)
         if self.empty_item(place):
             return
@@ -904,9 +961,12 @@ class VariableParse:
         else:
             return
 
-    def __parse_event(self, person, attrib_parse):
-        event = self.get_event_by_name(person, attrib_parse.get_name())
-        event_f = EventFormat(self.database, self._in, self._locale)
+    def __parse_event(self, key, person, attrib_parse):
+        name = attrib_parse.get_name()
+        event = self.get_event((key, name), self.get_event_by_name,
+                               person, name)
+        event_f = EventFormat(self.database, self._in, self._locale,
+                              self._cache)
         if event:
             return event_f.parse_format(event)
         else:
@@ -925,7 +985,8 @@ class VariableParse:
         return None
 
     def __parse_photo(self, person_or_marriage):
-        photo_f = GalleryFormat(self.database, self._in, self._locale)
+        photo_f = GalleryFormat(self.database, self._in, self._locale,
+                                self._cache)
         if person_or_marriage is None:
             return photo_f.parse_empty()
         photo = self.__get_photo(person_or_marriage)
@@ -962,27 +1023,29 @@ class VariableParse:
             if self.empty_item(self.friend.person):
                 return
             return self.__parse_date(
-                get_birth_or_fallback(self.friend.database, self.friend.person))
+                self.get_event('birth', get_birth_or_fallback,
+                               self.friend.database, self.friend.person))
         elif next_char == "d":
             #Person's Death date
             if self.empty_item(self.friend.person):
                 return
             return self.__parse_date(
-                get_death_or_fallback(self.friend.database, self.friend.person))
+                self.get_event('death', get_death_or_fallback,
+                               self.friend.database, self.friend.person))
         elif next_char == "m":
             #Marriage date
             if self.empty_item(self.friend.family):
                 return
             return self.__parse_date(
-                self.get_event_by_type(self.friend.family,
-                                       EventType.MARRIAGE))
+                self.get_event(EventType.MARRIAGE, self.get_event_by_type,
+                               self.friend.family, EventType.MARRIAGE))
         elif next_char == "v":
             #Divorce date
             if self.empty_item(self.friend.family):
                 return
             return self.__parse_date(
-                self.get_event_by_type(self.friend.family,
-                                       EventType.DIVORCE))
+                self.get_event(EventType.DIVORCE, self.get_event_by_type,
+                               self.friend.family, EventType.DIVORCE))
         elif next_char == "T":
             #Todays date
             date_f = DateFormat(self._in)
@@ -997,27 +1060,29 @@ class VariableParse:
             if self.empty_item(self.friend.person):
                 return
             return self.__parse_place(
-                get_birth_or_fallback(self.friend.database, self.friend.person))
+                self.get_event('birth', get_birth_or_fallback,
+                               self.friend.database, self.friend.person))
         elif next_char == "D":
             #Person's death place
             if self.empty_item(self.friend.person):
                 return
             return self.__parse_place(
-                get_death_or_fallback(self.friend.database, self.friend.person))
+                self.get_event('death', get_death_or_fallback,
+                               self.friend.database, self.friend.person))
         elif next_char == "M":
             #Marriage place
             if self.empty_item(self.friend.family):
                 return
             return self.__parse_place(
-                self.get_event_by_type(self.friend.family,
-                                       EventType.MARRIAGE))
+                self.get_event(EventType.MARRIAGE, self.get_event_by_type,
+                               self.friend.family, EventType.MARRIAGE))
         elif next_char == "V":
             #Divorce place
             if self.empty_item(self.friend.family):
                 return
             return self.__parse_place(
-                self.get_event_by_type(self.friend.family,
-                                       EventType.DIVORCE))
+                self.get_event(EventType.DIVORCE, self.get_event_by_type,
+                               self.friend.family, EventType.DIVORCE))
 
         elif next_char == "a":
             #Person's Atribute
@@ -1034,10 +1099,12 @@ class VariableParse:
 
         elif next_char == "e":
             #person event
-            return self.__parse_event(self.friend.person, attrib_parse)
+            return self.__parse_event(next_char, self.friend.person,
+                                      attrib_parse)
         elif next_char == "t":
             #family event
-            return self.__parse_event(self.friend.family, attrib_parse)
+            return self.__parse_event(next_char, self.friend.family,
+                                      attrib_parse)
 
         elif next_char == 'p':
             #photo for the person
@@ -1051,6 +1118,45 @@ class VariableParse:
             return gramps_format.parse_format()
 
 
+#------------------------------------------------------------------------
+#
+# DisplayCache
+#
+#------------------------------------------------------------------------
+class DisplayCache:
+    """The dates and places as displayed without a format string, and the
+    main locations of the places, kept to be shared by the SubstKeywords of
+    all of the boxes of a report.
+
+    Only use it with one database and locale, while they are not changed.
+    """
+    def __init__(self):
+        self.dates = {}
+        self.places = {}
+        self.locations = {}
+
+    def display_date(self, locale, date):
+        """ return the date as set in preferences """
+        key = date.serialize()
+        if key not in self.dates:
+            self.dates[key] = locale.date_displayer.display(date)
+        return self.dates[key]
+
+    def display_place(self, database, place):
+        """ return the place as set in preferences """
+        handle = place.get_handle()
+        if handle not in self.places:
+            self.places[handle] = _pd.display(database, place)
+        return self.places[handle]
+
+    def get_location(self, database, place):
+        """ return the Location of the main location of the place """
+        handle = place.get_handle()
+        if handle not in self.locations:
+            self.locations[handle] = get_location(database, place)
+        return self.locations[handle]
+
+
 #------------------------------------------------------------------------
 #
 # SubstKeywords
@@ -1069,9 +1175,12 @@ class SubstKeywords:
         family_handle
             this will specify the specific family/spouse to work with.
             If none given, then the first/preferred family/spouse is used
+        cache
+            The DisplayCache shared with the other displays of a report.
+            If none given, the dates and places are only kept for this one.
     """
     def __init__(self, database, locale, name_displayer,
-                 person_handle, family_handle=None):
+                 person_handle, family_handle=None, cache=None):
         """get the person and find the family/spouse to use for this display"""
 
         self.database = database
@@ -1080,6 +1189,10 @@ class SubstKeywords:
         self.line = None   # Consumable_string - set below
         self._locale = locale
         self._nd = name_displayer
+        if cache is None:
+            cache = DisplayCache()
+        self.cache = cache
+        self.events = {}   # events of the person/family, see get_event
 
         self.person = None
         if person_handle is not None:
@@ -1170,7 +1283,7 @@ class SubstKeywords:
                 curr_var.add_separator(self.line.text_to_next(">"))
 
             else:  #regular text
-                curr_var.add_text(self.line.parse_format())
+                curr_var.add_text(self.line.parse_plain_text())
 
         #the stack is for groups/subgroup and may contain items
         #if the user does not close his/her {}
@@ -29,7 +29,8 @@
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 from gramps.gen.plug.report import utils
-from gramps.plugins.lib.libsubstkeyword import SubstKeywords
+from gramps.gen.proxy.cache import CacheProxyDb
+from gramps.plugins.lib.libsubstkeyword import SubstKeywords, DisplayCache
 from gramps.gen.plug.docgen import (IndexMark, INDEX_TYPE_TOC)
 
 PT2CM = utils.pt2cm
@@ -45,9 +46,14 @@ class CalcLines:
 
     Receive:  Individual and family handle, and display format [string]
     return: [Text] ready for a box.
+
+    The people, families, events and places, and the displayed dates and
+    places, are shared by all of the boxes, as they are often in more than
+    one of them (a family in the boxes of both spouses).
     """
     def __init__(self, dbase, repl, locale, name_displayer):
-        self.database = dbase
+        self.database = CacheProxyDb(dbase)
+        self.cache = DisplayCache()
         self.display_repl = repl
         #self.default_string = default_str
         self._locale = locale
@@ -63,7 +69,7 @@ class CalcLines:
         ####################
         #1.1  Get our line information here
         subst = SubstKeywords(self.database, self._locale, self._nd,
-                              _indi_handle, _fams_handle)
+                              _indi_handle, _fams_handle, self.cache)
         lines = subst.replace_and_clean(workinglines)
 
         ####################
@@ -439,7 +445,7 @@ class Canvas(Page):
 
             line = box1.line_to
 
-            pages = [box1.page.y_page_num]
+            pages = {box1.page.y_page_num}
 
             end = line.start + line.end
 
@@ -456,7 +462,7 @@ class Canvas(Page):
                                         x_page_offsets[x_page],
                                         page_y_top[y_page])
                     self.__pages[x_page, y_page].add_line(box1.line_to)
-                    pages.append(y_page)
+                    pages.add(y_page)
 
                 if y_page < start_y_page:
                     start_y_page = y_page
@@ -836,13 +842,31 @@ class LineBase:
         #self.linestr = "None"
         self.start = [start]
         self.end = []
+        self.__pages = None
 
     def add_from(self, person):
         self.start.append(person)
+        self.__pages = None
 
     def add_to(self, person):
         """ add destination boxes to draw this line to """
         self.end.append(person)
+        self.__pages = None
+
+    def __get_pages(self):
+        """ returns the top and bottom (y_cm) of the vertical line, and
+        the start and end boxes by the y page they are on.  A line can be
+        on many pages, so this is only done once, after the pagination """
+        if self.__pages is None:
+            mid = [box.y_cm + box.height/2 for box in self.start + self.end]
+            starts = {}
+            for box in self.start:
+                starts.setdefault(box.page.y_page_num, []).append(box)
+            ends = {}
+            for box in self.end:
+                ends.setdefault(box.page.y_page_num, []).append(box)
+            self.__pages = (min(mid), max(mid), starts, ends)
+        return self.__pages
 
     def display(self, page):
         """ display the line.  left to right line.  one start, multiple end.
@@ -864,22 +888,18 @@ class LineBase:
         x34 = xbegin + (report_opts.col_width * 3/4)
         xend = xbegin + report_opts.col_width
 
+        top, bottom, starts, ends = self.__get_pages()
+
         if x34 > 0:  # > 0 tell us we are printing on this page.
             usable_height = doc.get_usable_height()
             #1 - Line from start box out
-            for box in self.start:
+            for box in starts.get(page.y_page_num, []):
                 yme = box.y_cm + box.height/2 - page.page_y_offset
-                if box.page.y_page_num == page.y_page_num:
-                    # and 0 < yme < usable_height and \
-                    doc.draw_line(linestr, xbegin, yme, x34, yme)
+                # and 0 < yme < usable_height and \
+                doc.draw_line(linestr, xbegin, yme, x34, yme)
 
             #2 - vertical line
-            mid = []
-            for box in self.start + self.end:
-                tmp = box.y_cm + box.height/2
-                mid.append(tmp)
-            mid.sort()
-            mid = [mid[0]-page.page_y_offset, mid[-1]-page.page_y_offset]
+            mid = [top-page.page_y_offset, bottom-page.page_y_offset]
             if mid[0] < 0:
                 mid[0] = 0
             if mid[1] > usable_height:
@@ -890,10 +910,9 @@ class LineBase:
             x34 = 0
 
         #3 - horizontal line(s)
-        for box in self.end:
-            if box.page.y_page_num == page.y_page_num:
-                yme = box.y_cm + box.height/2 - box.page.page_y_offset
-                doc.draw_line(linestr, x34, yme, xend, yme)
+        for box in ends.get(page.y_page_num, []):
+            yme = box.y_cm + box.height/2 - box.page.page_y_offset
+            doc.draw_line(linestr, x34, yme, xend, yme)
 
 
 #------------------------------------------------------------------------
@@ -0,0 +1,1285 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2008       Brian G. Matherly
+# Copyright (C) 2010       Jakim Friant
+# Copyright (C) 2011       Paul Franklin
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+The rules of the Verify tool, and the engine that tests them.
+
+The engine collects the facts that the rules test (the dates of the events
+of the people, their families, the parents and children of the families) in
+a single pass over the events, people and families, and tests all the rules
+against these facts. It keeps the facts and the results, so that the data
+can be verified again after changes by testing only the people and families
+whose facts depend on the changed objects.
+"""
+
+#------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.sgettext
+from gramps.gen.lib import (ChildRefType, EventRoleType, EventType,
+                            FamilyRelType, NameType, Person)
+from gramps.gen.lib.date import Today
+from gramps.gen.utils.db import family_name
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+_today = Today().get_sort_value()
+
+# the options of the Verify tool, with their default values
+DEFAULT_OPTIONS = {
+    'oldage'       : 90,
+    'hwdif'        : 30,
+    'cspace'       : 8,
+    'cbspan'       : 25,
+    'yngmar'       : 17,
+    'oldmar'       : 50,
+    'oldmom'       : 48,
+    'yngmom'       : 17,
+    'yngdad'       : 18,
+    'olddad'       : 65,
+    'wedder'       : 3,
+    'mxchildmom'   : 12,
+    'mxchilddad'   : 15,
+    'lngwdw'       : 30,
+    'oldunm'       : 99,
+    'estimate_age' : 0,
+    'invdate'      : 1,
+}
+
+#-------------------------------------------------------------------------
+#
+# The facts that the rules test
+#
+#-------------------------------------------------------------------------
+def _event_facts(event):
+    """
+    The facts about an event: its type, the sort value of its date if the
+    date is complete (or 0), the sort value of its date, and whether the date
+    is valid.
+    """
+    date = event.get_date_object()
+    sort_value = date.get_sort_value()
+    if date.get_day() == 0 or date.get_month() == 0:
+        exact = 0
+    else:
+        exact = sort_value
+    return (int(event.get_type()), exact, sort_value, date.get_valid())
+
+class PersonFacts:
+    """
+    The facts about a person that the rules test.
+
+    The dates are the sort values of the dates, or 0; they are kept both as
+    (exact, estimated) pairs: an exact date must have a day and a month.
+    """
+    __slots__ = ('handle', 'gramps_id', 'name', 'gender', 'name_type',
+                 'surname', 'birth', 'bapt', 'death', 'bury', 'dead',
+                 'invalid_birth', 'invalid_death', 'parent_families',
+                 'families')
+
+    def __init__(self, person, events):
+        """
+        Collect the facts about a person.
+
+        :param person: The person.
+        :param events: The facts about the events, by handle.
+        """
+        self.handle = person.handle
+        self.gramps_id = person.gramps_id
+        name = person.get_primary_name()
+        self.name = name.get_name()
+        self.name_type = int(name.get_type())
+        self.surname = name.get_surname()
+        self.gender = person.get_gender()
+        self.parent_families = person.get_parent_family_handle_list()
+        self.families = person.get_family_handle_list()
+
+        self.birth = self.death = (0, 0)
+        self.invalid_birth = self.invalid_death = False
+        birth_ref = person.get_birth_ref()
+        if birth_ref and birth_ref.ref in events:
+            dummy, exact, sort_value, valid = events[birth_ref.ref]
+            self.birth = (exact, sort_value)
+            self.invalid_birth = not valid
+        death_ref = person.get_death_ref()
+        self.dead = bool(death_ref)
+        if death_ref and death_ref.ref in events:
+            dummy, exact, sort_value, valid = events[death_ref.ref]
+            self.death = (exact, sort_value)
+            self.invalid_death = not valid
+
+        # the first baptism, and the first burial as primary
+        self.bapt = (0, 0)
+        self.bury = None
+        found_bapt = False
+        for event_ref in person.get_event_ref_list():
+            if event_ref.ref not in events:
+                continue
+            event_type, exact, sort_value, dummy = events[event_ref.ref]
+            if event_type == EventType.BURIAL:
+                if (self.bury is None
+                        and event_ref.get_role() == EventRoleType.PRIMARY):
+                    self.bury = (exact, sort_value)
+            elif event_type == EventType.BAPTISM and not found_bapt:
+                self.bapt = (exact, sort_value)
+                found_bapt = True
+
+    def get_birth_date(self, estimate=False):
+        """ get the birth date (or baptism date if 'estimated') """
+        if not estimate:
+            return self.birth[0]
+        return self.birth[1] or self.bapt[1]
+
+    def get_bapt_date(self, estimate=False):
+        """ get the baptism date """
+        return self.bapt[1] if estimate else self.bapt[0]
+
+    def get_death_date(self, estimate=False):
+        """ get the death date (or burial date if 'estimated') """
+        if not estimate:
+            return self.death[0]
+        if self.death[1] == 0 and self.bury is not None:
+            return self.bury[1]
+        return self.death[1]
+
+    def get_bury_date(self, estimate=False):
+        """ get the burial date, or None if there is no burial """
+        if self.bury is None:
+            return None
+        return self.bury[1] if estimate else self.bury[0]
+
+    def get_age_at_death(self, estimate):
+        """ get the age at death, in days """
+        birth_date = self.get_birth_date(estimate)
+        death_date = self.get_death_date(estimate)
+        if (birth_date > 0) and (death_date > 0):
+            return death_date - birth_date
+        return 0
+
+class FamilyFacts:
+    """
+    The facts about a family that the rules test.
+    """
+    __slots__ = ('handle', 'gramps_id', 'father', 'mother', 'relationship',
+                 'marriage', 'children')
+
+    def __init__(self, family, events):
+        """
+        Collect the facts about a family.
+
+        :param family: The family.
+        :param events: The facts about the events, by handle.
+        """
+        self.handle = family.handle
+        self.gramps_id = family.gramps_id
+        self.father = family.get_father_handle()
+        self.mother = family.get_mother_handle()
+        self.relationship = int(family.get_relationship())
+        self.children = [(child_ref.ref, int(child_ref.get_mother_relation()),
+                          int(child_ref.get_father_relation()))
+                         for child_ref in family.get_child_ref_list()]
+        # the date of the first marriage
+        self.marriage = 0
+        for event_ref in family.get_event_ref_list():
+            if event_ref.ref not in events:
+                continue
+            event_type, dummy, sort_value, dummy = events[event_ref.ref]
+            if (event_type == EventType.MARRIAGE
+                    and event_ref.get_role() in (EventRoleType.FAMILY,
+                                                 EventRoleType.PRIMARY)):
+                self.marriage = sort_value
+                break
+
+#-------------------------------------------------------------------------
+#
+# The engine
+#
+#-------------------------------------------------------------------------
+class Verifier:
+    """
+    Verify the people and families of a database against the rules.
+
+    The first run collects the facts about all the events, people and
+    families. The objects that are added, changed or removed afterwards are
+    given to :meth:`object_changed`, and the next run collects their facts
+    again and tests only the people and families that depend on them. When
+    the options change, all the objects are tested again against the facts
+    that are kept.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.events = None
+        self.people = None
+        self.families = None
+        self._changed = {'Event': set(), 'Person': set(), 'Family': set()}
+        self._options = None
+        self._person_results = {}
+        self._family_results = {}
+
+    def object_changed(self, obj_type, handles):
+        """
+        Record that objects were added, changed or removed.
+
+        :param obj_type: 'Event', 'Person' or 'Family'.
+        :param handles: The handles of the objects.
+        """
+        if self.events is not None:
+            self._changed[obj_type].update(handles)
+
+    def get_person(self, handle):
+        """ Return the facts about a person, or None """
+        return self.people.get(handle) if handle else None
+
+    def get_family(self, handle):
+        """ Return the facts about a family, or None """
+        return self.families.get(handle) if handle else None
+
+    def get_mother(self, family):
+        """ Return the facts about the mother of a family, or None """
+        return self.get_person(family.mother)
+
+    def get_father(self, family):
+        """ Return the facts about the father of a family, or None """
+        return self.get_person(family.father)
+
+    def get_n_children(self, person):
+        """ Return the number of children of the families of a person """
+        number = 0
+        for family_handle in person.families:
+            family = self.get_family(family_handle)
+            if family:
+                number += len(family.children)
+        return number
+
+    def get_child_birth_dates(self, family, estimate):
+        """ Return the known birth dates of the children of a family """
+        dates = []
+        for child_handle, dummy, dummy in family.children:
+            child = self.get_person(child_handle)
+            if child:
+                child_birth_date = child.get_birth_date(estimate)
+                if child_birth_date > 0:
+                    dates.append(child_birth_date)
+        return dates
+
+    def run(self, options, callback=None):
+        """
+        Verify the data, and return the results.
+
+        :param options: The options of the rules, as in DEFAULT_OPTIONS.
+        :param callback: Called once for each person and family whose facts
+                         are collected, to show the progress.
+        :returns: The list of the results, as returned by
+                  :meth:`Rule.report_itself`.
+        """
+        if self.events is None:
+            self._collect(callback)
+            people, families = list(self.people), list(self.families)
+        else:
+            people, families = self._update(callback)
+        options = dict(options)
+        if options != self._options:
+            self._options = options
+            people, families = list(self.people), list(self.families)
+
+        person_rules, family_rules = make_rules(self, options)
+        self._verify(people, self.people, person_rules, self._person_results)
+        self._verify(families, self.families, family_rules,
+                     self._family_results)
+        return [result
+                for results in (self._person_results, self._family_results)
+                for object_results in results.values()
+                for result in object_results]
+
+    def _collect(self, callback):
+        """ Collect the facts about all the objects """
+        self.events = {event.handle: _event_facts(event)
+                       for event in self.db.iter_events()}
+        self.people = {}
+        for person in self.db.iter_people():
+            self.people[person.handle] = PersonFacts(person, self.events)
+            if callback:
+                callback()
+        self.families = {}
+        for family in self.db.iter_families():
+            self.families[family.handle] = FamilyFacts(family, self.events)
+            if callback:
+                callback()
+
+    def _update(self, callback):
+        """
+        Collect the facts about the changed objects, and return the people
+        and the families to verify again.
+        """
+        db = self.db
+        people = self._changed['Person']
+        families = self._changed['Family']
+        for handle in self._changed['Event']:
+            if db.has_event_handle(handle):
+                event = db.get_event_from_handle(handle)
+                self.events[handle] = _event_facts(event)
+                for obj_type, obj_handle in db.find_backlink_handles(
+                        handle, ['Person', 'Family']):
+                    if obj_type == 'Person':
+                        people.add(obj_handle)
+                    else:
+                        families.add(obj_handle)
+            else:
+                self.events.pop(handle, None)
+
+        todo_people = set(people)
+        todo_families = set(families)
+        for handle in people:
+            facts = [self.people.pop(handle, None)]
+            if db.has_person_handle(handle):
+                person = db.get_person_from_handle(handle)
+                self.people[handle] = PersonFacts(person, self.events)
+                facts.append(self.people[handle])
+            # the family rules test the parents and the children
+            for person in facts:
+                if person:
+                    todo_families.update(person.families)
+                    todo_families.update(person.parent_families)
+            if callback:
+                callback()
+        for handle in families:
+            facts = [self.families.pop(handle, None)]
+            if db.has_family_handle(handle):
+                family = db.get_family_from_handle(handle)
+                self.families[handle] = FamilyFacts(family, self.events)
+                facts.append(self.families[handle])
+            # the person rules test the children and marriages of the parents
+            for family in facts:
+                if family:
+                    todo_people.update(parent for parent in (family.father,
+                                                             family.mother)
+                                       if parent)
+            if callback:
+                callback()
+        for changed in self._changed.values():
+            changed.clear()
+        return todo_people, todo_families
+
+    def _verify(self, handles, facts, rules, results):
+        """ Test the objects against the rules, and keep the results """
+        for handle in handles:
+            obj = facts.get(handle)
+            if obj is None:
+                results.pop(handle, None)
+                continue
+            object_results = [rule.report_itself(obj) for rule in rules
+                              if rule.broken(obj)]
+            if object_results:
+                results[handle] = object_results
+            else:
+                results.pop(handle, None)
+
+def make_rules(verifier, options):
+    """
+    Return the person rules and the family rules, with the options.
+    """
+    est = options['estimate_age']
+    person_rules = [
+        BirthAfterBapt(verifier),
+        DeathBeforeBapt(verifier),
+        BirthAfterBury(verifier),
+        DeathAfterBury(verifier),
+        BirthAfterDeath(verifier),
+        BaptAfterBury(verifier),
+        OldAge(verifier, options['oldage'], est),
+        OldAgeButNoDeath(verifier, options['oldage'], est),
+        UnknownGender(verifier),
+        MultipleParents(verifier),
+        MarriedOften(verifier, options['wedder']),
+        OldUnmarried(verifier, options['oldunm'], est),
+        TooManyChildren(verifier, options['mxchilddad'],
+                        options['mxchildmom']),
+        Disconnected(verifier),
+        InvalidBirthDate(verifier, options['invdate']),
+        InvalidDeathDate(verifier, options['invdate']),
+        BirthEqualsDeath(verifier),
+        BirthEqualsMarriage(verifier),
+        DeathEqualsMarriage(verifier),
+        ]
+    family_rules = [
+        SameSexFamily(verifier),
+        FemaleHusband(verifier),
+        MaleWife(verifier),
+        SameSurnameFamily(verifier),
+        LargeAgeGapFamily(verifier, options['hwdif'], est),
+        MarriageBeforeBirth(verifier, est),
+        MarriageAfterDeath(verifier, est),
+        EarlyMarriage(verifier, options['yngmar'], est),
+        LateMarriage(verifier, options['oldmar'], est),
+        OldParent(verifier, options['oldmom'], options['olddad'], est),
+        YoungParent(verifier, options['yngmom'], options['yngdad'], est),
+        UnbornParent(verifier, est),
+        DeadParent(verifier, est),
+        LargeChildrenSpan(verifier, options['cbspan'], est),
+        LargeChildrenAgeDiff(verifier, options['cspace'], est),
+        MarriedRelation(verifier),
+        ]
+    return person_rules, family_rules
+
+#-------------------------------------------------------------------------
+#
+# Rules
+#
+#-------------------------------------------------------------------------
+class Rule:
+    """
+    Basic class for use in this tool.
+
+    Other rules must inherit from this. A rule is tested against the facts
+    about each object, as kept by the :class:`Verifier`.
+    """
+    ID = 0
+    TYPE = ''
+
+    ERROR = 1
+    WARNING = 2
+
+    SEVERITY = WARNING
+
+    def __init__(self, verifier):
+        """ initialize the rule """
+        self.verifier = verifier
+
+    def broken(self, obj):
+        """
+        Return boolean indicating whether this rule is violated.
+        """
+        return False
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        assert False, "Need to be overriden in the derived class"
+
+    def get_name(self, obj):
+        """ return the person's primary name or the name of the family """
+        assert False, "Need to be overriden in the derived class"
+
+    def get_rule_id(self):
+        """ return the rule's identification number, and parameters """
+        params = self._get_params()
+        return (self.ID, params)
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return tuple()
+
+    def report_itself(self, obj):
+        """ return the details about a rule """
+        return (self.get_message(obj), obj.gramps_id, self.get_name(obj),
+                self.TYPE, self.get_rule_id(), self.SEVERITY, obj.handle)
+
+class PersonRule(Rule):
+    """
+    Person-based class.
+    """
+    TYPE = 'Person'
+    def get_name(self, obj):
+        """ return the person's primary name """
+        return obj.name
+
+class FamilyRule(Rule):
+    """
+    Family-based class.
+    """
+    TYPE = 'Family'
+    def get_name(self, obj):
+        """ return the name of the family """
+        db = self.verifier.db
+        return family_name(db.get_family_from_handle(obj.handle), db)
+
+class ParentRule(FamilyRule):
+    """
+    Family-based class, for the rules that test each parent against each
+    child.
+    """
+    def broken_parent(self, obj):
+        """
+        Return 'father' or 'mother' for the first parent that violates this
+        rule, or None.
+        """
+        return None
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return self.broken_parent(obj) is not None
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        if self.broken_parent(obj) == 'father':
+            return self.father_message()
+        return self.mother_message()
+
+#-------------------------------------------------------------------------
+#
+# Actual rules for testing
+#
+#-------------------------------------------------------------------------
+class BirthAfterBapt(PersonRule):
+    """ test if a person was baptised before their birth """
+    ID = 1
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.get_birth_date()
+        bapt_date = obj.get_bapt_date()
+        return birth_date > 0 and bapt_date > 0 and birth_date > bapt_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Baptism before birth")
+
+class DeathBeforeBapt(PersonRule):
+    """ test if a person died before their baptism """
+    ID = 2
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        death_date = obj.get_death_date()
+        bapt_date = obj.get_bapt_date()
+        return death_date > 0 and bapt_date > 0 and bapt_date > death_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Death before baptism")
+
+class BirthAfterBury(PersonRule):
+    """ test if a person was buried before their birth """
+    ID = 3
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.get_birth_date()
+        bury_date = obj.get_bury_date()
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return birth_date > 0 and bury_ok and birth_date > bury_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Burial before birth")
+
+class DeathAfterBury(PersonRule):
+    """ test if a person was buried before their death """
+    ID = 4
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        death_date = obj.get_death_date()
+        bury_date = obj.get_bury_date()
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return death_date > 0 and bury_ok and death_date > bury_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Burial before death")
+
+class BirthAfterDeath(PersonRule):
+    """ test if a person died before their birth """
+    ID = 5
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.get_birth_date()
+        death_date = obj.get_death_date()
+        return birth_date > 0 and death_date > 0 and birth_date > death_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Death before birth")
+
+class BaptAfterBury(PersonRule):
+    """ test if a person was buried before their baptism """
+    ID = 6
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        bapt_date = obj.get_bapt_date()
+        bury_date = obj.get_bury_date()
+        bury_ok = bury_date > 0 if bury_date is not None else False
+        return bapt_date > 0 and bury_ok and bapt_date > bury_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Burial before baptism")
+
+class OldAge(PersonRule):
+    """ test if a person died beyond the age the user has set """
+    ID = 7
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, old_age, est):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self.old_age = old_age
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_age, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        age_at_death = obj.get_age_at_death(self.est)
+        return age_at_death / 365 > self.old_age
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Old age at death")
+
+class UnknownGender(PersonRule):
+    """ test if a person is neither a male nor a female """
+    ID = 8
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return obj.gender not in (Person.MALE, Person.FEMALE)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Unknown gender")
+
+class MultipleParents(PersonRule):
+    """ test if a person belongs to multiple families """
+    ID = 9
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return len(obj.parent_families) > 1
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Multiple parents")
+
+class MarriedOften(PersonRule):
+    """ test if a person was married 'often' """
+    ID = 10
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, wedder):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self.wedder = wedder
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.wedder,)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return len(obj.families) > self.wedder
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Married often")
+
+class OldUnmarried(PersonRule):
+    """ test if a person was married when they died """
+    ID = 11
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, old_unm, est):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self.old_unm = old_unm
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_unm, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        age_at_death = obj.get_age_at_death(self.est)
+        return age_at_death / 365 > self.old_unm and not obj.families
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Old and unmarried")
+
+class TooManyChildren(PersonRule):
+    """ test if a person had 'too many' children """
+    ID = 12
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, mx_child_dad, mx_child_mom):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self.mx_child_dad = mx_child_dad
+        self.mx_child_mom = mx_child_mom
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.mx_child_dad, self.mx_child_mom)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        if obj.gender == Person.MALE:
+            return self.verifier.get_n_children(obj) > self.mx_child_dad
+        if obj.gender == Person.FEMALE:
+            return self.verifier.get_n_children(obj) > self.mx_child_mom
+        return False
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Too many children")
+
+class SameSexFamily(FamilyRule):
+    """ test if a family's parents are both male or both female """
+    ID = 13
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = self.verifier.get_mother(obj)
+        father = self.verifier.get_father(obj)
+        return bool(mother and father and mother.gender == father.gender
+                    and mother.gender != Person.UNKNOWN)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Same sex marriage")
+
+class FemaleHusband(FamilyRule):
+    """ test if a family's 'husband' is female """
+    ID = 14
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        father = self.verifier.get_father(obj)
+        return bool(father and father.gender == Person.FEMALE)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Female husband")
+
+class MaleWife(FamilyRule):
+    """ test if a family's 'wife' is male """
+    ID = 15
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = self.verifier.get_mother(obj)
+        return bool(mother and mother.gender == Person.MALE)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Male wife")
+
+class SameSurnameFamily(FamilyRule):
+    """ test if a family's parents were born with the same surname """
+    ID = 16
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = self.verifier.get_mother(obj)
+        father = self.verifier.get_father(obj)
+        # Make sure both mother and father exist, compare only birth names
+        # (not married names), and empty names don't count.
+        return bool(mother and father
+                    and mother.name_type == NameType.BIRTH
+                    and father.name_type == NameType.BIRTH
+                    and mother.surname
+                    and mother.surname == father.surname)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Husband and wife with the same surname")
+
+class LargeAgeGapFamily(FamilyRule):
+    """ test if a family's parents were born far apart """
+    ID = 17
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, hw_diff, est):
+        """ initialize the rule """
+        FamilyRule.__init__(self, verifier)
+        self.hw_diff = hw_diff
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.hw_diff, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        mother = self.verifier.get_mother(obj)
+        father = self.verifier.get_father(obj)
+        if not (mother and father):
+            return False
+        mother_birth_date = mother.get_birth_date(self.est)
+        father_birth_date = father.get_birth_date(self.est)
+        return (mother_birth_date > 0 and father_birth_date > 0 and
+                abs(father_birth_date - mother_birth_date) / 365 >
+                self.hw_diff)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Large age difference between spouses")
+
+class MarriageRule(FamilyRule):
+    """
+    Family-based class, for the rules that test the marriage date against
+    the dates of the parents.
+    """
+    def __init__(self, verifier, est):
+        """ initialize the rule """
+        FamilyRule.__init__(self, verifier)
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def parent_broken(self, marr_date, parent):
+        """ return boolean indicating whether a parent violates this rule """
+        return False
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        marr_date = obj.marriage
+        if marr_date <= 0:
+            return False
+        for parent in (self.verifier.get_father(obj),
+                       self.verifier.get_mother(obj)):
+            if parent and self.parent_broken(marr_date, parent):
+                return True
+        return False
+
+class MarriageBeforeBirth(MarriageRule):
+    """ test if each family's parent was born before the marriage """
+    ID = 18
+    SEVERITY = Rule.ERROR
+    def parent_broken(self, marr_date, parent):
+        """ return boolean indicating whether a parent violates this rule """
+        birth_date = parent.get_birth_date(self.est)
+        return birth_date > 0 and birth_date > marr_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Marriage before birth")
+
+class MarriageAfterDeath(MarriageRule):
+    """ test if each family's parent died before the marriage """
+    ID = 19
+    SEVERITY = Rule.ERROR
+    def parent_broken(self, marr_date, parent):
+        """ return boolean indicating whether a parent violates this rule """
+        death_date = parent.get_death_date(self.est)
+        return death_date > 0 and death_date < marr_date
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Marriage after death")
+
+class EarlyMarriage(MarriageRule):
+    """ test if each family's parent was 'too young' at the marriage """
+    ID = 20
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, yng_mar, est):
+        """ initialize the rule """
+        MarriageRule.__init__(self, verifier, est)
+        self.yng_mar = yng_mar
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.yng_mar, self.est,)
+
+    def parent_broken(self, marr_date, parent):
+        """ return boolean indicating whether a parent violates this rule """
+        birth_date = parent.get_birth_date(self.est)
+        return (birth_date > 0 and birth_date < marr_date and
+                (marr_date - birth_date) / 365 < self.yng_mar)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Early marriage")
+
+class LateMarriage(MarriageRule):
+    """ test if each family's parent was 'too old' at the marriage """
+    ID = 21
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, old_mar, est):
+        """ initialize the rule """
+        MarriageRule.__init__(self, verifier, est)
+        self.old_mar = old_mar
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_mar, self.est)
+
+    def parent_broken(self, marr_date, parent):
+        """ return boolean indicating whether a parent violates this rule """
+        birth_date = parent.get_birth_date(self.est)
+        return (birth_date > 0 and
+                (marr_date - birth_date) / 365 > self.old_mar)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Late marriage")
+
+class OldParent(ParentRule):
+    """ test if each family's parent was 'too old' at a child's birth """
+    ID = 22
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, old_mom, old_dad, est):
+        """ initialize the rule """
+        ParentRule.__init__(self, verifier)
+        self.old_mom = old_mom
+        self.old_dad = old_dad
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_mom, self.old_dad, self.est)
+
+    def broken_parent(self, obj):
+        """ return the first parent that violates this rule, or None """
+        father = self.verifier.get_father(obj)
+        mother = self.verifier.get_mother(obj)
+        father_birth_date = father.get_birth_date(self.est) if father else 0
+        mother_birth_date = mother.get_birth_date(self.est) if mother else 0
+        for child_birth_date in self.verifier.get_child_birth_dates(obj,
+                                                                    self.est):
+            if (father_birth_date > 0 and
+                    (child_birth_date - father_birth_date) / 365 >
+                    self.old_dad):
+                return 'father'
+            if (mother_birth_date > 0 and
+                    (child_birth_date - mother_birth_date) / 365 >
+                    self.old_mom):
+                return 'mother'
+        return None
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Old father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Old mother")
+
+class YoungParent(ParentRule):
+    """ test if each family's parent was 'too young' at a child's birth """
+    ID = 23
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, yng_mom, yng_dad, est):
+        """ initialize the rule """
+        ParentRule.__init__(self, verifier)
+        self.yng_dad = yng_dad
+        self.yng_mom = yng_mom
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.yng_mom, self.yng_dad, self.est)
+
+    def broken_parent(self, obj):
+        """ return the first parent that violates this rule, or None """
+        father = self.verifier.get_father(obj)
+        mother = self.verifier.get_mother(obj)
+        father_birth_date = father.get_birth_date(self.est) if father else 0
+        mother_birth_date = mother.get_birth_date(self.est) if mother else 0
+        for child_birth_date in self.verifier.get_child_birth_dates(obj,
+                                                                    self.est):
+            if (father_birth_date > 0 and
+                    (child_birth_date - father_birth_date) / 365 <
+                    self.yng_dad):
+                return 'father'
+            if (mother_birth_date > 0 and
+                    (child_birth_date - mother_birth_date) / 365 <
+                    self.yng_mom):
+                return 'mother'
+        return None
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Young father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Young mother")
+
+class UnbornParent(ParentRule):
+    """ test if each family's parent was not yet born at a child's birth """
+    ID = 24
+    SEVERITY = Rule.ERROR
+    def __init__(self, verifier, est):
+        """ initialize the rule """
+        ParentRule.__init__(self, verifier)
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken_parent(self, obj):
+        """ return the first parent that violates this rule, or None """
+        father = self.verifier.get_father(obj)
+        mother = self.verifier.get_mother(obj)
+        father_birth_date = father.get_birth_date(self.est) if father else 0
+        mother_birth_date = mother.get_birth_date(self.est) if mother else 0
+        for child_birth_date in self.verifier.get_child_birth_dates(obj,
+                                                                    self.est):
+            if father_birth_date > 0 and father_birth_date > child_birth_date:
+                return 'father'
+            if mother_birth_date > 0 and mother_birth_date > child_birth_date:
+                return 'mother'
+        return None
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Unborn father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Unborn mother")
+
+class DeadParent(ParentRule):
+    """ test if each family's parent was dead at a child's birth """
+    ID = 25
+    SEVERITY = Rule.ERROR
+    def __init__(self, verifier, est):
+        """ initialize the rule """
+        ParentRule.__init__(self, verifier)
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.est,)
+
+    def broken_parent(self, obj):
+        """ return the first parent that violates this rule, or None """
+        father = self.verifier.get_father(obj)
+        mother = self.verifier.get_mother(obj)
+        father_death_date = father.get_death_date(self.est) if father else 0
+        mother_death_date = mother.get_death_date(self.est) if mother else 0
+        for child_handle, mrel, frel in obj.children:
+            child = self.verifier.get_person(child_handle)
+            if not child:
+                continue
+            child_birth_date = child.get_birth_date(self.est)
+            if child_birth_date <= 0:
+                continue
+            if (frel == ChildRefType.BIRTH and father_death_date > 0
+                    and (father_death_date + 294) < child_birth_date):
+                return 'father'
+            if (mrel == ChildRefType.BIRTH and mother_death_date > 0
+                    and mother_death_date < child_birth_date):
+                return 'mother'
+        return None
+
+    def father_message(self):
+        """ return the rule's error message """
+        return _("Dead father")
+
+    def mother_message(self):
+        """ return the rule's error message """
+        return _("Dead mother")
+
+class LargeChildrenSpan(FamilyRule):
+    """ test if a family's first and last children were born far apart """
+    ID = 26
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, cb_span, est):
+        """ initialize the rule """
+        FamilyRule.__init__(self, verifier)
+        self.cbs = cb_span
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.cbs, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        child_birth_dates = self.verifier.get_child_birth_dates(obj, self.est)
+        return bool(child_birth_dates and
+                    (max(child_birth_dates) - min(child_birth_dates)) / 365 >
+                    self.cbs)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Large year span for all children")
+
+class LargeChildrenAgeDiff(FamilyRule):
+    """ test if any of a family's children were born far apart """
+    ID = 27
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, c_space, est):
+        """ initialize the rule """
+        FamilyRule.__init__(self, verifier)
+        self.c_space = c_space
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.c_space, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        child_birth_dates = self.verifier.get_child_birth_dates(obj, self.est)
+        child_birth_dates_diff = [child_birth_dates[i+1] - child_birth_dates[i]
+                                  for i in range(len(child_birth_dates)-1)]
+        return bool(child_birth_dates_diff and
+                    max(child_birth_dates_diff) / 365 > self.c_space)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Large age differences between children")
+
+class Disconnected(PersonRule):
+    """ test if a person has no children and no parents """
+    ID = 28
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return not (obj.parent_families or obj.families)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Disconnected individual")
+
+class InvalidBirthDate(PersonRule):
+    """ test if a person has an 'invalid' birth date """
+    ID = 29
+    SEVERITY = Rule.ERROR
+    def __init__(self, verifier, invdate):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self._invdate = invdate
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return bool(self._invdate and obj.invalid_birth)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Invalid birth date")
+
+class InvalidDeathDate(PersonRule):
+    """ test if a person has an 'invalid' death date """
+    ID = 30
+    SEVERITY = Rule.ERROR
+    def __init__(self, verifier, invdate):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self._invdate = invdate
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return bool(self._invdate and obj.invalid_death)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Invalid death date")
+
+class MarriedRelation(FamilyRule):
+    """ test if a family has a marriage date but is not marked 'married' """
+    ID = 31
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        return (obj.marriage > 0
+                and obj.relationship != FamilyRelType.MARRIED)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Marriage date but not married")
+
+class OldAgeButNoDeath(PersonRule):
+    """ test if a person is 'too old' but is not shown as dead """
+    ID = 32
+    SEVERITY = Rule.WARNING
+    def __init__(self, verifier, old_age, est):
+        """ initialize the rule """
+        PersonRule.__init__(self, verifier)
+        self.old_age = old_age
+        self.est = est
+
+    def _get_params(self):
+        """ return the rule's parameters """
+        return (self.old_age, self.est)
+
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.get_birth_date(self.est)
+        # or burial date
+        if obj.dead or obj.get_death_date(True) or not birth_date:
+            return False
+        return (_today - birth_date) / 365 > self.old_age
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Old age but no death")
+
+class BirthEqualsDeath(PersonRule):
+    """ test if a person's birth date is the same as their death date """
+    ID = 33
+    SEVERITY = Rule.WARNING
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        birth_date = obj.get_birth_date()
+        return birth_date > 0 and birth_date == obj.get_death_date()
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Birth equals death")
+
+class BirthEqualsMarriage(PersonRule):
+    """ test if a person's birth date is the same as their marriage date """
+    ID = 34
+    SEVERITY = Rule.ERROR
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        # only the first family is tested
+        family = self.verifier.get_family(obj.families[0]
+                                          if obj.families else None)
+        birth_date = obj.get_birth_date()
+        return bool(family and birth_date > 0
+                    and birth_date == family.marriage)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Birth equals marriage")
+
+class DeathEqualsMarriage(PersonRule):
+    """ test if a person's death date is the same as their marriage date """
+    ID = 35
+    SEVERITY = Rule.WARNING # it's possible
+    def broken(self, obj):
+        """ return boolean indicating whether this rule is violated """
+        # only the first family is tested
+        family = self.verifier.get_family(obj.families[0]
+                                          if obj.families else None)
+        death_date = obj.get_death_date()
+        return bool(family and death_date > 0
+                    and death_date == family.marriage)
+
+    def get_message(self, obj):
+        """ return the rule's error message """
+        return _("Death equals marriage")
@@ -67,6 +67,7 @@ from .selectionlayer import SelectionLayer
 from .placeselection import PlaceSelection
 from .cairoprint import CairoPrintSave
 from .libkml import Kml
+from .spatialindex import SpatialIndex
 gi.require_version('OsmGpsMap', '1.0')
 _ = glocale.translation.sgettext
 
@@ -92,6 +93,15 @@ GEOGRAPHY_PATH = os.path.join(HOME_DIR, "maps")
 PLACE_REGEXP = re.compile('<span background="green">(.*)</span>')
 PLACE_STRING = '<span background="green">%s</span>'
 
+# the digits of the coordinates compared and the distance in degrees to a
+# marker clicked, depending on the zoom.
+_PRECISION = {1 : 0, 2 : 1, 3 : 1, 4 : 1, 5 : 2, 6 : 2, 7 : 2, 8 : 3, 9 : 3,
+              10 : 3, 11 : 3, 12 : 3, 13 : 3, 14 : 4, 15 : 4, 16 : 4, 17 : 4,
+              18 : 4}
+_SHIFT = {1 : 5.0, 2 : 5.0, 3 : 3.0, 4 : 1.0, 5 : 0.5, 6 : 0.3, 7 : 0.15,
+          8 : 0.06, 9 : 0.03, 10 : 0.015, 11 : 0.005, 12 : 0.003, 13 : 0.001,
+          14 : 0.0005, 15 : 0.0003, 16 : 0.0001, 17 : 0.0001, 18 : 0.0001}
+
 def _get_sign(value):
     """
     return 1 if we have a negative number, 0 in other case
@@ -166,6 +176,9 @@ class GeoGraphyView(OsmGps, NavigationView):
         self.geo_altmap = theme.load_surface('gramps-geo-altmap', 48, 1,
                                              None, 0)
         self.sort = []
+        self._marker_index = None
+        self._indexed_sort = None
+        self._place_coordinates = None
         self.geo_othermap = {}
         for ident in (EventType.BIRTH,
                       EventType.DEATH,
@@ -289,6 +302,7 @@ class GeoGraphyView(OsmGps, NavigationView):
         from self.state.db
         """
         dummy_dbse = dbse
+        self._place_coordinates = None
         if self.active:
             self.bookmarks.redraw()
         self.build_tree()
@@ -480,49 +494,47 @@ class GeoGraphyView(OsmGps, NavigationView):
     # Markers management
     #
     #-------------------------------------------------------------------------
+    def _get_marker_index(self):
+        """
+        Return the spatial index of the markers, built once for each list
+        of markers.
+        """
+        if self._marker_index is None or self._indexed_sort is not self.sort:
+            self._marker_index = SpatialIndex()
+            for position, mark in enumerate(self.sort):
+                self._marker_index.add(mark[3], mark[4], position)
+            self._indexed_sort = self.sort
+        return self._marker_index
+
     def is_there_a_marker_here(self, event, lat, lon):
         """
         Is there a marker at this position ?
         """
-        found = False
         mark_selected = []
         self.uistate.set_busy_cursor(True)
-        for mark in self.sort:
-            # as we are not precise with our hand, reduce the precision
-            # depending on the zoom.
-            precision = {1 : '%3.0f', 2 : '%3.1f', 3 : '%3.1f', 4 : '%3.1f',
-                         5 : '%3.2f', 6 : '%3.2f', 7 : '%3.2f', 8 : '%3.3f',
-                         9 : '%3.3f', 10 : '%3.3f', 11 : '%3.3f', 12 : '%3.3f',
-                         13 : '%3.3f', 14 : '%3.4f', 15 : '%3.4f', 16 : '%3.4f',
-                         17 : '%3.4f', 18 : '%3.4f'
-                        }.get(config.get("geography.zoom"), '%3.1f')
-            shift = {1 : 5.0, 2 : 5.0, 3 : 3.0,
-                     4 : 1.0, 5 : 0.5, 6 : 0.3, 7 : 0.15,
-                     8 : 0.06, 9 : 0.03, 10 : 0.015,
-                     11 : 0.005, 12 : 0.003, 13 : 0.001,
-                     14 : 0.0005, 15 : 0.0003, 16 : 0.0001,
-                     17 : 0.0001, 18 : 0.0001
-                    }.get(config.get("geography.zoom"), 5.0)
-            latp = precision % lat
-            lonp = precision % lon
-            mlatp = precision % float(mark[3])
-            mlonp = precision % float(mark[4])
-            latok = lonok = False
+        # as we are not precise with our hand, reduce the precision
+        # depending on the zoom.
+        zoom = config.get("geography.zoom")
+        digits = _PRECISION.get(zoom, 1)
+        precision = '%%3.%df' % digits
+        shift = _SHIFT.get(zoom, 5.0)
+        latp = float(precision % lat)
+        lonp = float(precision % lon)
+        # the rounding moves the click and the markers by half a digit
+        found = self._get_marker_index().nearby(lat, lon,
+                                                shift + 10.0 ** -digits)
+        for mlat, mlon, position in sorted(found, key=lambda entry: entry[2]):
+            mark = self.sort[position]
+            mlatp = float(precision % mlat)
+            mlonp = float(precision % mlon)
             _LOG.debug(" compare latitude : %s with %s (precision = %s)"
-                       " place='%s'", float(mark[3]), lat, precision, mark[0])
+                       " place='%s'", mlat, lat, precision, mark[0])
             _LOG.debug("compare longitude : %s with %s (precision = %s)"
-                       " zoom=%d", float(mark[4]), lon, precision,
-                       config.get("geography.zoom"))
-            if (float(mlatp) >= (float(latp) - shift)) and \
-               (float(mlatp) <= (float(latp) + shift)):
-                latok = True
-            if (float(mlonp) >= (float(lonp) - shift)) and \
-               (float(mlonp) <= (float(lonp) + shift)):
-                lonok = True
-            if latok and lonok:
+                       " zoom=%d", mlon, lon, precision, zoom)
+            if (latp - shift <= mlatp <= latp + shift and
+                    lonp - shift <= mlonp <= lonp + shift):
                 mark_selected.append(mark)
-                found = True
-        if found:
+        if mark_selected:
             self.bubble_message(event, lat, lon, mark_selected)
         self.uistate.set_busy_cursor(False)
 
@@ -585,12 +597,28 @@ class GeoGraphyView(OsmGps, NavigationView):
         """
         self.marker_layer.clear_markers()
 
+    @property
+    def place_list(self):
+        """
+        The places shown on the map, with the values of each field searched
+        by _present_in_places_list.
+        """
+        return self._place_list
+
+    @place_list.setter
+    def place_list(self, place_list):
+        # the views start a new list for each map: forget the searched values
+        self._place_list = place_list
+        self._place_keys = {}
+
     def _present_in_places_list(self, index, string):
         """
         Search a string in place_list depending index
         """
-        found = any(p[index] == string for p in self.place_list)
-        return found
+        if index not in self._place_keys:
+            self._place_keys[index] = set(place[index]
+                                          for place in self._place_list)
+        return string in self._place_keys[index]
 
     def _append_to_places_list(self, place, evttype, name, lat,
                                longit, descr, year, icontype,
@@ -608,11 +636,14 @@ class GeoGraphyView(OsmGps, NavigationView):
             # In this case, filter the places ...
             self.nbplaces += 1
             self.places_found.append([place, lat, longit])
-        self.place_list.append([place, name, evttype, lat,
-                                longit, descr, year, icontype,
-                                gramps_id, place_id, event_id, family_id,
-                                color
-                               ])
+        entry = [place, name, evttype, lat,
+                 longit, descr, year, icontype,
+                 gramps_id, place_id, event_id, family_id,
+                 color
+                ]
+        self.place_list.append(entry)
+        for index, keys in self._place_keys.items():
+            keys.add(entry[index])
         self.nbmarkers += 1
         tfa = float(lat)
         tfb = float(longit)
@@ -642,6 +673,24 @@ class GeoGraphyView(OsmGps, NavigationView):
             self.place_without_coordinates.append([gid, place])
             self.without += 1
 
+    def get_place_coordinates(self, place):
+        """
+        Return the latitude and longitude of a place as strings, in the
+        'D.D8' format of conv_lat_lon, or (None, None) if it has no valid
+        coordinates. The coordinates of all the places are read at once
+        from the database, and again when the places change.
+        """
+        hierarchy = self.dbstate.db.get_place_hierarchy()
+        generation = hierarchy.generation if hierarchy else None
+        if (self._place_coordinates is None or
+                self._place_coordinates[0] != generation):
+            self._place_coordinates = (
+                generation, self.dbstate.db.get_place_coordinates())
+        coordinates = self._place_coordinates[1].get(place.handle)
+        if coordinates is None:
+            return (None, None)
+        return ("%.8f" % coordinates[0], "%.8f" % coordinates[1])
+
     def _create_markers(self):
         """
         Create all markers for the specified person.
@@ -50,6 +50,7 @@ _LOG = logging.getLogger("maps.markerlayer")
 # Gramps Modules
 #
 #-------------------------------------------------------------------------
+from .spatialindex import SpatialIndex
 
 #-------------------------------------------------------------------------
 #
@@ -69,13 +70,21 @@ except:
 class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
     """
     This is the layer used to display the markers.
+
+    Only the markers in the visible part of the map are drawn. Up to
+    CLUSTER_ZOOM, the markers closer than CLUSTER_SIZE pixels are drawn as
+    one marker, for all their references.
     """
+    CLUSTER_ZOOM = 6
+    CLUSTER_SIZE = 24
+
     def __init__(self):
         """
         Initialize the layer
         """
         GObject.GObject.__init__(self)
         self.markers = []
+        self.index = SpatialIndex()
         self.max_references = 0
         self.max_places = 0
         self.nb_ref_by_places = 0
@@ -87,6 +96,7 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         reset the layer attributes.
         """
         self.markers = []
+        self.index.clear()
         self.max_references = 0
         self.max_places = 0
         self.nb_ref_by_places = 0
@@ -100,6 +110,7 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         Set the average value too.
         We calculate that here, to minimize the overhead at markers drawing
         """
+        self.index.add(points[0], points[1], len(self.markers))
         self.markers.append((points, image, count, color))
         self.max_references += count
         self.max_places += 1
@@ -123,10 +134,9 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
             min_interval = 0.01
         _LOG.debug("%s", time.strftime("start drawing   : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
-        for marker in self.markers:
+        for marker, mark in self.get_visible_markers(gpsmap):
             # the icon size in 48, so the standard icon size is 0.6 * 48 = 28.8
             size = 0.6
-            mark = float(marker[2])
             if mark > self.nb_ref_by_places or max_interval > 3:
                 # at maximum, we'll have an icon size = (0.6 + 0.2) * 48 = 38.4
                 size += (0.2 * ((mark - self.nb_ref_by_places)
@@ -161,6 +171,42 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         _LOG.debug("%s", time.strftime("end drawing     : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
 
+    def get_visible_markers(self, gpsmap):
+        """
+        Return the markers to draw, with their count of references, in the
+        order they were added.
+        """
+        pt1, pt2 = gpsmap.get_bbox()
+        lat1, lon1 = pt1.get_degrees()
+        lat2, lon2 = pt2.get_degrees()
+        # the icons are drawn above their position: keep the markers just
+        # outside the map.
+        margin = abs(lat1 - lat2) / 4
+        if lon1 > lon2:
+            # the map shows the antimeridian
+            entries = self.index.query(lat1 + margin, -180.0,
+                                       lat2 - margin, 180.0)
+        else:
+            entries = self.index.query(lat1 + margin, lon1 - margin,
+                                       lat2 - margin, lon2 + margin)
+        if gpsmap.props.zoom <= self.CLUSTER_ZOOM and len(entries) > 1:
+            # the width of a tile of 256 pixels is 360 / 2 ** zoom degrees
+            size = 360.0 * self.CLUSTER_SIZE / 256 / 2 ** gpsmap.props.zoom
+            visible = []
+            for group in self.index.cluster(size, entries):
+                markers = [self.markers[position]
+                           for dummy, dummy, position in group]
+                # the marker with the most references represents the group
+                first = min(position for dummy, dummy, position in group)
+                marker = max(markers, key=lambda marker: marker[2])
+                count = sum(float(marker[2]) for marker in markers)
+                visible.append((first, marker, min(count, self.max_value)))
+            visible.sort(key=lambda entry: entry[0])
+            return [(marker, count) for dummy, marker, count in visible]
+        return [(self.markers[position], float(self.markers[position][2]))
+                for dummy, dummy, position in sorted(
+                    entries, key=lambda entry: entry[2])]
+
     def do_render(self, gpsmap):
         """
         render the layer
@@ -0,0 +1,121 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Grid index of the markers of the geography views, by their coordinates.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+from math import floor
+
+#-------------------------------------------------------------------------
+#
+# SpatialIndex
+#
+#-------------------------------------------------------------------------
+class SpatialIndex:
+    """
+    The items of a map, in cells of cell_size degrees by their latitude and
+    longitude in decimal degrees.
+
+    The coordinates are converted to float once, when the items are added,
+    so that the items near a point, or in a region of the map, are found
+    without looking at the other ones.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all the items.
+        """
+        self.cells = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __cell(self, lat, lon):
+        return (floor(lat / self.cell_size), floor(lon / self.cell_size))
+
+    def add(self, lat, lon, item):
+        """
+        Add an item at a position. The latitude and longitude can be strings,
+        as returned by :func:`.conv_lat_lon`.
+        """
+        lat = float(lat)
+        lon = float(lon)
+        self.cells.setdefault(self.__cell(lat, lon), []).append((lat, lon,
+                                                                  item))
+        self.count += 1
+
+    def __entries(self, lat1, lon1, lat2, lon2):
+        """
+        Yield the (lat, lon, item) of the cells that overlap the region.
+        """
+        row1, col1 = self.__cell(lat1, lon1)
+        row2, col2 = self.__cell(lat2, lon2)
+        if (row2 - row1 + 1) * (col2 - col1 + 1) > len(self.cells):
+            # a large region: look at the cells that have items
+            for (row, col), entries in self.cells.items():
+                if row1 <= row <= row2 and col1 <= col <= col2:
+                    yield from entries
+        else:
+            for row in range(row1, row2 + 1):
+                for col in range(col1, col2 + 1):
+                    yield from self.cells.get((row, col), ())
+
+    def query(self, lat1, lon1, lat2, lon2):
+        """
+        Return the (lat, lon, item) of the items in a region, bounds
+        included, in the order they were added in each cell.
+        """
+        lat1, lat2 = min(lat1, lat2), max(lat1, lat2)
+        lon1, lon2 = min(lon1, lon2), max(lon1, lon2)
+        return [(lat, lon, item)
+                for (lat, lon, item) in self.__entries(lat1, lon1, lat2, lon2)
+                if lat1 <= lat <= lat2 and lon1 <= lon <= lon2]
+
+    def nearby(self, lat, lon, shift):
+        """
+        Return the (lat, lon, item) of the items at most shift degrees away
+        from a position in latitude and in longitude.
+        """
+        return self.query(lat - shift, lon - shift, lat + shift, lon + shift)
+
+    def cluster(self, size, entries=None):
+        """
+        Return the (lat, lon, item) of the items, or of the given entries,
+        in groups of size degrees. The groups are returned in the order of
+        their first item.
+        """
+        if entries is None:
+            entries = (entry for cell in self.cells.values() for entry in cell)
+        groups = {}
+        for entry in entries:
+            key = (floor(entry[0] / size), floor(entry[1] / size))
+            groups.setdefault(key, []).append(entry)
+        return list(groups.values())
@@ -0,0 +1,208 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the records of librecords.py """
+
+import os
+import random
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.filters import GenericFilter
+from gramps.gen.filters.rules.person import IsDescendantOf
+from gramps.gen.proxy import LivingProxyDb
+from gramps.gen.user import User
+from gramps.plugins.lib.librecords import (RECORDS, _TopList, RecordFinder,
+                                           find_records)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+TOP_SIZE = 3
+
+# the categories of the lowest values, the others are of the highest values
+LOWEST = {'person_youngestliving', 'person_youngestdied',
+          'person_youngestmarried', 'person_youngestdivorced',
+          'person_youngestfather', 'person_youngestmother',
+          'family_youngestmarried', 'family_shortest',
+          'family_smallestagediff'}
+
+
+def sorted_top(entries, top_size, highest):
+    """
+    The records as they were found by sorting all the entries: the first
+    top_size entries, and the following ones with the same value as the
+    last of them.
+    """
+    if highest:
+        entries = sorted(entries, reverse=True)
+    else:
+        entries = sorted(entries, key=lambda entry: entry[0])
+    for i in range(top_size, len(entries)):
+        if entries[i-1][0] != entries[i][0]:
+            return entries[:i]
+    return entries
+
+
+def values(entries):
+    return [(entry[0], str(entry[1]), entry[3], entry[4])
+            for entry in entries]
+
+
+class TopListTest(unittest.TestCase):
+    """
+    A _TopList keeps the entries found by sorting all of them.
+    """
+
+    def check(self, entries, top_size, highest):
+        top_list = _TopList(top_size, highest)
+        for entry in entries:
+            top_list.add(entry[0], entry)
+        self.assertEqual(top_list.get_entries(),
+                         sorted_top(entries, top_size, highest))
+
+    def test_ties(self):
+        entries = [(5, 'a'), (1, 'b'), (3, 'c'), (3, 'd'), (2, 'e'),
+                   (3, 'f'), (4, 'g'), (1, 'h')]
+        for highest in (False, True):
+            for top_size in range(1, len(entries) + 2):
+                self.check(entries, top_size, highest)
+
+    def test_boundary(self):
+        # the third best value is shared by the entries after it
+        lowest = _TopList(3, False)
+        highest = _TopList(3, True)
+        for value, text in [(4, 'a'), (7, 'b'), (1, 'c'), (2, 'd'),
+                            (7, 'e'), (4, 'f'), (4, 'g'), (2, 'h')]:
+            lowest.add(value, (value, text))
+            highest.add(value, (value, text))
+        self.assertEqual(lowest.get_entries(),
+                         [(1, 'c'), (2, 'd'), (2, 'h')])
+        self.assertEqual(highest.get_entries(),
+                         [(7, 'e'), (7, 'b'), (4, 'g'), (4, 'f'), (4, 'a')])
+
+    def test_random(self):
+        rand = random.Random(36)
+        for dummy in range(200):
+            entries = [(rand.randint(0, 10), n)
+                       for n in range(rand.randint(0, 30))]
+            self.check(entries, rand.randint(1, 8), rand.random() < 0.5)
+
+
+class RecordsTest(unittest.TestCase):
+    """
+    The records of the example database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def get_records(self, db, filter, top_size, living_mode):
+        return [(varname, entries) for (text, varname, entries)
+                in find_records(db, filter, top_size, 0,
+                                living_mode=living_mode)]
+
+    def check(self, db, filter=None,
+              living_mode=LivingProxyDb.MODE_INCLUDE_ALL):
+        """
+        Compare the records with those found by sorting all the entries, and
+        return the value, the span, the type and the handle of the entries
+        of each category.
+        """
+        records = self.get_records(db, filter, TOP_SIZE, living_mode)
+        self.assertEqual([varname for (varname, entries) in records],
+                         [varname for (text, varname, default) in RECORDS])
+        everything = self.get_records(db, filter, 1000000, living_mode)
+        result = {}
+        for (varname, entries), (dummy, all_entries) in zip(records,
+                                                            everything):
+            result[varname] = values(entries)
+            self.assertEqual(result[varname],
+                             values(sorted_top(all_entries, TOP_SIZE,
+                                               varname not in LOWEST)),
+                             varname)
+        return result
+
+    def test_records(self):
+        records = self.check(self.db)
+        handles = {varname: [entry[3] for entry in entries]
+                   for varname, entries in records.items()}
+        # ties at the boundary of the lowest values
+        self.assertEqual([entry[0] for entry
+                          in records['person_youngestdied']], [0, 0, 0, 0])
+        self.assertEqual(sorted(handles['person_youngestdied']),
+                         ['5MKKQCKO30LMTM0ENC', 'E8MKQCQG98F3EWBN65',
+                          'N7MKQCIKM9VD7A4ZJU', 'VUNKQCD6MLN8VGJJIT'])
+        # ties at the boundary of the highest values
+        self.assertEqual([entry[0] for entry
+                          in records['person_mostkidsmother']],
+                         [16, 13, 12, 12, 12])
+        self.assertEqual(handles['person_mostkidsmother'][:2],
+                         ['GBUJQC4VGB46GGF31U', 'STTJQC8EDV5PN031EQ'])
+        self.assertEqual([entry[0] for entry
+                          in records['family_mostchildren']],
+                         [16, 13, 12, 12, 12])
+        self.assertEqual(handles['person_oldestdied'],
+                         ['LW4KQCI6NR543UDCSL', 'BA5KQCEM6C344FS3HI',
+                          '2C2KQCYKETRCKNEUIK'])
+        self.assertEqual(handles['person_youngestfather'],
+                         ['3LEKQCRF3FD2E1H73I', 'VGTJQCIJ2KKM9FCTI3',
+                          'GU3KQC5J7J2EYNGFM8'])
+        self.assertEqual(handles['person_mostgrandkidsfather'],
+                         ['I3VJQCUY5I6UR92507', 'I2VJQC2NNUFVGSQSXT',
+                          'ENTJQCZXQV1IRKJXUL'])
+        self.assertEqual(handles['family_biggestagediff'],
+                         ['1BVJQCNTFAGS8273LJ', '8LVJQCF3MEOJ7E6QLU',
+                          'W1EKQC9EAWJGIVV6E4'])
+        self.assertEqual(records['person_youngestdivorced'], [])
+
+    def test_filter(self):
+        filter = GenericFilter()
+        filter.add_rule(IsDescendantOf(['I0044', '1']))
+        people = set(filter.apply(self.db,
+                                  list(self.db.iter_person_handles())))
+        records = self.check(self.db, filter)
+        for varname, entries in records.items():
+            for dummy, dummy, handle_type, handle in entries:
+                if handle_type == 'Person':
+                    self.assertIn(handle, people)
+                else:
+                    family = self.db.get_family_from_handle(handle)
+                    self.assertTrue(family.father_handle in people or
+                                    family.mother_handle in people)
+
+    def test_living(self):
+        for mode in (LivingProxyDb.MODE_EXCLUDE_ALL,
+                     LivingProxyDb.MODE_INCLUDE_FULL_NAME_ONLY):
+            records = self.check(LivingProxyDb(self.db, mode),
+                                 living_mode=mode)
+            self.assertEqual(records['person_youngestliving'], [])
+            self.assertEqual(records['person_oldestliving'], [])
+
+    def test_iter_find(self):
+        finder = RecordFinder(self.db, None, TOP_SIZE, 0)
+        steps = sum(1 for dummy in finder.iter_find())
+        self.assertGreater(steps, 1)
+        self.assertEqual(finder.records,
+                         find_records(self.db, None, TOP_SIZE, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the spatial index of the geography views """
+
+import random
+import unittest
+
+from gramps.plugins.lib.maps.spatialindex import SpatialIndex
+
+
+class SpatialIndexTest(unittest.TestCase):
+    """
+    The items found in the index are those found by looking at all of them.
+    """
+
+    def setUp(self):
+        rand = random.Random(45)
+        self.points = [(rand.uniform(-90, 90), rand.uniform(-180, 180))
+                       for dummy in range(2000)]
+        # some markers at the same place, as strings from conv_lat_lon
+        self.points += [(48.85, 2.35)] * 5
+        self.index = SpatialIndex()
+        for item, (lat, lon) in enumerate(self.points):
+            self.index.add("%.8f" % lat, "%.8f" % lon, item)
+
+    def scan(self, lat1, lon1, lat2, lon2):
+        return sorted(item for item, (lat, lon) in enumerate(self.points)
+                      if lat1 <= round(lat, 8) <= lat2 and
+                      lon1 <= round(lon, 8) <= lon2)
+
+    def assert_query(self, lat1, lon1, lat2, lon2):
+        found = sorted(item for dummy, dummy, item
+                       in self.index.query(lat1, lon1, lat2, lon2))
+        self.assertEqual(found, self.scan(lat1, lon1, lat2, lon2))
+
+    def test_query(self):
+        self.assertEqual(len(self.index), len(self.points))
+        self.assert_query(-90, -180, 90, 180)
+        self.assert_query(40.5, -3.25, 55.0, 10.0)
+        self.assert_query(-12.0, 100.0, -11.99, 100.01)
+        found = self.index.nearby(48.85, 2.35, 0.0001)
+        self.assertEqual([item for dummy, dummy, item in found][-5:],
+                         list(range(2000, 2005)))
+        self.index.clear()
+        self.assertEqual(self.index.query(-90, -180, 90, 180), [])
+
+    def test_cluster(self):
+        groups = self.index.cluster(10.0)
+        self.assertEqual(sum(len(group) for group in groups),
+                         len(self.points))
+        for group in groups:
+            cells = {(lat // 10.0, lon // 10.0) for lat, lon, dummy in group}
+            self.assertEqual(len(cells), 1)
+        entries = self.index.nearby(48.85, 2.35, 0.0001)
+        self.assertEqual(len(self.index.cluster(1.0, entries)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
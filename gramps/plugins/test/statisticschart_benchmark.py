@@ -0,0 +1,73 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the data collection of the statistics charts on the example
+database, with all the charts selected.
+
+Run with::
+
+    python3 -m gramps.plugins.test.statisticschart_benchmark [repeat]
+"""
+import os
+import sys
+from time import perf_counter
+
+from gramps.gen.const import DATA_DIR, GRAMPS_LOCALE as glocale
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.filters import reload_custom_filters
+from gramps.gen.lib import Person
+from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.user import User
+from gramps.plugins.drawreport.statisticschart import (
+    StatisticsChartOptions, _Extract)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+def collect(db, menu):
+    """
+    Collect the data of all the charts, for everybody.
+    """
+    return _Extract.collect_data(db, list(db.iter_person_handles()), menu,
+                                 Person.UNKNOWN, -9999, 9999, True,
+                                 lambda: None, glocale)
+
+def main(repeat=5):
+    """
+    Run the benchmark and print the results.
+    """
+    db = import_as_dict(EXAMPLE, User())
+    reload_custom_filters()
+    options = StatisticsChartOptions("statchart", db)
+    options.load_previous_values()
+    menu = options.menu
+    for name in _Extract.extractors:
+        menu.get_option_by_name(name).set_value(True)
+    best = None
+    for dummy in range(repeat):
+        start = perf_counter()
+        tables = collect(CacheProxyDb(db), menu)
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print("%d charts, %d people: %.1f ms" % (
+        len(tables), db.get_number_of_people(), best * 1000))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
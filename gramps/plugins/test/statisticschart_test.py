@@ -0,0 +1,169 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the ages and years of the statistics charts """
+
+import os
+import unittest
+from collections import Counter
+
+from gramps.gen.const import DATA_DIR, GRAMPS_LOCALE as glocale
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Date, Person
+from gramps.gen.lib import datebatch
+from gramps.gen.lib.date import gregorian
+from gramps.gen.user import User
+from gramps.plugins.drawreport.statisticschart import (
+    _Extract, estimate_age, gregorian_years)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+CHARTS = ['data_dage', 'data_fchild', 'data_lchild', 'data_byear']
+
+
+class Option:
+    def __init__(self, value):
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+
+class Menu:
+    def get_option_by_name(self, name):
+        return Option(name in CHARTS)
+
+
+def age_key(age):
+    if age[0] < 0 or age[1] < 0:
+        return "Date(s) missing"
+    if age[0] == age[1]:
+        return "%3d" % age[0]
+    return "%3d-%d" % age
+
+
+class StatisticsChartTest(unittest.TestCase):
+    """
+    The ages estimated at once are those estimated for each person, and the
+    Gregorian years converted at once are those of each date.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        # dates in the other calendars
+        calendars = [Date.CAL_JULIAN, Date.CAL_HEBREW, Date.CAL_FRENCH,
+                     Date.CAL_SWEDISH, Date.CAL_PERSIAN, Date.CAL_ISLAMIC]
+        with DbTxn("Calendars", cls.db) as trans:
+            for count, event in enumerate(list(cls.db.iter_events())):
+                date = event.get_date_object()
+                if count % 3 == 0 and date.get_year_valid():
+                    date.convert_calendar(calendars[count % len(calendars)])
+                    cls.db.commit_event(event, trans)
+
+    def setUp(self):
+        self.have_numpy = datebatch.HAVE_NUMPY
+
+    def tearDown(self):
+        datebatch.HAVE_NUMPY = self.have_numpy
+
+    def accept(self, person):
+        """
+        Whether the person was born from 1800 to 1900, or died after 1800
+        if the year of birth is unknown.
+        """
+        birth_ref = person.get_birth_ref()
+        if not birth_ref:
+            return False
+        date = self.db.get_event_from_handle(birth_ref.ref).get_date_object()
+        if date.get_year_valid():
+            return 1800 <= gregorian(date).get_year() <= 1900
+        death_ref = person.get_death_ref()
+        if not death_ref:
+            return False
+        date = self.db.get_event_from_handle(death_ref.ref).get_date_object()
+        return not date.get_year_valid() or gregorian(date).get_year() >= 1800
+
+    def expected(self):
+        """
+        The charts, with an age estimated for each person.
+        """
+        charts = {name: Counter() for name in CHARTS}
+        for person in self.db.iter_people():
+            if not self.accept(person):
+                continue
+            birth = self.db.get_event_from_handle(person.get_birth_ref().ref)
+            date = birth.get_date_object()
+            if date.get_year():
+                charts['data_byear'][glocale.get_date(
+                    Date(date.get_year()))] += 1
+            else:
+                charts['data_byear']["Date(s) missing"] += 1
+            death_ref = person.get_death_ref()
+            if death_ref:
+                charts['data_dage'][age_key(estimate_age(
+                    self.db, person, death_ref.ref))] += 1
+            else:
+                charts['data_dage']["Still alive"] += 1
+            children = [self.db.get_person_from_handle(child_ref.ref)
+                        for handle in person.get_family_handle_list()
+                        for child_ref in self.db.get_family_from_handle(
+                            handle).get_child_ref_list()]
+            ages = [age_key(estimate_age(self.db, person,
+                                         child.get_birth_ref().ref))
+                    for child in children if child.get_birth_ref()]
+            errors = ["Birth missing" for child in children
+                      if not child.get_birth_ref()]
+            for name, pick in (('data_fchild', min), ('data_lchild', max)):
+                if not children:
+                    charts[name]["Personal information missing"] += 1
+                elif ages:
+                    charts[name].update(errors + [pick(ages)])
+                else:
+                    charts[name]["Children missing"] += 1
+        return charts
+
+    def collect(self):
+        tables = _Extract.collect_data(
+            self.db, list(self.db.iter_person_handles()), Menu(),
+            Person.UNKNOWN, 1800, 1900, True, lambda: None, glocale)
+        return {name: Counter(table[1]) for name, table
+                in zip([name for name in _Extract.extractors
+                        if name in CHARTS], tables)}
+
+    def test_ages(self):
+        expected = self.expected()
+        datebatch.HAVE_NUMPY = False
+        self.assertEqual(self.collect(), expected)
+        if self.have_numpy:
+            datebatch.HAVE_NUMPY = True
+            self.assertEqual(self.collect(), expected)
+
+    def test_gregorian_years(self):
+        dates = [event.get_date_object() for event in self.db.iter_events()
+                 if event.get_date_object().get_year_valid()]
+        self.assertTrue(any(date.get_calendar() != Date.CAL_GREGORIAN
+                            for date in dates))
+        self.assertEqual(gregorian_years(dates),
+                         [gregorian(date).get_year() for date in dates])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+""" Unittest for the substitution of the keywords of the tree reports """
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR, GRAMPS_LOCALE as glocale
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.display.name import displayer as name_displayer
+from gramps.gen.proxy.cache import CacheProxyDb
+from gramps.gen.user import User
+from gramps.plugins.lib.libsubstkeyword import (ConsumableString,
+                                                DisplayCache, SubstKeywords)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+FORMATS = ["$n", "b. $b", "-{d. $d}", "{$B}", "-{at $D}", "$s(f l)",
+           "m. $m(yyyy) $M(c)", "-{$v <, > $V}", "$e[Birth](d D i)",
+           "$e[Death](d(yyyy) D", "$t[Marriage](n d(mmm) D)x)",
+           "{$b(yyyy)<->$d(yyyy)} text } \\$n $x", "$i/$j"]
+
+
+class ConsumableStringTest(unittest.TestCase):
+    """
+    The chars of the string are consumed one at a time, or by runs of plain
+    text.
+    """
+
+    def test_step(self):
+        line = ConsumableString("ab\\c")
+        self.assertEqual((line.this, line.next), ("a", "b"))
+        self.assertEqual(line.step2(), "\\")
+        self.assertEqual(line.parse_format(), "c")
+        self.assertEqual((line.this, line.next), (None, None))
+        line.step()
+        self.assertIsNone(line.this)
+
+    def test_plain_text(self):
+        line = ConsumableString("$ text } \\$n<x>")
+        self.assertEqual(line.parse_plain_text(), "$ text ")
+        self.assertEqual(line.parse_plain_text(), "} ")
+        self.assertEqual(line.parse_plain_text(), "$n")
+        self.assertEqual(line.this, "<")
+        self.assertEqual(line.text_to_next("x"), "<")
+        self.assertEqual(line.parse_plain_text(), ">")
+        self.assertIsNone(line.this)
+
+
+class SubstKeywordsTest(unittest.TestCase):
+    """
+    The lines of the people are the same, whether the objects and the
+    displayed dates and places are shared by all of them or not.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def substitute(self, database, handle, cache=None):
+        person = self.db.get_person_from_handle(handle)
+        return [SubstKeywords(database, glocale, name_displayer, handle,
+                              family_handle, cache).replace_and_clean(FORMATS)
+                for family_handle in person.get_family_handle_list()[:1]
+                + [None]]
+
+    def test_shared(self):
+        database = CacheProxyDb(self.db)
+        cache = DisplayCache()
+        handles = sorted(self.db.iter_person_handles())[::5]
+        for handle in handles + handles:
+            self.assertEqual(self.substitute(database, handle, cache),
+                             self.substitute(self.db, handle))
+        self.assertTrue(cache.dates)
+        self.assertTrue(cache.places)
+
+    def test_no_person(self):
+        self.assertEqual(SubstKeywords(self.db, glocale, name_displayer,
+                                       None).replace_and_clean(FORMATS),
+                         ["", "b. ", "", "", "m.  ", "", "", "x)",
+                          " text } $n $x", "/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
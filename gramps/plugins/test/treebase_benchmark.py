@@ -0,0 +1,128 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the pagination and the display of the pages of the tree
+reports, on generated descendant trees of up to 10 generations, and on a
+family with many children.
+
+Run with::
+
+    python3 -m gramps.plugins.test.treebase_benchmark [generations]
+"""
+import sys
+from time import perf_counter
+
+from gramps.plugins.lib.libtreebase import BoxBase, Canvas, LineBase
+
+class Doc:
+    """
+    A document of A4 pages, that only counts what is drawn.
+    """
+    def __init__(self):
+        self.drawn = 0
+
+    def get_usable_width(self):
+        return 19.0
+
+    def get_usable_height(self):
+        return 27.7
+
+    def draw_box(self, *args):
+        self.drawn += 1
+
+    def draw_line(self, *args):
+        self.drawn += 1
+
+class ReportOptions:
+    """
+    The options of the report used by the pagination.
+    """
+    littleoffset = 0.035
+    col_width = 0.8
+    line_str = "line"
+
+def build(generations, children=2):
+    """
+    Return a canvas with the descendants of one person, over generations,
+    each with children children, laid out as by the Descendant Tree.
+    """
+    canvas = Canvas(Doc(), ReportOptions())
+    canvas.add_title(BoxBase())
+    width = 3.0
+    height = 1.2
+    y_cm = [0.0]
+
+    def add(generation):
+        box = BoxBase()
+        box.boxstr = "box"
+        box.level = (generation, 0)
+        box.x_cm = generation * (width + ReportOptions.col_width)
+        box.width = width
+        box.height = height
+        canvas.add_box(box)
+        kids = []
+        if generation + 1 < generations:
+            kids = [add(generation + 1) for dummy in range(children)]
+        if kids:
+            box.y_cm = (kids[0].y_cm + kids[-1].y_cm) / 2
+            box.line_to = LineBase(box)
+            for kid in kids:
+                box.line_to.add_to(kid)
+        else:
+            box.y_cm = y_cm[0]
+            y_cm[0] += height + 0.4
+        return box
+
+    add(0)
+    canvas.sort_boxes_on_y_cm()
+    return canvas
+
+def paginate(canvas):
+    """
+    Paginate the canvas, and display all its pages. Return the number of
+    pages.
+    """
+    colsperpage = int((19.0 + ReportOptions.col_width) /
+                      (3.0 + ReportOptions.col_width)) or 1
+    canvas.paginate(colsperpage, False)
+    pages = 0
+    for page in canvas.page_iter_gen(False):
+        page.display()
+        pages += 1
+    return pages
+
+def main(generations=10):
+    """
+    Run the benchmark and print the results.
+    """
+    # binary trees, and a family with many children, whose line is on
+    # many pages
+    trees = [(count, 2) for count in range(6, generations + 1)]
+    trees.append((2, 4000))
+    for count, children in trees:
+        canvas = build(count, children)
+        boxes = len(canvas.boxes)
+        start = perf_counter()
+        pages = paginate(canvas)
+        elapsed = perf_counter() - start
+        print("%2d generations of %4d children, %5d boxes, %4d pages: "
+              "%.1f ms" % (count, children, boxes, pages, elapsed * 1000))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,96 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the engine of the Verify tool """
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+from gramps.plugins.lib.libverify import DEFAULT_OPTIONS, Verifier
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class VerifierTest(unittest.TestCase):
+    """
+    Verify the example database, in full and after changes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        self.verifier = Verifier(self.db)
+        for obj_type in ('Person', 'Family', 'Event'):
+            for action in ('add', 'update', 'delete'):
+                self.db.connect('%s-%s' % (obj_type.lower(), action),
+                                lambda handles, obj_type=obj_type:
+                                self.verifier.object_changed(obj_type,
+                                                             handles))
+
+    def get_results(self, results):
+        return {(msg, gramps_id) for (msg, gramps_id, name, the_type,
+                                      rule_id, severity, handle) in results}
+
+    def test_run(self):
+        results = self.get_results(self.verifier.run(DEFAULT_OPTIONS))
+        for expected in [("Early marriage", "F0008"),
+                         ("Young mother", "F0069"),
+                         ("Birth equals marriage", "I0334"),
+                         ("Burial before death", "I1344"),
+                         ("Old age but no death", "I0229")]:
+            self.assertIn(expected, results)
+
+    def test_options(self):
+        results = self.verifier.run(DEFAULT_OPTIONS)
+        options = dict(DEFAULT_OPTIONS, oldage=70, estimate_age=1)
+        self.assertEqual(sorted(self.verifier.run(options)),
+                         sorted(Verifier(self.db).run(options)))
+        self.assertNotEqual(sorted(self.verifier.run(options)),
+                            sorted(results))
+
+    def test_changes(self):
+        self.verifier.run(DEFAULT_OPTIONS)
+        with DbTxn("Verify test", self.db) as trans:
+            person = self.db.get_person_from_gramps_id('I0044')
+            person.set_gender(Person.UNKNOWN)
+            self.db.commit_person(person, trans)
+            person = self.db.get_person_from_gramps_id('I0001')
+            event = self.db.get_event_from_handle(person.get_birth_ref().ref)
+            event.get_date_object().set_yr_mon_day(2100, 1, 1)
+            self.db.commit_event(event, trans)
+            family = self.db.get_family_from_gramps_id('F0008')
+            self.db.remove_family_relationships(family.handle, trans)
+        results = self.verifier.run(DEFAULT_OPTIONS)
+        self.assertEqual(sorted(results),
+                         sorted(Verifier(self.db).run(DEFAULT_OPTIONS)))
+        results = self.get_results(results)
+        self.assertIn(("Unknown gender", "I0044"), results)
+        self.assertNotIn(("Early marriage", "F0008"), results)
+        self.db.undo()
+
+
+if __name__ == "__main__":
+    unittest.main()
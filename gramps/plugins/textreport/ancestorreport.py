@@ -104,7 +104,7 @@ class AncestorReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
 
         self.max_generations = menu.get_option_by_name('maxgen').get_value()
         self.pgbrk = menu.get_option_by_name('pagebbg').get_value()
@@ -178,6 +178,13 @@ class AncestorReport(Report):
         self.apply_filter(father_handle, index*2, generation+1)
         self.apply_filter(mother_handle, (index*2)+1, generation+1)
 
+    def build_map(self):
+        """
+        Return the map of the birth ancestors of the center person.
+        """
+        self.apply_filter(self.center_person.get_handle(), 1)
+        return self.map
+
     def write_report(self):
         """
         The routine the actually creates the report. At this point, the document
@@ -185,9 +192,13 @@ class AncestorReport(Report):
         """
 
         # Call apply_filter to build the self.map array of people in the
-        # database that match the ancestry.
+        # database that match the ancestry. The map is shared with the other
+        # reports of a book for the same person.
 
-        self.apply_filter(self.center_person.get_handle(), 1)
+        self.map = self.cache.get(
+            ('birth-ancestors', self.database,
+             self.center_person.get_handle(), self.max_generations),
+            self.build_map)
 
         # Write the title line. Set an INDEX mark so that this section will be
         # identified as a major category if this is included in a Book report.
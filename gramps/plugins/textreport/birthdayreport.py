@@ -259,12 +259,17 @@ class BirthdayReport(Report):
         This method runs through the data, and collects the relevant dates
         and text.
         """
-        people = self.database.iter_person_handles()
-        people = self.filter.apply(self.database, people, user=self._user)
+        people = self.cache.apply_filter(self.filter, self.database,
+                                         user=self._user)
 
         ngettext = self._locale.translation.ngettext # to see "nearby" comments
-        rel_calc = get_relationship_calculator(reinit=True,
-                                               clocale=self._locale)
+        relationships = {}
+        if self.relationships:
+            rel_calc = get_relationship_calculator(reinit=True,
+                                                   clocale=self._locale)
+            relationships = rel_calc.get_relationships_to_person(
+                self.database, self.center_person, people,
+                olocale=self._locale)
 
         with self._user.progress(_('Birthday and Anniversary Report'),
                 _('Reading database...'), len(people)) as step:
@@ -315,11 +320,7 @@ class BirthdayReport(Report):
 
                         comment = ""
                         if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            relation = relationships.get(person_handle)
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
@@ -427,11 +428,7 @@ class BirthdayReport(Report):
 
                     comment = ""
                     if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            relation = relationships.get(person_handle)
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
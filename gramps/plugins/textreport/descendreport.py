@@ -442,7 +442,7 @@ class DescendantReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
 
         self.max_generations = menu.get_option_by_name('gen').get_value()
         self.want_ids = menu.get_option_by_name('inc_id').get_value()
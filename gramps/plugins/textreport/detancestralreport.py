@@ -132,7 +132,7 @@ class DetAncestorReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self._db = self.database
 
         self.max_generations = get_value('gen')
@@ -205,8 +205,17 @@ class DetAncestorReport(Report):
             self.apply_filter(family.get_father_handle(), index*2)
             self.apply_filter(family.get_mother_handle(), (index*2)+1)
 
-    def write_report(self):
+    def build_map(self):
+        """ return the map of the ancestors of the center person """
         self.apply_filter(self.center_person.get_handle(), 1)
+        return self.map
+
+    def write_report(self):
+        # the map is shared with the other reports of a book
+        self.map = self.cache.get(
+            ('ancestors', self._db, self.center_person.get_handle(),
+             self.max_generations),
+            self.build_map)
 
         name = self._nd.display_name(self.center_person.get_primary_name())
         if not name:
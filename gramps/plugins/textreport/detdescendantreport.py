@@ -146,7 +146,7 @@ class DetDescendantReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self._db = self.database
 
         self.max_generations = get_value('gen')
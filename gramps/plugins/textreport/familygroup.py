@@ -94,7 +94,7 @@ class FamilyGroup(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self.db = self.database
 
         self.filter = menu.get_option_by_name('filter').get_filter()
@@ -667,7 +667,8 @@ class FamilyGroup(Report):
         if not self.filter:
             fam_list = flist
         else:
-            fam_list = self.filter.apply(self.db, flist, user=self._user)
+            fam_list = self.cache.apply_filter(self.filter, self.db, flist,
+                                               user=self._user)
         if fam_list:
             with self._user.progress(_('Family Group Report'),
                                      _('Writing families'),
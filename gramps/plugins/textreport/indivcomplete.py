@@ -134,7 +134,7 @@ class IndivCompleteReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self._db = self.database
 
         self.use_pagebreak = menu.get_option_by_name('pageben').get_value()
@@ -824,7 +824,8 @@ class IndivCompleteReport(Report):
         plist = self._db.get_person_handles(sort_handles=True,
                                             locale=self._locale)
         if self.filter:
-            ind_list = self.filter.apply(self._db, plist, user=self._user)
+            ind_list = self.cache.apply_filter(self.filter, self._db, plist,
+                                               user=self._user)
         else:
             ind_list = plist
         if not ind_list:
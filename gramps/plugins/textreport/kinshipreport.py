@@ -92,7 +92,7 @@ class KinshipReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self.__db = self.database
 
         self.max_descend = menu.get_option_by_name('maxdescend').get_value()
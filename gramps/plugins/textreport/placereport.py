@@ -88,7 +88,7 @@ class PlaceReport(Report):
         stdoptions.run_private_data_option(self, menu)
         living_opt = stdoptions.run_living_people_option(self, menu,
                                                          self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self._db = self.database
 
         self._lv = menu.get_option_by_name('living_people').get_value()
@@ -115,9 +115,9 @@ class PlaceReport(Report):
         self.place_handles = []
         if self.filter.get_name() != '':
             # Use the selected filter to provide a list of place handles
-            plist = self._db.iter_place_handles()
-            self.place_handles = self.filter.apply(self._db, plist,
-                                                   user=self._user)
+            self.place_handles = self.cache.apply_filter(self.filter,
+                                                         self._db,
+                                                         user=self._user)
 
         if places:
             # Add places selected individually
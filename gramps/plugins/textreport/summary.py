@@ -79,7 +79,7 @@ class SummaryReport(Report):
 
         stdoptions.run_private_data_option(self, options.menu)
         stdoptions.run_living_people_option(self, options.menu, self._locale)
-        self.database = CacheProxyDb(self.database)
+        self.database = self.cache.get_proxy(CacheProxyDb, self.database)
         self.__db = self.database
 
     def write_report(self):
@@ -114,54 +114,66 @@ class SummaryReport(Report):
         self.doc.end_paragraph()
 
         num_people = 0
-        for person in self.__db.iter_people():
-            num_people += 1
-            primary_names = [person.get_primary_name()]
-
-            # Count people with media.
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-
-            # Count people with incomplete names.
-            for name in primary_names + person.get_alternate_names():
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
+        stats = self.__db.get_statistics()
+        if stats is not None:
+            num_people = stats.get_number_of_people()
+            with_media = stats.get_people_with_media()
+            incomp_names = stats.get_incomplete_names()
+            disconnected = stats.get_disconnected()
+            missing_bday = stats.get_missing_births()
+            males = stats.get_gender_count(Person.MALE)
+            females = stats.get_gender_count(Person.FEMALE)
+            unknowns = stats.get_gender_count(Person.UNKNOWN)
+            namelist = list(stats.get_surname_counts())
+        else:
+            for person in self.__db.iter_people():
+                num_people += 1
+                primary_names = [person.get_primary_name()]
+
+                # Count people with media.
+                length = len(person.get_media_list())
+                if length > 0:
+                    with_media += 1
+
+                # Count people with incomplete names.
+                for name in primary_names + person.get_alternate_names():
+                    if name.get_first_name().strip() == "":
                         incomp_names += 1
+                    else:
+                        if name.get_surname_list():
+                            for surname in name.get_surname_list():
+                                if surname.get_surname().strip() == "":
+                                    incomp_names += 1
+                        else:
+                            incomp_names += 1
+
+                # Count people without families.
+                if (not person.get_main_parents_family_handle() and
+                        not len(person.get_family_handle_list())):
+                    disconnected += 1
+
+                # Count missing birthdays.
+                birth_ref = person.get_birth_ref()
+                if birth_ref:
+                    birth = self.__db.get_event_from_handle(birth_ref.ref)
+                    if not get_date(birth):
+                        missing_bday += 1
+                else:
+                    missing_bday += 1
 
-            # Count people without families.
-            if (not person.get_main_parents_family_handle() and
-                    not len(person.get_family_handle_list())):
-                disconnected += 1
+                # Count genders.
+                if person.get_gender() == Person.FEMALE:
+                    females += 1
+                elif person.get_gender() == Person.MALE:
+                    males += 1
+                else:
+                    unknowns += 1
 
-            # Count missing birthdays.
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = self.__db.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            # Count genders.
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            else:
-                unknowns += 1
-
-            # Count unique surnames
-            for name in primary_names + person.get_alternate_names():
-                if (not name.get_surname().strip() in namelist
-                        and not name.get_surname().strip() == ""):
-                    namelist.append(name.get_surname().strip())
+                # Count unique surnames
+                for name in primary_names + person.get_alternate_names():
+                    if (not name.get_surname().strip() in namelist
+                            and not name.get_surname().strip() == ""):
+                        namelist.append(name.get_surname().strip())
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(self._("Number of individuals: %d") % num_people)
@@ -230,18 +242,28 @@ class SummaryReport(Report):
 
         total_media = len(self.__db.get_media_handles())
         mbytes = "0"
-        for media_id in self.__db.get_media_handles():
-            media = self.__db.get_media_from_handle(media_id)
-            try:
-                size_in_bytes += os.path.getsize(
-                    media_path_full(self.__db, media.get_path()))
-                length = len(str(size_in_bytes))
+        stats = self.__db.get_statistics()
+        if stats is not None:
+            size_in_bytes = stats.get_media_bytes()
+            notfound = stats.get_missing_media()
+            if len(notfound) < total_media:
                 if size_in_bytes <= 999999:
                     mbytes = self._("less than 1")
                 else:
-                    mbytes = str(size_in_bytes)[:(length-6)]
-            except:
-                notfound.append(media.get_path())
+                    mbytes = str(size_in_bytes)[:-6]
+        else:
+            for media_id in self.__db.get_media_handles():
+                media = self.__db.get_media_from_handle(media_id)
+                try:
+                    size_in_bytes += os.path.getsize(
+                        media_path_full(self.__db, media.get_path()))
+                    length = len(str(size_in_bytes))
+                    if size_in_bytes <= 999999:
+                        mbytes = self._("less than 1")
+                    else:
+                        mbytes = str(size_in_bytes)[:(length-6)]
+                except:
+                    notfound.append(media.get_path())
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(self._("Number of unique media objects: %d"
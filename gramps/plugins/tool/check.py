@@ -80,6 +80,11 @@ from gramps.gen.errors import HandleError
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) +
                            list(range(14, 32)), " ")
 
+# the classes of the primary objects, by their names
+PRIMARY_CLASSES = {cls.__name__: cls
+                   for cls in (Person, Family, Event, Place, Source, Citation,
+                               Repository, Media, Note, Tag)}
+
 
 class ProgressMeter:
     def __init__(self, *args, **kwargs):
@@ -292,6 +297,7 @@ class CheckIntegrity:
         self.duplicated_gramps_ids = 0
         self.bad_backlinks = 0
         self.bad_note_links = 0
+        self.references = None
         self.text = StringIO()
         self.last_img_dir = config.get('behavior.addmedia-image-dir')
         self.progress = ProgressMeter(_('Checking Database'), '',
@@ -1237,34 +1243,36 @@ class CheckIntegrity:
     def check_backlinks(self):
         '''Looking for backlink reference problems'''
 
+        # the objects have changed since the references were read
+        self.references = None
         total = self.db.get_total()
 
         self.progress.set_pass(_('Looking for backlink reference problems') +
                                ' (1)', total)
         logging.info('Looking for backlink reference problems')
 
+        # set of the (class_name, handle) of the objects of the db
+        objects = set()
         # dict of object handles indexed by forward link created here
-        my_blinks = defaultdict(list)
-        my_items = 0  # count of my backlinks for progress meter
-        # dict of object handles indexed by forward link from db
-        db_blinks = {}
-        db_items = 0  # count of db backlinks for progress meter
-
-        # first we assemble our own backlinks table, and while we have the
-        # handle, gather up a second table with the db's backlinks
-        for obj_class in CLASS_TO_KEY_MAP.keys():
-            for handle in self.db.method("iter_%s_handles", obj_class)():
-                self.progress.step()
-                blinks = list(self.db.find_backlink_handles(handle))
-                db_blinks[(obj_class, handle)] = blinks
-                db_items += len(blinks)
-                pri_obj = self.db.method('get_%s_from_handle',
-                                         obj_class)(handle)
-                handle_list = pri_obj.get_referenced_handles_recursively()
-                my_items += len(handle_list)
+        my_blinks = defaultdict(set)
+
+        # first we assemble our own backlinks table, reading the objects
+        # through the cursors of the tables
+        for obj_class, class_func in PRIMARY_CLASSES.items():
+            with self.db.method('get_%s_cursor', obj_class)() as cursor:
+                for handle, data in cursor:
+                    self.progress.step()
+                    objects.add((obj_class, handle))
+                    pri_obj = class_func.create(data)
+                    handle_list = pri_obj.get_referenced_handles_recursively()
+
+                    for item in handle_list:
+                        my_blinks[item].add((obj_class, handle))
+        my_items = sum(len(blinks) for blinks in my_blinks.values())
 
-                for item in handle_list:
-                    my_blinks[item].append((obj_class, handle))
+        # dict of object handles indexed by handle of the forward link,
+        # from the db, read at once
+        db_blinks = self.db.get_backlink_map()
 
         # Now we go through our backlinks and the dbs table comparing them
         # check that each real reference has a backlink in the db table
@@ -1273,14 +1281,14 @@ class CheckIntegrity:
         for key, blinks in my_blinks.items():
             for item in blinks:
                 self.progress.step()
-                if key not in db_blinks:
+                if key not in objects:
                     # object has reference to something not in db;
                     # should have been found in previous checks
                     logging.warning('    Fail: reference to an object %(obj)s'
                                     ' not in the db by %(ref)s!',
                                     {'obj': key, 'ref': item})
                     continue
-                if item not in db_blinks[key]:
+                if item not in db_blinks.get(key[1], ()):
                     # Object has reference with no cooresponding backlink
                     self.bad_backlinks += 1
                     pri_obj = self.db.method('get_%s_from_handle',
@@ -1293,12 +1301,13 @@ class CheckIntegrity:
 
         # Now we go through the db table and make checks against ours
         # Check for db backlinks that don't have a reference object at all
+        db_items = sum(len(db_blinks.get(key[1], ())) for key in objects)
         self.progress.set_pass(_('Looking for backlink reference problems') +
                                ' (3)', db_items)
-        for key, blinks in db_blinks.items():
-            for item in blinks:
+        for key in objects:
+            for item in db_blinks.get(key[1], ()):
                 self.progress.step()
-                if item not in db_blinks:
+                if item not in objects:
                     # backlink to object entirely missing
                     self.bad_backlinks += 1
                     pri_obj = self.db.method('get_%s_from_handle',
@@ -1310,7 +1319,7 @@ class CheckIntegrity:
                                      'cls': key[0], 'cls2': item[0]})
                     continue
                 # Check if the object has a reference to the backlinked one
-                if key not in my_blinks or item not in my_blinks[key]:
+                if item not in my_blinks.get(key, ()):
                     # backlink to object which doesn't have reference
                     self.bad_backlinks += 1
                     pri_obj = self.db.method('get_%s_from_handle',
@@ -1518,123 +1527,70 @@ class CheckIntegrity:
         if len(self.invalid_place_references) == 0:
             logging.info('    OK: no place reference problems found')
 
+    def get_references(self):
+        """
+        Return the references of the primary objects, as lists of
+        (class_name, handle, ref_handle) tuples of the referencing objects
+        and the referenced handles, by the class names of the referenced
+        objects.
+
+        The objects are read once, for all the checks of the references to
+        citations, media, notes and tags, which do not change the references
+        they do not check.
+        """
+        if self.references is None:
+            self.progress.set_pass(_('Looking for references'),
+                                   self.db.get_total())
+            self.references = defaultdict(list)
+            for obj_class, class_func in PRIMARY_CLASSES.items():
+                with self.db.method('get_%s_cursor', obj_class)() as cursor:
+                    for handle, data in cursor:
+                        self.progress.step()
+                        obj = class_func.create(data)
+                        for (ref_class, ref_handle) in \
+                                obj.get_referenced_handles_recursively():
+                            self.references[ref_class].append(
+                                (obj_class, handle, ref_handle))
+        return self.references
+
+    def check_class_references(self, title, ref_class, obj_classes,
+                               known_handles, invalid_references):
+        """
+        Look for the references to objects of class ref_class, held by the
+        objects of the obj_classes, that are not in the set known_handles,
+        and add them to invalid_references. The empty references of an
+        object are replaced by a new handle, added to invalid_references.
+        """
+        references = self.get_references()[ref_class]
+        self.progress.set_pass(title, len(references))
+        empty = {}
+        for (obj_class, handle, ref_handle) in references:
+            self.progress.step()
+            if obj_class not in obj_classes:
+                continue
+            if not ref_handle:
+                empty[(obj_class, handle)] = True
+            elif ref_handle not in known_handles:
+                invalid_references.add(ref_handle)
+
+        for (obj_class, handle) in empty:
+            obj = self.db.method('get_%s_from_handle', obj_class)(handle)
+            new_handle = create_id()
+            getattr(obj, 'replace_%s_references' % ref_class.lower())(
+                None, new_handle)
+            self.db.method('commit_%s', obj_class)(obj, self.trans)
+            invalid_references.add(new_handle)
+
     def check_citation_references(self):
         '''Looking for citation reference problems'''
-        known_handles = self.db.get_citation_handles()
+        known_handles = set(self.db.iter_citation_handles())
 
-        total = (
-            self.db.get_number_of_people() +
-            self.db.get_number_of_families() +
-            self.db.get_number_of_events() +
-            self.db.get_number_of_places() +
-            self.db.get_number_of_citations() +
-            self.db.get_number_of_sources() +
-            self.db.get_number_of_media() +
-            self.db.get_number_of_repositories()
-            )
-
-        self.progress.set_pass(_('Looking for citation reference problems'),
-                               total)
         logging.info('Looking for citation reference problems')
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_citation_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_citation_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_citation_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_citation_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_citation_references(None,
-                                                               new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_citation_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_citation_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
+        self.check_class_references(
+            _('Looking for citation reference problems'),
+            'Citation', ('Person', 'Family', 'Place', 'Citation', 'Repository',
+                         'Media', 'Event'),
+            known_handles, self.invalid_citation_references)
 
         for bad_handle in self.invalid_citation_references:
             created = make_unknown(bad_handle, self.explanation.handle,
@@ -1682,104 +1638,15 @@ class CheckIntegrity:
 
     def check_media_references(self):
         '''Looking for media object reference problems'''
-        known_handles = self.db.get_media_handles(False)
-
-        total = (
-            self.db.get_number_of_people() +
-            self.db.get_number_of_families() +
-            self.db.get_number_of_events() +
-            self.db.get_number_of_places() +
-            self.db.get_number_of_citations() +
-            self.db.get_number_of_sources()
-            )
+        known_handles = set(self.db.iter_media_handles())
 
-        self.progress.set_pass(_('Looking for media object reference '
-                                 'problems'), total)
         logging.info('Looking for media object reference problems')
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_media_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_media_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_media_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_media_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_media_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_media_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
+        self.check_class_references(
+            _('Looking for media object reference '
+              'problems'),
+            'Media', ('Person', 'Family', 'Event', 'Place', 'Citation',
+                      'Source'),
+            known_handles, self.invalid_media_references)
 
         for bad_handle in self.invalid_media_references:
             make_unknown(bad_handle, self.explanation.handle, self.class_media,
@@ -1804,132 +1671,14 @@ class CheckIntegrity:
         if missing_references:
             self.db.add_note(self.explanation, self.trans, set_gid=True)
 
-        known_handles = self.db.get_note_handles()
-
-        total = (self.db.get_number_of_people() +
-                 self.db.get_number_of_families() +
-                 self.db.get_number_of_events() +
-                 self.db.get_number_of_places() +
-                 self.db.get_number_of_media() +
-                 self.db.get_number_of_citations() +
-                 self.db.get_number_of_sources() +
-                 self.db.get_number_of_repositories())
+        known_handles = set(self.db.iter_note_handles())
 
-        self.progress.set_pass(_('Looking for note reference problems'),
-                               total)
         logging.info('Looking for note reference problems')
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_note_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_note_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_note_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_note_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_note_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_note_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_note_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repo = self.db.get_repository_from_handle(handle)
-            handle_list = repo.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repo.replace_note_references(None, new_handle)
-                        self.db.commit_repository(repo, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
+        self.check_class_references(
+            _('Looking for note reference problems'),
+            'Note', ('Person', 'Family', 'Place', 'Citation', 'Source',
+                     'Media', 'Event', 'Repository'),
+            known_handles, self.invalid_note_references)
 
         for bad_handle in self.invalid_note_references:
             make_unknown(bad_handle, self.explanation.handle,
@@ -1957,147 +1706,14 @@ class CheckIntegrity:
 
     def check_tag_references(self):
         '''Looking for tag reference problems'''
-        known_handles = self.db.get_tag_handles()
-
-        total = (self.db.get_number_of_people() +
-                 self.db.get_number_of_families() +
-                 self.db.get_number_of_media() +
-                 self.db.get_number_of_notes() +
-                 self.db.get_number_of_events() +
-                 self.db.get_number_of_citations() +
-                 self.db.get_number_of_sources() +
-                 self.db.get_number_of_places() +
-                 self.db.get_number_of_repositories())
-
-        self.progress.set_pass(_('Looking for tag reference problems'),
-                               total)
-        logging.info('Looking for tag reference problems')
+        known_handles = set(self.db.iter_tag_handles())
 
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_tag_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_tag_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_tag_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_note_handles():
-            self.progress.step()
-            note = self.db.get_note_from_handle(handle)
-            handle_list = note.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        note.replace_tag_references(None, new_handle)
-                        self.db.commit_note(note, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_tag_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_tag_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_tag_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_tag_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_tag_references(None, new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+        logging.info('Looking for tag reference problems')
+        self.check_class_references(
+            _('Looking for tag reference problems'),
+            'Tag', ('Person', 'Family', 'Media', 'Note', 'Event', 'Citation',
+                    'Source', 'Place', 'Repository'),
+            known_handles, self.invalid_tag_references)
 
         for bad_handle in self.invalid_tag_references:
             make_unknown(bad_handle, None, self.class_tag,
@@ -2185,113 +1801,27 @@ class CheckIntegrity:
         self.progress.set_pass(_('Looking for Duplicated Gramps ID '
                                  'problems'), total)
         logging.info('Looking for Duplicated Gramps ID problems')
-        gid_list = []
-        for citation in self.db.iter_citations():
-            self.progress.step()
-            ogid = gid = citation.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_citation_gramps_id()
-                citation.set_gramps_id(gid)
-                self.db.commit_citation(citation, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for event in self.db.iter_events():
-            self.progress.step()
-            ogid = gid = event.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_event_gramps_id()
-                event.set_gramps_id(gid)
-                self.db.commit_event(event, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for family in self.db.iter_families():
-            self.progress.step()
-            ogid = gid = family.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_family_gramps_id()
-                family.set_gramps_id(gid)
-                self.db.commit_family(family, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for media in self.db.iter_media():
-            self.progress.step()
-            ogid = gid = media.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_media_gramps_id()
-                media.set_gramps_id(gid)
-                self.db.commit_media(media, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for note in self.db.iter_notes():
-            ogid = gid = note.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_note_gramps_id()
-                note.set_gramps_id(gid)
-                self.db.commit_note(note, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for person in self.db.iter_people():
-            self.progress.step()
-            ogid = gid = person.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_person_gramps_id()
-                person.set_gramps_id(gid)
-                self.db.commit_person(person, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for place in self.db.iter_places():
-            self.progress.step()
-            ogid = gid = place.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_place_gramps_id()
-                place.set_gramps_id(gid)
-                self.db.commit_place(place, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for repository in self.db.iter_repositories():
-            self.progress.step()
-            ogid = gid = repository.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_repository_gramps_id()
-                repository.set_gramps_id(gid)
-                self.db.commit_repository(repository, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for source in self.db.iter_sources():
-            self.progress.step()
-            ogid = gid = source.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_source_gramps_id()
-                source.set_gramps_id(gid)
-                self.db.commit_source(source, self.trans)
-                logging.warning('    FAIL: Duplicated Gramps ID found, '
-                                'Original: "%s" changed to: "%s"', ogid, gid)
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
+        # the Gramps ID is the second field of the data of the objects: an
+        # object is only created when its ID is a duplicate
+        for obj_class in ('Citation', 'Event', 'Family', 'Media', 'Note',
+                          'Person', 'Place', 'Repository', 'Source'):
+            gid_set = set()
+            with self.db.method('get_%s_cursor', obj_class)() as cursor:
+                for dummy, data in cursor:
+                    self.progress.step()
+                    ogid = gid = data[1]
+                    if gid in gid_set:
+                        obj = PRIMARY_CLASSES[obj_class].create(data)
+                        gid = self.db.method('find_next_%s_gramps_id',
+                                             obj_class)()
+                        obj.set_gramps_id(gid)
+                        self.db.method('commit_%s', obj_class)(obj,
+                                                                self.trans)
+                        logging.warning('    FAIL: Duplicated Gramps ID '
+                                        'found, Original: "%s" changed to: '
+                                        '"%s"', ogid, gid)
+                        self.duplicated_gramps_ids += 1
+                    gid_set.add(gid)
 
     def check_note_links(self):
         """
@@ -2323,7 +1853,7 @@ class CheckIntegrity:
                     logging.warning('    FAIL: Bad Note Link found, '
                                     '%s: %s: %s', obj_class, prop, value)
                     self.bad_note_links += 1
-            if len(text.get_tags()) != new_tags:
+            if len(text.get_tags()) != len(new_tags):
                 text.set_tags(new_tags)
                 self.db.commit_note(note, self.trans)
 
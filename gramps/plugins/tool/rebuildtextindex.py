@@ -0,0 +1,97 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"Rebuild the text index"
+
+#-------------------------------------------------------------------------
+#
+# python modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.gettext
+
+#------------------------------------------------------------------------
+#
+# Set up logging
+#
+#------------------------------------------------------------------------
+import logging
+log = logging.getLogger(".RebuildTextIndex")
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gui.plug import tool
+from gramps.gui.dialog import OkDialog
+
+#-------------------------------------------------------------------------
+#
+# runTool
+#
+#-------------------------------------------------------------------------
+class RebuildTextIndex(tool.Tool):
+
+    def __init__(self, dbstate, user, options_class, name, callback=None):
+        uistate = user.uistate
+
+        tool.Tool.__init__(self, dbstate, options_class, name)
+
+        if self.db.readonly:
+            return
+
+        self.db.disable_signals()
+        if uistate:
+            self.callback = uistate.pulse_progressbar
+            uistate.set_busy_cursor(True)
+            uistate.progress.show()
+            uistate.push_message(dbstate, _("Rebuilding text index..."))
+        else:
+            self.callback = None
+            print(_("Rebuilding text index..."))
+
+        rebuilt = self.db.rebuild_text_index(self.callback)
+
+        if rebuilt:
+            title = _("Text index rebuilt")
+            message = _('The text index has been rebuilt.')
+        else:
+            title = _("No text index")
+            message = _('This database does not support a text index.')
+        if uistate:
+            uistate.set_busy_cursor(False)
+            uistate.progress.hide()
+            OkDialog(title, message, parent=uistate.window)
+        else:
+            print(message)
+        self.db.enable_signals()
+
+#------------------------------------------------------------------------
+#
+#
+#
+#------------------------------------------------------------------------
+class RebuildTextIndexOptions(tool.ToolOptions):
+    """
+    Defines options and provides handling interface.
+    """
+
+    def __init__(self, name, person_id=None):
+        tool.ToolOptions.__init__(self, name, person_id)
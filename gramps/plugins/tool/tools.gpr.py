@@ -298,6 +298,28 @@ optionclass = 'RebuildRefMapOptions',
 tool_modes = [TOOL_MODE_GUI, TOOL_MODE_CLI]
   )
 
+#------------------------------------------------------------------------
+#
+# Rebuild Text Index
+#
+#------------------------------------------------------------------------
+
+register(TOOL,
+id = 'rebuild_textindex',
+name = _("Rebuild Text Index"),
+description = _("Rebuilds the index used to search text"),
+version = '1.0',
+gramps_target_version = MODULE_VERSION,
+status = STABLE,
+fname = 'rebuildtextindex.py',
+authors = ["The Gramps Project"],
+authors_email = [""],
+category = TOOL_DBFIX,
+toolclass = 'RebuildTextIndex',
+optionclass = 'RebuildTextIndexOptions',
+tool_modes = [TOOL_MODE_GUI, TOOL_MODE_CLI]
+  )
+
 #------------------------------------------------------------------------
 #
 # Rebuild Gender Statistics
@@ -53,7 +53,6 @@ from gramps.gen.config import config
 from gramps.gen.datehandler import displayer, get_date
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.display.place import displayer as _pd
-from gramps.gen.utils.place import conv_lat_lon
 from gramps.gui.views.bookmarks import PersonBookmarks
 from gramps.plugins.lib.maps import constants
 from gramps.plugins.lib.maps.geography import GeoGraphyView
@@ -476,10 +475,7 @@ class GeoClose(GeoGraphyView):
                 if place_handle:
                     place = dbstate.db.get_place_from_handle(place_handle)
                     if place:
-                        longitude = place.get_longitude()
-                        latitude = place.get_latitude()
-                        latitude, longitude = conv_lat_lon(latitude,
-                                                           longitude, "D.D8")
+                        latitude, longitude = self.get_place_coordinates(place)
                         descr = _pd.display(dbstate.db, place)
                         evt = EventType(event.get_type())
                         descr1 = _("%(eventtype)s : %(name)s") % {
@@ -531,10 +527,8 @@ class GeoClose(GeoGraphyView):
                                     place = dbstate.db.get_place_from_handle(
                                                     place_handle)
                                     if place:
-                                        longitude = place.get_longitude()
-                                        latitude = place.get_latitude()
-                                        latitude, longitude = conv_lat_lon(
-                                                  latitude, longitude, "D.D8")
+                                        latitude, longitude = (
+                                            self.get_place_coordinates(place))
                                         descr = _pd.display(dbstate.db, place)
                                         evt = EventType(event.get_type())
                                         eyear = str(
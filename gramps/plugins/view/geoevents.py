@@ -53,7 +53,6 @@ from gramps.gen.config import config
 from gramps.gen.datehandler import displayer
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.display.place import displayer as _pd
-from gramps.gen.utils.place import conv_lat_lon
 from gramps.gui.views.bookmarks import EventBookmarks
 from gramps.plugins.lib.maps.geography import GeoGraphyView
 from gramps.gui.utils import ProgressMeter
@@ -258,9 +257,7 @@ class GeoEvents(GeoGraphyView):
             place = dbstate.db.get_place_from_handle(place_handle)
             if place:
                 descr1 = _pd.display(dbstate.db, place)
-                longitude = place.get_longitude()
-                latitude = place.get_latitude()
-                latitude, longitude = conv_lat_lon(latitude, longitude, "D.D8")
+                latitude, longitude = self.get_place_coordinates(place)
                 # place.get_longitude and place.get_latitude return
                 # one string. We have coordinates when the two values
                 # contains non null string.
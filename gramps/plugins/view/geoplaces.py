@@ -301,9 +301,7 @@ class GeoPlaces(GeoGraphyView):
         if self.nbplaces >= self._config.get("geography.max_places"):
             return
         descr = _pd.display(self.dbstate.db, place)
-        longitude = place.get_longitude()
-        latitude = place.get_latitude()
-        latitude, longitude = conv_lat_lon(latitude, longitude, "D.D8")
+        latitude, longitude = self.get_place_coordinates(place)
         self.load_kml_files(place)
         # place.get_longitude and place.get_latitude return
         # one string. We have coordinates when the two values
@@ -80,7 +80,6 @@ from gramps.gen.utils.db import get_birth_or_fallback, get_death_or_fallback
 from gramps.gen.datehandler import parser as _dp
 from gramps.plugins.lib.libhtml import Html, xml_lang
 from gramps.plugins.lib.libhtmlbackend import HtmlBackend, process_spaces
-from gramps.gen.utils.place import conv_lat_lon
 from gramps.gen.utils.location import get_main_location
 from gramps.plugins.webreport.common import (_NAME_STYLE_DEFAULT, HTTP, HTTPS,
                                              add_birthdate, CSS, html_escape,
@@ -224,6 +223,19 @@ class BasePage:
         name = _nd.display(person)
         return (name, person.get_gramps_id())
 
+    def sort_people_on_name(self, handle_list):
+        """
+        Sort people on name and gramps ID, as sort_on_name_and_grampsid,
+        formatting all the names at once.
+        """
+        people = [self.r_db.get_person_from_handle(handle)
+                  for handle in handle_list]
+        names = _nd.format_many(person.get_primary_name().serialize()
+                                for person in people)
+        keys = {person.handle: (name, person.get_gramps_id())
+                for person, name in zip(people, names)}
+        return sorted(handle_list, key=keys.get)
+
     def sort_on_given_and_birth(self, handle):
         """ Used to sort on given name and birth date. """
         person = self.r_db.get_person_from_handle(handle)
@@ -880,13 +892,11 @@ class BasePage:
                     for data in place_lat_long)
         if not found:
             placetitle = _pd.display(self.r_db, place)
-            latitude = place.get_latitude()
-            longitude = place.get_longitude()
-            if latitude and longitude:
-                latitude, longitude = conv_lat_lon(latitude, longitude, "D.D8")
-                if latitude is not None:
-                    place_lat_long.append([latitude, longitude, placetitle,
-                                           place_handle, event])
+            latitude, longitude = self.report.get_place_coordinates(
+                place_handle)
+            if latitude is not None:
+                place_lat_long.append([latitude, longitude, placetitle,
+                                       place_handle, event])
 
     def _get_event_place(self, person, place_lat_long):
         """
@@ -215,8 +215,8 @@ class FamilyPages(BasePage):
                         letter = '&nbsp;'
 
                     # get person from sorted database list
-                    for person_handle in sorted(
-                            handle_list, key=self.sort_on_name_and_grampsid):
+                    for person_handle in self.sort_people_on_name(
+                            handle_list):
                         person = self.r_db.get_person_from_handle(person_handle)
                         if person:
                             family_list = person.get_family_handle_list()
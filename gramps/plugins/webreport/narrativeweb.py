@@ -153,6 +153,7 @@ class NavWebReport(Report):
         stdoptions.run_living_people_option(self, menu)
         self.database = CacheProxyDb(self.database)
         self._db = self.database
+        self.place_coordinates = None
 
         filters_option = menu.get_option_by_name('filter')
         self.filter = filters_option.get_filter()
@@ -1810,6 +1811,21 @@ class NavWebReport(Report):
         """
         return person_handle in self.obj_dict[Person]
 
+    def get_place_coordinates(self, place_handle):
+        """
+        Return the latitude and longitude of a place as strings, in the
+        'D.D8' format of conv_lat_lon, or (None, None) if it has no valid
+        coordinates. The coordinates of all the places are read at once.
+
+        @param: place_handle -- The place we are looking for
+        """
+        if self.place_coordinates is None:
+            self.place_coordinates = self.database.get_place_coordinates()
+        coordinates = self.place_coordinates.get(place_handle)
+        if coordinates is None:
+            return (None, None)
+        return ("%.8f" % coordinates[0], "%.8f" % coordinates[1])
+
     def pgrs_title(self, the_lang):
         """Set the user progress popup message depending on the lang."""
         if the_lang:
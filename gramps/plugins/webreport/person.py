@@ -271,8 +271,7 @@ class PersonPages(BasePage):
                 else:
                     surnamed = surname
                 first_surname = True
-                for person_handle in sorted(handle_list,
-                                            key=self.sort_on_name_and_grampsid):
+                for person_handle in self.sort_people_on_name(handle_list):
                     person = self.r_db.get_person_from_handle(person_handle)
                     if person.get_change_time() > date:
                         date = person.get_change_time()
@@ -442,9 +442,8 @@ class PlacePages(BasePage):
             # docstring, it does NOT have to be properly indented
             if self.placemappages:
                 if place and (place.lat and place.long):
-                    latitude, longitude = conv_lat_lon(place.get_latitude(),
-                                                       place.get_longitude(),
-                                                       "D.D8")
+                    latitude, longitude = self.report.get_place_coordinates(
+                        place_handle)
                     tracelife = " "
                     if self.create_media and media_list:
                         for fmedia in media_list: